@@ -0,0 +1 @@
+"""Offline performance benchmarks. Run modules with `python -m benchmarks.<name>`."""
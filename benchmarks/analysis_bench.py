@@ -0,0 +1,334 @@
+"""
+Code analysis benchmark: wall time, files stat'ed, bytes read and memory per detector.
+
+Generates a synthetic monorepo (N services x M source files, mixed Node.js and
+Python, with vendored node_modules/.venv trees and ignored build output that
+the scanner must prune), then runs CodeAnalysisAgent.analyze in three
+scenarios:
+
+    cold         no analysis cache
+    warm         nothing changed since the cold run
+    one-service  one service's source file edited
+
+Every phase (index build, each detector, everything else) is measured
+separately. Stats are counted by instrumenting os.stat / os.scandir,
+bytes read come from /proc/self/io (Linux; "n/a" elsewhere).
+
+Usage:
+    python -m benchmarks.analysis_bench                            # 50 services x 20 files
+    python -m benchmarks.analysis_bench --services 200 --files 40 --json analysis_bench.json
+    python -m benchmarks.analysis_bench --baseline analysis_bench.json   # exit 1 on regression
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks.common import current_rss_mb, io_read_bytes, peak_rss_mb, print_table, timed, write_json
+from src.agents.code_analysis_agent import CodeAnalysisAgent
+
+DEFAULT_SERVICES = 50
+DEFAULT_FILES = 20
+DEFAULT_VENDORED = 30       # packages under each Node service's node_modules
+DEFAULT_FILE_KB = 4
+DEFAULT_TOLERANCE = 0.25    # allowed growth vs --baseline before failing
+
+NODE_DEPS = ["express", "fastify", "pg", "ioredis", "mongoose", "kafkajs", "react", "vite", "@aws-sdk/client-s3",
+             "lodash", "axios", "zod", "dotenv"]
+PYTHON_DEPS = ["flask", "fastapi", "django", "psycopg2", "redis", "celery", "boto3", "requests", "pydantic"]
+
+
+# ─── Synthetic monorepo ─────────────────────────────────────────────
+
+def _source(rng: random.Random, size: int, line: str) -> str:
+    body, words = [], 0
+    while words * 8 < size:
+        body.append(f"{line} // {rng.randrange(10**6)}")
+        words += len(body[-1]) // 8 + 1
+    return "\n".join(body) + "\n"
+
+
+def _write(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def generate_monorepo(root: str, services: int = DEFAULT_SERVICES, files: int = DEFAULT_FILES,
+                      vendored: int = DEFAULT_VENDORED, file_kb: int = DEFAULT_FILE_KB,
+                      python_share: float = 0.3, seed: int = 7) -> dict:
+    """Writes the repo under `root`; returns counts of what was generated (and what should be pruned)."""
+    rng = random.Random(seed)
+    size = file_kb * 1024
+    counts = {"services": services, "source_files": 0, "vendored_files": 0}
+
+    _write(os.path.join(root, ".gitignore"), "dist/\n*.log\n")
+    _write(os.path.join(root, "package.json"), json.dumps({"name": "mono", "private": True,
+                                                           "workspaces": ["services/*"]}, indent=2))
+    compose = ["services:"] + [f"  svc{i:03d}:\n    build: ./services/svc{i:03d}\n    ports:\n      - \"{4000 + i}:{4000 + i}\""
+                               for i in range(min(services, 20))]
+    _write(os.path.join(root, "docker-compose.yml"), "\n".join(compose) + "\n")
+
+    for i in range(services):
+        svc = os.path.join(root, "services", f"svc{i:03d}")
+        if rng.random() < python_share:
+            deps = rng.sample(PYTHON_DEPS, 4)
+            _write(os.path.join(svc, "requirements.txt"), "\n".join(f"{d}=={rng.randint(1, 9)}.0" for d in deps) + "\n")
+            _write(os.path.join(svc, "app.py"), f"import os\nPORT = int(os.environ.get('PORT_{i}', {5000 + i}))\n"
+                   + _source(rng, size, "x = compute()"))
+            for k in range(files):
+                _write(os.path.join(svc, "pkg", f"mod_{k}.py"), _source(rng, size, "value = transform(value)"))
+            for k in range(vendored // 3):
+                _write(os.path.join(svc, ".venv", "lib", "site-packages", f"lib{k}", "__init__.py"), "pass\n")
+                counts["vendored_files"] += 1
+        else:
+            deps = rng.sample(NODE_DEPS, 5)
+            _write(os.path.join(svc, "package.json"), json.dumps({
+                "name": f"svc{i:03d}", "dependencies": {d: "^1.0.0" for d in deps},
+                "devDependencies": {"jest": "^29"}, "scripts": {"start": "node server.js"},
+            }, indent=2))
+            _write(os.path.join(svc, "server.js"), f"const port = process.env.PORT || {4000 + i};\n"
+                   f"app.listen({4000 + i});\n" + _source(rng, size, "const x = require('./lib');"))
+            for k in range(files):
+                _write(os.path.join(svc, "src", f"file_{k}.js"), _source(rng, size, "export const f = () => g();"))
+            for k in range(vendored):
+                pkg = os.path.join(svc, "node_modules", f"pkg{k}")
+                _write(os.path.join(pkg, "package.json"), json.dumps({"name": f"pkg{k}", "version": "1.0.0"}))
+                _write(os.path.join(pkg, "index.js"), "module.exports = {};\n")
+                counts["vendored_files"] += 2
+            _write(os.path.join(svc, "dist", "bundle.js"), _source(rng, size, "bundled();"))
+            counts["vendored_files"] += 1
+        counts["source_files"] += files + 2
+    return counts
+
+
+# ─── Instrumentation ────────────────────────────────────────────────
+
+class _CountingEntry:
+    """os.DirEntry proxy (DirEntry itself can't be patched) that counts stat() calls."""
+
+    __slots__ = ("_entry", "_counter")
+
+    def __init__(self, entry, counter):
+        self._entry = entry
+        self._counter = counter
+
+    def stat(self, *args, **kwargs):
+        self._counter.stats += 1
+        return self._entry.stat(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def __fspath__(self):
+        return self._entry.path
+
+
+class _CountingScandir:
+    def __init__(self, it, counter):
+        self._it = it
+        self._counter = counter
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._it.close()
+
+    def __iter__(self):
+        return (_CountingEntry(e, self._counter) for e in self._it)
+
+    def close(self):
+        self._it.close()
+
+
+class IOCounter:
+    """Counts os.stat/os.lstat calls (including via os.path and DirEntry.stat) and directory listings."""
+
+    def __init__(self):
+        self.stats = 0
+        self.listings = 0
+        self._saved = None
+
+    def __enter__(self):
+        self._saved = (os.stat, os.lstat, os.scandir)
+        real_stat, real_lstat, real_scandir = self._saved
+
+        def stat(*args, **kwargs):
+            self.stats += 1
+            return real_stat(*args, **kwargs)
+
+        def lstat(*args, **kwargs):
+            self.stats += 1
+            return real_lstat(*args, **kwargs)
+
+        def scandir(*args, **kwargs):
+            self.listings += 1
+            return _CountingScandir(real_scandir(*args, **kwargs), self)
+
+        os.stat, os.lstat, os.scandir = stat, lstat, scandir
+        return self
+
+    def __exit__(self, *exc):
+        os.stat, os.lstat, os.scandir = self._saved
+
+
+class PhaseRecorder:
+    """Wraps the agent's index build and detector methods to measure each one."""
+
+    def __init__(self, counter: IOCounter, trace_alloc: bool):
+        self.counter = counter
+        self.trace_alloc = trace_alloc
+        self.phases: list[dict] = []
+
+    def wrap(self, agent: CodeAnalysisAgent):
+        targets = [("index", "_build_index")] + [(d.name, d.method) for d in agent.DETECTORS]
+        for phase, method in targets:
+            setattr(agent, method, self._measured(phase, getattr(agent, method)))
+
+    def _measured(self, phase: str, fn):
+        def run(*args, **kwargs):
+            stats, listings, read = self.counter.stats, self.counter.listings, io_read_bytes()
+            if self.trace_alloc:
+                tracemalloc.reset_peak()
+            with timed() as elapsed:
+                result = fn(*args, **kwargs)
+            read_after = io_read_bytes()
+            self.phases.append({
+                "phase": phase,
+                "wall_ms": elapsed() * 1000,
+                "stats": self.counter.stats - stats,
+                "listings": self.counter.listings - listings,
+                "read_kb": (read_after - read) / 1024 if read is not None else "n/a",
+                "peak_alloc_mb": tracemalloc.get_traced_memory()[1] / (1024 * 1024) if self.trace_alloc else "",
+                "rss_mb": current_rss_mb(),
+            })
+            return result
+        return run
+
+
+# ─── Scenarios ──────────────────────────────────────────────────────
+
+def run_scenario(repo: str, scenario: str, incremental: bool, workers: int = 1,
+                 trace_alloc: bool = False) -> list[dict]:
+    """One analyze() run; rows per phase plus "other" (tree summary, cache I/O) and "total"."""
+    agent = CodeAnalysisAgent(repo, workers=workers)
+    counter = IOCounter()
+    recorder = PhaseRecorder(counter, trace_alloc)
+    recorder.wrap(agent)
+    read = io_read_bytes()
+    with counter, contextlib.redirect_stdout(io.StringIO()), timed() as elapsed:
+        agent.analyze(incremental=incremental)
+    total_ms = elapsed() * 1000
+    read_after = io_read_bytes()
+
+    rows = [{"scenario": scenario, **p} for p in recorder.phases]
+    measured = sum(p["wall_ms"] for p in recorder.phases)
+    total = {
+        "scenario": scenario, "phase": "total", "wall_ms": total_ms,
+        "stats": counter.stats, "listings": counter.listings,
+        "read_kb": (read_after - read) / 1024 if read is not None else "n/a",
+        "peak_alloc_mb": "", "rss_mb": current_rss_mb(),
+        "detectors_rerun": len(agent.last_rerun), "services_analyzed": len(agent.last_services_analyzed),
+    }
+    rows.append({"scenario": scenario, "phase": "other", "wall_ms": max(0.0, total_ms - measured),
+                 "stats": counter.stats - sum(p["stats"] for p in recorder.phases),
+                 "listings": counter.listings - sum(p["listings"] for p in recorder.phases)})
+    rows.append(total)
+    return rows
+
+
+def bench_repo(repo: str, workers: int = 1, trace_alloc: bool = False) -> list[dict]:
+    """cold -> warm -> one-service runs over an already generated repo."""
+    for cache in (".devops_analysis_cache.json", ".devops_context.json"):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(repo, cache))
+    if trace_alloc:
+        tracemalloc.start()
+    try:
+        rows = run_scenario(repo, "cold", False, workers, trace_alloc)
+        rows += run_scenario(repo, "warm", True, workers, trace_alloc)
+        services = sorted(os.listdir(os.path.join(repo, "services")))
+        target = next(os.path.join(repo, "services", s, name) for s in services
+                      for name in ("server.js", "app.py") if os.path.exists(os.path.join(repo, "services", s, name)))
+        with open(target, "a", encoding="utf-8") as f:
+            f.write("// edited\n")
+        rows += run_scenario(repo, "one-service", True, workers, trace_alloc)
+    finally:
+        if trace_alloc:
+            tracemalloc.stop()
+    return rows
+
+
+def check_regressions(rows: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Messages for every scenario total whose wall time, stats or bytes read grew beyond `tolerance`."""
+    base = {r["scenario"]: r for r in baseline if r.get("phase") == "total"}
+    problems = []
+    for row in rows:
+        if row.get("phase") != "total" or row["scenario"] not in base:
+            continue
+        old = base[row["scenario"]]
+        for key in ("wall_ms", "stats", "read_kb"):
+            new_v, old_v = row.get(key), old.get(key)
+            if not isinstance(new_v, (int, float)) or not isinstance(old_v, (int, float)):
+                continue
+            # Small absolute values are noise-dominated; give them a floor
+            floor = {"wall_ms": 5.0, "stats": 10, "read_kb": 16.0}[key]
+            if new_v > max(old_v, floor) * (1 + tolerance):
+                problems.append(f"{row['scenario']}: {key} {old_v:.1f} -> {new_v:.1f} (+{(new_v / max(old_v, floor) - 1):.0%})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CodeAnalysisAgent on a synthetic monorepo.")
+    parser.add_argument("--services", type=int, default=DEFAULT_SERVICES, help="Number of services")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES, help="Source files per service")
+    parser.add_argument("--vendored", type=int, default=DEFAULT_VENDORED, help="node_modules packages per Node service")
+    parser.add_argument("--file-kb", type=int, default=DEFAULT_FILE_KB, help="Approximate size of each source file")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the generated repo")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes for per-service analysis (reads in workers are not counted)")
+    parser.add_argument("--alloc", action="store_true", help="Trace Python allocations per phase (slows every phase)")
+    parser.add_argument("--repo", help="Generate into (and keep) this directory instead of a temp dir")
+    parser.add_argument("--json", help="Also write results to this file")
+    parser.add_argument("--baseline", help="Earlier --json output; exit 1 if a scenario regressed")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed growth vs --baseline")
+    args = parser.parse_args()
+
+    repo = args.repo or tempfile.mkdtemp(prefix="analysis_bench_")
+    try:
+        print(f"  [>] Generating {args.services} services x {args.files} files in {repo}...")
+        counts = generate_monorepo(repo, args.services, args.files, args.vendored, args.file_kb, seed=args.seed)
+        rows = bench_repo(repo, args.workers, args.alloc)
+    finally:
+        if not args.repo:
+            shutil.rmtree(repo, ignore_errors=True)
+
+    print()
+    print_table(rows, [
+        ("scenario", "scenario"), ("phase", "phase"), ("wall_ms", "wall ms"), ("stats", "stats"),
+        ("listings", "dirs listed"), ("read_kb", "read KB"), ("peak_alloc_mb", "alloc MB"), ("rss_mb", "RSS MB"),
+    ])
+    print(f"\nGenerated: {counts['source_files']} source files, {counts['vendored_files']} vendored/ignored files")
+    print(f"Peak RSS: {peak_rss_mb():.1f} MB")
+    write_json(args.json, {"params": vars(args) | {"repo": None}, "generated": counts,
+                           "peak_rss_mb": peak_rss_mb(), "results": rows})
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = check_regressions(rows, json.load(f)["results"], args.tolerance)
+        if problems:
+            print("\n❌ Regressions vs baseline:\n  " + "\n  ".join(problems))
+            sys.exit(1)
+        print(f"\n✅ Within {args.tolerance:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Shared helpers for the benchmark suites: timing, percentiles, memory, reporting."""
+
+import json
+import math
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0..100). Returns 0.0 for no samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def current_rss_mb() -> float:
+    """Resident set size right now (Linux /proc), falling back to the peak."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def io_read_bytes() -> int | None:
+    """Bytes this process has read via read() syscalls so far (Linux /proc/self/io), None elsewhere."""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+@contextmanager
+def timed():
+    """with timed() as t: ...; t() -> elapsed seconds."""
+    start = time.perf_counter()
+    end = None
+
+    def elapsed():
+        return (end if end is not None else time.perf_counter()) - start
+
+    try:
+        yield elapsed
+    finally:
+        end = time.perf_counter()
+
+
+def print_table(rows: list[dict], columns: list[tuple[str, str]]):
+    """columns: [(key, header)]. Floats are shown with 3 significant decimals."""
+    def fmt(v):
+        return f"{v:.3f}" if isinstance(v, float) else str(v)
+
+    widths = [max(len(h), *(len(fmt(r.get(k, ""))) for r in rows)) for k, h in columns]
+    print("  ".join(h.ljust(w) for (_, h), w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for r in rows:
+        print("  ".join(fmt(r.get(k, "")).ljust(w) for (k, _), w in zip(columns, widths)))
+
+
+def write_json(path: str | None, payload):
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        print(f"\n📝 Results written to {path}")
@@ -0,0 +1,196 @@
+"""
+RAG retrieval benchmark: recall@k, query latency, build time and memory.
+
+Seeds a fresh local (NumPy) store per size with labeled relevant chunks plus
+distractors, then replays two query sets through RAGStore.retrieve:
+
+    synthetic  generated topics; each query has known relevant chunks
+    recorded   real reviewer-style queries (benchmarks/data/rag_recorded_queries.jsonl)
+               whose relevant chunks are the matching guideline bullets
+
+Runs fully offline: no chromadb, no model downloads.
+
+Usage:
+    python -m benchmarks.rag_bench                          # 1k / 10k / 100k chunks
+    python -m benchmarks.rag_bench --sizes 1000 --k 5 --json rag_bench.json
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+
+from benchmarks.common import current_rss_mb, peak_rss_mb, percentile, print_table, timed, write_json
+from src.engine.rag import RAGStore
+from src.engine.rule_index import parse_guideline_rules
+from src.engine.rag_snapshot import guideline_artifact_type
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_K = 5
+ARTIFACT_TYPES = ["docker", "k8s", "ci"]
+RECORDED_QUERIES = os.path.join(os.path.dirname(__file__), "data", "rag_recorded_queries.jsonl")
+
+# Shared vocabulary so distractors overlap lexically with real queries
+_FILLER = {
+    "docker": "image layer build stage base copy run user port healthcheck cache apt pip npm alpine slim entrypoint",
+    "k8s": "pod deployment service container replicas probe limits requests namespace ingress volume secret label",
+    "ci": "workflow job step runner checkout action cache matrix artifact permissions trigger branch secret deploy",
+}
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice("bcdfghjklmnpqrstvwxz") + rng.choice("aeiou") for _ in range(3))
+
+
+def _filler(rng: random.Random, artifact_type: str, n: int) -> str:
+    return " ".join(rng.choice(_FILLER[artifact_type].split()) for _ in range(n))
+
+
+def synthetic_corpus(rng: random.Random, n_topics: int = 50, per_topic: int = 3):
+    """Returns (chunks, queries). chunks: [(artifact_type, text, label|None)]; queries carry their labels."""
+    chunks, queries = [], []
+    for t in range(n_topics):
+        artifact_type = ARTIFACT_TYPES[t % len(ARTIFACT_TYPES)]
+        terms = [_word(rng) for _ in range(4)]
+        labels = set()
+        for j in range(per_topic):
+            label = f"syn-{t}-{j}"
+            labels.add(label)
+            signature = " ".join(rng.sample(terms, 3))
+            chunks.append((artifact_type, f"{signature} {_filler(rng, artifact_type, 8)}", label))
+        queries.append({
+            "artifact_type": artifact_type,
+            "query": f"{' '.join(rng.sample(terms, 3))} {_filler(rng, artifact_type, 3)}",
+            "relevant": labels,
+        })
+    return chunks, queries
+
+
+def recorded_corpus(guidelines_dir: str = "configs/guidelines", queries_path: str = RECORDED_QUERIES):
+    """Guideline bullets become chunks; a query's relevant set is the bullets containing its substrings."""
+    chunks = []
+    for path in sorted(glob.glob(os.path.join(guidelines_dir, "*.md"))):
+        artifact_type = guideline_artifact_type(path)
+        for i, rule in enumerate(parse_guideline_rules(path)):
+            chunks.append((artifact_type, rule.text, f"rec-{artifact_type}-{i}"))
+
+    queries = []
+    with open(queries_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            q = json.loads(line)
+            relevant = {
+                label for artifact_type, text, label in chunks
+                if artifact_type == q["artifact_type"] and any(s.lower() in text.lower() for s in q["relevant"])
+            }
+            if relevant:
+                queries.append({**q, "relevant": relevant})
+    return chunks, queries
+
+
+def seed_store(db_path: str, labeled: list, size: int, rng: random.Random) -> tuple[RAGStore, dict, float]:
+    """Writes labeled chunks + distractors up to `size` in one batch. Returns (store, id->label, seconds)."""
+    ids, documents, metadatas, id_to_label = [], [], [], {}
+    for i, (artifact_type, text, label) in enumerate(labeled):
+        doc_id = f"{artifact_type}_bench_{i}"
+        ids.append(doc_id)
+        documents.append(text)
+        metadatas.append({"artifact_type": artifact_type, "source": "benchmark"})
+        id_to_label[doc_id] = label
+    for i in range(max(0, size - len(labeled))):
+        artifact_type = ARTIFACT_TYPES[i % len(ARTIFACT_TYPES)]
+        ids.append(f"{artifact_type}_noise_{i}")
+        documents.append(f"{_filler(rng, artifact_type, 14)} {_word(rng)} {_word(rng)}")
+        metadatas.append({"artifact_type": artifact_type, "source": "benchmark"})
+
+    store = RAGStore(db_path, backend="numpy", use_snapshot=False)
+    with timed() as elapsed:
+        store.backend.add(ids=ids, documents=documents, metadatas=metadatas)
+    return store, id_to_label, elapsed()
+
+
+def run_queries(store: RAGStore, queries: list[dict], id_to_label: dict, k: int) -> dict:
+    latencies, recalls = [], []
+    for q in queries:
+        # retrieve() logs each call; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()), timed() as elapsed:
+            store.retrieve(q["query"], q["artifact_type"], k=k)
+        latencies.append(elapsed() * 1000)
+        found = {id_to_label.get(i) for i in store.last_retrieved_ids} & q["relevant"]
+        recalls.append(len(found) / min(len(q["relevant"]), k))
+    return {
+        "queries": len(queries),
+        "recall_at_k": sum(recalls) / len(recalls) if recalls else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def bench_size(size: int, k: int, seed: int = 7, repeats: int = 3) -> list[dict]:
+    rng = random.Random(seed)
+    syn_chunks, syn_queries = synthetic_corpus(rng)
+    rec_chunks, rec_queries = recorded_corpus()
+
+    tmp = tempfile.mkdtemp(prefix="rag_bench_")
+    try:
+        rss_before = current_rss_mb()
+        store, id_to_label, build_s = seed_store(tmp, syn_chunks + rec_chunks, size, rng)
+        rss_after = current_rss_mb()
+
+        # Cold open: what a fresh process pays before its first query
+        with timed() as elapsed:
+            reopened = RAGStore(tmp, backend="numpy", use_snapshot=False)
+            reopened.backend.count()
+        load_ms = elapsed() * 1000
+
+        rows = []
+        for name, queries in (("synthetic", syn_queries), ("recorded", rec_queries)):
+            result = run_queries(reopened, queries * repeats, id_to_label, k)
+            result["queries"] = len(queries)
+            rows.append({
+                "size": size,
+                "query_set": name,
+                "k": k,
+                **result,
+                "build_s": build_s,
+                "load_ms": load_ms,
+                "index_rss_mb": rss_after - rss_before,
+            })
+        return rows
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RAG retrieval quality and latency.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Store sizes in chunks")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="Results per query")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the synthetic corpus")
+    parser.add_argument("--repeats", type=int, default=3, help="Times each query set is replayed for latency")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        print(f"  [>] Seeding {size:,} chunks...")
+        rows.extend(bench_size(size, args.k, args.seed, args.repeats))
+
+    print()
+    print_table(rows, [
+        ("size", "chunks"), ("query_set", "queries"), ("recall_at_k", f"recall@{args.k}"),
+        ("p50_ms", "p50 ms"), ("p95_ms", "p95 ms"), ("p99_ms", "p99 ms"),
+        ("build_s", "build s"), ("load_ms", "load ms"), ("index_rss_mb", "index MB"),
+    ])
+    print(f"\nPeak RSS: {peak_rss_mb():.1f} MB")
+    write_json(args.json, {"k": args.k, "seed": args.seed, "peak_rss_mb": peak_rss_mb(), "results": rows})
+
+
+if __name__ == "__main__":
+    main()
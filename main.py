@@ -30,7 +30,7 @@ from src.utils.constants import GUIDELINES_DOCKER, GUIDELINES_K8S, GUIDELINES_CI
 from src.utils.logger import get_logger, set_correlation_id, configure_logging
 from src.utils.parallel import run_writers_parallel
 from src.audit.decision_log import AuditLog
-from src.policy.validator import PolicyValidator
+from src.policy.validator import get_policy_validator
 from src.gitops.pr_creator import GitOpsPublisher
 from src.schemas import ProjectContext, StageResult, Decision, Severity, PolicyViolation
 from src.decision_engine.generator.llm_generator import LLMGenerator # For manual scan hack
@@ -78,7 +78,7 @@ def stage_decision_loop(stage_name, reviewer, drafts, executor, run_executor_fn,
     """
     Shared refine loop logic across all stages.
     """
-    policy_validator = PolicyValidator()
+    policy_validator = get_policy_validator()
     user_feedback = ""
     
     for i in range(3):
@@ -89,9 +89,10 @@ def stage_decision_loop(stage_name, reviewer, drafts, executor, run_executor_fn,
         if det_reviewer and det_fn:
             report = "--- VALIDATION REPORT ---\n"
             labels = ["Draft A", "Draft B", "Draft C"]
-            for idx, d in enumerate(drafts):
-                if d:
-                    report += f"{labels[idx]}: {det_fn(det_reviewer, d)[1]}\n"
+            present = [idx for idx, d in enumerate(drafts) if d]
+            # det_fn validates all drafts in one tool run
+            for idx, (_, log) in zip(present, det_fn(det_reviewer, [drafts[idx] for idx in present])):
+                report += f"{labels[idx]}: {log}\n"
         if user_feedback:
             report += f"\nUSER FEEDBACK (MUST ADDRESS): {user_feedback}\n"
         
@@ -118,7 +119,8 @@ def stage_decision_loop(stage_name, reviewer, drafts, executor, run_executor_fn,
         
         decision = human_decision()
         audit.record(stage=stage_name, decision=decision.value, reasoning=reasoning,
-                     user_feedback=user_feedback, cycle=i + 1, drafts_count=sum(1 for d in drafts if d))
+                     user_feedback=user_feedback, cycle=i + 1, drafts_count=sum(1 for d in drafts if d),
+                     policy_rules=[v.rule for v in violations])
         
         if decision == Decision.APPROVE:
             published_via = None
@@ -217,7 +219,7 @@ def run_docker_stage(project_path, context: ProjectContext, audit, publisher=Non
         stage_name="Docker", reviewer=reviewer, drafts=drafts,
         executor=executor, run_executor_fn=lambda final: executor.run(final, project_path),
         guidelines_path=GUIDELINES_DOCKER, audit=audit,
-        det_reviewer=det_reviewer, det_fn=lambda r, d: r.review_dockerfile(d),
+        det_reviewer=det_reviewer, det_fn=lambda r, ds: r.review_dockerfiles(ds),
         publisher=publisher, output_files={"Dockerfile": None},
         project_path=project_path, run_id=run_id,
     )
@@ -316,7 +318,7 @@ def run_k8s_stage(project_path, context: ProjectContext, audit, publisher=None,
         stage_name="K8s", reviewer=reviewer, drafts=drafts,
         executor=executor, run_executor_fn=lambda final: executor.run(final, os.path.join(project_path, "k8s", "manifest.yaml")),
         guidelines_path=GUIDELINES_K8S, audit=audit,
-        det_reviewer=det_reviewer, det_fn=lambda r, d: r.review_k8s(d),
+        det_reviewer=det_reviewer, det_fn=lambda r, ds: r.review_k8s_batch(ds),
         publisher=publisher, output_files={"k8s/manifest.yaml": None},
         project_path=project_path, run_id=run_id,
     )
@@ -344,7 +346,7 @@ def run_cicd_stage(project_path, context: ProjectContext, audit, publisher=None,
                 return (a, "Mock CI Review: Combined security and speed steps.")
         reviewer = MockCIReviewer()
         
-    executor = CIExecutor()
+    det_reviewer, executor = DeterministicReviewer(), CIExecutor()
     
     # Generate in parallel
     logger.info("Generating drafts in parallel", extra={"stage": "CI"})
@@ -360,6 +362,7 @@ def run_cicd_stage(project_path, context: ProjectContext, audit, publisher=None,
         stage_name="CI", reviewer=reviewer, drafts=drafts,
         executor=executor, run_executor_fn=lambda final: executor.run(final, project_path),
         guidelines_path=GUIDELINES_CI, audit=audit,
+        det_reviewer=det_reviewer, det_fn=lambda r, ds: r.review_workflows(ds),
         publisher=publisher, output_files={".github/workflows/main.yml": None},
         project_path=project_path, run_id=run_id,
     )
@@ -608,6 +611,8 @@ def main():
     run_id = set_correlation_id()
     audit = AuditLog(run_id=run_id)
     publisher = GitOpsPublisher()
+    # Resident OPA servers start (from precompiled bundles when current) while analysis runs
+    get_policy_validator().preload()
     
     print_header(f"DevOps AI Agent Pipeline v12.0 [run:{run_id}]")
     logger.info("Pipeline started | gitops_mode=%s", publisher.mode, extra={"stage": "init"})
@@ -648,8 +653,9 @@ def main():
     print(audit.summary())
     logger.info("Pipeline completed", extra={"stage": "exit"})
 
-    # Clean up DevOps context caching footprint on graceful exit
-    for f in [".devops_context.json", ".devops_memory.json"]:
+    # Clean up session memory on graceful exit
+    # .devops_context.json stays: the next run revalidates it incrementally
+    for f in [".devops_memory.json"]:
         fpath = os.path.join(project_path, f)
         if os.path.exists(fpath):
             try: os.remove(fpath)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Precompile the Rego policies into OPA bundles loaded by the resident engine.
+
+Builds one optimized bundle per directory under policies/ with `opa build`
+into build/policy-bundles/ (or POLICY_BUNDLE_DIR) and writes index.json with
+each bundle's SHA-256 and source hash. Run it in the image build or after
+editing a policy:
+
+    python scripts/build_policy_bundles.py
+    python scripts/build_policy_bundles.py --policies policies --out /opt/agent/bundles
+
+The engine only uses a bundle whose source hash matches the policies on
+disk; an edited policy is served from source until the bundle is rebuilt.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.policy.bundle import INDEX_FILE, build_bundle, bundle_directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--policies", default="policies", help="directory holding one subdirectory per stage")
+    parser.add_argument("--out", default=None, help="bundle directory (default: POLICY_BUNDLE_DIR or build/policy-bundles)")
+    parser.add_argument("--opa", default=shutil.which("opa"), help="opa binary")
+    args = parser.parse_args()
+
+    if not args.opa:
+        sys.exit("opa not found; install it or pass --opa")
+    out = bundle_directory(args.out)
+    index = {"built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "bundles": {}}
+    for name in sorted(os.listdir(args.policies)):
+        policy_dir = os.path.join(args.policies, name)
+        if not os.path.isdir(policy_dir):
+            continue
+        start = time.perf_counter()
+        index["bundles"][name] = build_bundle(args.opa, policy_dir, out, name)
+        print(f"  [>] {name}.tar.gz ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    with open(os.path.join(out, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    print(f"{len(index['bundles'])} policy bundles in {out}")
+
+
+if __name__ == "__main__":
+    main()
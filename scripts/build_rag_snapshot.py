@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Build the read-only RAG knowledge snapshot shipped with the container image.
+
+Embeds the golden paths, configs/guidelines/*.md and curated advisories with the
+local hashing embedder, so runtime retrieval never embeds documents:
+
+    python scripts/build_rag_snapshot.py                       # -> rag_snapshot/
+    python scripts/build_rag_snapshot.py --advisories curated.jsonl
+    python scripts/build_rag_snapshot.py --from-store --min-value 0.75
+
+Point the runtime at it with RAG_SNAPSHOT=<dir> (default: rag_snapshot).
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engine.rag import GOLDEN_PATHS, PROTECTED_SOURCES, RAGStore, entry_value
+from src.engine.rag_snapshot import DEFAULT_SNAPSHOT_DIR, build_snapshot
+
+
+def load_advisories(path: str) -> list[dict]:
+    """JSONL: one {"artifact_type": ..., "content": ...} object per line."""
+    advisories = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                advisories.append(json.loads(line))
+    return advisories
+
+
+def curated_from_store(min_value: float, min_outcomes: int) -> list[dict]:
+    """Promotes flywheel entries with a proven track record into the snapshot."""
+    store = RAGStore(use_snapshot=False)
+    data = store.backend.get()
+    curated = []
+    for doc, meta in zip(data["documents"], data["metadatas"]):
+        if meta.get("source") in PROTECTED_SOURCES:
+            continue
+        outcomes = meta.get("success_count", 0) + meta.get("failure_count", 0)
+        if outcomes >= min_outcomes and entry_value(meta) >= min_value:
+            curated.append({"artifact_type": meta["artifact_type"], "content": doc,
+                            "source": f"curated:{meta.get('source', 'unknown')}"})
+    return curated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=DEFAULT_SNAPSHOT_DIR)
+    parser.add_argument("--guidelines-dir", default="configs/guidelines")
+    parser.add_argument("--advisories", action="append", default=[], help="JSONL file of curated advisories")
+    parser.add_argument("--from-store", action="store_true", help="Include high-value entries from the live RAG store")
+    parser.add_argument("--min-value", type=float, default=0.75)
+    parser.add_argument("--min-outcomes", type=int, default=3)
+    args = parser.parse_args()
+
+    advisories = []
+    for path in args.advisories:
+        advisories.extend(load_advisories(path))
+    if args.from_store:
+        advisories.extend(curated_from_store(args.min_value, args.min_outcomes))
+
+    version = build_snapshot(args.out, args.guidelines_dir, GOLDEN_PATHS, advisories)
+    print(f"✅ RAG snapshot {version} written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
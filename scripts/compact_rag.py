@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Offline compaction of the RAG knowledge store.
+
+Evicts stale and low-value flywheel entries, merges near-duplicates and
+rebuilds the vector index. Run it between pipeline runs, e.g. from cron:
+
+    python scripts/compact_rag.py --ttl-days 60
+    python scripts/compact_rag.py --dry-run
+    python scripts/compact_rag.py --backend numpy
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engine.rag import (
+    DUPLICATE_SIMILARITY,
+    ENTRY_TTL_DAYS,
+    MIN_VALUE_SCORE,
+    compact_rag,
+)
+from src.engine.vector_backends import DEFAULT_DB_PATHS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=sorted(DEFAULT_DB_PATHS), default=os.environ.get("RAG_BACKEND"),
+                        help="Vector store to compact (default: $RAG_BACKEND, else chroma)")
+    parser.add_argument("--db-path", default=None,
+                        help="Store directory (default: the backend's own, e.g. .chroma_db or .rag_index)")
+    parser.add_argument("--ttl-days", type=float, default=ENTRY_TTL_DAYS)
+    parser.add_argument("--min-value", type=float, default=MIN_VALUE_SCORE)
+    parser.add_argument("--duplicate-similarity", type=float, default=DUPLICATE_SIMILARITY)
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without rebuilding")
+    args = parser.parse_args()
+
+    report = compact_rag(
+        args.db_path,
+        backend=args.backend,
+        ttl_days=args.ttl_days,
+        min_value=args.min_value,
+        duplicate_similarity=args.duplicate_similarity,
+        dry_run=args.dry_run,
+    )
+    print(report.summary())
+    if args.dry_run:
+        for label, ids in [("stale", report.evicted_stale), ("low-value", report.evicted_low_value),
+                           ("duplicate", report.merged)]:
+            for doc_id in ids:
+                print(f"  would drop ({label}): {doc_id}")
+
+
+if __name__ == "__main__":
+    main()
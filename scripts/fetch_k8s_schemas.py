@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Fill the offline Kubernetes schema cache used by manifest validation.
+
+Downloads the standalone-strict JSON schemas for one Kubernetes version from
+the kubeconform schema repository into schemas/kubernetes/ (the layout
+kubeconform's -schema-location expects), and records a SHA-256 index so the
+set is reproducible. Run it once in the image build or a cached CI step:
+
+    python scripts/fetch_k8s_schemas.py                          # KUBERNETES_VERSION or 1.29.0
+    python scripts/fetch_k8s_schemas.py --version 1.30 --kinds Deployment:apps/v1 Service:v1
+
+Validation then runs offline: KUBERNETES_VERSION=1.30 selects the set.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tools.k8s_schema import DEFAULT_KUBERNETES_VERSION, SchemaStore, schema_filename
+
+SCHEMA_REPO = "https://raw.githubusercontent.com/yannh/kubernetes-json-schema/master"
+
+# Kinds the K8s stage generates
+DEFAULT_KINDS = [
+    "Deployment:apps/v1", "StatefulSet:apps/v1", "DaemonSet:apps/v1",
+    "Service:v1", "ConfigMap:v1", "Secret:v1", "ServiceAccount:v1", "Namespace:v1",
+    "PersistentVolumeClaim:v1", "Pod:v1",
+    "Ingress:networking.k8s.io/v1", "NetworkPolicy:networking.k8s.io/v1",
+    "HorizontalPodAutoscaler:autoscaling/v2", "PodDisruptionBudget:policy/v1",
+    "Job:batch/v1", "CronJob:batch/v1",
+    "Role:rbac.authorization.k8s.io/v1", "RoleBinding:rbac.authorization.k8s.io/v1",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--version", default=os.getenv("KUBERNETES_VERSION", DEFAULT_KUBERNETES_VERSION))
+    parser.add_argument("--out", default=None, help="cache root (default: K8S_SCHEMA_DIR or schemas/kubernetes)")
+    parser.add_argument("--kinds", nargs="+", default=DEFAULT_KINDS, help="Kind:apiVersion pairs")
+    parser.add_argument("--repo", default=SCHEMA_REPO)
+    args = parser.parse_args()
+
+    store = SchemaStore(args.out, args.version)
+    os.makedirs(store.directory, exist_ok=True)
+    subdir = os.path.basename(store.directory)
+    index = {"kubernetes_version": store.kubernetes_version, "source": args.repo, "files": {}}
+
+    session = requests.Session()
+    for spec in args.kinds:
+        kind, _, api_version = spec.partition(":")
+        name = schema_filename(kind, api_version)
+        resp = session.get(f"{args.repo}/{subdir}/{name}", timeout=60)
+        if resp.status_code != 200:
+            print(f"  [!] {kind} {api_version}: HTTP {resp.status_code}, skipped")
+            continue
+        json.loads(resp.content)  # refuse to cache anything that isn't JSON
+        with open(os.path.join(store.directory, name), "wb") as f:
+            f.write(resp.content)
+        index["files"][name] = hashlib.sha256(resp.content).hexdigest()
+        print(f"  [>] {name}")
+
+    with open(os.path.join(store.directory, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    print(f"{len(index['files'])} schemas for Kubernetes {store.kubernetes_version} in {store.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,3 +27,25 @@ if [ ! -f "$BIN_DIR/hadolint" ]; then
 else
     echo "✅ hadolint already exists."
 fi
+
+# Actionlint (GitHub Actions workflow linting)
+ACTIONLINT_VERSION="1.7.1"
+if [ ! -f "$BIN_DIR/actionlint" ]; then
+    echo "⬇️  Installing actionlint $ACTIONLINT_VERSION..."
+    wget -q https://github.com/rhysd/actionlint/releases/download/v$ACTIONLINT_VERSION/actionlint_${ACTIONLINT_VERSION}_linux_amd64.tar.gz
+    tar xf actionlint_${ACTIONLINT_VERSION}_linux_amd64.tar.gz actionlint
+    mv actionlint "$BIN_DIR/"
+    rm actionlint_${ACTIONLINT_VERSION}_linux_amd64.tar.gz
+    chmod +x "$BIN_DIR/actionlint"
+    echo "✅ actionlint installed to $BIN_DIR/actionlint"
+else
+    echo "✅ actionlint already exists."
+fi
+
+# Kubernetes JSON schemas (offline manifest validation)
+if [ ! -d "$(pwd)/schemas/kubernetes" ]; then
+    echo "⬇️  Fetching Kubernetes schemas..."
+    python3 "$(dirname "$0")/fetch_k8s_schemas.py"
+else
+    echo "✅ Kubernetes schemas already cached."
+fi
@@ -2,6 +2,8 @@ from src.llm_clients.gemini_client import GeminiClient
 from src.llm_clients.groq_client import GroqClient
 from src.llm_clients.nvidia_client import NvidiaClient
 from src.tools.file_ops import read_file, write_file
+from src.utils.constants import GUIDELINES_CI
+from src.engine.rule_index import retrieve_rules
 import os
 
 class CIWriterA:
@@ -49,6 +51,11 @@ class CIReviewer:
         self.llm = PerplexityClient()
     
     def review_and_merge(self, yaml_a: str, yaml_b: str, yaml_c: str, validation_report: str = "") -> tuple[str, str]:
+        try:
+            guidelines = retrieve_rules(GUIDELINES_CI, [yaml_a, yaml_b, yaml_c])
+        except Exception:
+            guidelines = "No specific guidelines available."
+
         feedback_section = ""
         if validation_report:
             feedback_section = f"""
@@ -58,6 +65,9 @@ class CIReviewer:
         prompt = f"""
         You are a Lead DevOps Architect. Review 3 GitHub Actions workflows.
         
+        GUIDELINES TO FOLLOW:
+        {guidelines}
+        
         Workflow A (General):
         {yaml_a}
         
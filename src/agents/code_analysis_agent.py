@@ -1,25 +1,325 @@
 import os
+import copy
 import json
-from typing import Any
-from src.tools.file_ops import scan_directory, read_file, write_file
+import re
+import subprocess
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable
+from src.tools.file_ops import read_file, write_file
+from src.tools.file_index import FileIndex, git_changed_files, git_head
+from src.tools.analysis_cache import AnalysisCache, ANALYSIS_CACHE_FILE
+from src.tools.content_scanner import ContentScanner
+from src.tools.file_tree import summarize_tree, render_tree, tree_to_dict
+from src.tools.dependency_catalog import get_catalog
 from src.tools.context_gatherer import ContextGatherer
+from src.tools.manifest_parsers import ROOT_MANIFEST_FILES, parse_cargo_toml, parse_go_mod, parse_pom
 from src.schemas import ProjectContext
 
+# Files whose contents the detectors scan (everything else is judged by name only)
+PORT_FILES = ["server.js", "app.py", "main.py", "index.js", "docker-compose.yml"]
+ENV_FILES = ["server.js", "app.py", "main.py", "config.js", "settings.py"]
+SERVICE_SOURCE_SUFFIXES = (".js", ".ts", ".mjs", ".cjs")
+# Below this many services to (re)analyze, process start-up costs more than it saves
+SERVICE_POOL_MIN_JOBS = 16
+
+# Compiled-language services, judged by their manifest:
+# manifest -> (parser, language, version key in DependencySet.meta, default version, base image, default port)
+COMPILED_SERVICE_MANIFESTS = {
+    "go.mod":     (parse_go_mod, "Go", "go", "1.22",
+                   "golang:{version}-alpine → gcr.io/distroless/static (runtime)", "8080"),
+    "pom.xml":    (parse_pom, "Java", "java", "21",
+                   "maven:3-eclipse-temurin-{version} → eclipse-temurin:{version}-jre (runtime)", "8080"),
+    "Cargo.toml": (parse_cargo_toml, "Rust", "rust", "1",
+                   "rust:{version}-slim → debian:bookworm-slim (runtime)", "8080"),
+}
+# A directory holding any of these is a service
+SERVICE_MANIFEST_FILES = ("package.json", "requirements.txt", *COMPILED_SERVICE_MANIFESTS)
+
+EXISTING_ARTIFACT_NAMES = {"Dockerfile", "docker-compose.yml", "docker-compose.yaml",
+                           "manifest.yaml", "deployment.yaml", "service.yaml", "Chart.yaml"}
+
+
+# Database buckets reported per project and per service (see configs/dependency_catalog.json)
+DB_CATEGORY_NAMES = ("rdbms", "cache", "nosql", "broker")
+FRONTEND_FRAMEWORKS = ("React", "Vue", "Svelte", "Angular", "Nuxt")
+
+
+def infer_role(frameworks: list, deps: list, dev_deps: list, name: str) -> str:
+    """Infer what this service actually does."""
+    all_d = set(d.lower() for d in deps + dev_deps)
+    fw    = set(f.lower() for f in frameworks)
+    nm    = name.lower()
+    if any(x in fw for x in ["react", "vue", "svelte", "next.js", "angular", "nuxt"]):
+        return "Frontend Web App (SPA)"
+    if "vite" in all_d and "react" in all_d:
+        return "Frontend Web App (React + Vite)"
+    if any(x in fw for x in ["express", "fastify", "koa", "hapi.js", "nestjs"]):
+        if any(d in all_d for d in ["pg", "mongoose", "mysql2", "sequelize", "prisma", "typeorm"]):
+            return "REST API Server + DB Layer"
+        return "REST API Server"
+    if "fastapi" in fw: return "Python FastAPI Service"
+    if "flask" in fw:   return "Python Flask API"
+    if "django" in fw:  return "Django Web Application"
+    if any(x in all_d for x in ["bull", "bullmq", "celery", "kafkajs", "amqplib"]):
+        return "Background Worker / Message Consumer"
+    if any(x in nm for x in ["worker", "job", "queue", "consumer", "cron"]):
+        return "Background Worker / Scheduler"
+    if any(x in nm for x in ["gateway", "proxy"]):
+        return "API Gateway / Reverse Proxy"
+    if any(x in nm for x in ["auth", "identity", "login"]):
+        return "Authentication Service"
+    if any(x in nm for x in ["notification", "email", "sms"]):
+        return "Notification Service"
+    return "Microservice"
+
+
+def analyze_service(project_root: str, rel_dir: str, files: set[str],
+                    scan_hits: dict[str, dict[str, list[str]]]) -> dict:
+    """{"details": {...}, "databases": {category: [db names]}} for one service directory.
+
+    Depends only on its arguments, so it can run in a worker process.
+    `scan_hits` holds the content-scan results for the service's own files.
+    """
+    root  = os.path.join(project_root, *rel_dir.split("/"))
+    catalog = get_catalog()
+    svc_databases = {category: [] for category in DB_CATEGORY_NAMES}
+
+    def _register_db(dep: str) -> str | None:
+        """Add dep to the correct category bucket, return human name."""
+        hit = catalog.database(dep)
+        if hit is None:
+            return None
+        category, name = hit
+        if name not in svc_databases.setdefault(category, []):
+            svc_databases[category].append(name)
+        return name
+
+    # ── Node.js service ────────────────────────────────────────
+    if "package.json" in files:
+        pkg_path = os.path.join(root, "package.json")
+        try:
+            data     = json.loads(read_file(pkg_path))
+            deps     = list(data.get("dependencies", {}).keys())
+            dev_deps = list(data.get("devDependencies", {}).keys())
+            all_deps = deps + dev_deps
+
+            # Catalog order is priority: the first framework picks the default port
+            svc_frameworks = catalog.frameworks(all_deps)
+
+            node_ver = "20"
+            if "engines" in data and "node" in data["engines"]:
+                m = re.search(r'(\d+)', data["engines"]["node"])
+                if m: node_ver = m.group(1)
+            nvmrc = os.path.join(root, ".nvmrc")
+            if ".nvmrc" in files:
+                node_ver = read_file(nvmrc).strip().lstrip("v").split(".")[0]
+
+            is_frontend = any(f in svc_frameworks for f in FRONTEND_FRAMEWORKS) or "vite" in all_deps
+            base_image = (f"node:{node_ver}-alpine → nginx:alpine (runtime)"
+                          if is_frontend else f"node:{node_ver}-alpine")
+
+            svc_ports = []
+            for fname in sorted(files):
+                if fname.endswith(SERVICE_SOURCE_SUFFIXES):
+                    svc_ports.extend(scan_hits.get(f"{rel_dir}/{fname}", {}).get("service_port", []))
+            if "vite.config.js" in files:
+                svc_ports.extend(scan_hits.get(f"{rel_dir}/vite.config.js", {}).get("config_port", []))
+            if not svc_ports:
+                defaults = {"Express":"3000","Fastify":"3000","NestJS":"3000",
+                            "React":"80","Next.js":"3000","Vue":"80","Vite":"5173"}
+                svc_ports = [defaults.get(svc_frameworks[0], "3000")] if svc_frameworks else ["3000"]
+
+            svc_dbs = []
+            for dep in deps:
+                name = _register_db(dep)
+                if name and name not in svc_dbs:
+                    svc_dbs.append(name)
+
+            details = {
+                "language": "Node.js", "frameworks": svc_frameworks,
+                "node_version": node_ver, "base_image": base_image,
+                "ports": list(dict.fromkeys(svc_ports)),
+                "key_deps": deps[:6], "role": infer_role(svc_frameworks, deps, dev_deps, os.path.basename(root)),
+                "databases": svc_dbs,
+            }
+        except Exception:
+            details = {
+                "language": "Node.js", "frameworks": [], "ports": ["3000"],
+                "base_image": "node:20-alpine", "node_version": "20",
+                "role": "Microservice", "databases": [],
+            }
+
+    # ── Python service ─────────────────────────────────────────
+    elif "requirements.txt" in files:
+        req_path = os.path.join(root, "requirements.txt")
+        try:
+            content = read_file(req_path)
+            deps = [l.split("==")[0].split(">=")[0].split("~=")[0].strip().lower()
+                    for l in content.splitlines() if l.strip() and not l.startswith("#")]
+
+            svc_frameworks = catalog.frameworks(deps)
+
+            py_ver = "3.11"
+            pv = os.path.join(root, ".python-version")
+            if ".python-version" in files: py_ver = read_file(pv).strip()
+
+            svc_dbs = []
+            for dep in deps:
+                name = _register_db(dep)
+                if name and name not in svc_dbs:
+                    svc_dbs.append(name)
+
+            details = {
+                "language": "Python", "frameworks": svc_frameworks,
+                "node_version": py_ver, "base_image": f"python:{py_ver}-slim",
+                "ports": ["8000"], "key_deps": deps[:6],
+                "role": infer_role(svc_frameworks, deps, [], os.path.basename(root)),
+                "databases": svc_dbs,
+            }
+        except Exception:
+            details = {
+                "language": "Python", "frameworks": [], "ports": ["8000"],
+                "base_image": "python:3.11-slim", "node_version": "3.11",
+                "role": "Microservice", "databases": [],
+            }
+
+    # ── Go / Java (Maven) / Rust service ──────────────────────
+    else:
+        manifest = next(m for m in COMPILED_SERVICE_MANIFESTS if m in files)
+        parser, language, version_key, version, base_image, port = COMPILED_SERVICE_MANIFESTS[manifest]
+        try:
+            ds = parser(os.path.join(root, manifest))
+            deps, dev_deps = list(ds.direct), list(ds.dev)
+            version = ds.meta.get(version_key) or version
+            svc_frameworks = catalog.frameworks(deps)
+
+            svc_dbs = []
+            for dep in deps:
+                name = _register_db(dep)
+                if name and name not in svc_dbs:
+                    svc_dbs.append(name)
+
+            details = {
+                "language": language, "frameworks": svc_frameworks,
+                "node_version": version, "base_image": base_image.format(version=version),
+                "ports": [port], "key_deps": deps[:6],
+                "role": infer_role(svc_frameworks, deps, dev_deps, os.path.basename(root)),
+                "databases": svc_dbs, "clouds": sorted(catalog.clouds(deps)),
+            }
+        except Exception:
+            details = {
+                "language": language, "frameworks": [], "ports": [port],
+                "base_image": base_image.format(version=version), "node_version": version,
+                "role": "Microservice", "databases": [],
+            }
+    return {"details": details, "databases": svc_databases}
+
+
+def _usable_cpus() -> int:
+    """CPUs this process may run on (container/affinity limits included)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def _service_job(job: tuple[str, str, list[str]], scan_workers: int | None = None) -> tuple[dict, dict]:
+    """Unit of work: scans one service's sources, then analyzes it.
+
+    `scan_workers` sizes the scanner's thread pool (None: its default); inside
+    a process pool it is 1, since the processes already use every CPU.
+    """
+    project_root, rel_dir, names = job
+    sources = [f"{rel_dir}/{n}" for n in names if n.endswith(SERVICE_SOURCE_SUFFIXES) or n == "vite.config.js"]
+    hits = ContentScanner(workers=scan_workers).scan([os.path.join(project_root, *p.split("/")) for p in sources])
+    scan_hits = {p: hits[os.path.join(project_root, *p.split("/"))] for p in sources}
+    return analyze_service(project_root, rel_dir, set(names), scan_hits), scan_hits
+
+
+@dataclass(frozen=True)
+class Detector:
+    name: str
+    method: str                                     # CodeAnalysisAgent method that fills `analysis`
+    outputs: tuple[str, ...]                        # analysis keys it produces
+    inputs: Callable[["CodeAnalysisAgent"], list[str]]  # files (relative paths) it reads
+    after: tuple[str, ...] = ()                     # detectors whose outputs it builds on
+
+
 class CodeAnalysisAgent:
     """
     Stage 1 Agent: Deeply analyzes the codebase and caches the results
     to .devops_context.json for all subsequent agents to use.
+
+    Per-detector results and the fingerprints of the files each detector read
+    are kept in .devops_analysis_cache.json; re-running the analysis only
+    re-runs detectors whose input files (or upstream results) changed.
+
+    With `git_base`, the file index comes from `git ls-files` (no walk, no
+    untracked build output) and "changed" means "in `git diff --name-only`
+    against the commit the cached results were computed at" rather than a
+    moved mtime, so a fresh CI checkout still reuses the cached results of
+    every service the diff doesn't touch. When that commit is unknown (a
+    cache from an older version) or missing from the clone (restored from
+    another branch's build, shallow fetch), the diff is taken against
+    `git_base` instead, the ref the restored cache is assumed to come from;
+    if that fails too, fingerprints are compared.
+
+    Services that do need (re)analysis are independent units of work; in
+    large monorepos they are spread across a process pool (`workers`).
     """
-    def __init__(self, project_path: str):
+    DETECTORS = (
+        Detector("raw_context", "_detect_raw_context", ("raw_context_summary",),
+                 lambda a: [p for p in ROOT_MANIFEST_FILES if a.index.get(p)]),
+        Detector("node", "_detect_node", ("language", "dependencies", "frameworks", "scripts"),
+                 lambda a: [e.path for e in a.index.named("package.json")]),
+        Detector("python", "_detect_python", ("language", "dependencies", "frameworks"),
+                 lambda a: [e.path for e in a.index.named("requirements.txt")], after=("node",)),
+        Detector("ports", "_detect_ports", ("ports",),
+                 lambda a: [e.path for e in a.index.named(*PORT_FILES)], after=("node", "python")),
+        Detector("env_vars", "_detect_env_vars", ("env_vars",),
+                 lambda a: [e.path for e in a.index.named(*ENV_FILES)]),
+        Detector("existing_files", "_detect_existing_files", ("existing_files",),
+                 lambda a: [e.path for e in a.index if e.name in EXISTING_ARTIFACT_NAMES
+                            or e.name.endswith(".tf") or e.parent.endswith(".github/workflows")]),
+        Detector("architecture", "_detect_architecture",
+                 ("architecture", "microservice_dirs", "microservice_details", "databases"),
+                 lambda a: [e.path for d in a._service_dirs() for e in a.index.children(d)],
+                 after=("node", "python")),
+    )
+
+    def __init__(self, project_path: str, hash_contents: bool = False,
+                 use_git: bool = False, git_base: str | None = None, workers: int | None = None):
         self.project_path = project_path
+        # Processes for per-service analysis; 1 keeps everything in-process
+        self.workers = workers if workers is not None else _usable_cpus()
         self.cache_file = os.path.join(project_path, ".devops_context.json")
+        self.analysis_cache_file = os.path.join(project_path, ANALYSIS_CACHE_FILE)
+        self.hash_contents = hash_contents
+        self.use_git = use_git or bool(git_base)
+        self.git_base = git_base
+        self.index: FileIndex | None = None
+        # Paths changed since the cached commit; None means "compare fingerprints instead"
+        self.changed_paths: set[str] | None = None
+        # (HEAD sha, paths differing from it) of this run, recorded with the cache
+        self._git_state: tuple[str, list[str]] | None = None
+        # {relative path: {pattern name: [captures]}} from the shared content scan
+        self.scan_hits: dict[str, dict[str, list[str]]] = {}
+        self.last_rerun: list[str] = []
+        self.last_services_analyzed: list[str] = []
     
-    def analyze(self) -> ProjectContext:
+    def analyze(self, incremental: bool = True) -> ProjectContext:
         print(f"🕵️  Code Analysis Agent: Scanning {self.project_path}...")
-        
-        # 1. Gather raw context using our existing tool
-        gatherer = ContextGatherer(self.project_path)
-        raw_context = gatherer.get_context()
+
+        # 1. One file index (git or a single pruned walk); every detector below reads from it
+        self.index = self._build_index()
+        self.scan_hits = {}
+        self.last_services_analyzed = []
+        ruleset = get_catalog().version  # a catalog update invalidates every cached classification
+        cache = self._cache = (AnalysisCache.load(self.analysis_cache_file, self.hash_contents, ruleset) if incremental
+                               else AnalysisCache(self.analysis_cache_file, self.hash_contents, ruleset))
+        self.changed_paths = self._changes_since(cache)
         
         # 2. Extract structured data
         analysis = {
@@ -29,102 +329,147 @@ class CodeAnalysisAgent:
             "dependencies": [],
             "ports": [],
             "env_vars": [],
-            "file_structure": scan_directory(self.project_path),
-            "raw_context_summary": raw_context
         }
+        # Prompts get a bounded directory summary, never the full index
+        tree = summarize_tree(self.index)
+        analysis["file_structure"] = render_tree(tree)
+        analysis["file_tree"] = tree_to_dict(tree)
         
-        # 3. specific heuristics
-        self._detect_node(analysis)
-        self._detect_python(analysis)
-        self._detect_ports(analysis)
-        self._detect_env_vars(analysis)
-        self._detect_existing_files(analysis)
-        self._detect_architecture(analysis)
+        # 3. specific heuristics, reusing any whose inputs haven't changed
+        changed, self.last_rerun = set(), []
+        for det in self.DETECTORS:
+            inputs = cache.fingerprints(self.index, det.inputs(self))
+            cached = cache.lookup(det.name, inputs, self.changed_paths)
+            if cached is not None and not changed.intersection(det.after):
+                analysis.update(copy.deepcopy(cached))
+                continue
+            getattr(self, det.method)(analysis)
+            outputs = {k: copy.deepcopy(analysis[k]) for k in det.outputs if k in analysis}
+            if outputs != cached:
+                changed.add(det.name)
+            cache.store(det.name, inputs, outputs)
+            self.last_rerun.append(det.name)
+
+        if self.last_rerun:
+            print(f"  [>] Re-ran detectors: {', '.join(self.last_rerun)}")
+        else:
+            print("  [>] No changes since last analysis; reused all detector results")
         
         # 4. Create Pydantic model
         context = ProjectContext(**analysis)
         
         # 5. Save to Cache
         self._save_cache(context)
+        cache.commit, cache.dirty = self._git_state or (None, [])
+        cache.save()
         print(f"✅ Analysis complete. Cached to {self.cache_file}")
         
         return context
 
+    def _build_index(self) -> FileIndex:
+        self._git_state = None
+        if self.use_git:
+            try:
+                index = FileIndex.from_git(self.project_path)
+                if self.git_base:
+                    self._git_state = (git_head(self.project_path),
+                                       sorted(git_changed_files(self.project_path, "HEAD")))
+                return index
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"  [!] git index unavailable ({e}); walking the tree instead")
+                self._git_state = None
+        return FileIndex.build(self.project_path)
+
+    def _changes_since(self, cache: AnalysisCache) -> set[str] | None:
+        """Paths changed since the cached results were computed; None to compare fingerprints instead.
+
+        Diffs against the commit recorded with the cache, else against `git_base`.
+        """
+        if self._git_state is None or not cache.detectors:
+            return None
+        if cache.commit:
+            try:
+                changed = git_changed_files(self.project_path, cache.commit) | set(cache.dirty)
+                print(f"  [>] {len(self.index)} tracked files; {len(changed)} changed since {cache.commit[:12]}")
+                return changed
+            except (OSError, subprocess.CalledProcessError):
+                print(f"  [!] cached commit {cache.commit[:12]} is not in this clone; diffing against {self.git_base}")
+        try:
+            changed = git_changed_files(self.project_path, self.git_base)
+        except (OSError, subprocess.CalledProcessError):
+            print(f"  [!] {self.git_base} is not in this clone either; comparing fingerprints instead")
+            return None
+        print(f"  [>] {len(self.index)} tracked files; {len(changed)} changed since {self.git_base}")
+        return changed
+
+    def _service_dirs(self) -> list[str]:
+        """Subdirectories holding their own service manifest (package.json, requirements.txt, go.mod, ...)."""
+        return sorted({e.parent for e in self.index.named(*SERVICE_MANIFEST_FILES) if e.parent})
+
+    def _scan(self, paths: list[str]):
+        """Concurrently reads any of `paths` not scanned yet this run into `scan_hits`."""
+        todo = [p for p in dict.fromkeys(paths) if p not in self.scan_hits]
+        if not todo:
+            return
+        hits = ContentScanner().scan([self.index.abspath(p) for p in todo])
+        self.scan_hits.update({p: hits[self.index.abspath(p)] for p in todo})
+
+    def _detect_raw_context(self, analysis: dict):
+        analysis["raw_context_summary"] = ContextGatherer(self.project_path).get_context()
+
     def _detect_node(self, analysis: dict):
-        # Scan recursively
-        for root, dirs, files in os.walk(self.project_path):
-            if "node_modules" in dirs: 
-                dirs.remove("node_modules")
-            
-            if "package.json" in files:
-                analysis["language"] = "javascript/node" # At least one node app found
-                pkg_path = os.path.join(root, "package.json")
-                try:
-                    data = json.loads(read_file(pkg_path))
-                    deps = list(data.get("dependencies", {}).keys())
-                    analysis["dependencies"].extend(deps)
+        for entry in self.index.named("package.json"):
+            analysis["language"] = "javascript/node" # At least one node app found
+            try:
+                data = json.loads(read_file(self.index.abspath(entry.path)))
+                deps = list(data.get("dependencies", {}).keys())
+                analysis["dependencies"].extend(deps)
+                
+                # Merge scripts (prefix with folder name to avoid collision?)
+                # For now just flat merge, last wins or maybe ignore scripts for deep files
+                if entry.parent == "":
+                    analysis["scripts"] = data.get("scripts", {})
                     
-                    # Merge scripts (prefix with folder name to avoid collision?)
-                    # For now just flat merge, last wins or maybe ignore scripts for deep files
-                    if root == self.project_path:
-                        analysis["scripts"] = data.get("scripts", {})
-                        
-                    if "express" in deps:
-                        analysis["frameworks"].append("express")
-                    if "react" in deps:
-                        analysis["frameworks"].append("react")
-                except Exception: pass
+                if "express" in deps:
+                    analysis["frameworks"].append("express")
+                if "react" in deps:
+                    analysis["frameworks"].append("react")
+            except Exception: pass
         
         # Deduplicate
-        analysis["dependencies"] = list(set(analysis["dependencies"]))
-        analysis["frameworks"] = list(set(analysis["frameworks"]))
+        analysis["dependencies"] = sorted(set(analysis["dependencies"]))
+        analysis["frameworks"] = sorted(set(analysis["frameworks"]))
 
     def _detect_python(self, analysis: dict):
-        for root, dirs, files in os.walk(self.project_path):
-            if "venv" in dirs: dirs.remove("venv")
-            if "__pycache__" in dirs: dirs.remove("__pycache__")
-            
-            if "requirements.txt" in files:
-                analysis["language"] = "python"
-                req_path = os.path.join(root, "requirements.txt")
-                try:
-                    content = read_file(req_path)
-                    deps = [line.split('==')[0].split('>=')[0].strip() for line in content.splitlines() if line and not line.startswith("#")]
-                    analysis["dependencies"].extend(deps)
-                    
-                    content_lower = content.lower()
-                    if "flask" in content_lower: analysis["frameworks"].append("flask")
-                    if "django" in content_lower: analysis["frameworks"].append("django")
-                    if "fastapi" in content_lower: analysis["frameworks"].append("fastapi")
-                except Exception: pass
+        for entry in self.index.named("requirements.txt"):
+            analysis["language"] = "python"
+            try:
+                content = read_file(self.index.abspath(entry.path))
+                deps = [line.split('==')[0].split('>=')[0].strip() for line in content.splitlines() if line and not line.startswith("#")]
+                analysis["dependencies"].extend(deps)
+                
+                content_lower = content.lower()
+                if "flask" in content_lower: analysis["frameworks"].append("flask")
+                if "django" in content_lower: analysis["frameworks"].append("django")
+                if "fastapi" in content_lower: analysis["frameworks"].append("fastapi")
+            except Exception: pass
                 
         # Deduplicate
-        analysis["dependencies"] = list(set(analysis["dependencies"]))
-        analysis["frameworks"] = list(set(analysis["frameworks"]))
+        analysis["dependencies"] = sorted(set(analysis["dependencies"]))
+        analysis["frameworks"] = sorted(set(analysis["frameworks"]))
 
     def _detect_ports(self, analysis: dict):
-        # Naive scan for common port patterns
-        import re
-        full_text = analysis["raw_context_summary"] 
-        likely_files = ["server.js", "app.py", "main.py", "index.js", "docker-compose.yml"]
-        
-        files_to_scan = []
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file in likely_files:
-                    files_to_scan.append(os.path.join(root, file))
-        
+        # Naive scan for common port patterns: port=XXXX / .listen(XXXX)
+        paths = [e.path for e in self.index.named(*PORT_FILES)]
+        self._scan(paths)
         found_ports = set()
-        for fpath in files_to_scan: # Limit scanning
-            content = read_file(fpath)
-            # Look for 3000, 8000, 8080 or port=XXXX
-            matches = re.findall(r'port\s*[:=]\s*(\d{4})', content, re.IGNORECASE)
-            found_ports.update(matches)
-            matches2 = re.findall(r'\.listen\(\s*(\d{4})', content)
-            found_ports.update(matches2)
+        for entry in self.index.named(*PORT_FILES):
+            hits = self.scan_hits.get(entry.path, {})
+            found_ports.update(hits.get("port_assignment", []))
+            found_ports.update(hits.get("listen_call", []))
             
         if found_ports:
-            analysis["ports"] = list(found_ports)
+            analysis["ports"] = sorted(found_ports)
         # Default fallback if known framework
         elif "express" in analysis["frameworks"]:
             analysis["ports"].append("3000")
@@ -132,269 +477,55 @@ class CodeAnalysisAgent:
             analysis["ports"].append("8000")
 
     def _detect_env_vars(self, analysis: dict):
-        import re
-        likely_files = ["server.js", "app.py", "main.py", "config.js", "settings.py"]
-        files_to_scan = []
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file in likely_files:
-                    files_to_scan.append(os.path.join(root, file))
-        
+        self._scan([e.path for e in self.index.named(*ENV_FILES)])
         envs = set()
-        for fpath in files_to_scan:
-            content = read_file(fpath)
-            # Node
-            matches = re.findall(r'process\.env\.([A-Z_][A-Z0-9_]*)', content)
-            envs.update(matches)
-            # Python
-            matches_py = re.findall(r'os\.environ\.get\([\'"]([A-Z_][A-Z0-9_]*)[\'"]\)', content)
-            envs.update(matches_py)
+        for entry in self.index.named(*ENV_FILES):
+            hits = self.scan_hits.get(entry.path, {})
+            envs.update(hits.get("node_env", []))    # process.env.X
+            envs.update(hits.get("python_env", []))  # os.environ.get("X")
             
-        analysis["env_vars"] = list(envs)
+        analysis["env_vars"] = sorted(envs)
 
     def _detect_existing_files(self, analysis: dict):
         """Scans for existing DevOps artifacts."""
         found = {}
-        for root, dirs, files in os.walk(self.project_path):
-            if ".git" in dirs: dirs.remove(".git")
-            if "node_modules" in dirs: dirs.remove("node_modules")
-            if "__pycache__" in dirs: dirs.remove("__pycache__")
-            
-            for file in files:
-                fpath = os.path.join(root, file)
-                rel_path = os.path.relpath(fpath, self.project_path)
-                
-                if file == "Dockerfile":
-                    found["Dockerfile"] = rel_path
-                elif file in ["docker-compose.yml", "docker-compose.yaml"]:
-                    found["Compose"] = rel_path
-                elif file in ["manifest.yaml", "deployment.yaml", "service.yaml"]:
-                    found["K8s"] = rel_path
-                elif file == "Chart.yaml":
-                    found["Helm"] = rel_path
-                elif file.endswith(".tf"):
-                    found["Terraform"] = rel_path
-            
-            # Check for hidden .github
-            if ".github" in dirs or ".github" in root:
-                gh_path = os.path.join(root, ".github", "workflows")
-                if os.path.exists(gh_path):
-                    found["GitHub Actions"] = os.path.relpath(gh_path, self.project_path)
+        for entry in self.index:
+            file, rel_path = entry.name, entry.path
+            if file == "Dockerfile":
+                found["Dockerfile"] = rel_path
+            elif file in ["docker-compose.yml", "docker-compose.yaml"]:
+                found["Compose"] = rel_path
+            elif file in ["manifest.yaml", "deployment.yaml", "service.yaml"]:
+                found["K8s"] = rel_path
+            elif file == "Chart.yaml":
+                found["Helm"] = rel_path
+            elif file.endswith(".tf"):
+                found["Terraform"] = rel_path
+
+        # .github/workflows at the root or in any service directory
+        for rel_dir in self.index.dirs:
+            if rel_dir == ".github/workflows" or rel_dir.endswith("/.github/workflows"):
+                found["GitHub Actions"] = rel_dir
 
         analysis["existing_files"] = found
 
     def _detect_architecture(self, analysis: dict):
         """Detects architectural patterns, per-service details, categorized and annotated databases."""
-        import re
         arch = set()
 
-        # ─── Comprehensive Database Detection Maps ──────────────────────
-        DB_RDBMS = {
-            "pg": "PostgreSQL", "psycopg2": "PostgreSQL", "psycopg": "PostgreSQL",
-            "postgres": "PostgreSQL", "pg-promise": "PostgreSQL",
-            "mysql2": "MySQL", "mysql": "MySQL", "mysql-connector-python": "MySQL",
-            "mariadb": "MariaDB",
-            "sqlite3": "SQLite", "better-sqlite3": "SQLite",
-            "sequelize": "Sequelize (ORM)", "typeorm": "TypeORM", "prisma": "Prisma (ORM)",
-            "knex": "Knex (Query Builder)",
-            "mssql": "MS SQL Server", "tedious": "MS SQL Server",
-            "oracledb": "Oracle DB",
-            "cockroachdb": "CockroachDB",
-            "sqlalchemy": "SQLAlchemy (ORM)", "alembic": "Alembic (Migrations)",
-        }
-        DB_CACHE = {
-            "redis": "Redis", "ioredis": "Redis", "redis-py": "Redis",
-            "dragonfly": "Dragonfly", "dragonfly-db": "Dragonfly",
-            "memcached": "Memcached", "pylibmc": "Memcached",
-            "keydb": "KeyDB", "valkey": "Valkey",
-        }
-        DB_NOSQL = {
-            "mongoose": "MongoDB", "pymongo": "MongoDB", "mongodb": "MongoDB",
-            "motor": "MongoDB (async)",
-            "cassandra-driver": "Cassandra", "cassandra": "Cassandra",
-            "elasticsearch": "Elasticsearch", "opensearch-py": "OpenSearch",
-            "@elastic/elasticsearch": "Elasticsearch",
-            "dynamodb": "DynamoDB", "@aws-sdk/client-dynamodb": "DynamoDB",
-            "firestore": "Firestore", "@google-cloud/firestore": "Firestore",
-            "firebase-admin": "Firebase/Firestore",
-            "nano": "CouchDB", "couchbase": "Couchbase",
-            "neo4j-driver": "Neo4j (Graph DB)",
-            "influxdb-client": "InfluxDB (Time-series)", "influxdb": "InfluxDB",
-            "timescaledb": "TimescaleDB", "arangodb": "ArangoDB",
-        }
-        DB_BROKER = {
-            "kafkajs": "Kafka", "kafka-node": "Kafka", "confluent-kafka-python": "Kafka",
-            "amqplib": "RabbitMQ", "pika": "RabbitMQ",
-            "nats": "NATS",
-            "bull": "Bull (Redis Queue)", "bullmq": "BullMQ (Redis Queue)",
-            "celery": "Celery (Task Queue)",
-        }
-
-        # Tracking: {db_name -> [service_names]}
-        db_rdbms: dict  = {}
-        db_cache: dict  = {}
-        db_nosql: dict  = {}
-        db_broker: dict = {}
-
-        def _register_db(dep: str, svc_name: str) -> str | None:
-            """Add dep to the correct category bucket, return human name."""
-            for db_map, store in [
-                (DB_RDBMS, db_rdbms), (DB_CACHE, db_cache),
-                (DB_NOSQL, db_nosql), (DB_BROKER, db_broker)
-            ]:
-                if dep in db_map:
-                    name = db_map[dep]
-                    if name not in store:
-                        store[name] = []
-                    if svc_name not in store[name]:
-                        store[name].append(svc_name)
-                    return name
-            return None
-
-        def _infer_role(frameworks: list, deps: list, dev_deps: list, name: str) -> str:
-            """Infer what this service actually does."""
-            all_d = set(d.lower() for d in deps + dev_deps)
-            fw    = set(f.lower() for f in frameworks)
-            nm    = name.lower()
-            if any(x in fw for x in ["react", "vue", "svelte", "next.js", "angular", "nuxt"]):
-                return "Frontend Web App (SPA)"
-            if "vite" in all_d and "react" in all_d:
-                return "Frontend Web App (React + Vite)"
-            if any(x in fw for x in ["express", "fastify", "koa", "hapi.js", "nestjs"]):
-                if any(d in all_d for d in ["pg", "mongoose", "mysql2", "sequelize", "prisma", "typeorm"]):
-                    return "REST API Server + DB Layer"
-                return "REST API Server"
-            if "fastapi" in fw: return "Python FastAPI Service"
-            if "flask" in fw:   return "Python Flask API"
-            if "django" in fw:  return "Django Web Application"
-            if any(x in all_d for x in ["bull", "bullmq", "celery", "kafkajs", "amqplib"]):
-                return "Background Worker / Message Consumer"
-            if any(x in nm for x in ["worker", "job", "queue", "consumer", "cron"]):
-                return "Background Worker / Scheduler"
-            if any(x in nm for x in ["gateway", "proxy"]):
-                return "API Gateway / Reverse Proxy"
-            if any(x in nm for x in ["auth", "identity", "login"]):
-                return "Authentication Service"
-            if any(x in nm for x in ["notification", "email", "sms"]):
-                return "Notification Service"
-            return "Microservice"
+        # Tracking: {category -> {db_name -> [service_names]}}
+        databases = {category: {} for category in DB_CATEGORY_NAMES}
 
         # ─── Per-service detection ──────────────────────────────────────
-        microservice_dirs   = []
+        microservice_dirs   = self._service_dirs()
         microservice_details = {}
-
-        for root, dirs, files in os.walk(self.project_path):
-            dirs[:] = [d for d in dirs if d not in
-                       ("node_modules", "venv", ".git", "__pycache__", "dist", "build", ".next")]
-            rel_dir  = os.path.relpath(root, self.project_path)
-            is_subdir = root != self.project_path
-
-            # ── Node.js service ────────────────────────────────────────
-            if "package.json" in files and is_subdir:
-                microservice_dirs.append(rel_dir)
-                pkg_path = os.path.join(root, "package.json")
-                try:
-                    data     = json.loads(read_file(pkg_path))
-                    deps     = list(data.get("dependencies", {}).keys())
-                    dev_deps = list(data.get("devDependencies", {}).keys())
-                    all_deps = deps + dev_deps
-
-                    svc_frameworks = []
-                    for fw_dep, fw_name in [
-                        ("express","Express"), ("fastify","Fastify"), ("koa","Koa"),
-                        ("react","React"), ("next","Next.js"), ("vue","Vue"),
-                        ("svelte","Svelte"), ("angular","Angular"), ("nuxt","Nuxt"),
-                        ("hapi","Hapi.js"), ("@nestjs/core","NestJS"),
-                        ("graphql","GraphQL"), ("apollo-server","Apollo Server"),
-                    ]:
-                        if fw_dep in all_deps: svc_frameworks.append(fw_name)
-                    if "vite" in all_deps: svc_frameworks.append("Vite")
-
-                    node_ver = "20"
-                    if "engines" in data and "node" in data["engines"]:
-                        m = re.search(r'(\d+)', data["engines"]["node"])
-                        if m: node_ver = m.group(1)
-                    nvmrc = os.path.join(root, ".nvmrc")
-                    if os.path.exists(nvmrc):
-                        node_ver = read_file(nvmrc).strip().lstrip("v").split(".")[0]
-
-                    is_frontend = any(f in svc_frameworks for f in ["React","Vue","Svelte","Angular","Nuxt"]) or "vite" in all_deps
-                    base_image = (f"node:{node_ver}-alpine → nginx:alpine (runtime)"
-                                  if is_frontend else f"node:{node_ver}-alpine")
-
-                    svc_ports = []
-                    for fname in os.listdir(root):
-                        fpath = os.path.join(root, fname)
-                        if os.path.isfile(fpath) and fname.endswith((".js",".ts",".mjs",".cjs")):
-                            svc_ports.extend(re.findall(r'(?:listen|PORT)\D{0,10}(\d{3,5})', read_file(fpath)))
-                    vite_cfg = os.path.join(root, "vite.config.js")
-                    if os.path.exists(vite_cfg):
-                        svc_ports.extend(re.findall(r'port\s*:\s*(\d+)', read_file(vite_cfg)))
-                    if not svc_ports:
-                        defaults = {"Express":"3000","Fastify":"3000","NestJS":"3000",
-                                    "React":"80","Next.js":"3000","Vue":"80","Vite":"5173"}
-                        svc_ports = [defaults.get(svc_frameworks[0], "3000")] if svc_frameworks else ["3000"]
-
-                    svc_dbs = []
-                    for dep in deps:
-                        name = _register_db(dep, rel_dir)
-                        if name and name not in svc_dbs:
-                            svc_dbs.append(name)
-
-                    microservice_details[rel_dir] = {
-                        "language": "Node.js", "frameworks": svc_frameworks,
-                        "node_version": node_ver, "base_image": base_image,
-                        "ports": list(dict.fromkeys(svc_ports)),
-                        "key_deps": deps[:6], "role": _infer_role(svc_frameworks, deps, dev_deps, os.path.basename(root)),
-                        "databases": svc_dbs,
-                    }
-                except Exception:
-                    microservice_details[rel_dir] = {
-                        "language": "Node.js", "frameworks": [], "ports": ["3000"],
-                        "base_image": "node:20-alpine", "node_version": "20",
-                        "role": "Microservice", "databases": [],
-                    }
-
-            # ── Python service ─────────────────────────────────────────
-            elif "requirements.txt" in files and is_subdir:
-                microservice_dirs.append(rel_dir)
-                req_path = os.path.join(root, "requirements.txt")
-                try:
-                    content = read_file(req_path)
-                    deps = [l.split("==")[0].split(">=")[0].split("~=")[0].strip().lower()
-                            for l in content.splitlines() if l.strip() and not l.startswith("#")]
-
-                    svc_frameworks = []
-                    for fw_dep, fw_name in [
-                        ("flask","Flask"), ("django","Django"), ("fastapi","FastAPI"),
-                        ("tornado","Tornado"), ("aiohttp","aiohttp"), ("sanic","Sanic"),
-                        ("starlette","Starlette"), ("uvicorn","Uvicorn"),
-                    ]:
-                        if fw_dep in deps: svc_frameworks.append(fw_name)
-
-                    py_ver = "3.11"
-                    pv = os.path.join(root, ".python-version")
-                    if os.path.exists(pv): py_ver = read_file(pv).strip()
-
-                    svc_dbs = []
-                    for dep in deps:
-                        name = _register_db(dep, rel_dir)
-                        if name and name not in svc_dbs:
-                            svc_dbs.append(name)
-
-                    microservice_details[rel_dir] = {
-                        "language": "Python", "frameworks": svc_frameworks,
-                        "node_version": py_ver, "base_image": f"python:{py_ver}-slim",
-                        "ports": ["8000"], "key_deps": deps[:6],
-                        "role": _infer_role(svc_frameworks, deps, [], os.path.basename(root)),
-                        "databases": svc_dbs,
-                    }
-                except Exception:
-                    microservice_details[rel_dir] = {
-                        "language": "Python", "frameworks": [], "ports": ["8000"],
-                        "base_image": "python:3.11-slim", "node_version": "3.11",
-                        "role": "Microservice", "databases": [],
-                    }
+        for rel_dir, result in self._service_results(microservice_dirs).items():
+            microservice_details[rel_dir] = result["details"]
+            for category, names in result["databases"].items():
+                for name in names:
+                    svcs = databases.setdefault(category, {}).setdefault(name, [])
+                    if rel_dir not in svcs:
+                        svcs.append(rel_dir)
 
         if microservice_dirs:
             arch.add("microservices")
@@ -404,35 +535,60 @@ class CodeAnalysisAgent:
             arch.add("monolith")
 
         # ─── Final categorized DB dict with service annotations ────────
-        analysis["databases"] = {
-            "rdbms":  db_rdbms,
-            "cache":  db_cache,
-            "nosql":  db_nosql,
-            "broker": db_broker,
-        }
+        analysis["databases"] = databases
+        db_rdbms = databases["rdbms"]
         # Legacy fallback
         if not db_rdbms and "postgres" in str(analysis.get("architecture", [])):
             analysis["databases"]["rdbms"]["PostgreSQL"] = []
 
         # ─── Cloud SDKs ────────────────────────────────────────────────
         deps_all = analysis.get("dependencies", [])
-        if any(d.startswith("aws-sdk") or d == "boto3" for d in deps_all): arch.add("aws")
-        if any("google-cloud" in d for d in deps_all): arch.add("gcp")
-        if "azure" in str(deps_all): arch.add("azure")
-
-        analysis["architecture"] = list(arch)
+        arch.update(get_catalog().clouds(deps_all))
+        # Go / Maven / Cargo dependencies never reach the project-wide list; their services report them
+        for details in microservice_details.values():
+            arch.update(details.get("clouds", []))
+
+        analysis["architecture"] = sorted(arch)
+
+
+    def _service_results(self, service_dirs: list[str]) -> dict[str, dict]:
+        """Per-service analysis, re-run only for services whose own files changed."""
+        results, stale = {}, []
+        for rel_dir in service_dirs:
+            inputs = self._cache.fingerprints(self.index, [e.path for e in self.index.children(rel_dir)])
+            cached = self._cache.lookup(f"service:{rel_dir}", inputs, self.changed_paths)
+            if cached is not None:
+                results[rel_dir] = copy.deepcopy(cached)
+            else:
+                stale.append((rel_dir, inputs))
+
+        jobs = [(self.project_path, rel_dir, [e.name for e in self.index.children(rel_dir)]) for rel_dir, _ in stale]
+        for (rel_dir, inputs), (result, hits) in zip(stale, self._run_service_jobs(jobs)):
+            results[rel_dir] = result
+            self.scan_hits.update(hits)
+            self._cache.store(f"service:{rel_dir}", inputs, copy.deepcopy(result))
+            self.last_services_analyzed.append(rel_dir)
+        self._cache.retain("service:", {f"service:{d}" for d in service_dirs})
+        return {d: results[d] for d in service_dirs}
+
+    def _run_service_jobs(self, jobs: list[tuple]) -> list[tuple[dict, dict]]:
+        """Runs `_service_job` for each job, across a process pool when there are enough of them."""
+        workers = min(self.workers, len(jobs))
+        if workers > 1 and len(jobs) >= SERVICE_POOL_MIN_JOBS:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    # A few chunks per worker balances uneven services without per-job IPC
+                    return list(pool.map(partial(_service_job, scan_workers=1), jobs,
+                                         chunksize=max(1, len(jobs) // (workers * 4))))
+            except (OSError, BrokenProcessPool) as e:
+                print(f"  [!] Process pool unavailable ({e}); analyzing services serially")
+        return [_service_job(job) for job in jobs]
 
     def _save_cache(self, context: ProjectContext):
         write_file(self.cache_file, context.model_dump_json(indent=2))
 
     def get_cached_analysis(self) -> ProjectContext:
-        """Reads from cache if exists, otherwise analyzes"""
-        if os.path.exists(self.cache_file):
-            print(f"⚡ Loading cached analysis from {self.cache_file}")
-            try:
-                content = read_file(self.cache_file)
-                return ProjectContext.model_validate_json(content)
-            except Exception:
-                print("⚠️  Cache invalid, re-analyzing...")
-                return self.analyze()
-        return self.analyze()
+        """Returns the analysis, re-running only detectors whose inputs changed since the cached run."""
+        if os.path.exists(self.cache_file) and os.path.exists(self.analysis_cache_file):
+            print(f"⚡ Validating cached analysis in {self.cache_file}")
+        return self.analyze(incremental=True)
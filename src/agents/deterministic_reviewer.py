@@ -1,8 +1,14 @@
 import subprocess
-import tempfile
 import os
-import json
-from typing import Tuple, Dict, Any
+from typing import List, Tuple
+
+import yaml
+
+from src.tools.batch_validate import ToolError, hadolint_failures, run_actionlint, run_hadolint, run_kubeconform
+from src.tools.dockerfile_lint import lint_dockerfile
+from src.tools.k8s_schema import get_schema_store
+from src.tools.validation_cache import get_validation_cache
+from src.tools.workflow_analysis import analyze_workflow
 
 class DeterministicReviewer:
     """
@@ -14,6 +20,12 @@ class DeterministicReviewer:
         self.base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.hadolint_path = os.path.join(self.base_dir, "bin", "hadolint")
         self.kubeval_path = os.path.join(self.base_dir, "bin", "kubeval")
+        self.kubeconform_path = os.path.join(self.base_dir, "bin", "kubeconform")
+        self.actionlint_path = os.path.join(self.base_dir, "bin", "actionlint")
+        # Drafts unchanged between review cycles reuse their earlier findings
+        self.cache = get_validation_cache()
+        # Versioned local Kubernetes schemas (KUBERNETES_VERSION), so manifest checks stay offline
+        self.schemas = get_schema_store()
 
     def run_cmd(self, cmd: list) -> Tuple[bool, str]:
         try:
@@ -26,57 +38,154 @@ class DeterministicReviewer:
 
     def review_dockerfile(self, content: str) -> Tuple[bool, str]:
         """
-        Runs hadolint on Dockerfile content.
+        Lints Dockerfile content (built-in linter, then hadolint).
         Returns: (is_valid, log_message)
         """
-        if not os.path.exists(self.hadolint_path):
-            return True, "⚠️ Hadolint binary not found. Skipping linting."
+        return self.review_dockerfiles([content])[0]
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
+    def review_dockerfiles(self, contents: List[str]) -> List[Tuple[bool, str]]:
+        """
+        Pre-screens every draft with the in-process linter, then runs hadolint
+        once over the drafts that passed (one process, one temp workspace).
+        Returns: [(is_valid, log_message)] in input order.
+        """
+        results: List[Tuple[bool, str] | None] = [None] * len(contents)
+        for idx, content in enumerate(contents):
+            found = lint_dockerfile(content)
+            if found:
+                out = "\n".join(f.format("Dockerfile") for f in found)
+                results[idx] = (False, f"⚠️ Deterministic Validation Errors (Dockerfile lint):\n{out}")
+        clean = {idx: c for idx, c in enumerate(contents) if results[idx] is None}
+        if not clean:
+            return results
 
+        if not os.path.exists(self.hadolint_path):
+            for idx in clean:
+                results[idx] = (True, "✅ Deterministic Validation: No issues found by the built-in Dockerfile "
+                                      "linter (hadolint binary not found).")
+            return results
         try:
-            # Run hadolint
-            # We use json format for cleaner parsing if needed, but text is fine for LLM context
-            ok, out = self.run_cmd([self.hadolint_path, tmp_path])
-            
-            if ok:
-                return True, "✅ Deterministic Validation: No syntax errors found by Hadolint."
+            findings = self.cache.run_batch("hadolint", self.hadolint_path, clean, run_hadolint)
+        except ToolError as e:
+            for idx in clean:
+                results[idx] = (False, f"⚠️ Deterministic Validation Errors (Hadolint):\n{e}")
+            return results
+        if findings is None:
+            for idx in clean:
+                results[idx] = (False, f"Tool not found: {self.hadolint_path}")
+            return results
+
+        for idx in clean:
+            failing = hadolint_failures(findings[idx])
+            if not failing:
+                results[idx] = (True, "✅ Deterministic Validation: No syntax errors found by Hadolint.")
             else:
-                # Filter output to remove temp file path for cleanliness
-                clean_out = out.replace(tmp_path, "Dockerfile")
-                return False, f"⚠️ Deterministic Validation Errors (Hadolint):\n{clean_out}"
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+                out = "\n".join(f.format("Dockerfile") for f in failing)
+                results[idx] = (False, f"⚠️ Deterministic Validation Errors (Hadolint):\n{out}")
+        return results
 
     def review_k8s(self, content: str) -> Tuple[bool, str]:
         """
-        Runs kubeconform on Kubernetes manifest content.
+        Validates a Kubernetes manifest (offline schemas, then kubeconform).
         Returns: (is_valid, log_message)
         """
-        # Update path to kubeconform
-        self.kubeconform_path = os.path.join(self.base_dir, "bin", "kubeconform")
-        
+        return self.review_k8s_batch([content])[0]
+
+    def review_k8s_batch(self, contents: List[str]) -> List[Tuple[bool, str]]:
+        """
+        Checks every draft against the local schema cache in-process, then runs
+        kubeconform once, offline, over the drafts that passed.
+        Returns: [(is_valid, log_message)] in input order.
+        """
+        results: List[Tuple[bool, str] | None] = [None] * len(contents)
+        if self.schemas.available:
+            for idx, content in enumerate(contents):
+                found = self.schemas.validate(content)
+                if found:
+                    out = "\n".join(f.format("manifest.yaml") for f in found)
+                    results[idx] = (False, f"⚠️ Deterministic Validation Errors (Kubernetes schema "
+                                           f"{self.schemas.kubernetes_version}):\n{out}")
+        clean = {idx: c for idx, c in enumerate(contents) if results[idx] is None}
+        if not clean:
+            return results
+
         if not os.path.exists(self.kubeconform_path):
-            return True, "⚠️ Kubeconform binary not found. Skipping validation."
+            note = (f"✅ Deterministic Validation: Valid against Kubernetes {self.schemas.kubernetes_version} "
+                    "schemas (kubeconform binary not found)." if self.schemas.available
+                    else "⚠️ Kubeconform binary not found. Skipping validation.")
+            for idx in clean:
+                results[idx] = (True, note)
+            return results
+        args = self.schemas.kubeconform_args() if self.schemas.available else ()
+        try:
+            findings = self.cache.run_batch("kubeconform", self.kubeconform_path, clean, run_kubeconform,
+                                            *args, extra_args=args)
+        except ToolError as e:
+            for idx in clean:
+                results[idx] = (False, f"⚠️ Deterministic Validation Errors (Kubeconform):\n{e}")
+            return results
+        if findings is None:
+            for idx in clean:
+                results[idx] = (False, f"Tool not found: {self.kubeconform_path}")
+            return results
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=".yaml") as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
+        for idx in clean:
+            if not findings[idx]:
+                results[idx] = (True, "✅ Deterministic Validation: Valid Kubernetes manifests (Kubeconform passed).")
+            else:
+                out = "\n".join(f.format("manifest.yaml") for f in findings[idx])
+                results[idx] = (False, f"⚠️ Deterministic Validation Errors (Kubeconform):\n{out}")
+        return results
 
+    def review_workflows(self, contents: List[str]) -> List[Tuple[bool, str]]:
+        """
+        Analyzes each workflow's job graph (cycles, unknown `needs`, matrix
+        size, caching, critical path), then runs actionlint once over the
+        drafts whose graph is sound. Every log carries the expected wall
+        time, so drafts can be compared on speed as well as correctness.
+        Returns: [(is_valid, log_message)] in input order.
+        """
+        results: List[Tuple[bool, str] | None] = [None] * len(contents)
+        notes: dict[int, str] = {}
+        for idx, content in enumerate(contents):
+            try:
+                workflow = yaml.safe_load(content)
+            except yaml.YAMLError as e:
+                results[idx] = (False, f"⚠️ Deterministic Validation Errors (workflow YAML):\n{e}")
+                continue
+            if not isinstance(workflow, dict) or not isinstance(workflow.get("jobs"), dict) or not workflow["jobs"]:
+                results[idx] = (False, "⚠️ Deterministic Validation Errors (workflow YAML):\n"
+                                       "A workflow must be a mapping with a non-empty `jobs` mapping")
+                continue
+            analysis = analyze_workflow(workflow)
+            notes[idx] = f"Job graph: {analysis.summary()}." + "".join(f"\n- {w}" for w in analysis.warnings())
+            if analysis.errors():
+                out = "\n".join(analysis.errors())
+                results[idx] = (False, f"⚠️ Deterministic Validation Errors (job graph):\n{out}\n{notes[idx]}")
+        clean = {idx: c for idx, c in enumerate(contents) if results[idx] is None}
+        if not clean:
+            return results
+
+        if not os.path.exists(self.actionlint_path):
+            for idx in clean:
+                results[idx] = (True, "✅ Deterministic Validation: Job graph is sound (actionlint binary not "
+                                      f"found).\n{notes[idx]}")
+            return results
         try:
-            # Run kubeconform -strict -summary
-            # -kubernetes-version can be added if we know the version context
-            cmd = [self.kubeconform_path, "-strict", "-summary", tmp_path]
-            ok, out = self.run_cmd(cmd)
-            
-            if ok:
-                return True, "✅ Deterministic Validation: Valid Kubernetes manifests (Kubeconform passed)."
+            findings = self.cache.run_batch("actionlint", self.actionlint_path, clean, run_actionlint)
+        except ToolError as e:
+            for idx in clean:
+                results[idx] = (False, f"⚠️ Deterministic Validation Errors (Actionlint):\n{e}\n{notes[idx]}")
+            return results
+        if findings is None:
+            for idx in clean:
+                results[idx] = (False, f"Tool not found: {self.actionlint_path}")
+            return results
+
+        for idx in clean:
+            if not findings[idx]:
+                results[idx] = (True, f"✅ Deterministic Validation: Actionlint passed.\n{notes[idx]}")
             else:
-                clean_out = out.replace(tmp_path, "manifest.yaml")
-                return False, f"⚠️ Deterministic Validation Errors (Kubeconform):\n{clean_out}"
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+                out = "\n".join(f.format("workflow.yml") for f in findings[idx])
+                results[idx] = (False, f"⚠️ Deterministic Validation Errors (Actionlint):\n{out}\n{notes[idx]}")
+        return results
@@ -3,6 +3,7 @@ from src.llm_clients.groq_client import GroqClient
 from src.llm_clients.nvidia_client import NvidiaClient
 from src.tools.file_ops import read_file, scan_directory, write_file
 from src.utils.constants import GUIDELINES_DOCKER
+from src.engine.rule_index import retrieve_rules
 
 class DockerWriterA:
     def __init__(self):
@@ -59,9 +60,9 @@ class DockerReviewer:
         Uses Perplexity AI to intelligently review all 3 Dockerfiles and select/combine the best.
         Has access to guidelines and best practices.
         """
-        # Load guidelines
+        # Only the rules relevant to these drafts, so the prompt stays flat as guidelines grow
         try:
-            guidelines = read_file(GUIDELINES_DOCKER)
+            guidelines = retrieve_rules(GUIDELINES_DOCKER, [docker_a, docker_b, docker_c])
         except Exception:
             guidelines = "No specific guidelines available."
         
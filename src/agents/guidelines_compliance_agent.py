@@ -2,6 +2,7 @@ import os
 import json
 from src.llm_clients.perplexity_client import PerplexityClient
 from src.tools.file_ops import read_file, write_file
+from src.engine.rule_index import retrieve_rules
 
 class GuidelinesComplianceAgent:
     def __init__(self):
@@ -13,11 +14,13 @@ class GuidelinesComplianceAgent:
         ONLY if 'UNIVERSAL' best practices are found.
         """
         
-        # 1. Read existing guidelines
+        # 1. Read existing guidelines (only the rules near this reasoning go into the prompt)
         if os.path.exists(guidelines_path):
             current_guidelines = read_file(guidelines_path)
+            related_guidelines = retrieve_rules(guidelines_path, [reasoning], n=25)
         else:
-            current_guidelines = "No guidelines yet."
+            current_guidelines = ""
+            related_guidelines = "No guidelines yet."
 
         # 2. Extract potential rules and classify them (The Quality Gate)
         prompt = f"""
@@ -29,8 +32,8 @@ class GuidelinesComplianceAgent:
         Input Reasoning:
         {reasoning}
         
-        Current Guidelines:
-        {current_guidelines}
+        Current Guidelines (most related):
+        {related_guidelines}
         
         TASK:
         1. Identify new best practices not currently in the guidelines.
@@ -60,7 +63,10 @@ class GuidelinesComplianceAgent:
             new_practices = data.get("new_practices", [])
             
             # 3. Filter for UNIVERSAL rules only (The Gate)
-            universal_rules = [p['rule'] for p in new_practices if p['type'] == 'UNIVERSAL']
+            existing = {line.strip()[2:].strip().lower() for line in current_guidelines.splitlines()
+                        if line.strip().startswith("- ")}
+            universal_rules = [p['rule'] for p in new_practices
+                               if p['type'] == 'UNIVERSAL' and p['rule'].strip().lower() not in existing]
             
             # 4. Update file if needed
             if universal_rules:
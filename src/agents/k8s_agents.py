@@ -3,6 +3,7 @@ from src.llm_clients.groq_client import GroqClient
 from src.llm_clients.nvidia_client import NvidiaClient
 from src.tools.file_ops import read_file, write_file
 from src.utils.constants import GUIDELINES_K8S
+from src.engine.rule_index import retrieve_rules
 
 class K8sWriterA:
     def __init__(self):
@@ -58,9 +59,9 @@ class K8sReviewer:
         """
         Uses Perplexity AI to intelligently review all 3 K8s manifests.
         """
-        # Load guidelines
+        # Only the rules relevant to these drafts, so the prompt stays flat as guidelines grow
         try:
-            guidelines = read_file(GUIDELINES_K8S)
+            guidelines = retrieve_rules(GUIDELINES_K8S, [yaml_a, yaml_b, yaml_c])
         except Exception:
             guidelines = "No specific guidelines available."
         
@@ -38,8 +38,9 @@ class AuditLog:
         user_feedback: str = "",
         cycle: int = 0,
         drafts_count: int = 0,
+        policy_rules: list[str] | None = None,
     ):
-        """Record a single decision event."""
+        """Record a single decision event (with the policy rules that fired, for rule feedback)."""
         entry = {
             "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             "stage": stage,
@@ -52,6 +53,8 @@ class AuditLog:
             entry["user_feedback"] = user_feedback[:500]
         if drafts_count:
             entry["drafts_received"] = drafts_count
+        if policy_rules:
+            entry["policy_rules"] = sorted(set(policy_rules))
 
         self.entries.append(entry)
         logger.info(
@@ -187,7 +187,8 @@ class V2Orchestrator:
 
         print("\n🎉 Pipeline Execution Completed Successfully!")
         import os
-        for f in [".devops_context.json", ".devops_memory.json"]:
+        # .devops_context.json stays: the next run revalidates it incrementally
+        for f in [".devops_memory.json"]:
             fpath = os.path.join(project_path, f)
             if os.path.exists(fpath):
                 try: os.remove(fpath)
@@ -17,7 +17,7 @@ class InnovationFlywheel:
             print(f"  [!] Innovation Layer failed for {persona}: {e}")
             return ""
 
-    def run_async(self, artifact_content: str, artifact_type: str, original_prompt: str):
+    def run_async(self, artifact_content: str, artifact_type: str, original_prompt: str, validated: bool | None = None):
         """Runs the innovation flywheel non-blocking"""
         print(f"  [>] Starting Async Innovation Flywheel for {artifact_type}...")
         
@@ -43,10 +43,10 @@ class InnovationFlywheel:
         if suggestions:
             combined = "\n\n".join(suggestions)
             # Write to ChromaDB
-            save_to_rag(artifact_type, combined, source=f"innovation_flywheel_{artifact_type}")
+            save_to_rag(artifact_type, combined, source=f"innovation_flywheel_{artifact_type}", validated=validated)
             print(f"  [+] Saved {len(suggestions)} innovation advisories to RAG.")
 
-def run_innovation_async(artifact_content: str, artifact_type: str, original_prompt: str):
+def run_innovation_async(artifact_content: str, artifact_type: str, original_prompt: str, validated: bool | None = None):
     # This function itself can be called in a background thread by the orchestrator
     flywheel = InnovationFlywheel()
-    flywheel.run_async(artifact_content, artifact_type, original_prompt)
+    flywheel.run_async(artifact_content, artifact_type, original_prompt, validated)
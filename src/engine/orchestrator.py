@@ -3,7 +3,7 @@ import threading
 import os
 from src.engine.models import GeneratedFile
 from src.engine.research import run_research
-from src.engine.rag import get_rag_context
+from src.engine.rag import RAGStore
 from src.engine.sampler import Sampler
 from src.engine.constitution import critique_file
 from src.engine.heal import Healer
@@ -17,6 +17,7 @@ class Orchestrator:
         self.sampler = Sampler(self.llm)
         self.validator = Validator()
         self.healer = Healer()
+        self.rag = RAGStore()
 
     def _get_generator_prompt(self, task_type: str) -> str:
         # Load the elite prompt
@@ -41,7 +42,9 @@ class Orchestrator:
         print(f"  [+] Layer 0 Complete: Spec and Research locked.")
 
         # --- LAYER 1: RAG Injection ---
-        rag_context = get_rag_context(user_request, artifact_type)
+        self.rag.seed_initial_knowledge()
+        rag_context = self.rag.retrieve(user_request, artifact_type)
+        rag_ids = self.rag.last_retrieved_ids
         print(f"  [+] Layer 1 Complete: RAG Golden Paths injected.")
 
         # Assemble the ultimate prompt
@@ -86,7 +89,7 @@ LAYER 1 (RAG GOLDEN PATHS & CIS BENCHMARKS):
              print("❌ Failed to strictly parse files out of the winning candidate.")
              return []
 
-        final_artifacts = []
+        critiqued_files = []
         for file in files:
             print(f"\n--- Processing File: {file.path} ---")
             
@@ -97,29 +100,39 @@ LAYER 1 (RAG GOLDEN PATHS & CIS BENCHMARKS):
             # Fix path
             original_path = critiqued_file.path
             critiqued_file.path = os.path.normpath(os.path.join(project_path, original_path))
+            critiqued_files.append(critiqued_file)
 
-            # --- LAYER 4: Deterministic Validation ---
-            print(f"  [>] Layer 4: Running Deterministic Validators...")
-            val_result = self.validator.validate(critiqued_file)
-            
-            # --- LAYER 5: Surgical Heal Loop ---
-            if not val_result.passed:
-                print(f"  [!] Layer 5: Invoking Surgical Heal Loop...")
-                healed_file = self.healer.heal(critiqued_file, val_result.errors)
-                
-                # Re-validate
-                re_val = self.validator.validate(healed_file)
-                if not re_val.passed:
-                     print(f"⚠️  Healer failed to resolve all issues. Escalate to human.")
-                     # We keep the best attempt
-                     final_artifacts.append(healed_file)
+        # --- LAYER 4: Deterministic Validation (one tool run per type for all files) ---
+        print(f"\n  [>] Layer 4: Running Deterministic Validators on {len(critiqued_files)} file(s)...")
+        val_results = self.validator.validate_many(critiqued_files)
+
+        # --- LAYER 5: Surgical Heal Loop ---
+        failing = [i for i, r in enumerate(val_results) if not r.passed]
+        healed = {}
+        if failing:
+            print(f"  [!] Layer 5: Invoking Surgical Heal Loop for {len(failing)} file(s)...")
+            healed = {i: self.healer.heal(critiqued_files[i], val_results[i].errors) for i in failing}
+            # Re-validate only what was healed
+            re_vals = dict(zip(failing, self.validator.validate_many([healed[i] for i in failing])))
+
+        final_artifacts = []
+        all_passed = True
+        for i, critiqued_file in enumerate(critiqued_files):
+            if i in healed:
+                passed = re_vals[i].passed
+                if not passed:
+                     print(f"⚠️  Healer failed to resolve all issues in {critiqued_file.path}. Escalate to human.")
                 else:
-                     print(f"✅ Healer succeeded. File is valid.")
-                     final_artifacts.append(healed_file)
+                     print(f"✅ Healer succeeded. {critiqued_file.path} is valid.")
+                # We keep the best attempt
+                final_artifacts.append(healed[i])
             else:
-                 print(f"✅ File passed validation directly.")
+                 passed = True
+                 print(f"✅ {critiqued_file.path} passed validation directly.")
                  final_artifacts.append(critiqued_file)
                  
+            all_passed = all_passed and passed
+
             # Write to disk
             self._write_to_disk(final_artifacts[-1])
             
@@ -127,9 +140,12 @@ LAYER 1 (RAG GOLDEN PATHS & CIS BENCHMARKS):
             print(f"  [>] Layer 6: Triggering Async Innovation Flywheel...")
             threading.Thread(
                 target=run_innovation_async,
-                args=(final_artifacts[-1].content, artifact_type, user_request),
+                args=(final_artifacts[-1].content, artifact_type, user_request, passed),
                 daemon=True
             ).start()
+
+        # Feed the validation outcome back to the knowledge that shaped this run
+        self.rag.record_outcome(rag_ids, success=all_passed)
             
         print(f"\n✅ Finished {artifact_type}: Successfully processed {len(final_artifacts)} files.")
         return final_artifacts
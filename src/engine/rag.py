@@ -1,32 +1,96 @@
 import os
-import chromadb
-from chromadb.config import Settings
+import time
+import hashlib
+import logging
+from dataclasses import dataclass, field
+import numpy as np
+from src.engine.vector_backends import VectorBackend, create_backend
+from src.engine.rag_snapshot import KnowledgeSnapshot
 
-class RAGStore:
-    def __init__(self, db_path: str = ".chroma_db"):
-        self.db_path = db_path
-        self._ensure_db_dir()
-        self.client = chromadb.PersistentClient(path=self.db_path, settings=Settings(allow_reset=True))
-        
-        # We use a single collection for simplicity, or we could separate by artifact_type
-        self.collection = self.client.get_or_create_collection(
-            name="devops_knowledge_base",
-            metadata={"hnsw:space": "cosine"}
+logger = logging.getLogger("devops-agent.rag")
+
+COLLECTION_NAME = "devops_knowledge_base"
+
+# ─── Lifecycle policy for flywheel-learned entries ──────────────────
+# Seeded golden paths are never aged out; everything else must earn its place.
+ENTRY_TTL_DAYS = 90               # evict if not retrieved within this window
+MIN_OUTCOMES_FOR_SCORING = 3      # don't judge an entry on fewer outcomes than this
+MIN_VALUE_SCORE = 0.35            # evict below this smoothed success rate
+DUPLICATE_SIMILARITY = 0.95       # cosine similarity above which entries are merged
+PROTECTED_SOURCES = {"initial_seed"}
+RRF_K = 60                        # reciprocal-rank-fusion constant for layered retrieval
+
+GOLDEN_PATHS = [
+    ("docker",
+     "Docker Best Practices 2026:\n- Use multi-stage builds to minimize image size.\n- Do not run containers as root; USER nonroot.\n- Avoid :latest tags; pin strict SHA or explicit version.\n- Order commands to leverage caching (COPY requirements first).\n- No hardcoded secrets."),
+    ("k8s",
+     "Kubernetes Best Practices 2026:\n- Always configure requests and limits for CPU and memory.\n- Use readOnlyRootFilesystem where applicable.\n- Set runAsNonRoot: true and allowPrivilegeEscalation: false.\n- Define liveness and readiness probes.\n- Use namespaces; never deploy to 'default' implicitly."),
+    ("ci",
+     "GitHub Actions CI/CD Best Practices 2026:\n- Use granular permissions: `contents: read` at minimum.\n- Pin actions to full commit SHA, not tags.\n- Avoid passing secrets directly to run commands if possible, use environment variables bounding.\n- Ensure workflow triggers are restricted (e.g., branches: [main])."),
+]
+
+
+def entry_value(metadata: dict) -> float:
+    """Laplace-smoothed success rate of the artifacts this entry contributed to."""
+    successes = metadata.get("success_count", 0)
+    failures = metadata.get("failure_count", 0)
+    return (successes + 1) / (successes + failures + 2)
+
+
+@dataclass
+class CompactionReport:
+    total: int = 0
+    kept: int = 0
+    evicted_stale: list = field(default_factory=list)
+    evicted_low_value: list = field(default_factory=list)
+    merged: list = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"Compaction: {self.total} entries -> {self.kept} kept | "
+            f"stale: {len(self.evicted_stale)} | low-value: {len(self.evicted_low_value)} | "
+            f"merged duplicates: {len(self.merged)}"
         )
 
-    def _ensure_db_dir(self):
-        if not os.path.exists(self.db_path):
-            os.makedirs(self.db_path)
 
-    def add_knowledge(self, artifact_type: str, content: str, source: str = "innovation_layer"):
-        """Adds a piece of knowledge to the vector store."""
-        # Generate a simple ID based on content hash or UUID
-        import hashlib
+class RAGStore:
+    def __init__(self, db_path: str | None = None, backend: str | None = None,
+                 snapshot_path: str | None = None, use_snapshot: bool = True):
+        # Read-only prebuilt knowledge (scripts/build_rag_snapshot.py); the backend holds what we learn
+        self.snapshot = KnowledgeSnapshot.load(snapshot_path) if use_snapshot else None
+        backend = backend or os.environ.get("RAG_BACKEND", "chroma")
+        try:
+            # We use a single collection for simplicity, or we could separate by artifact_type
+            self.backend: VectorBackend = create_backend(backend, db_path, COLLECTION_NAME)
+        except ImportError:
+            fallback = create_backend("numpy", None, COLLECTION_NAME)
+            logger.warning("chromadb is not installed; using the NumPy RAG backend at %s instead of %s",
+                           fallback.db_path, db_path or "the Chroma store")
+            self.backend = fallback
+        # IDs returned by the last retrieve(), so callers can report the outcome later
+        self.last_retrieved_ids: list[str] = []
+
+    def add_knowledge(self, artifact_type: str, content: str, source: str = "innovation_layer",
+                      validated: bool | None = None):
+        """Adds a piece of knowledge to the vector store.
+
+        `validated` records whether the artifact that produced this knowledge passed
+        deterministic validation; it seeds the entry's outcome counters.
+        """
+        # Generate a simple ID based on content hash
         doc_id = hashlib.sha256(content.encode()).hexdigest()[:16]
-        
-        self.collection.add(
+
+        self.backend.add(
             documents=[content],
-            metadatas=[{"artifact_type": artifact_type, "source": source}],
+            metadatas=[{
+                "artifact_type": artifact_type,
+                "source": source,
+                "created_at": time.time(),
+                "last_retrieved_at": 0.0,
+                "retrieval_count": 0,
+                "success_count": 1 if validated is True else 0,
+                "failure_count": 1 if validated is False else 0,
+            }],
             ids=[f"{artifact_type}_{doc_id}"]
         )
         print(f"  [+] Added knowledge to RAG store for {artifact_type} ({source})")
@@ -34,50 +98,188 @@ class RAGStore:
     def retrieve(self, query: str, artifact_type: str, k: int = 5) -> str:
         """Retrieves top-k relevant knowledge chunks."""
         print(f"  [>] Retrieving context from RAG for {artifact_type}...")
-        
-        # Optional: we can filter by artifact type, but for now we just do a text query
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=k,
-            where={"artifact_type": artifact_type}
-        )
-        
-        if not results['documents'] or not results['documents'][0]:
+
+        where = {"artifact_type": artifact_type}
+        layers = []
+        if self.snapshot is not None:
+            layers.append(self.snapshot.query(query, k, where=where))
+        # An empty mutable store costs nothing: no query embedding, no index load
+        if self.backend.count() > 0:
+            mutable = self.backend.query(query, k, where=where)
+            layers.append(mutable)
+        else:
+            mutable = {"ids": [], "metadatas": []}
+
+        documents, ids = self._fuse(layers, k)
+        if not documents:
+            self.last_retrieved_ids = []
             return "No specific best practices found in RAG store. Follow general industry standards."
-            
+
+        self.last_retrieved_ids = ids
+        if mutable['ids']:
+            self._mark_retrieved(mutable['ids'], mutable['metadatas'])
+
         # Combine the retrieved documents
-        combined = "\n\n---\n\n".join(results['documents'][0])
+        combined = "\n\n---\n\n".join(documents)
         return combined
 
+    @staticmethod
+    def _fuse(layers: list[dict], k: int) -> tuple[list[str], list[str]]:
+        """Reciprocal rank fusion. Layers may use different embedders, so raw distances aren't comparable."""
+        if len(layers) <= 1:
+            return (layers[0]['documents'][:k], layers[0]['ids'][:k]) if layers else ([], [])
+        scores: dict[str, float] = {}
+        docs: dict[str, str] = {}
+        for layer in layers:
+            for rank, (doc_id, doc) in enumerate(zip(layer['ids'], layer['documents'])):
+                scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (RRF_K + rank + 1)
+                docs[doc_id] = doc
+        ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+        return [docs[i] for i in ranked], ranked
+
+    def _mark_retrieved(self, ids: list[str], metadatas: list[dict]):
+        now = time.time()
+        updated = []
+        for meta in metadatas:
+            meta = dict(meta or {})
+            meta["retrieval_count"] = meta.get("retrieval_count", 0) + 1
+            meta["last_retrieved_at"] = now
+            meta.setdefault("created_at", now)
+            updated.append(meta)
+        try:
+            self.backend.update(ids=ids, metadatas=updated)
+        except Exception as e:
+            # Usage stats are best-effort; never fail a retrieval over them
+            print(f"  [!] Could not update RAG usage stats: {e}")
+
+    def record_outcome(self, doc_ids: list[str], success: bool):
+        """Feeds the downstream result (validated/approved or not) back to the entries used.
+
+        Snapshot entries are read-only; only ids living in the mutable store are updated.
+        """
+        if not doc_ids:
+            return
+        existing = self.backend.get(ids=doc_ids)
+        if not existing['ids']:
+            return
+        key = "success_count" if success else "failure_count"
+        updated = []
+        for meta in existing['metadatas']:
+            meta = dict(meta or {})
+            meta[key] = meta.get(key, 0) + 1
+            updated.append(meta)
+        self.backend.update(ids=existing['ids'], metadatas=updated)
+
+    def compact(self, ttl_days: float = ENTRY_TTL_DAYS, min_value: float = MIN_VALUE_SCORE,
+                duplicate_similarity: float = DUPLICATE_SIMILARITY, dry_run: bool = False) -> CompactionReport:
+        """Evicts stale/low-value entries, merges near-duplicates and rebuilds the index.
+
+        Meant to run offline (see scripts/compact_rag.py), not on the request path: the
+        surviving entries are written to a fresh index with their stored embeddings,
+        which is then swapped in, so the index is rebuilt without tombstones.
+        """
+        report = CompactionReport()
+        data = self.backend.get(include_embeddings=True)
+        ids = list(data['ids'])
+        report.total = len(ids)
+        if not ids:
+            return report
+
+        now = time.time()
+        ttl_seconds = ttl_days * 86400
+        entries = []
+        for i, doc_id in enumerate(ids):
+            meta = dict(data['metadatas'][i] or {})
+            # Legacy entries predate lifecycle metadata: start their clock now
+            meta.setdefault("created_at", now)
+            meta.setdefault("last_retrieved_at", 0.0)
+            meta.setdefault("retrieval_count", 0)
+            meta.setdefault("success_count", 0)
+            meta.setdefault("failure_count", 0)
+
+            if meta.get("source") not in PROTECTED_SOURCES:
+                last_seen = max(meta["created_at"], meta["last_retrieved_at"])
+                outcomes = meta["success_count"] + meta["failure_count"]
+                if now - last_seen > ttl_seconds:
+                    report.evicted_stale.append(doc_id)
+                    continue
+                if outcomes >= MIN_OUTCOMES_FOR_SCORING and entry_value(meta) < min_value:
+                    report.evicted_low_value.append(doc_id)
+                    continue
+
+            entries.append({
+                "id": doc_id,
+                "document": data['documents'][i],
+                "metadata": meta,
+                "embedding": np.asarray(data['embeddings'][i], dtype=np.float32),
+            })
+
+        survivors = self._merge_duplicates(entries, duplicate_similarity, report)
+        report.kept = len(survivors)
+
+        if not dry_run:
+            self.backend.replace_all(
+                ids=[e["id"] for e in survivors],
+                documents=[e["document"] for e in survivors],
+                metadatas=[e["metadata"] for e in survivors],
+                embeddings=[e["embedding"] for e in survivors],
+            )
+        return report
+
+    def _merge_duplicates(self, entries: list[dict], threshold: float, report: CompactionReport) -> list[dict]:
+        """Greedy merge: keep the most valuable entry of each near-duplicate cluster."""
+        by_type: dict[str, list[dict]] = {}
+        for e in entries:
+            by_type.setdefault(e["metadata"].get("artifact_type", ""), []).append(e)
+
+        survivors = []
+        for group in by_type.values():
+            group.sort(
+                key=lambda e: (e["metadata"].get("source") in PROTECTED_SOURCES,
+                               entry_value(e["metadata"]), e["metadata"]["retrieval_count"]),
+                reverse=True,
+            )
+            vectors = np.stack([e["embedding"] for e in group])
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+            similarity = vectors @ vectors.T
+
+            kept_idx: list[int] = []
+            for i, e in enumerate(group):
+                match = next((j for j in kept_idx if similarity[i, j] >= threshold), None)
+                if match is None or e["metadata"].get("source") in PROTECTED_SOURCES:
+                    kept_idx.append(i)
+                    continue
+                target = group[match]["metadata"]
+                for key in ("retrieval_count", "success_count", "failure_count"):
+                    target[key] += e["metadata"][key]
+                target["created_at"] = min(target["created_at"], e["metadata"]["created_at"])
+                target["last_retrieved_at"] = max(target["last_retrieved_at"], e["metadata"]["last_retrieved_at"])
+                report.merged.append(e["id"])
+            survivors.extend(group[i] for i in kept_idx)
+        return survivors
+
     def seed_initial_knowledge(self):
         """Seeds the DB with initial, hardcoded golden paths if empty."""
-        count = self.collection.count()
+        count = self.backend.count()
         if count > 0:
             return  # Already seeded
-            
+
+        if self.snapshot is not None and self.snapshot.count() > 0:
+            return  # Golden paths ship prebuilt in the snapshot
+
         print("  [INIT] Seeding RAG store with initial Golden Paths...")
-        
-        # Docker Golden Path
-        self.add_knowledge("docker", 
-                           "Docker Best Practices 2026:\n- Use multi-stage builds to minimize image size.\n- Do not run containers as root; USER nonroot.\n- Avoid :latest tags; pin strict SHA or explicit version.\n- Order commands to leverage caching (COPY requirements first).\n- No hardcoded secrets.",
-                           "initial_seed")
-        
-        # K8s Golden Path
-        self.add_knowledge("k8s",
-                           "Kubernetes Best Practices 2026:\n- Always configure requests and limits for CPU and memory.\n- Use readOnlyRootFilesystem where applicable.\n- Set runAsNonRoot: true and allowPrivilegeEscalation: false.\n- Define liveness and readiness probes.\n- Use namespaces; never deploy to 'default' implicitly.",
-                           "initial_seed")
-
-        # CI/CD Golden Path
-        self.add_knowledge("ci",
-                           "GitHub Actions CI/CD Best Practices 2026:\n- Use granular permissions: `contents: read` at minimum.\n- Pin actions to full commit SHA, not tags.\n- Avoid passing secrets directly to run commands if possible, use environment variables bounding.\n- Ensure workflow triggers are restricted (e.g., branches: [main]).",
-                           "initial_seed")
+        for artifact_type, content in GOLDEN_PATHS:
+            self.add_knowledge(artifact_type, content, "initial_seed")
 
 def get_rag_context(query: str, artifact_type: str) -> str:
     store = RAGStore()
     store.seed_initial_knowledge()
     return store.retrieve(query, artifact_type)
 
-def save_to_rag(artifact_type: str, content: str, source: str = "innovation_layer"):
+def save_to_rag(artifact_type: str, content: str, source: str = "innovation_layer", validated: bool | None = None):
     store = RAGStore()
-    store.add_knowledge(artifact_type, content, source)
+    store.add_knowledge(artifact_type, content, source, validated=validated)
 
+def compact_rag(db_path: str | None = None, backend: str | None = None, **kwargs) -> CompactionReport:
+    return RAGStore(db_path, backend=backend).compact(**kwargs)
@@ -0,0 +1,174 @@
+"""
+Prebuilt, read-only RAG knowledge snapshot.
+
+Golden paths, `configs/guidelines/*.md` and curated advisories are embedded at
+build time (scripts/build_rag_snapshot.py) into:
+
+    <snapshot_dir>/manifest.json   format/version/embedder + documents and metadata
+    <snapshot_dir>/vectors.npy     float32 matrix, memory-mapped at runtime
+
+RAGStore layers the mutable flywheel store on top of it, so a fresh container
+serves retrieval without embedding a single document.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+from src.engine.vector_backends import HashingEmbedder, matches_where
+
+logger = logging.getLogger("devops-agent.rag")
+
+SNAPSHOT_FORMAT_VERSION = 1
+DEFAULT_SNAPSHOT_DIR = "rag_snapshot"
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+
+
+def guideline_artifact_type(path: str) -> str:
+    """configs/guidelines/k8s-guidelines.md -> 'k8s'."""
+    return os.path.basename(path).replace("-guidelines", "").rsplit(".", 1)[0]
+
+
+def chunk_guidelines(markdown: str) -> list[str]:
+    """Splits a guidelines file into one chunk per `##` section (title kept as context)."""
+    lines = markdown.splitlines()
+    title = next((l.lstrip("# ").strip() for l in lines if l.startswith("# ")), "")
+    chunks, current = [], []
+    for line in lines:
+        if line.startswith("## ") and current:
+            chunks.append(current)
+            current = []
+        if not line.startswith("# "):
+            current.append(line)
+    if current:
+        chunks.append(current)
+    out = []
+    for chunk in chunks:
+        body = "\n".join(chunk).strip()
+        if body:
+            out.append(f"{title}\n{body}" if title else body)
+    return out
+
+
+class KnowledgeSnapshot:
+    """Read-only view over a built snapshot. Vectors stay on disk via mmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"Snapshot {path} has format {manifest.get('format_version')}, "
+                f"expected {SNAPSHOT_FORMAT_VERSION}. Rebuild it."
+            )
+        self.version = manifest["version"]
+        self.built_at = manifest.get("built_at")
+        self.embedder = HashingEmbedder(dim=manifest["dim"])
+        if manifest["embedder"] != self.embedder.name:
+            raise ValueError(f"Snapshot {path} uses embedder {manifest['embedder']}, expected {self.embedder.name}")
+        self.ids: list[str] = manifest["ids"]
+        self.documents: list[str] = manifest["documents"]
+        self.metadatas: list[dict] = manifest["metadatas"]
+        self.vectors = (np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+                        if self.ids else np.zeros((0, self.embedder.dim), dtype=np.float32))
+
+    @classmethod
+    def load(cls, path: str | None = None) -> "KnowledgeSnapshot | None":
+        """Returns the snapshot at `path` (or $RAG_SNAPSHOT), or None if there isn't a usable one.
+
+        A snapshot from another format or embedder is skipped with a warning rather
+        than failing start-up; retrieval then uses the mutable store alone.
+        """
+        path = path or os.environ.get("RAG_SNAPSHOT", DEFAULT_SNAPSHOT_DIR)
+        if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+            return None
+        try:
+            return cls(path)
+        except (ValueError, KeyError, OSError) as e:
+            logger.warning("Ignoring RAG snapshot: %s. Rebuild it with scripts/build_rag_snapshot.py", e)
+            return None
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def query(self, text: str, k: int, where: dict | None = None) -> dict:
+        empty = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        rows = np.fromiter((i for i, m in enumerate(self.metadatas) if matches_where(m, where)), dtype=np.int64)
+        if rows.size == 0:
+            return empty
+        q = self.embedder.embed([text])[0]
+        scores = self.vectors[rows] @ q
+        k = min(k, rows.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return {
+            "ids": [self.ids[rows[t]] for t in top],
+            "documents": [self.documents[rows[t]] for t in top],
+            "metadatas": [dict(self.metadatas[rows[t]]) for t in top],
+            "distances": [float(1.0 - scores[t]) for t in top],
+        }
+
+
+def build_snapshot(out_dir: str = DEFAULT_SNAPSHOT_DIR, guidelines_dir: str = "configs/guidelines",
+                   golden_paths: list[tuple[str, str]] | None = None,
+                   advisories: list[dict] | None = None, dim: int = 512) -> str:
+    """
+    Embeds all static knowledge into a versioned snapshot. Returns the version.
+
+    `advisories` are dicts with `artifact_type` and `content` (and optional `source`).
+    The version is a content hash, so rebuilding unchanged inputs is a no-op diff.
+    """
+    entries: list[tuple[str, str, str]] = []  # (artifact_type, content, source)
+    for artifact_type, content in golden_paths or []:
+        entries.append((artifact_type, content, "initial_seed"))
+    for path in sorted(glob.glob(os.path.join(guidelines_dir, "*.md"))):
+        with open(path, "r", encoding="utf-8") as f:
+            for chunk in chunk_guidelines(f.read()):
+                entries.append((guideline_artifact_type(path), chunk, f"guidelines:{os.path.basename(path)}"))
+    for adv in advisories or []:
+        entries.append((adv["artifact_type"], adv["content"], adv.get("source", "curated_advisory")))
+
+    seen, ids, documents, metadatas = set(), [], [], []
+    for artifact_type, content, source in entries:
+        doc_id = f"{artifact_type}_{hashlib.sha256(content.encode()).hexdigest()[:16]}"
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+        ids.append(doc_id)
+        documents.append(content)
+        metadatas.append({"artifact_type": artifact_type, "source": source, "snapshot": True})
+
+    embedder = HashingEmbedder(dim=dim)
+    vectors = embedder.embed(documents)
+    version = hashlib.sha256(
+        json.dumps([embedder.name, ids], separators=(",", ":")).encode()
+    ).hexdigest()[:12]
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name in (MANIFEST_FILE, VECTORS_FILE):
+        target = os.path.join(out_dir, name)
+        if os.path.exists(target):
+            os.chmod(target, 0o644)
+    np.save(os.path.join(out_dir, VECTORS_FILE), vectors)
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "version": version,
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "embedder": embedder.name,
+            "dim": dim,
+            "ids": ids,
+            "documents": documents,
+            "metadatas": metadatas,
+        }, f, indent=1)
+    # Shipped read-only: runtime learning goes to the mutable store, never here
+    for name in (MANIFEST_FILE, VECTORS_FILE):
+        os.chmod(os.path.join(out_dir, name), 0o444)
+    return version
@@ -0,0 +1,166 @@
+"""
+Rule-level retrieval over guidelines and Rego policies.
+
+Every bullet in configs/guidelines/<domain>-guidelines.md and every
+deny/warn rule in policies/<domain>/*.rego becomes one retrievable rule.
+Reviewers ask for the top-N rules relevant to the drafts at hand instead of
+pasting the whole (ever-growing) guidelines file into the prompt.
+
+Usage:
+    from src.engine.rule_index import retrieve_rules
+
+    guidelines = retrieve_rules(GUIDELINES_DOCKER, [draft_a, draft_b, draft_c])
+"""
+
+import glob
+import os
+import re
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.engine.vector_backends import HashingEmbedder
+
+DEFAULT_TOP_N = 12
+# Sections whose title contains one of these are always included (counted within top-N)
+PINNED_SECTION_MARKERS = ("critical",)
+
+# guidelines file domain -> policy bundle directory
+_POLICY_DIRS = {
+    "docker": "policies/docker",
+    "k8s": "policies/k8s",
+    "ci": "policies/ci",
+}
+
+_REGO_RULE_RE = re.compile(r"^(deny|warn|violation)\s+contains\s+\w+\s+if\s*\{", re.MULTILINE)
+_REGO_MSG_RE = re.compile(r'msg\s*:?=\s*(?:sprintf\(\s*)?"((?:[^"\\]|\\.)*)"')
+
+
+@dataclass
+class Rule:
+    text: str
+    source: str
+    section: str = ""
+    kind: str = "guideline"   # "guideline" | "policy"
+    pinned: bool = False
+
+    def render(self) -> str:
+        prefix = f"[{self.section}] " if self.section else ""
+        return f"- {prefix}{self.text}"
+
+
+def parse_guideline_rules(path: str) -> list[Rule]:
+    """One rule per markdown bullet, tagged with its `##` section."""
+    rules, section = [], ""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith("## "):
+                section = stripped[3:].strip()
+            elif stripped.startswith(("- ", "* ")) and len(stripped) > 2:
+                rules.append(Rule(
+                    text=stripped[2:].strip(),
+                    source=path,
+                    section=section,
+                    pinned=any(m in section.lower() for m in PINNED_SECTION_MARKERS),
+                ))
+    return rules
+
+
+def parse_rego_rules(path: str) -> list[Rule]:
+    """One rule per deny/warn block: its leading comment plus the message template."""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    rules = []
+    lines = content.splitlines()
+    for match in _REGO_RULE_RE.finditer(content):
+        kind = match.group(1)
+        line_no = content.count("\n", 0, match.start())
+        comments = []
+        i = line_no - 1
+        while i >= 0 and lines[i].strip().startswith("#"):
+            comments.insert(0, lines[i].strip().lstrip("#").strip())
+            i -= 1
+        body_end = content.find("\n}", match.end())
+        msg = _REGO_MSG_RE.search(content, match.end(), body_end if body_end != -1 else len(content))
+        message = re.sub(r"'?%[sdv]'?", "…", msg.group(1)) if msg else ""
+        description = " ".join(comments) or message
+        text = description if not message or message == description else f"{description} — {message}"
+        rules.append(Rule(
+            text=text,
+            source=path,
+            section="policy: deny" if kind in ("deny", "violation") else "policy: warn",
+            kind="policy",
+        ))
+    return rules
+
+
+class RuleIndex:
+    """In-memory embedding index over one domain's rules; rebuilt when a source file changes."""
+
+    def __init__(self, guidelines_path: str, policy_dir: str | None = None, embedder: HashingEmbedder | None = None):
+        self.guidelines_path = guidelines_path
+        self.policy_dir = policy_dir
+        self.embedder = embedder or HashingEmbedder()
+        self._fingerprint = None
+        self._lock = threading.Lock()
+        self.rules: list[Rule] = []
+        self.vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+
+    def _sources(self) -> list[str]:
+        sources = [self.guidelines_path] if os.path.exists(self.guidelines_path) else []
+        if self.policy_dir and os.path.isdir(self.policy_dir):
+            sources.extend(sorted(glob.glob(os.path.join(self.policy_dir, "**", "*.rego"), recursive=True)))
+        return sources
+
+    def refresh(self):
+        sources = self._sources()
+        fingerprint = tuple((p, os.path.getmtime(p), os.path.getsize(p)) for p in sources)
+        if fingerprint == self._fingerprint:
+            return
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return
+            rules = []
+            for path in sources:
+                rules.extend(parse_rego_rules(path) if path.endswith(".rego") else parse_guideline_rules(path))
+            self.vectors = self.embedder.embed([r.text for r in rules])
+            self.rules = rules
+            self._fingerprint = fingerprint
+
+    def top_rules(self, query: str, n: int = DEFAULT_TOP_N) -> list[Rule]:
+        self.refresh()
+        if not self.rules:
+            return []
+        pinned = [i for i, r in enumerate(self.rules) if r.pinned][:n]
+        remaining = n - len(pinned)
+        chosen = list(pinned)
+        if remaining > 0:
+            scores = self.vectors @ self.embedder.embed([query])[0]
+            scores[pinned] = -np.inf
+            order = np.argsort(-scores)
+            chosen.extend(int(i) for i in order[:remaining] if np.isfinite(scores[i]))
+        # Keep the file's own order so related rules stay grouped in the prompt
+        return [self.rules[i] for i in sorted(chosen)]
+
+
+_INDEXES: dict[str, RuleIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_rule_index(guidelines_path: str) -> RuleIndex:
+    with _INDEXES_LOCK:
+        if guidelines_path not in _INDEXES:
+            domain = os.path.basename(guidelines_path).replace("-guidelines", "").rsplit(".", 1)[0]
+            _INDEXES[guidelines_path] = RuleIndex(guidelines_path, _POLICY_DIRS.get(domain))
+        return _INDEXES[guidelines_path]
+
+
+def retrieve_rules(guidelines_path: str, drafts: list[str], n: int = DEFAULT_TOP_N) -> str:
+    """Renders the top-N rules applicable to the drafts, ready to drop into a prompt."""
+    query = "\n".join(d for d in drafts if d)
+    rules = get_rule_index(guidelines_path).top_rules(query, n)
+    if not rules:
+        return "No specific guidelines available."
+    return "\n".join(r.render() for r in rules)
@@ -1,28 +1,133 @@
-import os
 import yaml
-from src.engine.utils import run_cmd
 from src.engine.models import GeneratedFile, ValidationResult
+from src.tools.batch_validate import ToolError, hadolint_failures, run_actionlint, run_hadolint, run_kubeconform
+from src.tools.dockerfile_lint import lint_dockerfile
+from src.tools.k8s_schema import SchemaStore, get_schema_store
+from src.tools.validation_cache import ValidationCache, get_validation_cache
+from src.tools.validation_scheduler import Check, run_checks
+from src.tools.workflow_analysis import analyze_workflow
+
+# Per-validator timeouts in seconds (a tool batch covers every file of its type)
+VALIDATOR_TIMEOUTS = {"hadolint": 120.0, "kubeconform": 120.0, "actionlint": 120.0, "rules": 30.0}
+# Output file name and what is skipped, per external tool
+_TOOL_FILES = {
+    "hadolint": ("Dockerfile", "static analysis"),
+    "kubeconform": ("manifest.yaml", "strict schema validation"),
+    "actionlint": ("workflow.yml", "workflow linting"),
+}
 
 class Validator:
-    def validate(self, file: GeneratedFile) -> ValidationResult:
-        path = file.path
-        # If absolute path is short or relative, we might need to write to a temp file for some tools
-        # But for now, let's assume the validators can handle the content if passed via stdin or temp file
-        
-        filetype = self._detect_type(path)
-        errors = []
+    def __init__(self, cache: ValidationCache | None = None, kubernetes_version: str | None = None,
+                 schemas: SchemaStore | None = None, timeouts: dict[str, float] | None = None):
+        self.timeouts = {**VALIDATOR_TIMEOUTS, **(timeouts or {})}
+        # Tool findings are memoized per content + tool binary, so unchanged files are never re-run
+        self.cache = cache if cache is not None else get_validation_cache()
+        # Local schema cache: in-process schema checks and an offline kubeconform
+        self.schemas = schemas if schemas is not None else get_schema_store(kubernetes_version)
+
+    def validate(self, file: GeneratedFile, fail_fast: bool = False) -> ValidationResult:
+        return self.validate_many([file], fail_fast)[0]
+
+    def validate_many(self, files: list[GeneratedFile], fail_fast: bool = False) -> list[ValidationResult]:
+        """
+        Validates a batch: one hadolint and one kubeconform process for all files, results in input order.
+
+        The validators are independent, so they run concurrently, each under
+        its own timeout. With fail_fast the run stops at the first error
+        (pass/fail pre-screening); files whose checks were cut short are
+        reported as failed rather than assumed clean.
+        """
+        types = [self._detect_type(f.path) for f in files]
+        errors: list[list[str]] = [[] for _ in files]
+        for file, filetype in zip(files, types):
+            if filetype is None:
+                print(f"⚠️  No valid validator for {file.path}")
+
+        def indexes(kind):
+            return [i for i, t in enumerate(types) if t == kind]
+
+        docker, k8s, gha = indexes("docker"), indexes("k8s"), indexes("gha")
+        plan = []  # (check, file indexes it covers)
+        if docker:
+            plan.append((Check("hadolint", lambda: self._check_dockerfiles({i: files[i].content for i in docker}),
+                               self.timeouts["hadolint"]), docker))
+        if k8s:
+            plan.append((Check("kubeconform", lambda: self._check_manifests({i: files[i].content for i in k8s}),
+                               self.timeouts["kubeconform"]), k8s))
+            plan.append((Check("k8s-rules", lambda: {i: self._k8s_rules(files[i]) for i in k8s},
+                               self.timeouts["rules"]), k8s))
+        if gha:
+            plan.append((Check("actionlint", lambda: self._run_batch(
+                "actionlint", run_actionlint, {i: files[i].content for i in gha}), self.timeouts["actionlint"]), gha))
+            plan.append((Check("gha-rules", lambda: {i: self._validate_github_actions(files[i]) for i in gha},
+                               self.timeouts["rules"]), gha))
+
+        stop_when = (lambda found: any(found.values())) if fail_fast else None
+        outcomes = run_checks([check for check, _ in plan], stop_when)
+        for (check, covered), outcome in zip(plan, outcomes):
+            if outcome.ok:
+                for i, errs in outcome.value.items():
+                    errors[i].extend(errs)
+            elif outcome.timed_out:
+                for i in covered:
+                    errors[i].append(f"{check.name.upper()} TIMEOUT: no result within {check.timeout:g}s")
+            elif outcome.error is not None:
+                for i in covered:
+                    errors[i].append(f"{check.name.upper()} ERROR:\n{outcome.error}")
+
+        stopped = {i for (_, covered), outcome in zip(plan, outcomes) if outcome.skipped for i in covered}
+        for i in stopped:
+            if not errors[i]:
+                errors[i].append("VALIDATION INCOMPLETE: stopped at the first error (fail_fast)")
+        return [ValidationResult(len(errs) == 0, errs) for errs in errors]
+
+    def _check_dockerfiles(self, items: dict[int, str]) -> dict[int, list[str]]:
+        """Built-in lint first; hadolint only gates the Dockerfiles that pass it."""
+        errors: dict[int, list[str]] = {i: [] for i in items}
+        clean = {}
+        for i, content in items.items():
+            found = lint_dockerfile(content)
+            if found:
+                errors[i].append("DOCKERFILE LINT ERROR:\n" + "\n".join(x.format("Dockerfile") for x in found))
+            else:
+                clean[i] = content
+        for i, errs in self._run_batch("hadolint", run_hadolint, clean).items():
+            errors[i].extend(errs)
+        return errors
 
-        if filetype == "docker":
-            errors = self._validate_dockerfile(file)
-        elif filetype == "k8s":
-            errors = self._validate_k8s(file)
-        elif filetype == "gha":
-            errors = self._validate_github_actions(file)
-        else:
-            print(f"⚠️  No valid validator for {path}")
-            return ValidationResult(True, [])
+    def _check_manifests(self, items: dict[int, str]) -> dict[int, list[str]]:
+        """Offline schema check first; kubeconform only gates the manifests that pass it."""
+        errors: dict[int, list[str]] = {i: [] for i in items}
+        clean = {}
+        for i, content in items.items():
+            found = self.schemas.validate(content) if self.schemas.available else []
+            if found:
+                errors[i].append("K8S SCHEMA ERROR:\n" + "\n".join(x.format("manifest.yaml") for x in found))
+            else:
+                clean[i] = content
+        kube_args = self.schemas.kubeconform_args() if self.schemas.available else ()
+        for i, errs in self._run_batch("kubeconform", run_kubeconform, clean, kube_args).items():
+            errors[i].extend(errs)
+        return errors
 
-        return ValidationResult(len(errors) == 0, errors)
+    def _run_batch(self, tool: str, runner, items: dict[int, str],
+                   extra_args: tuple[str, ...] = ()) -> dict[int, list[str]]:
+        """{index: error strings} from one run of `tool` over every item; {} when it isn't installed."""
+        if not items:
+            return {}
+        try:
+            kwargs = {"extra_args": extra_args} if extra_args else {}
+            findings = self.cache.run_batch(tool, tool, items, runner, *extra_args, **kwargs)
+        except ToolError as e:
+            return {i: [f"{tool.upper()} ERROR:\n{e}"] for i in items}
+        filename, what = _TOOL_FILES[tool]
+        if findings is None:
+            print(f"⚠️  {tool} not installed. Skipping {what}.")
+            return {}
+        if tool == "hadolint":
+            findings = {i: hadolint_failures(found) for i, found in findings.items()}
+        return {i: [f"{tool.upper()} ERROR:\n" + "\n".join(f.format(filename) for f in found)]
+                for i, found in findings.items() if found}
 
     def _detect_type(self, path: str):
         if path.endswith("Dockerfile"):
@@ -33,44 +138,9 @@ class Validator:
             return "k8s"
         return None
 
-    def _validate_dockerfile(self, file: GeneratedFile) -> list[str]:
+    def _k8s_rules(self, file: GeneratedFile) -> list[str]:
+        """Custom rules on top of the schema check."""
         errors = []
-        # 1. hadolint (via stdin)
-        code, out, err = run_cmd(["hadolint", "-"])
-        # We need to pipe the content. run_cmd doesn't support pipe yet in its simple form.
-        # Let's fix run_cmd logic or use a temp file.
-        
-        tmp_path = f"/tmp/hadolint_{os.getpid()}"
-        with open(tmp_path, "w") as f:
-            f.write(file.content)
-        
-        code, out, err = run_cmd(["hadolint", tmp_path])
-        if code != 0:
-            if "No such file or directory" in err or "not found" in err:
-                print("⚠️  hadolint not installed. Skipping static analysis.")
-            else:
-                errors.append(f"HADOLINT ERROR:\n{out or err}")
-        
-        # 2. docker build (dry run / check) - too slow for local loop usually without a daemon
-        # skip for now unless specifically requested.
-        
-        os.remove(tmp_path)
-        return errors
-
-    def _validate_k8s(self, file: GeneratedFile) -> list[str]:
-        errors = []
-        tmp_path = f"/tmp/k8s_{os.getpid()}.yaml"
-        with open(tmp_path, "w") as f:
-            f.write(file.content)
-
-        code, out, err = run_cmd(["kubeconform", "-strict", tmp_path])
-        if code != 0:
-            if "No such file or directory" in err or "not found" in err:
-                print("⚠️  kubeconform not installed. Skipping strict schema validation.")
-            else:
-                errors.append(f"KUBECONFORM ERROR:\n{out or err}")
-
-        # Custom rules
         try:
             docs = list(yaml.safe_load_all(file.content))
             for doc in docs:
@@ -89,11 +159,10 @@ class Validator:
                         errors.append("Pod securityContext.runAsNonRoot missing or not true")
         except Exception as e:
             errors.append(f"YAML PARSE ERROR: {str(e)}")
-
-        os.remove(tmp_path)
         return errors
 
     def _validate_github_actions(self, file: GeneratedFile) -> list[str]:
+        """Structure rules plus the job graph: `needs` cycles and unknown jobs fail the workflow."""
         errors = []
         try:
             workflow = yaml.safe_load(file.content)
@@ -106,9 +175,7 @@ class Validator:
                 for step in steps:
                     if "run" in step and "uses" in step:
                         errors.append(f"Step in job '{job_name}' contains both 'run' and 'uses'")
-                
-                # Check if needs is inside steps (shouldn't be possible to parse easily if it is, but let's check)
-                # needs is a job-level key. If it's in steps, it shouldn't even be there.
+            errors.extend(analyze_workflow(workflow).errors())
         except Exception as e:
             errors.append(f"GHA YAML PARSE ERROR: {str(e)}")
             
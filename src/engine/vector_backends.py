@@ -0,0 +1,428 @@
+"""
+Vector storage backends for the RAG store.
+
+Two implementations sit behind the same small interface:
+
+- ChromaBackend: chromadb PersistentClient + its default ONNX embedding model.
+- NumpyBackend: a memory-mapped float32 matrix with a local hashing embedder.
+  No model download, no native deps beyond numpy; loads in milliseconds.
+
+Select with RAGStore(backend="numpy") or RAG_BACKEND=numpy.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+DEFAULT_DB_PATHS = {
+    "chroma": ".chroma_db",
+    "numpy": ".rag_index",
+}
+
+
+def matches_where(metadata: dict, where: dict | None) -> bool:
+    if not where:
+        return True
+    return all(metadata.get(k) == v for k, v in where.items())
+
+
+# ─── Local embedding ───────────────────────────────────────────────
+
+
+class HashingEmbedder:
+    """
+    Feature-hashed bag of unigrams + bigrams with sublinear TF weighting.
+
+    Deterministic across processes (uses blake2b, not hash()), so vectors
+    written at build time stay comparable with queries embedded at runtime.
+    """
+
+    # Keeps image refs and versions whole ("node:20-alpine", "3.11") but drops trailing punctuation
+    _TOKEN_RE = re.compile(r"[a-z0-9_@/\-]+(?:[.:][a-z0-9_@/\-]+)*")
+    _SPLIT_RE = re.compile(r"[.:/@\-]")
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        # Bump the version whenever tokenization changes: vectors from another scheme are not comparable
+        self.name = f"hashing-tf-v2-{dim}"
+
+    def _bucket(self, token: str) -> tuple[int, float]:
+        h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+        return h % self.dim, (1.0 if (h >> 63) & 1 else -1.0)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = self._TOKEN_RE.findall(text.lower())
+            counts: dict[str, int] = {}
+            for tok in tokens:
+                counts[tok] = counts.get(tok, 0) + 1
+                # Compound tokens also count their parts, so "node:latest" matches ":latest" rules
+                if self._SPLIT_RE.search(tok):
+                    for part in self._SPLIT_RE.split(tok):
+                        if part:
+                            counts[part] = counts.get(part, 0) + 1
+            for a, b in zip(tokens, tokens[1:]):
+                bigram = f"{a} {b}"
+                counts[bigram] = counts.get(bigram, 0) + 1
+            for tok, n in counts.items():
+                idx, sign = self._bucket(tok)
+                out[row, idx] += sign * (1.0 + np.log(n))
+            norm = np.linalg.norm(out[row])
+            if norm:
+                out[row] /= norm
+        return out
+
+
+# ─── Interface ─────────────────────────────────────────────────────
+
+
+class VectorBackend(ABC):
+    """Minimal storage contract RAGStore relies on. Results mirror chromadb's shapes."""
+
+    @abstractmethod
+    def add(self, ids: list[str], documents: list[str], metadatas: list[dict],
+            embeddings: list | None = None) -> None: ...
+
+    @abstractmethod
+    def query(self, text: str, k: int, where: dict | None = None) -> dict:
+        """Returns {"ids": [...], "documents": [...], "metadatas": [...], "distances": [...]}."""
+
+    @abstractmethod
+    def get(self, ids: list[str] | None = None, include_embeddings: bool = False) -> dict: ...
+
+    @abstractmethod
+    def update(self, ids: list[str], metadatas: list[dict]) -> None: ...
+
+    @abstractmethod
+    def count(self) -> int: ...
+
+    @abstractmethod
+    def replace_all(self, ids: list[str], documents: list[str], metadatas: list[dict],
+                    embeddings: list) -> None:
+        """Atomically swap the whole store for the given entries (used by compaction)."""
+
+
+def _write_atomic(path: str, text: str):
+    """Replace `path` with `text` in one rename; readers see the old or the new file, never a mix."""
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# ─── Chroma ────────────────────────────────────────────────────────
+
+
+class ChromaBackend(VectorBackend):
+    """
+    chromadb collection. Compaction builds a new, versioned collection and
+    then flips <db_path>/<collection>.active to name it; that one file rename
+    is the swap, so a crash at any point leaves a complete collection live.
+    """
+
+    def __init__(self, db_path: str, collection_name: str):
+        import chromadb
+        from chromadb.config import Settings
+
+        self.collection_name = collection_name
+        self.pointer_path = os.path.join(db_path, f"{collection_name}.active")
+        self.client = chromadb.PersistentClient(path=db_path, settings=Settings(allow_reset=True))
+        self.collection = self.client.get_or_create_collection(
+            name=self._active_name(),
+            metadata={"hnsw:space": "cosine"}
+        )
+
+    def _active_name(self) -> str:
+        try:
+            with open(self.pointer_path, "r", encoding="utf-8") as f:
+                return f.read().strip() or self.collection_name
+        except OSError:
+            return self.collection_name
+
+    def add(self, ids, documents, metadatas, embeddings=None):
+        kwargs = {"ids": ids, "documents": documents, "metadatas": metadatas}
+        if embeddings is not None:
+            kwargs["embeddings"] = [list(map(float, e)) for e in embeddings]
+        self.collection.add(**kwargs)
+
+    def query(self, text, k, where=None):
+        results = self.collection.query(query_texts=[text], n_results=k, where=where or None)
+        if not results["ids"] or not results["ids"][0]:
+            return {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        return {
+            "ids": list(results["ids"][0]),
+            "documents": list(results["documents"][0]),
+            "metadatas": list(results["metadatas"][0]),
+            "distances": list(results["distances"][0]) if results.get("distances") else [],
+        }
+
+    def get(self, ids=None, include_embeddings=False):
+        include = ["documents", "metadatas"] + (["embeddings"] if include_embeddings else [])
+        data = self.collection.get(ids=ids, include=include)
+        out = {"ids": list(data["ids"]), "documents": list(data["documents"]),
+               "metadatas": list(data["metadatas"])}
+        if include_embeddings:
+            out["embeddings"] = [np.asarray(e, dtype=np.float32) for e in data["embeddings"]]
+        return out
+
+    def update(self, ids, metadatas):
+        self.collection.update(ids=ids, metadatas=metadatas)
+
+    def count(self):
+        return self.collection.count()
+
+    def replace_all(self, ids, documents, metadatas, embeddings, batch_size: int = 500):
+        # Build the new version beside the live one; the pointer rename below is the swap
+        previous = self.collection.name
+        staging = self.client.create_collection(name=f"{self.collection_name}-{uuid.uuid4().hex[:12]}",
+                                                metadata={"hnsw:space": "cosine"})
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            staging.add(
+                ids=ids[start:end],
+                documents=documents[start:end],
+                metadatas=metadatas[start:end],
+                embeddings=[list(map(float, e)) for e in embeddings[start:end]],
+            )
+        _write_atomic(self.pointer_path, staging.name)
+        self.collection = staging
+        try:
+            self.client.delete_collection(previous)
+        except Exception:
+            pass  # an unreferenced old version only costs disk space
+
+
+# ─── NumPy ─────────────────────────────────────────────────────────
+
+
+_PATH_LOCKS: dict[str, threading.Lock] = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_for(path: str) -> threading.Lock:
+    with _PATH_LOCKS_GUARD:
+        return _PATH_LOCKS.setdefault(os.path.abspath(path), threading.Lock())
+
+
+class NumpyBackend(VectorBackend):
+    """
+    Brute-force cosine search over an (N, dim) float32 matrix.
+
+    On disk: <db_path>/<collection>.json (ids, documents, metadata and the
+    name of its vectors file) and that versioned <collection>.<version>.npy
+    (memory-mapped on load). A write saves a new vectors file, then renames
+    the sidecar into place; that single rename is the commit, so readers and
+    crashes only ever see a complete old or new index.
+    Metadata-only updates (usage stats on every retrieval) are appended to
+    <db_path>/<collection>.log.jsonl and folded into the sidecar on the next
+    full write, so a retrieval never rewrites the whole index.
+    Exact search is fast enough for the knowledge-base sizes we run (≤100k).
+    """
+
+    def __init__(self, db_path: str, collection_name: str, embedder: HashingEmbedder | None = None):
+        self.embedder = embedder or HashingEmbedder()
+        os.makedirs(db_path, exist_ok=True)
+        self.db_path = db_path
+        self.collection_name = collection_name
+        # Pre-versioning indexes kept their vectors here; the sidecar names the current file
+        self.vectors_path = os.path.join(db_path, f"{collection_name}.npy")
+        self.entries_path = os.path.join(db_path, f"{collection_name}.json")
+        self.log_path = os.path.join(db_path, f"{collection_name}.log.jsonl")
+        self._lock = _lock_for(self.entries_path)
+        self._loaded_mtime = None
+        self._load()
+
+    def _load(self):
+        self.ids: list[str] = []
+        self.documents: list[str] = []
+        self.metadatas: list[dict] = []
+        self.vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._positions = None
+        self._log_offset = 0
+        for attempt in range(3):
+            if not os.path.exists(self.entries_path):
+                return
+            with open(self.entries_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            mtime = os.path.getmtime(self.entries_path)
+            if data.get("embedder") != self.embedder.name:
+                raise ValueError(
+                    f"Index at {self.entries_path} was built with {data.get('embedder')}, "
+                    f"not {self.embedder.name}. Rebuild it or pass the matching embedder."
+                )
+            if data.get("vectors"):
+                self.vectors_path = os.path.join(self.db_path, data["vectors"])
+            try:
+                vectors = np.load(self.vectors_path, mmap_mode="r") if data["ids"] else self.vectors
+                break
+            except FileNotFoundError:
+                if attempt == 2:
+                    raise
+                # A writer committed a newer sidecar and removed our vectors file; read again
+        self.ids = data["ids"]
+        self.documents = data["documents"]
+        self.metadatas = data["metadatas"]
+        self.vectors = vectors
+        self._loaded_mtime = mtime
+        self._replay_log()
+
+    def _replay_log(self):
+        """Applies metadata updates appended since `_log_offset`."""
+        if not os.path.exists(self.log_path):
+            self._log_offset = 0
+            return
+        with open(self.log_path, "rb") as f:
+            f.seek(self._log_offset)
+            chunk = f.read()
+        # Only consume complete lines; a concurrent writer may be mid-append
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        pos = self._position()
+        for line in complete.decode("utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("id") in pos:
+                row = pos[entry["id"]]
+                self.metadatas[row] = {**self.metadatas[row], **entry.get("metadata", {})}
+        self._log_offset += len(complete)
+
+    def _refresh(self):
+        """Pick up writes made by other RAGStore instances since we loaded."""
+        if os.path.exists(self.entries_path) and os.path.getmtime(self.entries_path) != self._loaded_mtime:
+            self._load()
+        elif os.path.exists(self.log_path) and os.path.getsize(self.log_path) != self._log_offset:
+            self._replay_log()
+
+    def _persist(self):
+        previous = self.vectors_path
+        vectors_file = f"{self.collection_name}.{uuid.uuid4().hex[:12]}.npy"
+        self.vectors_path = os.path.join(self.db_path, vectors_file)
+        np.save(self.vectors_path, np.ascontiguousarray(self.vectors, dtype=np.float32))
+        # The commit point: until this rename, readers keep using the old sidecar and its vectors
+        _write_atomic(self.entries_path, json.dumps({
+            "embedder": self.embedder.name,
+            "vectors": vectors_file,
+            "ids": self.ids,
+            "documents": self.documents,
+            "metadatas": self.metadatas,
+        }))
+        self._loaded_mtime = os.path.getmtime(self.entries_path)
+        try:
+            os.remove(previous)
+        except OSError:
+            pass  # never written, or still mapped by a reader on a platform that forbids removal
+        # The sidecar now includes every logged update
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self._log_offset = 0
+        # Re-map the file we just wrote instead of holding the in-memory copy
+        self.vectors = np.load(self.vectors_path, mmap_mode="r") if self.ids else self.vectors
+
+    def _position(self) -> dict[str, int]:
+        if getattr(self, "_positions", None) is None:
+            self._positions = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        return self._positions
+
+    def add(self, ids, documents, metadatas, embeddings=None):
+        with self._lock:
+            self._refresh()
+            known = self._position()
+            fresh = [i for i, doc_id in enumerate(ids) if doc_id not in known]
+            if not fresh:
+                return
+            if embeddings is None:
+                new_vecs = self.embedder.embed([documents[i] for i in fresh])
+            else:
+                new_vecs = np.asarray([embeddings[i] for i in fresh], dtype=np.float32)
+            self.ids = self.ids + [ids[i] for i in fresh]
+            self.documents = self.documents + [documents[i] for i in fresh]
+            self.metadatas = self.metadatas + [dict(metadatas[i]) for i in fresh]
+            self.vectors = np.vstack([np.asarray(self.vectors), new_vecs])
+            self._positions = None
+            self._persist()
+
+    def query(self, text, k, where=None):
+        self._refresh()
+        empty = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        if not self.ids:
+            return empty
+        candidates = np.fromiter(
+            (i for i, m in enumerate(self.metadatas) if matches_where(m, where)), dtype=np.int64
+        )
+        if candidates.size == 0:
+            return empty
+        q = self.embedder.embed([text])[0]
+        scores = self.vectors[candidates] @ q if candidates.size < len(self.ids) else self.vectors @ q
+        k = min(k, candidates.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = candidates[top]
+        return {
+            "ids": [self.ids[r] for r in rows],
+            "documents": [self.documents[r] for r in rows],
+            "metadatas": [dict(self.metadatas[r]) for r in rows],
+            "distances": [float(1.0 - scores[t]) for t in top],
+        }
+
+    def get(self, ids=None, include_embeddings=False):
+        self._refresh()
+        if ids is None:
+            rows = list(range(len(self.ids)))
+        else:
+            pos = self._position()
+            rows = [pos[i] for i in ids if i in pos]
+        out = {
+            "ids": [self.ids[r] for r in rows],
+            "documents": [self.documents[r] for r in rows],
+            "metadatas": [dict(self.metadatas[r]) for r in rows],
+        }
+        if include_embeddings:
+            out["embeddings"] = [np.array(self.vectors[r], dtype=np.float32) for r in rows]
+        return out
+
+    def update(self, ids, metadatas):
+        with self._lock:
+            self._refresh()
+            pos = self._position()
+            lines = []
+            for doc_id, meta in zip(ids, metadatas):
+                if doc_id in pos:
+                    self.metadatas[pos[doc_id]] = {**self.metadatas[pos[doc_id]], **meta}
+                    lines.append(json.dumps({"id": doc_id, "metadata": meta}) + "\n")
+            if not lines:
+                return
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+            self._log_offset = os.path.getsize(self.log_path)
+
+    def count(self):
+        self._refresh()
+        return len(self.ids)
+
+    def replace_all(self, ids, documents, metadatas, embeddings):
+        with self._lock:
+            self.ids = list(ids)
+            self.documents = list(documents)
+            self.metadatas = [dict(m) for m in metadatas]
+            self.vectors = (np.asarray(embeddings, dtype=np.float32).reshape(len(ids), self.embedder.dim)
+                            if ids else np.zeros((0, self.embedder.dim), dtype=np.float32))
+            self._positions = None
+            self._persist()
+
+
+def create_backend(name: str, db_path: str | None, collection_name: str) -> VectorBackend:
+    name = name.lower()
+    if name not in DEFAULT_DB_PATHS:
+        raise ValueError(f"Unknown RAG backend '{name}'. Choose from: {', '.join(DEFAULT_DB_PATHS)}")
+    db_path = db_path or DEFAULT_DB_PATHS[name]
+    if name == "chroma":
+        return ChromaBackend(db_path, collection_name)
+    return NumpyBackend(db_path, collection_name)
@@ -0,0 +1,99 @@
+"""
+Precompiled policy bundles.
+
+`opa build` compiles a policy directory ahead of time into a bundle
+(policy + optimized plan, -O=1 with the deny/warn entrypoints), so the
+resident OPA server starts from the artifact instead of parsing and
+compiling every .rego file at startup. scripts/build_policy_bundles.py
+writes one bundle per directory under policies/ plus an index.json that
+records each bundle's source hash (same hash the validation cache uses).
+
+At startup the engine serves a directory from its bundle only when the
+recorded hash matches the policies on disk; an edited policy falls back to
+the directory (with --watch) and a warning to rebuild, so a stale artifact
+is never evaluated.
+
+POLICY_BUNDLE_DIR sets the artifact directory (default build/policy-bundles).
+
+Usage:
+    from src.policy.bundle import BundleIndex
+
+    bundle = BundleIndex().bundle_for("policies/docker")   # path to docker.tar.gz, or None
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import threading
+
+from src.tools.validation_cache import bundle_hash
+
+logger = logging.getLogger("devops-agent.policy")
+
+DEFAULT_BUNDLE_DIR = "build/policy-bundles"
+BUNDLE_ENTRYPOINTS = ("main/deny", "main/warn")
+INDEX_FILE = "index.json"
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def bundle_directory(directory: str | None = None) -> str:
+    directory = directory or os.getenv("POLICY_BUNDLE_DIR", DEFAULT_BUNDLE_DIR)
+    return directory if os.path.isabs(directory) else os.path.join(_REPO_ROOT, directory)
+
+
+def _sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_bundle(binary: str, policy_dir: str, out_dir: str, name: str | None = None) -> dict:
+    """Compile `policy_dir` with `opa build`; returns its index entry."""
+    name = name or os.path.basename(os.path.normpath(policy_dir))
+    os.makedirs(out_dir, exist_ok=True)
+    target = os.path.join(out_dir, f"{name}.tar.gz")
+    cmd = [binary, "build", "-O", "1", *(arg for e in BUNDLE_ENTRYPOINTS for arg in ("-e", e)),
+           "-o", target, policy_dir]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"opa build {policy_dir} failed: {(result.stderr or result.stdout).strip()[:500]}")
+    return {"bundle": os.path.basename(target), "sha256": _sha256(target), "source_hash": bundle_hash(policy_dir)}
+
+
+class BundleIndex:
+    """The bundles listed in <bundle dir>/index.json (keyed by policy directory name), read once."""
+
+    def __init__(self, directory: str | None = None):
+        self.directory = bundle_directory(directory)
+        self._entries: dict[str, dict] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> dict[str, dict]:
+        with self._lock:
+            if self._entries is None:
+                try:
+                    with open(os.path.join(self.directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                        self._entries = json.load(f).get("bundles", {})
+                except (OSError, ValueError, AttributeError):
+                    self._entries = {}
+            return self._entries
+
+    def bundle_for(self, policy_dir: str) -> str | None:
+        """Path of an up-to-date bundle for `policy_dir`, or None (missing, stale or corrupt)."""
+        entry = self.entries.get(os.path.basename(os.path.realpath(policy_dir)))
+        if not entry:
+            return None
+        path = os.path.join(self.directory, entry.get("bundle", ""))
+        if not os.path.isfile(path):
+            return None
+        # The content hash, not the path, decides: a bundle built in another checkout is fine if identical
+        if entry.get("source_hash") != bundle_hash(policy_dir):
+            logger.warning("Policy bundle %s is stale (policies changed); serving %s directly. "
+                           "Rebuild with scripts/build_policy_bundles.py", path, policy_dir)
+            return None
+        if entry.get("sha256") != _sha256(path):
+            logger.warning("Policy bundle %s does not match its index; ignoring it", path)
+            return None
+        return path
@@ -0,0 +1,353 @@
+"""
+Policy documents — generated files parsed once into a typed model.
+
+A Dockerfile becomes a list of `Instruction`s (continuations joined,
+comments dropped, stages numbered). YAML is composed once so every value
+keeps its source line; Kubernetes documents are exposed as `Manifest`s
+with their `Container`s, and GitHub workflows as `Workflow`s with their
+`Step`s. Built-in rules (src/policy/rules.py) visit this model, and
+`inputs()` renders it in the shapes conftest hands Rego policies:
+
+- Dockerfile: [{"Cmd": "from", "Flags": [...], "Value": [...], "Original": ..., "Stage": n, "SubCmd": "", "JSON": bool}]
+- YAML: one document per `---` section, with YAML 1.2 scalars
+  (`on:` stays a string key, dates stay strings) as conftest's Go parser does.
+
+Usage:
+    from src.policy.documents import parse_document
+
+    doc = parse_document(manifest_yaml, "manifest.yaml")
+    for manifest in doc.manifests:
+        for container in manifest.containers:
+            print(container.name, container.line)
+"""
+
+import json
+import re
+import shlex
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import yaml
+
+from src.tools.workflow_analysis import WorkflowAnalysis, analyze_workflow
+
+# Instructions whose arguments buildkit keeps as one shell string (or a JSON array)
+_SHELL_FORM = {"run", "cmd", "entrypoint", "shell"}
+_KEY_VALUE = {"env", "label"}
+_CONTINUATION = re.compile(r"\\\s*$")
+
+# Where each workload kind keeps its pod spec
+POD_SPEC_PATHS = {
+    "Pod": ("spec",),
+    "Deployment": ("spec", "template", "spec"),
+    "StatefulSet": ("spec", "template", "spec"),
+    "DaemonSet": ("spec", "template", "spec"),
+    "ReplicaSet": ("spec", "template", "spec"),
+    "Job": ("spec", "template", "spec"),
+    "CronJob": ("spec", "jobTemplate", "spec", "template", "spec"),
+}
+
+
+# ─── Dockerfile ──────────────────────────────────────────────────
+
+@dataclass
+class Instruction:
+    cmd: str                # lower-case keyword: "from", "run", ...
+    value: list[str]
+    line: int               # first source line (1-based)
+    original: str
+    stage: int = 0
+    flags: list[str] = field(default_factory=list)
+    sub_cmd: str = ""       # keyword after ONBUILD
+    json: bool = False      # exec (JSON array) form
+
+    def to_input(self) -> dict:
+        return {"Cmd": self.cmd, "SubCmd": self.sub_cmd, "Flags": self.flags, "Value": self.value,
+                "Original": self.original, "Stage": self.stage, "JSON": self.json}
+
+
+@dataclass
+class Dockerfile:
+    instructions: list[Instruction]
+
+    @property
+    def stage_count(self) -> int:
+        return max((i.stage for i in self.instructions), default=-1) + 1
+
+    @property
+    def stage_names(self) -> set[str]:
+        """`AS` names of all stages, lower-cased."""
+        return {i.value[2].lower() for i in self.instructions
+                if i.cmd == "from" and len(i.value) >= 3 and i.value[1].lower() == "as"}
+
+
+def _logical_lines(content: str):
+    """(first line number, instruction text) with backslash continuations joined and comments dropped."""
+    buf: list[str] = []
+    start = 0
+    for lineno, raw in enumerate(content.splitlines(), 1):
+        stripped = raw.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if not buf:
+            start = lineno
+        if _CONTINUATION.search(raw):
+            buf.append(_CONTINUATION.sub("", raw).strip())
+            continue
+        buf.append(stripped)
+        yield start, " ".join(p for p in buf if p)
+        buf = []
+    if buf:
+        yield start, " ".join(p for p in buf if p)
+
+
+def _split_flags(rest: str) -> tuple[list[str], str]:
+    flags = []
+    while rest.startswith("--"):
+        flag, _, rest = rest.partition(" ")
+        flags.append(flag)
+        rest = rest.lstrip()
+    return flags, rest
+
+
+def _json_array(rest: str) -> list[str] | None:
+    if not rest.startswith("["):
+        return None
+    try:
+        value = json.loads(rest)
+    except json.JSONDecodeError:
+        return None
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return value
+    return None
+
+
+def _key_values(rest: str) -> list[str]:
+    try:
+        words = shlex.split(rest)
+    except ValueError:
+        words = rest.split()
+    if words and "=" not in words[0]:
+        # Legacy `ENV KEY value with spaces`
+        return [words[0], rest[len(rest.split(None, 1)[0]):].strip()]
+    out = []
+    for word in words:
+        key, _, value = word.partition("=")
+        out.extend([key, value])
+    return out
+
+
+def parse_dockerfile(content: str) -> Dockerfile:
+    instructions = []
+    stage = -1
+    for lineno, line in _logical_lines(content):
+        word, _, rest = line.partition(" ")
+        cmd = word.lower()
+        rest = rest.strip()
+        sub_cmd = ""
+        if cmd == "onbuild":
+            word, _, rest = rest.partition(" ")
+            sub_cmd, rest = word.lower(), rest.strip()
+        flags, rest = _split_flags(rest)
+        if cmd == "from":
+            stage += 1
+
+        as_json = _json_array(rest)
+        if as_json is not None:
+            value = as_json
+        elif cmd in _SHELL_FORM or sub_cmd in _SHELL_FORM:
+            value = [rest] if rest else []
+        elif cmd in _KEY_VALUE:
+            value = _key_values(rest)
+        elif cmd == "healthcheck":
+            value = rest.split(None, 1)
+        else:
+            value = rest.split()
+
+        instructions.append(Instruction(cmd, value, lineno, line, max(stage, 0), flags, sub_cmd,
+                                        as_json is not None))
+    return Dockerfile(instructions)
+
+
+# ─── YAML ────────────────────────────────────────────────────────
+
+class _Yaml12Loader(yaml.SafeLoader):
+    """SafeLoader with YAML 1.2 booleans and no timestamp conversion."""
+
+
+_Yaml12Loader.yaml_implicit_resolvers = {
+    first: [(tag, rx) for tag, rx in resolvers
+            if tag not in ("tag:yaml.org,2002:bool", "tag:yaml.org,2002:timestamp")]
+    for first, resolvers in yaml.SafeLoader.yaml_implicit_resolvers.items()
+}
+_Yaml12Loader.add_implicit_resolver(
+    "tag:yaml.org,2002:bool", re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"), list("tTfF"),
+)
+
+
+class YamlDocument:
+    """One YAML document: the plain data plus its node tree for line lookups."""
+
+    def __init__(self, data, node: yaml.Node):
+        self.data = data
+        self._node = node
+
+    def line(self, *path) -> int:
+        """1-based line of the value at `path` (mapping keys / sequence indexes), or of its nearest parent."""
+        node = self._node
+        for step in path:
+            child = None
+            if isinstance(node, yaml.MappingNode):
+                child = next((v for k, v in node.value if k.value == step), None)
+            elif isinstance(node, yaml.SequenceNode) and isinstance(step, int) and step < len(node.value):
+                child = node.value[step]
+            if child is None:
+                break
+            node = child
+        return node.start_mark.line + 1
+
+
+def load_yaml(content: str) -> list[YamlDocument]:
+    """All non-empty documents in a (multi-document) YAML string."""
+    loader = _Yaml12Loader(content)
+    docs = []
+    try:
+        while loader.check_node():
+            node = loader.get_node()
+            data = loader.construct_document(node)
+            if data is not None:
+                docs.append(YamlDocument(data, node))
+    finally:
+        loader.dispose()
+    return docs
+
+
+def _get(data, *path):
+    for step in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(step)
+    return data
+
+
+# ─── Kubernetes ──────────────────────────────────────────────────
+
+@dataclass
+class Container:
+    name: str
+    image: str
+    spec: dict
+    line: int
+
+
+@dataclass
+class Manifest:
+    doc: YamlDocument
+    kind: str
+    name: str
+    namespace: str | None
+    containers: list[Container]
+
+    @property
+    def ref(self) -> str:
+        return f"{self.kind}/{self.name}" if self.name else self.kind
+
+    @classmethod
+    def from_doc(cls, doc: YamlDocument) -> "Manifest":
+        data = doc.data
+        kind = str(data.get("kind", ""))
+        containers = []
+        pod_path = POD_SPEC_PATHS.get(kind)
+        items = _get(data, *pod_path, "containers") if pod_path else None
+        for idx, spec in enumerate(items if isinstance(items, list) else []):
+            if isinstance(spec, dict):
+                containers.append(Container(str(spec.get("name", f"#{idx}")), str(spec.get("image", "")),
+                                            spec, doc.line(*pod_path, "containers", idx)))
+        namespace = _get(data, "metadata", "namespace")
+        return cls(doc, kind, str(_get(data, "metadata", "name") or ""),
+                   None if namespace is None else str(namespace), containers)
+
+
+# ─── GitHub workflows ────────────────────────────────────────────
+
+@dataclass
+class Step:
+    job: str
+    index: int
+    name: str
+    uses: str
+    line: int
+
+
+@dataclass
+class Workflow:
+    doc: YamlDocument
+    triggers: list[str]
+    steps: list[Step]   # job-level `uses:` (reusable workflows) appear as index -1
+
+    @classmethod
+    def from_doc(cls, doc: YamlDocument) -> "Workflow":
+        data = doc.data
+        on = data.get("on")
+        if isinstance(on, str):
+            triggers = [on]
+        elif isinstance(on, list):
+            triggers = [str(t) for t in on]
+        elif isinstance(on, dict):
+            triggers = [str(t) for t in on]
+        else:
+            triggers = []
+
+        steps = []
+        jobs = data.get("jobs")
+        for job_name, job in (jobs.items() if isinstance(jobs, dict) else ()):
+            if not isinstance(job, dict):
+                continue
+            if isinstance(job.get("uses"), str):
+                steps.append(Step(job_name, -1, job_name, job["uses"], doc.line("jobs", job_name, "uses")))
+            for idx, step in enumerate(job.get("steps") or []):
+                if isinstance(step, dict):
+                    uses = step.get("uses")
+                    steps.append(Step(job_name, idx, str(step.get("name", f"#{idx + 1}")),
+                                      uses.strip() if isinstance(uses, str) else "",
+                                      doc.line("jobs", job_name, "steps", idx, "uses")))
+        return cls(doc, triggers, steps)
+
+    @cached_property
+    def analysis(self) -> WorkflowAnalysis:
+        """The `needs:` job graph, matrix sizes and caching, computed once per workflow."""
+        return analyze_workflow(self.doc.data)
+
+
+# ─── Parsed file ─────────────────────────────────────────────────
+
+@dataclass
+class PolicyDocument:
+    filename: str
+    dockerfile: Dockerfile | None = None
+    yaml_docs: list[YamlDocument] = field(default_factory=list)
+    error: str = ""     # YAML syntax error, if the file did not parse
+
+    @cached_property
+    def manifests(self) -> list[Manifest]:
+        return [Manifest.from_doc(d) for d in self.yaml_docs if isinstance(d.data, dict) and "kind" in d.data]
+
+    @cached_property
+    def workflows(self) -> list[Workflow]:
+        return [Workflow.from_doc(d) for d in self.yaml_docs if isinstance(d.data, dict) and "jobs" in d.data]
+
+    def inputs(self) -> list:
+        """Rego `input` documents, as conftest would build them for this file."""
+        if self.dockerfile is not None:
+            return [[i.to_input() for i in self.dockerfile.instructions]]
+        return [d.data for d in self.yaml_docs]
+
+
+def parse_document(content: str, filename: str) -> PolicyDocument:
+    """Parse a generated file once; Dockerfiles by name, everything else as YAML."""
+    if filename == "Dockerfile" or filename.endswith(".dockerfile"):
+        return PolicyDocument(filename, dockerfile=parse_dockerfile(content))
+    try:
+        return PolicyDocument(filename, yaml_docs=load_yaml(content))
+    except yaml.YAMLError as e:
+        return PolicyDocument(filename, error=str(e))
@@ -0,0 +1,233 @@
+"""
+Resident policy engine — Rego evaluated by a long-lived OPA server.
+
+`conftest test` starts a process and recompiles the whole bundle on every
+check. Instead, one `opa run --server --watch <policy_dir>` process per
+policy directory is started on first use and kept for the life of the
+agent: policies are compiled once, reloaded by OPA when a .rego file
+changes, and each check is a keep-alive HTTP POST of the parsed input to
+the loopback port (single-digit ms). When a precompiled bundle for the
+directory is current (src/policy/bundle.py), the server starts from it
+instead of compiling the sources.
+
+When `opa` is not installed (or will not start), `available` is False and
+callers fall back to conftest, then to built-in rules.
+
+Usage:
+    from src.policy.engine import get_policy_engine
+
+    engine = get_policy_engine()
+    if engine.available:
+        findings = engine.evaluate("policies/docker", [instructions])
+"""
+
+import atexit
+import http.client
+import json
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+
+from src.policy.bundle import BundleIndex
+from src.policy.profile import PolicyProfile, attribute_rego_profile
+from src.tools.batch_validate import ToolFinding
+
+logger = logging.getLogger("devops-agent.policy")
+
+OPA_START_TIMEOUT = 10.0   # seconds to wait for /health after spawning the server
+OPA_EVAL_TIMEOUT = 5.0     # seconds per evaluation request
+POLICY_QUERY = "main"      # package of the deny/warn rules (conftest's default namespace)
+
+
+class PolicyEngineError(Exception):
+    """The OPA server could not be started or stopped answering."""
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class OpaServer:
+    """One `opa run --server` process serving a single policy directory (or its bundle) on loopback."""
+
+    def __init__(self, binary: str, policy_dir: str, bundle: str | None = None):
+        self.binary = binary
+        self.policy_dir = policy_dir
+        self.bundle = bundle
+        self.port = 0
+        self._proc: subprocess.Popen | None = None
+        self._conn: http.client.HTTPConnection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def command(self) -> list[str]:
+        cmd = [self.binary, "run", "--server", "--log-level", "error", "--addr", f"127.0.0.1:{self.port}"]
+        # A bundle is an immutable artifact; the sources are watched for edits
+        return cmd + (["--bundle", self.bundle] if self.bundle else ["--watch", self.policy_dir])
+
+    def start(self):
+        self.port = _free_port()
+        cmd = self.command()
+        try:
+            self._proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            raise PolicyEngineError(f"cannot start opa: {e}")
+
+        deadline = time.monotonic() + OPA_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._proc.poll() is not None:
+                break
+            try:
+                if self._request("GET", "/health")[0] == 200:
+                    logger.info("OPA server ready | policies=%s port=%d", self.bundle or self.policy_dir, self.port)
+                    return
+            except OSError:
+                self._drop_connection()
+            time.sleep(0.05)
+        self.close()
+        raise PolicyEngineError(f"opa server for {self.policy_dir} did not become healthy")
+
+    def _request(self, method: str, path: str, body: bytes | None = None) -> tuple[int, bytes]:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=OPA_EVAL_TIMEOUT)
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        self._conn.request(method, path, body=body, headers=headers)
+        resp = self._conn.getresponse()
+        return resp.status, resp.read()
+
+    def _drop_connection(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def query(self, document) -> dict:
+        """Result of data.<POLICY_QUERY> for one input document; restarts a dead server once."""
+        body = json.dumps({"input": document}).encode("utf-8")
+        with self._lock:
+            for attempt in range(2):
+                if not self.running:
+                    self.start()
+                try:
+                    status, raw = self._request("POST", f"/v1/data/{POLICY_QUERY}", body)
+                except (OSError, http.client.HTTPException) as e:
+                    self._drop_connection()
+                    if attempt:
+                        raise PolicyEngineError(f"opa request failed: {e}")
+                    continue
+                if status != 200:
+                    raise PolicyEngineError(f"opa returned HTTP {status}: {raw[:300].decode(errors='replace')}")
+                return json.loads(raw or b"{}").get("result") or {}
+        return {}
+
+    def close(self):
+        self._drop_connection()
+        if self._proc is not None:
+            if self._proc.poll() is None:
+                self._proc.terminate()
+                try:
+                    self._proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self._proc.kill()
+            self._proc = None
+
+
+class PolicyEngine:
+    """OPA servers keyed by policy directory, started lazily (or preloaded) and shut down at exit."""
+
+    def __init__(self, binary: str | None = None, bundles: BundleIndex | None = None):
+        self.binary = binary if binary is not None else shutil.which("opa")
+        self.bundles = bundles if bundles is not None else BundleIndex()
+        self._servers: dict[str, OpaServer] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.binary)
+
+    def _server(self, policy_dir: str) -> OpaServer:
+        key = os.path.realpath(policy_dir)
+        with self._lock:
+            server = self._servers.get(key)
+            if server is None:
+                server = self._servers[key] = OpaServer(self.binary, key, self.bundles.bundle_for(key))
+            return server
+
+    def preload(self, policy_dirs: list[str]) -> list[threading.Thread]:
+        """Start the servers for `policy_dirs` in the background, so the first check doesn't pay for it."""
+        if not self.available:
+            return []
+
+        def warm(server: OpaServer):
+            with server._lock:
+                if server.running:
+                    return
+                try:
+                    server.start()
+                except PolicyEngineError as e:
+                    logger.warning("OPA preload failed (will retry on first use): %s", e)
+
+        threads = [threading.Thread(target=warm, args=(self._server(d),), daemon=True, name="opa-preload")
+                   for d in policy_dirs if os.path.isdir(d)]
+        for t in threads:
+            t.start()
+        return threads
+
+    def profile(self, policy_dir: str, documents: list, profile: PolicyProfile):
+        """Per-rule timings from `opa eval --profile` over the sources (not the bundle: rows must match)."""
+        if not self.available:
+            raise PolicyEngineError("opa is not installed")
+        for doc in documents:
+            cmd = [self.binary, "eval", "--profile", "--format", "json", "--data", policy_dir,
+                   "--stdin-input", f"data.{POLICY_QUERY}"]
+            try:
+                result = subprocess.run(cmd, input=json.dumps(doc), capture_output=True, text=True, timeout=60)
+                report = json.loads(result.stdout or "{}")
+            except (OSError, subprocess.TimeoutExpired, ValueError) as e:
+                raise PolicyEngineError(f"opa eval --profile failed: {e}")
+            attribute_rego_profile(report.get("profile") or [], profile, policy_dir)
+
+    def evaluate(self, policy_dir: str, documents: list) -> list[ToolFinding]:
+        """deny/warn messages for every input document, de-duplicated, in rule order."""
+        if not self.available:
+            raise PolicyEngineError("opa is not installed")
+        server = self._server(policy_dir)
+        findings: list[ToolFinding] = []
+        seen = set()
+        for doc in documents:
+            result = server.query(doc)
+            for level, rule in (("error", "deny"), ("warning", "warn")):
+                for msg in result.get(rule) or []:
+                    text = msg if isinstance(msg, str) else (msg.get("msg") if isinstance(msg, dict) else str(msg))
+                    if (level, text) not in seen:
+                        seen.add((level, text))
+                        findings.append(ToolFinding("opa", POLICY_QUERY, level, text))
+        return findings
+
+    def close(self):
+        with self._lock:
+            servers, self._servers = list(self._servers.values()), {}
+        for server in servers:
+            server.close()
+
+
+_ENGINE: PolicyEngine | None = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_policy_engine() -> PolicyEngine:
+    """The process-wide engine; its servers are stopped when the interpreter exits."""
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _ENGINE = PolicyEngine()
+            atexit.register(_ENGINE.close)
+        return _ENGINE
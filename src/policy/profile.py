@@ -0,0 +1,165 @@
+"""
+Policy profiling — per-rule cost, hit counts and human feedback.
+
+A `PolicyProfile` accumulates, per rule:
+    - calls and evaluation time (built-in visitors timed by `run_rules`,
+      Rego rules from `opa eval --profile`, attributed to the rule head
+      each expression belongs to);
+    - hits (violations the rule produced);
+    - feedback from the audit log: in how many review cycles the rule fired,
+      and what the human decided afterwards. An APPROVE despite the finding
+      counts as an override (a likely false positive); REFINE / REJECT count
+      as upheld.
+
+Set POLICY_PROFILE=1 to profile live runs (the report is printed at exit),
+or run scripts/profile_policies.py over sample files.
+
+Usage:
+    from src.policy.profile import PolicyProfile
+
+    profile = PolicyProfile()
+    run_rules(doc, STAGE_RULES["docker"], profile=profile)
+    profile.load_feedback("audit_logs")
+    print(profile.report())
+"""
+
+import glob
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class RuleStats:
+    rule: str
+    backend: str = "builtin"    # "builtin" | "rego"
+    calls: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+    fired: int = 0              # review cycles in which the rule reported something
+    overridden: int = 0         # ... and the human approved anyway
+    upheld: int = 0             # ... and the human asked for a refinement or rejected
+
+    @property
+    def mean_ms(self) -> float:
+        return self.seconds * 1000 / self.calls if self.calls else 0.0
+
+    @property
+    def override_rate(self) -> float:
+        return self.overridden / self.fired if self.fired else 0.0
+
+
+class PolicyProfile:
+    """Thread-safe per-rule accumulator (validators run concurrently)."""
+
+    def __init__(self):
+        self.rules: dict[tuple[str, str], RuleStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, rule: str, backend: str) -> RuleStats:
+        key = (backend, rule)
+        if key not in self.rules:
+            self.rules[key] = RuleStats(rule, backend)
+        return self.rules[key]
+
+    def record(self, rule: str, seconds: float, hits: int = 0, calls: int = 1, backend: str = "builtin"):
+        with self._lock:
+            stats = self._stats(rule, backend)
+            stats.calls += calls
+            stats.hits += hits
+            stats.seconds += seconds
+
+    def load_feedback(self, audit_dir: str) -> int:
+        """Add decision feedback from audit_logs/*.json; returns the number of review cycles read."""
+        cycles = 0
+        for path in sorted(glob.glob(os.path.join(audit_dir, "*.json"))):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entries = json.load(f).get("entries", [])
+            except (OSError, ValueError, AttributeError):
+                continue
+            for entry in entries:
+                fired = entry.get("policy_rules")
+                if "decision" not in entry or not fired:
+                    continue
+                cycles += 1
+                with self._lock:
+                    for rule in set(fired):
+                        stats = self._stats(rule, "rego" if rule.startswith(("opa-", "conftest-")) else "builtin")
+                        stats.fired += 1
+                        if entry["decision"] == "approve":
+                            stats.overridden += 1
+                        elif entry["decision"] in ("refine", "reject"):
+                            stats.upheld += 1
+        return cycles
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(s.seconds for s in self.rules.values())
+
+    def ranked(self) -> list[RuleStats]:
+        return sorted(self.rules.values(), key=lambda s: (-s.seconds, -s.fired, s.rule))
+
+    def report(self, top: int | None = None) -> str:
+        """Text table, slowest rules first."""
+        total = self.total_seconds or 1.0
+        lines = [f"{'rule':<44} {'backend':<8} {'calls':>7} {'hits':>6} {'total ms':>9} {'mean ms':>8} "
+                 f"{'share':>6} {'fired':>6} {'override':>8}"]
+        for s in self.ranked()[:top]:
+            lines.append(f"{s.rule[:44]:<44} {s.backend:<8} {s.calls:>7} {s.hits:>6} {s.seconds * 1000:>9.2f} "
+                         f"{s.mean_ms:>8.3f} {s.seconds / total:>6.1%} {s.fired:>6} "
+                         f"{(f'{s.override_rate:.0%}' if s.fired else '-'):>8}")
+        return "\n".join(lines)
+
+    def to_json(self) -> list[dict]:
+        return [dict(asdict(s), mean_ms=round(s.mean_ms, 4), override_rate=round(s.override_rate, 3))
+                for s in self.ranked()]
+
+
+# ─── Rego attribution ────────────────────────────────────────────
+
+_RULE_HEAD = re.compile(r"^(?:default\s+)?([a-zA-Z_][\w]*)(?:\s+contains\b|\s*\[|\s*(?::)?=|\s+if\b|\s*\{)")
+
+
+def rego_rule_heads(path: str) -> list[tuple[int, str]]:
+    """(row, label) for every rule head in a .rego file; the label is the comment above it, if any."""
+    heads = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return heads
+    for idx, line in enumerate(lines):
+        match = _RULE_HEAD.match(line)
+        if not match or match.group(1) in ("package", "import"):
+            continue
+        comment = lines[idx - 1].strip() if idx else ""
+        label = comment.lstrip("#").strip() if comment.startswith("#") else ""
+        heads.append((idx + 1, f"{match.group(1)}: {label}" if label else f"{match.group(1)}@{idx + 1}"))
+    return heads
+
+
+def attribute_rego_profile(entries: list[dict], profile: PolicyProfile, policy_dir: str):
+    """Fold `opa eval --profile` rows (one per expression) into per-rule-head stats."""
+    heads: dict[str, list[tuple[int, str]]] = {}
+    per_rule: dict[str, list] = {}
+    for entry in entries:
+        location = entry.get("location") or {}
+        file, row = location.get("file", ""), int(location.get("row", 0))
+        if not file:
+            continue
+        path = file if os.path.isabs(file) else os.path.join(policy_dir, os.path.basename(file))
+        if path not in heads:
+            heads[path] = rego_rule_heads(path)
+        owner = None
+        for head_row, label in heads[path]:
+            if head_row <= row:
+                owner = label
+        name = f"{os.path.basename(path)}:{owner or row}"
+        acc = per_rule.setdefault(name, [0, 0])
+        acc[0] += int(entry.get("total_time_ns", 0))
+        acc[1] = max(acc[1], int(entry.get("num_eval", 0)))
+    for name, (nanos, evals) in per_rule.items():
+        profile.record(name, nanos / 1e9, calls=evals, backend="rego")
@@ -0,0 +1,236 @@
+"""
+Built-in policy rules — visitors over the parsed document model.
+
+Each rule subclasses `PolicyRule` and implements the `visit_*` hooks it
+cares about; `run_rules` walks a `PolicyDocument` once and dispatches
+every node to every rule of the stage, then calls `finish` for rules
+that judge the file as a whole. Rules are instantiated per run, so they
+may keep state between hooks.
+
+Usage:
+    from src.policy.documents import parse_document
+    from src.policy.rules import STAGE_RULES, run_rules
+
+    doc = parse_document(content, "Dockerfile")
+    violations = run_rules(doc, STAGE_RULES["docker"])
+"""
+
+import time
+from typing import Iterable
+
+from src.policy.documents import Container, Dockerfile, Instruction, Manifest, PolicyDocument, Step, Workflow
+from src.policy.profile import PolicyProfile
+from src.schemas import PolicyViolation, Severity
+
+RULESET_VERSION = 2  # bump when a rule's verdicts change, to invalidate cached results
+
+# Pod-owning kinds that serve traffic (Jobs run to completion and need no readinessProbe)
+LONG_RUNNING_KINDS = {"Pod", "Deployment", "StatefulSet", "DaemonSet", "ReplicaSet"}
+ROOT_USERS = {"root", "0", "0:0", "root:root"}
+
+
+class PolicyRule:
+    rule = ""
+    severity = Severity.WARNING
+
+    def violation(self, message: str, line: int = 0) -> PolicyViolation:
+        prefix = f"Line {line}: " if line else ""
+        return PolicyViolation(rule=self.rule, message=prefix + message, severity=self.severity)
+
+    def visit_instruction(self, ins: Instruction, dockerfile: Dockerfile) -> Iterable[PolicyViolation]:
+        return ()
+
+    def visit_manifest(self, manifest: Manifest) -> Iterable[PolicyViolation]:
+        return ()
+
+    def visit_container(self, container: Container, manifest: Manifest) -> Iterable[PolicyViolation]:
+        return ()
+
+    def visit_workflow(self, workflow: Workflow) -> Iterable[PolicyViolation]:
+        return ()
+
+    def visit_step(self, step: Step, workflow: Workflow) -> Iterable[PolicyViolation]:
+        return ()
+
+    def finish(self, doc: PolicyDocument) -> Iterable[PolicyViolation]:
+        return ()
+
+
+def run_rules(doc: PolicyDocument, rule_types: Iterable[type[PolicyRule]],
+              profile: PolicyProfile | None = None) -> list[PolicyViolation]:
+    """All findings of `rule_types` on `doc`, from a single traversal (timed per rule with `profile`)."""
+    rules = [r() for r in rule_types]
+    found: list[PolicyViolation] = []
+    spent = [0.0] * len(rules)
+    hits = [0] * len(rules)
+
+    def emit(idx: int, findings: Iterable[PolicyViolation]):
+        if profile is None:
+            found.extend(findings)
+            return
+        start = time.perf_counter()
+        items = list(findings)  # hooks are generators: the work happens here
+        spent[idx] += time.perf_counter() - start
+        hits[idx] += len(items)
+        found.extend(items)
+
+    if doc.dockerfile is not None:
+        for ins in doc.dockerfile.instructions:
+            for i, r in enumerate(rules):
+                emit(i, r.visit_instruction(ins, doc.dockerfile))
+    for manifest in doc.manifests:
+        for i, r in enumerate(rules):
+            emit(i, r.visit_manifest(manifest))
+        for container in manifest.containers:
+            for i, r in enumerate(rules):
+                emit(i, r.visit_container(container, manifest))
+    for workflow in doc.workflows:
+        for i, r in enumerate(rules):
+            emit(i, r.visit_workflow(workflow))
+        for step in workflow.steps:
+            for i, r in enumerate(rules):
+                emit(i, r.visit_step(step, workflow))
+    for i, r in enumerate(rules):
+        emit(i, r.finish(doc))
+    if profile is not None:
+        for i, r in enumerate(rules):
+            profile.record(r.rule, spent[i], hits[i])
+    return found
+
+
+# ─── Dockerfile ──────────────────────────────────────────────────
+
+class DockerUnpinnedBase(PolicyRule):
+    rule = "docker-no-latest"
+
+    def visit_instruction(self, ins, dockerfile):
+        if ins.cmd != "from" or not ins.value:
+            return
+        image = ins.value[0]
+        if image.lower() in dockerfile.stage_names or image == "scratch" or "$" in image or "@" in image:
+            return
+        if image.endswith(":latest") or ":" not in image.split("/")[-1]:
+            yield self.violation(f"Image '{image}' uses :latest or unpinned tag.", ins.line)
+
+
+class DockerRunsAsRoot(PolicyRule):
+    """USER is per stage, so only the final stage's last USER counts."""
+    rule = "docker-no-user"
+    severity = Severity.ERROR
+
+    def __init__(self):
+        self.last_user: Instruction | None = None
+
+    def visit_instruction(self, ins, dockerfile):
+        if ins.cmd == "from":
+            self.last_user = None
+        elif ins.cmd == "user":
+            self.last_user = ins
+        return ()
+
+    def finish(self, doc):
+        if doc.dockerfile is None:
+            return
+        if self.last_user is None:
+            yield self.violation("No USER instruction found. Container will run as root.")
+        elif " ".join(self.last_user.value) in ROOT_USERS:
+            yield self.violation("Final stage runs as root. Switch to a non-root USER.", self.last_user.line)
+
+
+class DockerNoHealthcheck(PolicyRule):
+    rule = "docker-no-healthcheck"
+
+    def __init__(self):
+        self.seen = False
+
+    def visit_instruction(self, ins, dockerfile):
+        if ins.cmd == "from":
+            self.seen = False
+        elif ins.cmd == "healthcheck" and ins.value[:1] != ["NONE"]:
+            self.seen = True
+        return ()
+
+    def finish(self, doc):
+        if doc.dockerfile is not None and not self.seen:
+            yield self.violation("No HEALTHCHECK instruction. Consider adding one.")
+
+
+# ─── Kubernetes ──────────────────────────────────────────────────
+
+class K8sNoLimits(PolicyRule):
+    rule = "k8s-no-limits"
+    severity = Severity.ERROR
+
+    def visit_container(self, container, manifest):
+        if not (container.spec.get("resources") or {}).get("limits"):
+            yield self.violation(f"Container '{container.name}' in {manifest.ref} has no resource limits.",
+                                 container.line)
+
+
+class K8sDefaultNamespace(PolicyRule):
+    rule = "k8s-default-namespace"
+    severity = Severity.ERROR
+
+    def visit_manifest(self, manifest):
+        if manifest.namespace == "default":
+            yield self.violation(f"{manifest.ref} is deployed to the 'default' namespace, which is discouraged.",
+                                 manifest.doc.line("metadata", "namespace"))
+
+
+class K8sNoReadiness(PolicyRule):
+    rule = "k8s-no-readiness"
+
+    def visit_container(self, container, manifest):
+        if manifest.kind in LONG_RUNNING_KINDS and not container.spec.get("readinessProbe"):
+            yield self.violation(f"Container '{container.name}' in {manifest.ref} has no readinessProbe.",
+                                 container.line)
+
+
+# ─── CI workflows ────────────────────────────────────────────────
+
+class CiUnpinnedAction(PolicyRule):
+    rule = "ci-unpinned-action"
+
+    def visit_step(self, step, workflow):
+        if step.uses and "@" not in step.uses and not step.uses.startswith("./"):
+            where = f"job '{step.job}'" if step.index < 0 else f"step '{step.name}' of job '{step.job}'"
+            yield self.violation(f"Action '{step.uses}' in {where} is not pinned.", step.line)
+
+
+class CiPullRequestTarget(PolicyRule):
+    rule = "ci-pull-request-target"
+    severity = Severity.ERROR
+
+    def visit_workflow(self, workflow):
+        if "pull_request_target" in workflow.triggers:
+            line = workflow.doc.line("on", "pull_request_target")
+            yield self.violation("'pull_request_target' trigger detected. Risk of arbitrary code execution.", line)
+
+
+class CiJobGraph(PolicyRule):
+    rule = "ci-job-graph"
+    severity = Severity.ERROR
+
+    def visit_workflow(self, workflow):
+        analysis = workflow.analysis
+        for cycle in analysis.cycles:
+            yield self.violation(f"Job dependency cycle: {' -> '.join(cycle + cycle[:1])}.",
+                                 workflow.doc.line("jobs", cycle[0], "needs"))
+        for job, dep in analysis.unknown_needs:
+            yield self.violation(f"Job '{job}' needs unknown job '{dep}'.", workflow.doc.line("jobs", job, "needs"))
+
+
+class CiNoDependencyCache(PolicyRule):
+    rule = "ci-no-dependency-cache"
+
+    def visit_workflow(self, workflow):
+        for job in workflow.analysis.uncached_jobs:
+            yield self.violation(f"Job '{job}' installs dependencies without a cache.",
+                                 workflow.doc.line("jobs", job))
+
+
+STAGE_RULES: dict[str, tuple[type[PolicyRule], ...]] = {
+    "docker": (DockerUnpinnedBase, DockerRunsAsRoot, DockerNoHealthcheck),
+    "k8s": (K8sNoLimits, K8sDefaultNamespace, K8sNoReadiness),
+    "cicd": (CiUnpinnedAction, CiPullRequestTarget, CiJobGraph, CiNoDependencyCache),
+}
@@ -1,20 +1,43 @@
 """
 Policy Validator — OPA/Conftest policy-as-code enforcement.
 
+Each candidate is parsed once (src/policy/documents.py); the built-in
+rules in src/policy/rules.py visit that model in a single pass. Rego
+policies are evaluated by the resident OPA server when `opa` is
+installed (src/policy/engine.py), otherwise by one conftest run per batch.
+Set POLICY_ENGINE=opa|conftest|builtin to force a backend (default: auto).
+
+A check slower than POLICY_LATENCY_BUDGET_MS (default 500) logs a warning
+with the per-backend times, so a growing policy set can't silently slow
+every review cycle; POLICY_PROFILE=1 adds per-rule timings (report printed
+at exit, see src/policy/profile.py and scripts/profile_policies.py).
+
 Usage:
-    from src.policy.validator import PolicyValidator
+    from src.policy.validator import get_policy_validator
 
-    validator = PolicyValidator()
+    validator = get_policy_validator()
     passed, violations = validator.validate(dockerfile_content, stage="docker")
 """
 
+import atexit
+import functools
 import logging
 import os
+import shutil
 import subprocess
-import tempfile
+import threading
 from typing import List, Tuple
 
+from src.policy.documents import PolicyDocument, parse_document
+from src.policy.engine import PolicyEngine, PolicyEngineError, get_policy_engine
+from src.policy.profile import PolicyProfile
+from src.policy.rules import RULESET_VERSION, STAGE_RULES, run_rules
 from src.schemas import PolicyViolation, Severity
+from src.tools.batch_validate import ToolError, ToolFinding, run_conftest
+from src.tools.validation_cache import (
+    ValidationCache, bundle_hash, content_hash, get_validation_cache, tool_identity,
+)
+from src.tools.validation_scheduler import Check, run_checks
 
 logger = logging.getLogger("devops-agent.policy")
 
@@ -26,261 +49,283 @@ _STAGE_CONFIG = {
     "cicd": {"policy_dir": "policies/ci", "ext": ".yml", "filename": "workflow.yml"},
     "observability": {"policy_dir": "policies/k8s", "ext": ".yaml", "filename": "chart.yaml"},
 }
+_STAGE_ALIASES = {"ci": "cicd", "ci/cd": "cicd", "ci-cd": "cicd", "kubernetes": "k8s"}
+# Transient backend failures are re-checked next time rather than cached
+_UNCACHEABLE_RULES = {"conftest-error", "opa-error", "timeout"}
+POLICY_TIMEOUTS = {"builtin": 30.0, "rego": 60.0}  # seconds per check
+DEFAULT_LATENCY_BUDGET_MS = 500.0
+
+
+def resolve_stage(stage: str) -> Tuple[str, dict]:
+    """Canonical stage key ("CI" -> "cicd") and its policy config ({} for stages without policies)."""
+    stage_key = _STAGE_ALIASES.get(stage.lower(), stage.lower())
+    return stage_key, _STAGE_CONFIG.get(stage_key, {})
+
+
+@functools.lru_cache(maxsize=None)
+def _conftest_version(binary: str | None) -> str | None:
+    """`conftest --version` output, probed once per binary path."""
+    if not binary:
+        return None
+    try:
+        result = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _to_violations(findings: List[ToolFinding]) -> List[PolicyViolation]:
+    """Rego deny/warn findings as violations: `<tool>-failure` blocks, `<tool>-warning` does not."""
+    return [
+        PolicyViolation(
+            rule=f"{f.tool}-failure" if f.level == "error" else f"{f.tool}-warning",
+            message=f.message,
+            severity=Severity.ERROR if f.level == "error" else Severity.WARNING,
+        )
+        for f in findings
+    ]
 
 
 class PolicyValidator:
     """
-    Validates generated content against OPA/Rego policies using conftest.
+    Validates generated content against OPA/Rego policies.
 
-    Falls back gracefully if conftest is not installed.
+    Uses the resident OPA engine if available, else conftest, and falls
+    back gracefully to built-in rules if neither is installed.
     """
 
-    def __init__(self):
-        self.conftest_available = self._check_conftest()
+    def __init__(self, engine: PolicyEngine | None = None, backend: str | None = None,
+                 cache: ValidationCache | None = None, profile: PolicyProfile | None = None,
+                 latency_budget_ms: float | None = None):
+        self.cache = cache if cache is not None else get_validation_cache()
+        # Per-rule timings only when asked for; the budget check is always on (it reuses check timings)
+        self.profile = profile if profile is not None else (PolicyProfile() if os.getenv("POLICY_PROFILE") else None)
+        self.latency_budget_ms = latency_budget_ms if latency_budget_ms is not None else float(
+            os.getenv("POLICY_LATENCY_BUDGET_MS", DEFAULT_LATENCY_BUDGET_MS))
+        self.backend = (backend or os.getenv("POLICY_ENGINE", "auto")).lower()
+        self.engine = engine if engine is not None else get_policy_engine()
+        self.opa_available = self.backend in ("auto", "opa") and self.engine.available
+        self.conftest_available = self.backend in ("auto", "conftest") and self._check_conftest()
         self.project_root = os.path.dirname(
             os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         )
 
+    def preload(self):
+        """Start the resident OPA servers for every stage now, in the background."""
+        if self.opa_available:
+            dirs = {os.path.join(self.project_root, c["policy_dir"]) for c in _STAGE_CONFIG.values()}
+            self.engine.preload(sorted(dirs))
+
     def _check_conftest(self) -> bool:
         """Check if conftest CLI is available."""
-        try:
-            result = subprocess.run(
-                ["conftest", "--version"],
-                capture_output=True, text=True, timeout=5,
+        version = _conftest_version(shutil.which("conftest"))
+        if version:
+            logger.info("conftest found: %s", version)
+            return True
+
+        if not self.opa_available:
+            logger.warning(
+                "conftest not found — policy checks will use built-in rules only. "
+                "Install: https://www.conftest.dev/install/"
             )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                logger.info("conftest found: %s", version)
-                return True
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
-
-        logger.warning(
-            "conftest not found — policy checks will use built-in rules only. "
-            "Install: https://www.conftest.dev/install/"
-        )
         return False
 
-    def validate(self, content: str, stage: str) -> Tuple[bool, List[PolicyViolation]]:
+    def validate(self, content: str, stage: str, fail_fast: bool = False) -> Tuple[bool, List[PolicyViolation]]:
         """
         Validate content against policies for the given stage.
 
         Args:
             content: The generated file content (Dockerfile, YAML, etc.)
             stage: Pipeline stage (docker, k8s, cicd, etc.)
+            fail_fast: Stop at the first ERROR (pass/fail only; findings may be partial)
 
         Returns:
             (passed: bool, violations: List[PolicyViolation])
         """
-        stage_key = stage.lower()
-        violations: List[PolicyViolation] = []
-
-        # 1. Built-in rules (always run, no external deps)
-        builtin_violations = self._builtin_checks(content, stage_key)
-        violations.extend(builtin_violations)
-
-        # 2. Conftest/OPA rules (if available)
-        if self.conftest_available:
-            config = _STAGE_CONFIG.get(stage_key, {})
-            policy_dir = os.path.join(self.project_root, config.get("policy_dir", ""))
-
-            if os.path.isdir(policy_dir) and os.listdir(policy_dir):
-                conftest_violations = self._run_conftest(content, policy_dir, config)
-                violations.extend(conftest_violations)
-
-        # Filter out INFO severity from failing the check? 
-        # Usually warnings don't fail, errors fail.
-        # But existing logic was "passed = len(violations) == 0".
-        # Let's keep strict mode for now, or maybe only fail on ERRORS?
-        # The user's original request implies strict validation.
-        # But let's refine: Warnings shouldn't block, only Errors.
-        
-        errors = [v for v in violations if v.severity == Severity.ERROR]
-        passed = len(errors) == 0
-
-        if violations:
-            logger.warning(
-                "Policy violations found | stage=%s | count=%d",
-                stage, len(violations),
-                extra={"stage": stage},
-            )
-        else:
-            logger.info("Policy check passed | stage=%s", stage, extra={"stage": stage})
+        return self.validate_many([content], stage, fail_fast)[0]
 
-        return passed, violations
+    def validate_many(self, contents: List[str], stage: str,
+                      fail_fast: bool = False) -> List[Tuple[bool, List[PolicyViolation]]]:
+        """
+        Validate several candidates for one stage with a single conftest run.
 
-    def _run_conftest(self, content: str, policy_dir: str, config: dict) -> List[PolicyViolation]:
-        """Run conftest against the content."""
-        violations = []
-        ext = config.get("ext", ".txt")
+        Built-in rules and the Rego backend run concurrently; with fail_fast the
+        Rego run is abandoned once the built-in rules already found an ERROR.
 
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=ext, delete=False, prefix="devops_policy_"
-        ) as f:
-            f.write(content)
-            temp_path = f.name
+        Returns:
+            [(passed, violations)] in input order
+        """
+        stage_key, config = resolve_stage(stage)
+        rules = STAGE_RULES.get(stage_key, ())
+        policy_dir = os.path.join(self.project_root, config.get("policy_dir", ""))
+        use_rego = bool(config) and (self.opa_available or self.conftest_available) \
+            and os.path.isdir(policy_dir) and bool(os.listdir(policy_dir))
+
+        per_item: List[List[PolicyViolation]] = [[] for _ in contents]
+        if rules or use_rego:
+            # Unchanged content against an unchanged backend and bundle is answered from the cache
+            backend = self._backend_identity() if use_rego else "builtin"
+            bundle = bundle_hash(policy_dir) if use_rego else ""
+            keys = [self.cache.key("policy", stage_key, backend, bundle, str(RULESET_VERSION), content_hash(c))
+                    for c in contents]
+            misses = []
+            for idx, key in enumerate(keys):
+                cached = self.cache.get(key)
+                if cached is None:
+                    misses.append(idx)
+                else:
+                    per_item[idx] = [PolicyViolation(**v) for v in cached]
+
+            if misses:
+                fresh, complete = self._check([contents[i] for i in misses], config, rules, policy_dir,
+                                              use_rego, fail_fast)
+                for idx, violations in zip(misses, fresh):
+                    per_item[idx] = violations
+                    if complete and not any(v.rule in _UNCACHEABLE_RULES for v in violations):
+                        self.cache.put(keys[idx], [v.model_dump(mode="json") for v in violations])
+
+        # Warnings shouldn't block, only Errors.
+        results = []
+        for violations in per_item:
+            errors = [v for v in violations if v.severity == Severity.ERROR]
+            passed = len(errors) == 0
+
+            if violations:
+                logger.warning(
+                    "Policy violations found | stage=%s | count=%d",
+                    stage, len(violations),
+                    extra={"stage": stage},
+                )
+            else:
+                logger.info("Policy check passed | stage=%s", stage, extra={"stage": stage})
+            results.append((passed, violations))
+
+        return results
+
+    def _check(self, contents: List[str], config: dict, rules, policy_dir: str,
+               use_rego: bool, fail_fast: bool = False) -> Tuple[List[List[PolicyViolation]], bool]:
+        """
+        Built-in and Rego violations per candidate, each candidate parsed once.
 
-        try:
-            result = subprocess.run(
-                ["conftest", "test", temp_path, "--policy", policy_dir, "--output", "json"],
-                capture_output=True, text=True, timeout=30,
+        Returns (violations per candidate, whether every check ran to completion).
+        """
+        filename = config.get("filename", "input" + config.get("ext", ".txt"))
+        docs = [parse_document(c, filename) for c in contents]
+
+        def builtin():
+            found = []
+            for doc in docs:
+                if doc.error:
+                    found.append([PolicyViolation(
+                        rule="parse-error", message=f"{filename} is not valid YAML: {doc.error[:300]}",
+                        severity=Severity.ERROR,
+                    )])
+                else:
+                    found.append(run_rules(doc, rules, profile=self.profile))
+            return found
+
+        def rego():
+            # Resident engine first, conftest otherwise
+            found = self._run_opa(docs, policy_dir) if self.opa_available else None
+            if found is None and self.conftest_available:
+                found = self._run_conftest(contents, policy_dir, config)
+            if found is None:
+                # No backend answered: say so, and keep the (Rego-less) verdict out of the cache
+                return [[PolicyViolation(rule="opa-error", message="Rego policies could not be evaluated "
+                                         "(OPA engine failed, conftest unavailable)", severity=Severity.WARNING)]
+                        for _ in contents]
+            return found
+
+        # 1. Built-in rules (always run, no external deps)  2. OPA/Rego rules — concurrently
+        checks = [Check("builtin", builtin, POLICY_TIMEOUTS["builtin"])]
+        if use_rego:
+            checks.append(Check("rego", rego, POLICY_TIMEOUTS["rego"]))
+        stop_when = (lambda found: any(v.severity == Severity.ERROR for item in found for v in item)) \
+            if fail_fast else None
+
+        per_item: List[List[PolicyViolation]] = [[] for _ in contents]
+        complete = True
+        outcomes = run_checks(checks, stop_when)
+        self._account(outcomes, policy_dir, len(contents))
+        for check, outcome in zip(checks, outcomes):
+            if outcome.ok:
+                for idx, item in enumerate(outcome.value):
+                    per_item[idx].extend(item)
+                continue
+            complete = False
+            if outcome.timed_out:
+                logger.warning("%s policy check timed out", check.name)
+                for item in per_item:
+                    item.append(PolicyViolation(rule="timeout", message="Policy check timed out",
+                                                severity=Severity.WARNING))
+            elif outcome.error is not None:
+                raise outcome.error
+        return per_item, complete
+
+    def _account(self, outcomes, policy_dir: str, count: int):
+        """Profile the Rego backend as a whole and warn when a check overruns the latency budget."""
+        rego = next((o for o in outcomes if o.name == "rego" and o.ok), None)
+        if self.profile is not None and rego is not None:
+            self.profile.record(f"rego:{os.path.basename(policy_dir)}", rego.elapsed,
+                                hits=sum(len(item) for item in rego.value), calls=count, backend="rego")
+        slowest = max(outcomes, key=lambda o: o.elapsed, default=None)
+        if slowest is not None and slowest.elapsed * 1000 > self.latency_budget_ms:
+            timings = ", ".join(f"{o.name}={o.elapsed * 1000:.0f}ms" for o in outcomes)
+            logger.warning(
+                "Policy check over latency budget | policies=%s | %s | budget=%.0fms | "
+                "profile with POLICY_PROFILE=1 or scripts/profile_policies.py",
+                os.path.basename(policy_dir), timings, self.latency_budget_ms,
             )
 
-            if result.returncode != 0:
-                # Parse JSON output for violations
-                try:
-                    import json
-                    output = json.loads(result.stdout)
-                    for item in output:
-                        for failure in item.get("failures", []):
-                            violations.append(PolicyViolation(
-                                rule="conftest-failure",
-                                message=failure.get("msg", "Unknown violation"),
-                                severity=Severity.ERROR
-                            ))
-                        for warning in item.get("warnings", []):
-                            violations.append(PolicyViolation(
-                                rule="conftest-warning",
-                                message=warning.get("msg", "Unknown warning"),
-                                severity=Severity.WARNING
-                            ))
-                except (json.JSONDecodeError, TypeError):
-                    if result.stderr.strip():
-                        violations.append(PolicyViolation(
-                            rule="conftest-error",
-                            message=result.stderr.strip()[:300],
-                            severity=Severity.ERROR
-                        ))
-
+    def _backend_identity(self) -> str:
+        if self.opa_available:
+            return "opa:" + tool_identity(self.engine.binary)
+        return "conftest:" + tool_identity("conftest")
+
+    def _run_opa(self, docs: List[PolicyDocument], policy_dir: str) -> List[List[PolicyViolation]] | None:
+        """Evaluate each parsed candidate on the resident OPA server; None if the engine is unusable."""
+        results = []
+        for doc in docs:
+            if doc.error:
+                results.append([])  # already reported as parse-error
+                continue
+            try:
+                results.append(_to_violations(self.engine.evaluate(policy_dir, doc.inputs())))
+            except PolicyEngineError as e:
+                logger.warning("OPA engine unavailable, falling back: %s", e)
+                self.opa_available = False
+                return None
+        return results
+
+    def _run_conftest(self, contents: List[str], policy_dir: str,
+                      config: dict) -> List[List[PolicyViolation]] | None:
+        """Run conftest once against all candidates; violations per candidate, in order (None if missing)."""
+        filename = config.get("filename", "input" + config.get("ext", ".txt"))
+        try:
+            findings = run_conftest(dict(enumerate(contents)), policy_dir, filename)
+        except ToolError as e:
+            return [[PolicyViolation(rule="conftest-error", message=str(e)[:300], severity=Severity.ERROR)]
+                    for _ in contents]
         except subprocess.TimeoutExpired:
             logger.warning("conftest timed out")
-            violations.append(PolicyViolation(
-                rule="timeout",
-                message="Policy check timed out",
-                severity=Severity.WARNING
-            ))
-        finally:
-            os.unlink(temp_path)
-
-        return violations
-
-    # ─── Built-in Rules (no external deps) ───────────────────────
-
-    def _builtin_checks(self, content: str, stage: str) -> List[PolicyViolation]:
-        """Run simple built-in policy checks."""
-        violations = []
-        content_lower = content.lower()
-
-        if stage == "docker":
-            violations.extend(self._check_dockerfile(content, content_lower))
-        elif stage == "k8s":
-            violations.extend(self._check_k8s(content, content_lower))
-        elif stage == "cicd":
-            violations.extend(self._check_ci(content, content_lower))
-
-        return violations
-
-    def _check_dockerfile(self, content: str, content_lower: str) -> List[PolicyViolation]:
-        """Built-in Dockerfile policy checks."""
-        violations = []
-
-        # Check for :latest tag
-        lines = content.split("\n")
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if stripped.upper().startswith("FROM "):
-                # safe split even if empty
-                parts = stripped[5:].strip().split(" ")
-                if not parts or not parts[0]: continue
-                image = parts[0]
-                
-                if image.endswith(":latest") or ":" not in image.split("/")[-1]:
-                    violations.append(PolicyViolation(
-                        rule="docker-no-latest",
-                        message=f"Line {i}: Image '{image}' uses :latest or unpinned tag.",
-                        severity=Severity.WARNING
-                    ))
-
-        # Check for USER instruction
-        if "user " not in content_lower or all(
-            not line.strip().upper().startswith("USER ")
-            for line in lines
-            if not line.strip().startswith("#")
-        ):
-            # Running as root is a security risk -> ERROR
-            violations.append(PolicyViolation(
-                rule="docker-no-user",
-                message="No USER instruction found. Container will run as root.",
-                severity=Severity.ERROR
-            ))
-
-        # Check for HEALTHCHECK
-        if not any(
-            line.strip().upper().startswith("HEALTHCHECK ")
-            for line in lines
-            if not line.strip().startswith("#")
-        ):
-            violations.append(PolicyViolation(
-                rule="docker-no-healthcheck",
-                message="No HEALTHCHECK instruction. Consider adding one.",
-                severity=Severity.WARNING
-            ))
-
-        return violations
-
-    def _check_k8s(self, content: str, content_lower: str) -> List[PolicyViolation]:
-        """Built-in Kubernetes manifest policy checks."""
-        violations = []
-
-        # Check for resource limits
-        if "resources:" not in content_lower:
-            violations.append(PolicyViolation(
-                rule="k8s-no-limits",
-                message="No resource requests/limits found.",
-                severity=Severity.ERROR
-            ))
-
-        # Check for default namespace
-        if "namespace: default" in content_lower:
-            violations.append(PolicyViolation(
-                rule="k8s-default-namespace",
-                message="Deploying to 'default' namespace is discouraged.",
-                severity=Severity.ERROR
-            ))
-
-        # Check for readiness probe
-        if "readinessprobe:" not in content_lower.replace(" ", ""):
-            violations.append(PolicyViolation(
-                rule="k8s-no-readiness",
-                message="No readinessProbe found.",
-                severity=Severity.WARNING
-            ))
-
-        return violations
-
-    def _check_ci(self, content: str, content_lower: str) -> List[PolicyViolation]:
-        """Built-in CI workflow policy checks."""
-        violations = []
-
-        # Check for unpinned actions
-        lines = content.split("\n")
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if stripped.startswith("- uses:") or stripped.startswith("uses:"):
-                action_ref = stripped.split("uses:")[-1].strip()
-                if "@" not in action_ref and action_ref:
-                    violations.append(PolicyViolation(
-                        rule="ci-unpinned-action",
-                        message=f"Line {i}: Action '{action_ref}' is not pinned.",
-                        severity=Severity.WARNING
-                    ))
-
-        # Check for pull_request_target
-        if "pull_request_target" in content_lower:
-            violations.append(PolicyViolation(
-                rule="ci-pull-request-target",
-                message="'pull_request_target' trigger detected. Risk of arbitrary code execution.",
-                severity=Severity.ERROR
-            ))
-
-        return violations
+            return [[PolicyViolation(rule="timeout", message="Policy check timed out", severity=Severity.WARNING)]
+                    for _ in contents]
+        if findings is None:
+            return None
+
+        return [_to_violations(findings[idx]) for idx in range(len(contents))]
+
+
+_VALIDATOR: PolicyValidator | None = None
+_VALIDATOR_LOCK = threading.Lock()
+
+
+def get_policy_validator() -> PolicyValidator:
+    """The process-wide validator, so backends are probed once per run rather than per stage."""
+    global _VALIDATOR
+    with _VALIDATOR_LOCK:
+        if _VALIDATOR is None:
+            _VALIDATOR = PolicyValidator()
+            if _VALIDATOR.profile is not None:
+                atexit.register(lambda: print("\n📊 Policy profile (POLICY_PROFILE=1):\n" + _VALIDATOR.profile.report()))
+        return _VALIDATOR
@@ -48,7 +48,11 @@ class ProjectContext(BaseModel):
     ports: list[str] = Field(default_factory=list)
     env_vars: list[str] = Field(default_factory=list)
     scripts: dict[str, str] = Field(default_factory=dict)
-    file_structure: str = Field(default="")
+    file_structure: str = Field(default="", description="Bounded, rendered directory summary (see src/tools/file_tree.py)")
+    file_tree: dict[str, Any] = Field(
+        default_factory=dict, exclude=True,
+        description="Per-directory aggregates {dir: {files, bytes, extensions, subdirs}}; rebuilt each run, kept out of prompts and the cache file",
+    )
     raw_context_summary: str = Field(default="")
     existing_files: dict[str, str] = Field(default_factory=dict, description="Map of found DevOps files to their paths")
     architecture: list[str] = Field(default_factory=list, description="Detected architectural patterns (e.g. microservices)")
@@ -0,0 +1,134 @@
+"""
+Incremental cache for CodeAnalysisAgent.
+
+Stores, per detector, the fingerprints (size + mtime, optionally a content
+hash) of the files it read and the analysis keys it produced. On the next
+run a detector whose inputs are unchanged gets its previous result back
+instead of re-reading anything.
+
+In a git checkout the cache also records the commit it was computed at and
+the paths that were dirty then, so the next run can diff against exactly
+that commit instead of comparing mtimes.
+
+Usage:
+    from src.tools.analysis_cache import AnalysisCache
+
+    cache = AnalysisCache.load(os.path.join(project, ANALYSIS_CACHE_FILE))
+    inputs = cache.fingerprints(index, ["api/package.json"])
+    outputs = cache.lookup("node", inputs)        # None -> re-run the detector
+    cache.store("node", inputs, {"dependencies": [...]})
+    cache.save()
+"""
+
+import hashlib
+import json
+import os
+
+from src.tools.file_index import FileIndex
+
+CACHE_FORMAT_VERSION = 1
+ANALYSIS_CACHE_FILE = ".devops_analysis_cache.json"
+
+
+def _content_hash(path: str) -> str | None:
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """Per-detector results keyed by the fingerprints of their input files."""
+
+    def __init__(self, path: str, hash_contents: bool = False, ruleset: str = ""):
+        self.path = path
+        # Version of the classification data (dependency catalog) the outputs were derived from
+        self.ruleset = ruleset
+        # With hashing on, a file whose mtime moved (checkout, touch) but whose
+        # bytes didn't is still treated as unchanged
+        self.hash_contents = hash_contents
+        self.detectors: dict[str, dict] = {}
+        # HEAD when the outputs were computed, and the paths that differed from it then
+        self.commit: str | None = None
+        self.dirty: list[str] = []
+        self._root = os.path.dirname(os.path.abspath(path))
+
+    @classmethod
+    def load(cls, path: str, hash_contents: bool = False, ruleset: str = "") -> "AnalysisCache":
+        """Returns the cache at `path`, or an empty one if missing, corrupt, from another format or ruleset."""
+        cache = cls(path, hash_contents, ruleset)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format_version") == CACHE_FORMAT_VERSION and data.get("ruleset", "") == ruleset:
+                cache.detectors = data.get("detectors", {})
+                cache.commit = data.get("commit")
+                cache.dirty = data.get("dirty", [])
+        except (OSError, ValueError):
+            pass
+        return cache
+
+    @staticmethod
+    def fingerprints(index: FileIndex, paths) -> dict[str, list]:
+        """{relative path: [size, mtime]} for the paths that exist in the index."""
+        out = {}
+        for p in paths:
+            entry = index.get(p)
+            if entry is not None:
+                out[p] = [entry.size, entry.mtime]
+        return out
+
+    def _unchanged(self, stored: dict[str, list], current: dict[str, list]) -> bool:
+        if stored.keys() != current.keys():
+            return False
+        for path, (size, mtime) in current.items():
+            old = stored[path]
+            if old[0] == size and old[1] == mtime:
+                continue
+            if not (self.hash_contents and old[0] == size and len(old) > 2):
+                return False
+            if _content_hash(os.path.join(self._root, path)) != old[2]:
+                return False
+        return True
+
+    def lookup(self, name: str, inputs: dict[str, list], changed: set[str] | None = None) -> dict | None:
+        """The detector's cached outputs if its inputs are unchanged, else None.
+
+        With `changed` (`git diff --name-only <self.commit>` plus `self.dirty`),
+        an input counts as unchanged unless it is in that set; fingerprints are
+        not compared, so a fresh checkout with new mtimes still hits. The set
+        must be relative to the commit recorded here, never an arbitrary ref.
+        """
+        entry = self.detectors.get(name)
+        if entry is None:
+            return None
+        if changed is not None:
+            if entry["inputs"].keys() != inputs.keys() or not changed.isdisjoint(inputs):
+                return None
+        elif not self._unchanged(entry["inputs"], inputs):
+            return None
+        # Adopt the new mtimes so hash-verified files aren't re-hashed next run
+        for path, (size, mtime) in inputs.items():
+            entry["inputs"][path][:2] = [size, mtime]
+        return entry["outputs"]
+
+    def store(self, name: str, inputs: dict[str, list], outputs: dict):
+        if self.hash_contents:
+            inputs = {p: [size, mtime, _content_hash(os.path.join(self._root, p))]
+                      for p, (size, mtime, *_) in inputs.items()}
+        self.detectors[name] = {"inputs": inputs, "outputs": outputs}
+
+    def retain(self, prefix: str, keep: set[str]):
+        """Drops entries under `prefix` that aren't in `keep` (e.g. services that were removed)."""
+        self.detectors = {k: v for k, v in self.detectors.items() if not k.startswith(prefix) or k in keep}
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format_version": CACHE_FORMAT_VERSION, "ruleset": self.ruleset,
+                       "commit": self.commit, "dirty": self.dirty, "detectors": self.detectors}, f)
+        os.replace(tmp, self.path)
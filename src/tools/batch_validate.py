@@ -0,0 +1,192 @@
+"""
+Batch runs of the external validators: one process per tool per stage.
+
+Every candidate file (all drafts, all manifests) is written into a single
+private temp workspace (see src/tools/workspace.py), each under its own subdirectory with its real file name,
+and hadolint / kubeconform / actionlint / conftest are invoked once with all the paths.
+Findings come back through the tools' JSON output and are mapped to the
+caller's keys by file path.
+
+A tool that is not installed yields None, so callers keep their own
+"skipping" behaviour.
+
+Usage:
+    from src.tools.batch_validate import run_hadolint
+
+    findings = run_hadolint("hadolint", {"draft_a": dockerfile_a, "draft_b": dockerfile_b})
+    findings["draft_a"]   # -> [ToolFinding(tool="hadolint", code="DL3008", ...)]
+"""
+
+import json
+import os
+import subprocess
+from dataclasses import dataclass
+from typing import Hashable
+
+from src.tools.workspace import TempWorkspace
+
+BATCH_TIMEOUT = 120  # seconds for one tool invocation over the whole batch
+# hadolint severities, most severe first; its default --failure-threshold is "info"
+HADOLINT_LEVELS = ("error", "warning", "info", "style")
+
+
+@dataclass
+class ToolFinding:
+    tool: str
+    code: str       # hadolint rule ID (DL3008), kubeconform status, actionlint kind, conftest namespace
+    level: str      # "error" | "warning" | "info" | "style"
+    message: str
+    line: int = 0
+    resource: str = ""  # "Deployment/web" for kubeconform findings
+
+    def format(self, filename: str) -> str:
+        """One line in the tool's usual text style, with `filename` standing in for the temp path."""
+        if self.tool in ("hadolint", "dockerfile-lint", "actionlint"):
+            return f"{filename}:{self.line} {self.code} {self.level}: {self.message}"
+        if self.tool in ("kubeconform", "k8s-schema"):
+            return f"{filename} - {self.resource} {self.code}: {self.message}"
+        return f"{self.level.upper()} - {filename} - {self.code} - {self.message}"
+
+
+class BatchWorkspace(TempWorkspace):
+    """Private temp workspace holding one subdirectory per candidate file; removed on exit."""
+
+    def __init__(self, prefix: str = "validate_"):
+        super().__init__(prefix)
+        self.keys: dict[str, Hashable] = {}   # real path -> caller key
+
+    def add(self, key: Hashable, content: str, filename: str) -> str:
+        path = self.write(os.path.join(str(len(self.keys)), filename), content)
+        self.keys[os.path.realpath(path)] = key
+        return path
+
+    def key_for(self, reported: str) -> Hashable | None:
+        """Caller key for a path as the tool reported it (absolute or relative to the cwd)."""
+        return self.keys.get(os.path.realpath(reported))
+
+    @property
+    def paths(self) -> list[str]:
+        return list(self.keys)
+
+
+class ToolError(Exception):
+    """The tool ran but produced no parseable report (crash, bad flags, broken install)."""
+
+
+def _run(cmd: list[str]) -> subprocess.CompletedProcess | None:
+    try:
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=BATCH_TIMEOUT)
+    except (FileNotFoundError, PermissionError):
+        return None
+
+
+def _parse_json(proc: subprocess.CompletedProcess):
+    try:
+        return json.loads(proc.stdout) if proc.stdout.strip() else None
+    except json.JSONDecodeError:
+        raise ToolError((proc.stderr or proc.stdout).strip()[:500])
+
+
+def run_hadolint(binary: str, items: dict[Hashable, str],
+                 filename: str = "Dockerfile") -> dict[Hashable, list[ToolFinding]] | None:
+    """{key: findings} for each Dockerfile in `items`, from one `hadolint --format json` run."""
+    if not items:
+        return {}
+    with BatchWorkspace() as ws:
+        for key, content in items.items():
+            ws.add(key, content, filename)
+        proc = _run([binary, "--format", "json", *ws.paths])
+        if proc is None:
+            return None
+        report = _parse_json(proc)
+        if report is None and proc.returncode != 0:
+            raise ToolError(proc.stderr.strip()[:500])
+        results: dict[Hashable, list[ToolFinding]] = {key: [] for key in items}
+        for item in report or []:
+            key = ws.key_for(item.get("file", ""))
+            if key is not None:
+                results[key].append(ToolFinding("hadolint", item.get("code", ""), item.get("level", "error"),
+                                                item.get("message", ""), item.get("line", 0)))
+        return results
+
+
+def hadolint_failures(findings: list[ToolFinding], threshold: str = "info") -> list[ToolFinding]:
+    """The findings that fail a Dockerfile under hadolint's `--failure-threshold` (style never does by default)."""
+    failing = HADOLINT_LEVELS[:HADOLINT_LEVELS.index(threshold) + 1]
+    return [f for f in findings if f.level in failing]
+
+
+def run_kubeconform(binary: str, items: dict[Hashable, str], strict: bool = True,
+                    extra_args: tuple[str, ...] = ()) -> dict[Hashable, list[ToolFinding]] | None:
+    """{key: findings} for each manifest in `items`, from one `kubeconform -output json` run."""
+    if not items:
+        return {}
+    with BatchWorkspace() as ws:
+        for key, content in items.items():
+            ws.add(key, content, "manifest.yaml")
+        cmd = [binary, *(["-strict"] if strict else []), "-summary", "-output", "json", *extra_args, *ws.paths]
+        proc = _run(cmd)
+        if proc is None:
+            return None
+        report = _parse_json(proc)
+        if report is None and proc.returncode != 0:
+            raise ToolError(proc.stderr.strip()[:500])
+        results: dict[Hashable, list[ToolFinding]] = {key: [] for key in items}
+        for res in (report or {}).get("resources") or []:
+            if res.get("status") in ("statusValid", "statusSkipped", "statusEmpty"):
+                continue
+            key = ws.key_for(res.get("filename", ""))
+            if key is not None:
+                resource = "/".join(p for p in (res.get("kind", ""), res.get("name", "")) if p)
+                results[key].append(ToolFinding("kubeconform", res.get("status", "").removeprefix("status").lower(),
+                                                "error", res.get("msg", ""), resource=resource))
+        return results
+
+
+def run_actionlint(binary: str, items: dict[Hashable, str],
+                   filename: str = "workflow.yml") -> dict[Hashable, list[ToolFinding]] | None:
+    """{key: findings} for each GitHub Actions workflow in `items`, from one `actionlint` run."""
+    if not items:
+        return {}
+    with BatchWorkspace(prefix="actionlint_") as ws:
+        for key, content in items.items():
+            ws.add(key, content, filename)
+        proc = _run([binary, "-no-color", "-format", "{{json .}}", *ws.paths])
+        if proc is None:
+            return None
+        report = _parse_json(proc)
+        if report is None and proc.returncode != 0:
+            raise ToolError(proc.stderr.strip()[:500])
+        results: dict[Hashable, list[ToolFinding]] = {key: [] for key in items}
+        for item in report or []:
+            key = ws.key_for(item.get("filepath", ""))
+            if key is not None:
+                results[key].append(ToolFinding("actionlint", item.get("kind", ""), "error",
+                                                item.get("message", ""), item.get("line", 0)))
+        return results
+
+
+def run_conftest(items: dict[Hashable, str], policy_dir: str, filename: str,
+                 binary: str = "conftest") -> dict[Hashable, list[ToolFinding]] | None:
+    """{key: findings} for each file in `items`, from one `conftest test --output json` run."""
+    if not items:
+        return {}
+    with BatchWorkspace(prefix="policy_") as ws:
+        for key, content in items.items():
+            ws.add(key, content, filename)
+        proc = _run([binary, "test", "--policy", policy_dir, "--output", "json", "--no-color", *ws.paths])
+        if proc is None:
+            return None
+        report = _parse_json(proc)
+        if report is None and proc.returncode != 0:
+            raise ToolError(proc.stderr.strip()[:500])
+        results: dict[Hashable, list[ToolFinding]] = {key: [] for key in items}
+        for item in report or []:
+            key = ws.key_for(item.get("filename", ""))
+            if key is None:
+                continue
+            for level, section in (("error", "failures"), ("warning", "warnings")):
+                for f in item.get(section) or []:
+                    results[key].append(ToolFinding("conftest", item.get("namespace", "main"), level,
+                                                    f.get("msg", "Unknown violation")))
+        return results
@@ -0,0 +1,85 @@
+"""
+Concurrent source scanning for CodeAnalysisAgent.
+
+Each candidate file is read once on a thread pool and every registered
+pattern is applied to it, so the port, env-var and per-service detectors
+share one pass over the source instead of re-reading files per detector.
+Large files are capped and binaries skipped.
+
+Usage:
+    from src.tools.content_scanner import ContentScanner, DEFAULT_PATTERNS
+
+    hits = ContentScanner(DEFAULT_PATTERNS).scan(["/repo/api/server.js"])
+    hits["/repo/api/server.js"]["listen_call"]   # -> ["3000"]
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+MAX_SCAN_BYTES = 1_000_000     # larger files are scanned up to this many bytes
+BINARY_SNIFF_BYTES = 8192      # a NUL byte in this prefix marks the file as binary
+
+
+@dataclass(frozen=True)
+class ContentPattern:
+    name: str
+    regex: re.Pattern
+    # Lowercase literals, one of which must occur for the regex to possibly match.
+    # Lets most files skip most regexes after a single lowercase() + substring check.
+    hints: tuple[str, ...] = ()
+
+
+DEFAULT_PATTERNS = (
+    ContentPattern("port_assignment", re.compile(r'port\s*[:=]\s*(\d{4})', re.IGNORECASE), ("port",)),
+    ContentPattern("listen_call", re.compile(r'\.listen\(\s*(\d{4})'), (".listen(",)),
+    ContentPattern("service_port", re.compile(r'(?:listen|PORT)\D{0,10}(\d{3,5})'), ("listen", "port")),
+    ContentPattern("config_port", re.compile(r'port\s*:\s*(\d+)'), ("port",)),
+    ContentPattern("node_env", re.compile(r'process\.env\.([A-Z_][A-Z0-9_]*)'), ("process.env.",)),
+    ContentPattern("python_env", re.compile(r'os\.environ\.get\([\'"]([A-Z_][A-Z0-9_]*)[\'"]\)'), ("os.environ.get(",)),
+)
+
+
+def read_text_capped(path: str, max_bytes: int = MAX_SCAN_BYTES) -> str | None:
+    """File contents (first `max_bytes`), or None if unreadable or binary."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(max_bytes)
+    except OSError:
+        return None
+    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+class ContentScanner:
+    """Reads files concurrently and applies all patterns to each one."""
+
+    def __init__(self, patterns=DEFAULT_PATTERNS, max_bytes: int = MAX_SCAN_BYTES, workers: int | None = None):
+        self.patterns = tuple(patterns)
+        self.max_bytes = max_bytes
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+
+    def scan_text(self, text: str) -> dict[str, list[str]]:
+        lowered = text.lower()
+        hits = {}
+        for p in self.patterns:
+            if p.hints and not any(h in lowered for h in p.hints):
+                continue
+            found = p.regex.findall(text)
+            if found:
+                hits[p.name] = found
+        return hits
+
+    def _scan_file(self, path: str) -> dict[str, list[str]]:
+        text = read_text_capped(path, self.max_bytes)
+        return self.scan_text(text) if text else {}
+
+    def scan(self, paths) -> dict[str, dict[str, list[str]]]:
+        """{path: {pattern_name: [captures]}} for every path (empty dict if nothing matched)."""
+        unique = list(dict.fromkeys(paths))
+        if len(unique) <= 1 or self.workers <= 1:
+            return {p: self._scan_file(p) for p in unique}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(unique))) as pool:
+            return dict(zip(unique, pool.map(self._scan_file, unique)))
@@ -0,0 +1,128 @@
+"""
+Dependency classifier backed by configs/dependency_catalog.json.
+
+The catalog maps package names from any ecosystem (npm, PyPI, Go modules,
+Maven group:artifact, crates.io) to a database category, a framework or a
+cloud provider. It is compiled once per process into one exact-name dict
+plus one prefix dict, so classifying a dependency is a handful of dict
+lookups whatever the catalog size. New packages or ecosystems only need a
+catalog edit.
+
+Keys ending in `*` are prefix rules. `@aws-sdk/*`, `github.com/jackc/pgx/*`
+and `google-cloud*` match at `/ : - .` boundaries.
+
+Usage:
+    from src.tools.dependency_catalog import get_catalog
+
+    catalog = get_catalog()
+    catalog.database("ioredis")              # -> ("cache", "Redis")
+    catalog.frameworks(["vite", "react"])    # -> ["React", "Vite"]
+    catalog.clouds(["@aws-sdk/client-s3"])   # -> {"aws"}
+"""
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+
+from src.utils.constants import DEPENDENCY_CATALOG
+
+CATALOG_FORMAT_VERSION = 1
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_BOUNDARY_RE = re.compile(r"[/:\-.]")
+
+
+@dataclass(frozen=True)
+class Classification:
+    kind: str       # "database" | "framework" | "cloud"
+    category: str   # database category ("rdbms", "cache", ...), or the provider for "cloud"
+    label: str      # human name, e.g. "PostgreSQL"
+    order: int      # position in the catalog; frameworks are reported in this order
+
+
+class DependencyCatalog:
+    """Compiled lookup tables: {name: {kind: Classification}} for exact and prefix keys."""
+
+    def __init__(self, data: dict, source: str = "<dict>"):
+        if data.get("format_version") != CATALOG_FORMAT_VERSION:
+            raise ValueError(
+                f"Dependency catalog {source} has format {data.get('format_version')}, "
+                f"expected {CATALOG_FORMAT_VERSION}"
+            )
+        self.version = data.get("version", "unversioned")
+        self._exact: dict[str, dict[str, Classification]] = {}
+        self._prefix: dict[str, dict[str, Classification]] = {}
+        order = 0
+        for category, entries in data.get("databases", {}).items():
+            for key, label in entries.items():
+                self._add(key, Classification("database", category, label, order))
+                order += 1
+        for key, label in data.get("frameworks", {}).items():
+            self._add(key, Classification("framework", "", label, order))
+            order += 1
+        for provider, keys in data.get("cloud", {}).items():
+            for key in keys:
+                self._add(key, Classification("cloud", provider, provider, order))
+                order += 1
+
+    def _add(self, key: str, c: Classification):
+        if key.endswith("*"):
+            # "@aws-sdk/*" and "aws-sdk*" both compile to the cut point "@aws-sdk" / "aws-sdk"
+            key = key[:-1]
+            if key and _BOUNDARY_RE.fullmatch(key[-1]):
+                key = key[:-1]
+            table = self._prefix
+        else:
+            table = self._exact
+        # First entry wins, as with the old first-map-that-matches probing
+        table.setdefault(key, {}).setdefault(c.kind, c)
+
+    @classmethod
+    def load(cls, path: str | None = None) -> "DependencyCatalog":
+        path = path or DEPENDENCY_CATALOG
+        if not os.path.isabs(path) and not os.path.exists(path):
+            path = os.path.join(_REPO_ROOT, path)
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), path)
+
+    def classify(self, dep: str) -> dict[str, Classification]:
+        """{kind: Classification} for one dependency; exact names beat prefixes, longer prefixes beat shorter."""
+        found = dict(self._exact.get(dep, {}))
+        if self._prefix:
+            # The dependency itself, then each cut at a boundary, longest first
+            cuts = [dep] + [dep[:m.start()] for m in reversed(list(_BOUNDARY_RE.finditer(dep)))]
+            for cut in cuts:
+                for kind, c in self._prefix.get(cut, {}).items():
+                    found.setdefault(kind, c)
+        return found
+
+    def database(self, dep: str) -> tuple[str, str] | None:
+        """(category, name) if `dep` is a database/cache/broker client."""
+        c = self.classify(dep).get("database")
+        return (c.category, c.label) if c else None
+
+    def frameworks(self, deps) -> list[str]:
+        """Framework names found in `deps`, de-duplicated, in catalog priority order."""
+        hits = {}
+        for dep in deps:
+            c = self.classify(dep).get("framework")
+            if c and (c.label not in hits or c.order < hits[c.label]):
+                hits[c.label] = c.order
+        return sorted(hits, key=hits.get)
+
+    def clouds(self, deps) -> set[str]:
+        return {c.category for dep in deps if (c := self.classify(dep).get("cloud"))}
+
+
+_CATALOG: DependencyCatalog | None = None
+_CATALOG_LOCK = threading.Lock()
+
+
+def get_catalog() -> DependencyCatalog:
+    """The process-wide catalog, compiled on first use."""
+    global _CATALOG
+    with _CATALOG_LOCK:
+        if _CATALOG is None:
+            _CATALOG = DependencyCatalog.load()
+        return _CATALOG
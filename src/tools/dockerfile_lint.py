@@ -0,0 +1,295 @@
+"""
+In-process Dockerfile linter implementing the hadolint rules drafts hit most.
+
+Runs over the parsed instruction list from src/policy/documents.py and
+reports hadolint's own rule IDs, levels and messages, formatted like
+hadolint output (`Dockerfile:3 DL3008 warning: ...`), so review reports and
+the Healer's prompts read the same whichever linter produced them.
+Linting a draft takes microseconds; hadolint stays the final gate for
+drafts that pass here.
+
+`# hadolint ignore=DL3008,DL3015` on the line(s) above an instruction
+suppresses those rules for it, as in hadolint.
+
+Usage:
+    from src.tools.dockerfile_lint import lint_dockerfile
+
+    for finding in lint_dockerfile(content):
+        print(finding.format("Dockerfile"))
+"""
+
+import re
+import shlex
+
+from src.policy.documents import Instruction, parse_dockerfile
+from src.tools.batch_validate import ToolFinding
+
+LINTER_NAME = "dockerfile-lint"
+
+_IGNORE = re.compile(r"^\s*#\s*hadolint\s+ignore\s*=\s*([A-Z0-9,\s]+)", re.IGNORECASE)
+_SEPARATORS = {"&&", "||", ";", "|", "&"}
+_ARCHIVE = re.compile(r"\.(tar|tar\.gz|tgz|tar\.bz2|tbz2?|tar\.xz|txz|zip|gz|bz2|xz)$")
+_ROOT_USERS = {"root", "0", "0:0", "root:root"}
+_POSIX_SHELLS = {"sh", "bash", "ash", "dash", "zsh"}
+
+# Option flags that consume the next token, so it isn't mistaken for a package name
+_APK_VALUE_FLAGS = {"-t", "--virtual", "-X", "--repository", "-p", "--root", "--arch"}
+_PIP_VALUE_FLAGS = {"-r", "--requirement", "-c", "--constraint", "-e", "--editable", "-i", "--index-url",
+                    "--extra-index-url", "-t", "--target", "-f", "--find-links", "--prefix", "--root",
+                    "--trusted-host", "--platform", "--python-version", "--implementation", "--abi"}
+_PIP_PINNED = ("==", ">=", "<=", "~=", "!=", "===", "@")
+
+MESSAGES = {
+    "DL3000": ("error", "Use absolute WORKDIR"),
+    "DL3002": ("warning", "Last USER should not be root"),
+    "DL3003": ("warning", "Use WORKDIR to switch to a directory"),
+    "DL3004": ("error", "Do not use sudo as it leads to unpredictable behavior. Use a tool like gosu to enforce root"),
+    "DL3006": ("warning", "Always tag the version of an image explicitly"),
+    "DL3007": ("warning", "Using latest is prone to errors if the image will ever update. "
+                          "Pin the version explicitly to a release tag"),
+    "DL3008": ("warning", "Pin versions in apt get install. Instead of `apt-get install <package>` "
+                          "use `apt-get install <package>=<version>`"),
+    "DL3009": ("info", "Delete the apt-get lists after installing something"),
+    "DL3013": ("warning", "Pin versions in pip. Instead of `pip install <package>` "
+                          "use `pip install <package>==<version>` or `pip install --requirement <requirements file>`"),
+    "DL3014": ("warning", "Use the `-y` switch to avoid manual input `apt-get -y install <package>`"),
+    "DL3015": ("info", "Avoid additional packages by specifying `--no-install-recommends`"),
+    "DL3016": ("warning", "Pin versions in npm. Instead of `npm install <package>` use `npm install <package>@<version>`"),
+    "DL3018": ("warning", "Pin versions in apk add. Instead of `apk add <package>` use `apk add <package>=<version>`"),
+    "DL3019": ("info", "Use the `--no-cache` switch to avoid the need to use `--update` and remove "
+                       "`/var/cache/apk/*` when done installing packages"),
+    "DL3020": ("error", "Use COPY instead of ADD for files and folders"),
+    "DL3025": ("warning", "Use arguments JSON notation for CMD and ENTRYPOINT arguments"),
+    "DL3027": ("warning", "Do not use apt as it is meant to be a end-user tool, use apt-get or apt-cache instead"),
+    "DL3042": ("warning", "Avoid use of cache directory with pip. Use `pip install --no-cache-dir <package>`"),
+    "DL4000": ("error", "MAINTAINER is deprecated"),
+    "DL4003": ("warning", "Multiple `CMD` instructions found. If you list more than one `CMD` "
+                          "then only the last `CMD` will take effect"),
+    "DL4004": ("error", "Multiple `ENTRYPOINT` instructions found. If you list more than one `ENTRYPOINT` "
+                        "then only the last `ENTRYPOINT` will take effect"),
+    "DL4006": ("warning", "Set the SHELL option -o pipefail before RUN with a pipe in it. If you are using "
+                          "/bin/sh in an alpine image or if your shell is symlinked to busybox then consider "
+                          "explicitly setting your SHELL to /bin/ash, or disable this check"),
+}
+
+
+# ─── Shell helpers ───────────────────────────────────────────────
+
+def _tokens(script: str) -> list[str]:
+    lexer = shlex.shlex(script, posix=True, punctuation_chars=";&|")
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    try:
+        return list(lexer)
+    except ValueError:  # unbalanced quotes: fall back to a plain split
+        return script.split()
+
+
+def _commands(script: str) -> list[list[str]]:
+    """Simple commands of a shell script, split on && || ; | &."""
+    commands, current = [], []
+    for tok in _tokens(script):
+        if tok in _SEPARATORS:
+            if current:
+                commands.append(current)
+            current = []
+        else:
+            current.append(tok)
+    if current:
+        commands.append(current)
+    return commands
+
+
+def _strip_prefix(cmd: list[str]) -> list[str]:
+    """Drop env assignments and sudo/command wrappers in front of the program."""
+    i = 0
+    while i < len(cmd) and ("=" in cmd[i] and not cmd[i].startswith("-") or cmd[i] in ("sudo", "command", "exec")):
+        i += 1
+    return cmd[i:]
+
+
+def _args_after(cmd: list[str], sub: set[str],
+                value_flags: set[str] = frozenset()) -> tuple[list[str], list[str]] | None:
+    """(flags, positional args) after the first `sub` word, or None if `cmd` has no such subcommand."""
+    for i, tok in enumerate(cmd[1:], 1):
+        if tok in sub:
+            flags, args = [], []
+            rest = cmd[i + 1:]
+            skip = False
+            for arg in rest:
+                if skip:
+                    skip = False
+                    continue
+                if arg.startswith("-"):
+                    flags.append(arg)
+                    skip = arg in value_flags
+                else:
+                    args.append(arg)
+            return flags, args
+    return None
+
+
+# ─── Linter ──────────────────────────────────────────────────────
+
+class _Linter:
+    def __init__(self, content: str):
+        self.content = content
+        self.instructions = parse_dockerfile(content).instructions
+        self.findings: list[ToolFinding] = []
+        self.suppressed = self._suppressed()
+        self.pip_no_cache = False   # ENV PIP_NO_CACHE_DIR=... satisfies DL3042
+
+    def _suppressed(self) -> dict[int, set[str]]:
+        """{instruction line: rule IDs} from `# hadolint ignore=` comments since the previous instruction."""
+        pragmas = {}
+        for lineno, raw in enumerate(self.content.splitlines(), 1):
+            m = _IGNORE.match(raw)
+            if m:
+                pragmas[lineno] = {c.strip().upper() for c in m.group(1).split(",") if c.strip()}
+        out: dict[int, set[str]] = {}
+        prev = 0
+        for ins in self.instructions:
+            for line, codes in pragmas.items():
+                if prev < line < ins.line:
+                    out.setdefault(ins.line, set()).update(codes)
+            prev = ins.line
+        return out
+
+    def report(self, code: str, ins: Instruction):
+        if code in self.suppressed.get(ins.line, ()):
+            return
+        level, message = MESSAGES[code]
+        self.findings.append(ToolFinding(LINTER_NAME, code, level, message, ins.line))
+
+    def run(self) -> list[ToolFinding]:
+        stage_names: set[str] = set()
+        shell_pipefail = False
+        last_user: Instruction | None = None
+        cmds: list[Instruction] = []
+        entrypoints: list[Instruction] = []
+
+        for ins in self.instructions:
+            cmd = ins.cmd
+            if cmd == "from":
+                self._check_from(ins, stage_names)
+                if len(ins.value) >= 3 and ins.value[1].lower() == "as":
+                    stage_names.add(ins.value[2].lower())
+                shell_pipefail = False
+                last_user = None
+                cmds, entrypoints = [], []
+            elif cmd == "run":
+                self._check_run(ins, shell_pipefail)
+            elif cmd == "shell":
+                shell = ins.value[0].rsplit("/", 1)[-1] if ins.value else ""
+                shell_pipefail = "pipefail" in ins.value or shell not in _POSIX_SHELLS
+            elif cmd == "user":
+                last_user = ins
+            elif cmd == "workdir":
+                path = ins.value[0] if ins.value else ""
+                if path and not (path.startswith("/") or path.startswith("$") or re.match(r"^[A-Za-z]:[\\/]", path)):
+                    self.report("DL3000", ins)
+            elif cmd == "add":
+                srcs = ins.value[:-1]
+                if srcs and not any(s.startswith(("http://", "https://")) or _ARCHIVE.search(s) for s in srcs):
+                    self.report("DL3020", ins)
+            elif cmd in ("cmd", "entrypoint"):
+                if not ins.json and ins.value:
+                    self.report("DL3025", ins)
+                (cmds if cmd == "cmd" else entrypoints).append(ins)
+                if cmd == "cmd" and len(cmds) == 2:
+                    self.report("DL4003", ins)
+                if cmd == "entrypoint" and len(entrypoints) == 2:
+                    self.report("DL4004", ins)
+            elif cmd == "env":
+                if "PIP_NO_CACHE_DIR" in ins.value[::2]:
+                    self.pip_no_cache = True
+            elif cmd == "maintainer":
+                self.report("DL4000", ins)
+
+        if last_user is not None and " ".join(last_user.value) in _ROOT_USERS:
+            self.report("DL3002", last_user)
+        return self.findings
+
+    def _check_from(self, ins: Instruction, stage_names: set[str]):
+        if not ins.value:
+            return
+        image = ins.value[0]
+        if image == "scratch" or image.lower() in stage_names or "$" in image or "@" in image:
+            return
+        tag = image.rsplit("/", 1)[-1].partition(":")[2]
+        if not tag:
+            self.report("DL3006", ins)
+        elif tag == "latest":
+            self.report("DL3007", ins)
+
+    def _check_run(self, ins: Instruction, shell_pipefail: bool):
+        script = " ".join(ins.value)
+        if ins.json:
+            return  # exec form has no shell
+        commands = [_strip_prefix(c) for c in _commands(script)]
+        tokens = _tokens(script)
+        if "sudo" in tokens:
+            self.report("DL3004", ins)
+        if "|" in tokens and not shell_pipefail:
+            self.report("DL4006", ins)
+
+        apt_installed = False
+        for c in commands:
+            if not c:
+                continue
+            prog = c[0].rsplit("/", 1)[-1]
+            if prog == "cd":
+                self.report("DL3003", ins)
+            elif prog == "apt":
+                self.report("DL3027", ins)
+            elif prog == "apt-get":
+                parsed = _args_after(c, {"install"}, {"-o", "-t", "--target-release"})
+                if parsed is None:
+                    continue
+                flags, pkgs = parsed
+                apt_installed = True
+                all_flags = flags + [t for t in c[1:c.index("install")] if t.startswith("-")]
+                if any(p for p in pkgs if "=" not in p and not p.endswith(".deb") and "/" not in p and "$" not in p):
+                    self.report("DL3008", ins)
+                if not any(f in ("-y", "--yes", "-qq", "--assume-yes") or re.fullmatch(r"-[a-z]*y[a-z]*", f)
+                           for f in all_flags):
+                    self.report("DL3014", ins)
+                if "--no-install-recommends" not in all_flags and not any(
+                        "Install-Recommends=false" in t for t in c):
+                    self.report("DL3015", ins)
+            elif prog == "apk":
+                parsed = _args_after(c, {"add"}, _APK_VALUE_FLAGS)
+                if parsed is None:
+                    continue
+                flags, pkgs = parsed
+                if any(p for p in pkgs if "=" not in p and "$" not in p and not p.endswith(".apk")):
+                    self.report("DL3018", ins)
+                if "--no-cache" not in flags:
+                    self.report("DL3019", ins)
+            elif re.fullmatch(r"pip[0-9.]*", prog) or (prog.startswith("python") and c[1:3] == ["-m", "pip"]):
+                parsed = _args_after(c, {"install"}, _PIP_VALUE_FLAGS)
+                if parsed is None:
+                    continue
+                flags, pkgs = parsed
+                if not any(f in ("-r", "--requirement") or f.startswith("--requirement=") for f in flags):
+                    if any(not any(op in p for op in _PIP_PINNED) and not p.startswith((".", "/", "git+"))
+                           and not p.endswith((".whl", ".tar.gz", ".zip")) and "$" not in p for p in pkgs):
+                        self.report("DL3013", ins)
+                if "--no-cache-dir" not in flags and not self.pip_no_cache:
+                    self.report("DL3042", ins)
+            elif prog == "npm":
+                parsed = _args_after(c, {"install", "i", "add"})
+                if parsed is None:
+                    continue
+                _, pkgs = parsed
+                if any("@" not in p.lstrip("@") and not p.startswith((".", "/", "git", "http")) and "$" not in p
+                       for p in pkgs):
+                    self.report("DL3016", ins)
+
+        if apt_installed and "/var/lib/apt/lists" not in script:
+            self.report("DL3009", ins)
+
+
+def lint_dockerfile(content: str) -> list[ToolFinding]:
+    """hadolint-compatible findings for one Dockerfile, in instruction order."""
+    return _Linter(content).run()
@@ -0,0 +1,179 @@
+"""
+In-memory index of a project tree, built from one pruned directory walk.
+
+CodeAnalysisAgent builds the index once and every detector reads from it,
+so analysis costs a single traversal plus targeted reads of the files the
+detectors actually need. Ignored directories (see src/tools/ignore.py) are
+never entered.
+
+Usage:
+    from src.tools.file_index import FileIndex
+
+    index = FileIndex.build("/path/to/project")
+    for entry in index.named("package.json"):
+        print(entry.path, entry.size)
+"""
+
+import os
+import stat
+import subprocess
+from dataclasses import dataclass
+
+from src.tools.ignore import IgnoreMatcher
+
+# The agent's own state files in the analyzed project; never analysis input
+SKIP_FILES = frozenset({".devops_context.json", ".devops_analysis_cache.json", ".devops_memory.json"})
+
+
+@dataclass(frozen=True, slots=True)
+class FileEntry:
+    path: str           # relative to the index root, "/"-separated
+    size: int
+    mtime: float
+    type: str = "file"  # "file" | "symlink"
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self) -> str:
+        """Containing directory relative to the root ("" for top-level files)."""
+        return self.path.rsplit("/", 1)[0] if "/" in self.path else ""
+
+
+class FileIndex:
+    """Files (with size/mtime) and directories under `root`, queryable by name, suffix and directory."""
+
+    def __init__(self, root: str, files: list[FileEntry], dirs: list[str]):
+        self.root = root
+        self.files = sorted(files, key=lambda e: e.path)
+        self.dirs = sorted(set(dirs))
+        self._by_path = {e.path: e for e in self.files}
+        self._by_name: dict[str, list[FileEntry]] = {}
+        self._by_dir: dict[str, list[FileEntry]] = {}
+        for e in self.files:
+            self._by_name.setdefault(e.name, []).append(e)
+            self._by_dir.setdefault(e.parent, []).append(e)
+        self._dir_set = set(self.dirs)
+
+    @classmethod
+    def build(cls, root: str, ignore: IgnoreMatcher | None = None,
+              skip_files: frozenset[str] = SKIP_FILES) -> "FileIndex":
+        """Walks `root` once with os.scandir, never descending into ignored directories.
+
+        `ignore` defaults to IgnoreMatcher.for_project(root); nested .gitignore
+        files are added to it as the walk reaches their directory.
+        """
+        ignore = ignore if ignore is not None else IgnoreMatcher.for_project(root)
+        files: list[FileEntry] = []
+        dirs: list[str] = [""]
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            if rel_dir and any(e.name == ".gitignore" for e in entries):
+                ignore.add_file(os.path.join(root, rel_dir, ".gitignore"), base=rel_dir)
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not ignore.match(rel, is_dir=True):
+                            dirs.append(rel)
+                            stack.append(rel)
+                        continue
+                    if entry.name in skip_files or ignore.match(rel, is_dir=False):
+                        continue
+                    is_link = entry.is_symlink()
+                    st = entry.stat(follow_symlinks=True) if is_link else entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue  # dangling symlink or vanished file
+                if is_link and not os.path.isfile(entry.path):
+                    continue
+                files.append(FileEntry(rel, st.st_size, st.st_mtime, "symlink" if is_link else "file"))
+        return cls(root, files, dirs)
+
+    @classmethod
+    def build_context(cls, root: str, skip_files: frozenset[str] = SKIP_FILES) -> "FileIndex":
+        """The files `docker build` would send from `root`: the walk with the root .dockerignore applied."""
+        return cls.build(root, IgnoreMatcher.for_project(root, use_dockerignore=True), skip_files)
+
+    @classmethod
+    def from_git(cls, root: str, ignore: IgnoreMatcher | None = None,
+                 skip_files: frozenset[str] = SKIP_FILES) -> "FileIndex":
+        """Index of the files git tracks under `root`: no directory walk, no untracked build output.
+
+        Tracked files are kept even if a .gitignore matches them (as git does);
+        built-in vendor directories still apply.
+        Raises OSError / CalledProcessError if git or the repository is unavailable.
+        """
+        ignore = ignore if ignore is not None else IgnoreMatcher.for_project(root, use_gitignore=False)
+        files: list[FileEntry] = []
+        dirs: set[str] = {""}
+        for rel in _git(root, "ls-files", "-z", "--cached"):
+            if rel.rsplit("/", 1)[-1] in skip_files or ignore.is_ignored(rel):
+                continue
+            try:
+                st = os.stat(os.path.join(root, rel))
+            except OSError:
+                continue  # deleted in the working tree
+            if not stat.S_ISREG(st.st_mode):
+                continue  # submodule
+            files.append(FileEntry(rel, st.st_size, st.st_mtime))
+            parts = rel.split("/")
+            dirs.update("/".join(parts[:i]) for i in range(1, len(parts)))
+        return cls(root, files, list(dirs))
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def get(self, path: str) -> FileEntry | None:
+        return self._by_path.get(path)
+
+    def named(self, *names: str) -> list[FileEntry]:
+        """All files whose basename is one of `names`, in path order."""
+        if len(names) == 1:
+            return list(self._by_name.get(names[0], []))
+        return sorted((e for n in set(names) for e in self._by_name.get(n, [])), key=lambda e: e.path)
+
+    def with_suffix(self, *suffixes: str) -> list[FileEntry]:
+        return [e for e in self.files if e.name.endswith(suffixes)]
+
+    def children(self, rel_dir: str) -> list[FileEntry]:
+        """Files directly inside `rel_dir` ("" for the root)."""
+        return list(self._by_dir.get(rel_dir, []))
+
+    def has_dir(self, rel_dir: str) -> bool:
+        return rel_dir in self._dir_set
+
+    def abspath(self, path: str) -> str:
+        return os.path.join(self.root, *path.split("/"))
+
+    def listing(self) -> str:
+        """Newline-joined relative file paths."""
+        return "\n".join(e.path for e in self.files)
+
+
+def _git(root: str, *args: str) -> list[str]:
+    """NUL-separated output of a git command run in `root` (paths relative to it)."""
+    out = subprocess.run(["git", "-C", root, *args], capture_output=True, check=True).stdout
+    return sorted({p for p in out.decode("utf-8", errors="surrogateescape").split("\0") if p})
+
+
+def git_changed_files(root: str, base: str) -> set[str]:
+    """Paths under `root` (relative to it) that differ between `base` and the working tree."""
+    return set(_git(root, "diff", "--name-only", "-z", "--relative", base))
+
+
+def git_head(root: str) -> str:
+    """Commit sha of HEAD in the repository containing `root`."""
+    return subprocess.run(["git", "-C", root, "rev-parse", "HEAD"], capture_output=True, check=True,
+                          text=True).stdout.strip()
+
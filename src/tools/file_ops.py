@@ -1,5 +1,7 @@
 import os
 
+from src.tools.file_index import FileIndex
+
 def read_file(path: str) -> str:
     with open(path, "r", encoding="utf-8") as f:
         return f.read()
@@ -11,11 +13,8 @@ def write_file(path: str, content: str) -> None:
     with open(path, "w", encoding="utf-8") as f:
         f.write(content)
 
-def scan_directory(path: str) -> str:
-    entries = []
-    for root, dirs, files in os.walk(path):
-        for name in files:
-            rel = os.path.relpath(os.path.join(root, name), path)
-            entries.append(rel)
-    entries.sort()
-    return "\n".join(entries)
+def scan_directory(path: str, index=None) -> str:
+    """Sorted relative file paths under `path`. Pass a prebuilt FileIndex to avoid walking again."""
+    if index is None:
+        index = FileIndex.build(path)
+    return index.listing()
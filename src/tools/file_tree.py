@@ -0,0 +1,126 @@
+"""
+Compact, bounded view of a project's file tree for prompts.
+
+The full FileIndex can hold hundreds of thousands of paths. Prompts get a
+directory-level summary instead: file counts, sizes and extension mix per
+directory, real file names only near the top of the tree, and hard limits
+on depth, names per directory and total lines.
+
+Usage:
+    from src.tools.file_tree import summarize_tree, render_tree
+
+    tree = summarize_tree(index)
+    print(render_tree(tree))
+"""
+
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+
+from src.tools.file_index import FileIndex
+
+TREE_MAX_DEPTH = 3            # directories below this depth are folded into their ancestor
+TREE_MAX_FILES_PER_DIR = 8    # file names listed per directory before "+N more"
+TREE_MAX_LINES = 120          # hard cap on the rendered summary
+TREE_TOP_EXTENSIONS = 4       # extensions shown per directory aggregate
+
+
+@dataclass
+class DirSummary:
+    path: str                                       # "" for the project root
+    files: int = 0                                  # recursive file count
+    bytes: int = 0                                  # recursive size
+    extensions: Counter = field(default_factory=Counter)
+    direct_files: list = field(default_factory=list)
+    subdirs: list = field(default_factory=list)
+
+    @property
+    def depth(self) -> int:
+        return 0 if not self.path else self.path.count("/") + 1
+
+    def ext_mix(self, n: int = TREE_TOP_EXTENSIONS) -> str:
+        return ", ".join(f"{ext} {count}" for ext, count in self.extensions.most_common(n))
+
+
+def summarize_tree(index: FileIndex) -> dict[str, DirSummary]:
+    """Aggregates the index per directory (ignored paths never made it into the index)."""
+    dirs: dict[str, DirSummary] = {"": DirSummary("")}
+    for entry in index:
+        parent = entry.parent
+        # Create the directory chain and link each level to its parent
+        chain = parent.split("/") if parent else []
+        for i in range(len(chain)):
+            d = "/".join(chain[:i + 1])
+            if d not in dirs:
+                dirs[d] = DirSummary(d)
+                dirs["/".join(chain[:i])].subdirs.append(d)
+        dirs[parent].direct_files.append(entry.name)
+        ext = os.path.splitext(entry.name)[1] or entry.name
+        for i in range(len(chain) + 1):
+            d = dirs["/".join(chain[:i])]
+            d.files += 1
+            d.bytes += entry.size
+            d.extensions[ext] += 1
+    for d in dirs.values():
+        d.subdirs.sort()
+        d.direct_files.sort()
+    return dirs
+
+
+def _size(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def render_tree(tree: dict[str, DirSummary], max_depth: int = TREE_MAX_DEPTH,
+                max_files_per_dir: int = TREE_MAX_FILES_PER_DIR, max_lines: int = TREE_MAX_LINES) -> str:
+    """Indented directory summary, bounded by depth, names per directory and total lines."""
+    root = tree[""]
+    lines = [f"{root.files} files, {_size(root.bytes)} ({root.ext_mix()})"]
+    truncated = 0
+
+    def emit(line: str):
+        nonlocal truncated
+        if len(lines) >= max_lines:
+            truncated += 1
+        else:
+            lines.append(line)
+
+    def walk(d: DirSummary, indent: str):
+        names = d.direct_files
+        for name in names[:max_files_per_dir]:
+            emit(f"{indent}{name}")
+        if len(names) > max_files_per_dir:
+            emit(f"{indent}… +{len(names) - max_files_per_dir} more files")
+        for sub_path in d.subdirs:
+            sub = tree[sub_path]
+            label = sub_path.rsplit("/", 1)[-1]
+            if sub.depth >= max_depth and sub.subdirs:
+                emit(f"{indent}{label}/  [{sub.files} files, {len(sub.subdirs)} subdirs folded; {sub.ext_mix()}]")
+                continue
+            emit(f"{indent}{label}/  [{sub.files} files; {sub.ext_mix()}]")
+            walk(sub, indent + "  ")
+
+    walk(root, "")
+    if truncated:
+        lines.append(f"… {truncated} more entries omitted")
+    return "\n".join(lines)
+
+
+def tree_to_dict(tree: dict[str, DirSummary], max_depth: int = TREE_MAX_DEPTH,
+                 max_entries: int = TREE_MAX_LINES) -> dict:
+    """Per-directory aggregates down to `max_depth`; the biggest `max_entries` directories if there are more."""
+    dirs = [d for d in tree.values() if d.depth <= max_depth]
+    if len(dirs) > max_entries:
+        dirs = sorted(dirs, key=lambda d: (d.depth > 0, -d.files))[:max_entries]
+    return {
+        d.path or ".": {
+            "files": d.files,
+            "bytes": d.bytes,
+            "extensions": dict(d.extensions.most_common(TREE_TOP_EXTENSIONS)),
+            "subdirs": len(d.subdirs),
+        }
+        for d in sorted(dirs, key=lambda d: d.path)
+    }
@@ -0,0 +1,198 @@
+"""
+Compiled ignore rules shared by every project scanner.
+
+Rules come from a built-in vendor/build list, the project's .dockerignore
+and every .gitignore in the tree (each scoped to its own directory). They
+use gitignore semantics: last match wins, `!` re-includes, a trailing `/`
+matches directories only, and a leading or inner `/` anchors the pattern.
+
+Plain names (`node_modules`) are looked up in a dict and anchored literal
+paths (`/frontend/dist`) in a prefix trie. Only real globs fall back to
+regexes, so pruning a huge vendored tree costs one lookup per directory.
+
+Usage:
+    from src.tools.ignore import IgnoreMatcher
+
+    matcher = IgnoreMatcher.for_project("/repo")
+    matcher.match("web/node_modules", is_dir=True)     # -> True (this path only)
+    matcher.is_ignored("web/node_modules/x/index.js")   # -> True (checks ancestors)
+"""
+
+import os
+import re
+
+# Vendored dependencies, VCS metadata, caches and build output
+BUILTIN_IGNORES = (
+    ".git/", ".hg/", ".svn/",
+    "node_modules/", "bower_components/", "jspm_packages/",
+    "venv/", ".venv/", "__pycache__/", ".tox/", ".nox/", ".mypy_cache/", ".pytest_cache/", ".ruff_cache/",
+    "dist/", "build/", ".next/", ".nuxt/", ".svelte-kit/", ".parcel-cache/", ".turbo/",
+    "target/", ".gradle/", ".terraform/", ".serverless/",
+)
+
+# Files the analysis must see even when a project ignores them (e.g. `Dockerfile` in .dockerignore)
+ALWAYS_KEEP = frozenset({
+    "Dockerfile", ".dockerignore", ".gitignore",
+    "docker-compose.yml", "docker-compose.yaml", ".github",
+})
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """gitignore glob -> regex fragment (no anchors)."""
+    out, i, n = [], 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape("["))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+class IgnoreMatcher:
+    """Ordered ignore rules compiled into name lookups, an anchored-path trie and glob regexes."""
+
+    def __init__(self):
+        self._count = 0
+        # basename -> [(rule index, base dir, negate, dir_only)]
+        self._names: dict[str, list[tuple]] = {}
+        # nested dicts keyed by path component; "\0" holds [(rule index, negate, dir_only)]
+        self._trie: dict = {}
+        # [(rule index, compiled regex, match_basename, base dir, negate, dir_only)]
+        self._globs: list[tuple] = []
+        self._cache: dict[str, bool] = {}
+
+    @classmethod
+    def for_project(cls, root: str, builtin=BUILTIN_IGNORES,
+                    use_gitignore: bool = True, use_dockerignore: bool = False) -> "IgnoreMatcher":
+        """Built-ins, then (optionally) the root .dockerignore, then the root .gitignore.
+
+        .dockerignore describes the Docker build context, not the project source, so it is
+        only applied on request (see FileIndex.build_context). Nested .gitignore files are
+        added by the walker as it reaches them (see FileIndex.build).
+        """
+        matcher = cls()
+        matcher.add_patterns(builtin)
+        if use_dockerignore:
+            # Docker resolves every pattern against the context root
+            matcher.add_file(os.path.join(root, ".dockerignore"), anchored=True)
+        if use_gitignore:
+            matcher.add_file(os.path.join(root, ".gitignore"))
+        return matcher
+
+    def add_file(self, path: str, base: str = "", anchored: bool = False) -> bool:
+        """Adds the patterns in `path` (if it exists), scoped to `base`. Returns whether it was read."""
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                self.add_patterns(f.read().splitlines(), base, anchored)
+        except OSError:
+            return False
+        return True
+
+    def add_patterns(self, lines, base: str = "", anchored: bool = False):
+        for raw in lines:
+            line = raw.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.strip("/") if anchored else line.rstrip("/")
+            if not line:
+                continue
+            if line.startswith("/") or "/" in line or anchored:
+                self._add_anchored(line.lstrip("/"), base, negate, dir_only)
+            elif _GLOB_CHARS.search(line) or "\\" in line:
+                regex = re.compile(_glob_to_regex(line) + r"\Z")
+                self._globs.append((self._count, regex, True, base, negate, dir_only))
+            else:
+                self._names.setdefault(line, []).append((self._count, base, negate, dir_only))
+            self._count += 1
+        self._cache.clear()
+
+    def _add_anchored(self, pattern: str, base: str, negate: bool, dir_only: bool):
+        full = f"{base}/{pattern}" if base else pattern
+        if _GLOB_CHARS.search(full) or "\\" in full:
+            regex = re.compile(_glob_to_regex(full) + r"\Z")
+            self._globs.append((self._count, regex, False, "", negate, dir_only))
+            return
+        node = self._trie
+        for part in full.split("/"):
+            node = node.setdefault(part, {})
+        node.setdefault("\0", []).append((self._count, negate, dir_only))
+
+    def match(self, rel_path: str, is_dir: bool) -> bool:
+        """Whether this exact path is ignored (its ancestors are not checked)."""
+        name = rel_path.rsplit("/", 1)[-1]
+        if name in ALWAYS_KEEP:
+            return False
+        best, ignored = -1, False
+
+        for idx, base, negate, dir_only in self._names.get(name, ()):
+            if idx > best and (is_dir or not dir_only) and (not base or rel_path.startswith(base + "/")):
+                best, ignored = idx, not negate
+
+        node = self._trie
+        for part in rel_path.split("/"):
+            node = node.get(part)
+            if node is None:
+                break
+        else:
+            for idx, negate, dir_only in node.get("\0", ()):
+                if idx > best and (is_dir or not dir_only):
+                    best, ignored = idx, not negate
+
+        # Later rules win; stop once the remaining globs are older than the best match
+        for idx, regex, basename_only, base, negate, dir_only in reversed(self._globs):
+            if idx <= best:
+                break
+            if dir_only and not is_dir:
+                continue
+            if base and not rel_path.startswith(base + "/"):
+                continue
+            if regex.match(name if basename_only else rel_path):
+                best, ignored = idx, not negate
+                break
+        return ignored
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Whether `rel_path` or any directory above it is ignored (for paths not found by walking)."""
+        parts = rel_path.split("/")
+        for i in range(1, len(parts)):
+            parent = "/".join(parts[:i])
+            hit = self._cache.get(parent)
+            if hit is None:
+                hit = self._cache[parent] = self.match(parent, is_dir=True)
+            if hit:
+                return True
+        return self.match(rel_path, is_dir)
@@ -0,0 +1,229 @@
+"""
+Offline Kubernetes JSON Schema validation.
+
+Schemas come from a local, versioned cache laid out like kubeconform's
+schema repository (fill it once with scripts/fetch_k8s_schemas.py):
+
+    schemas/kubernetes/v1.29.0-standalone-strict/deployment-apps-v1.json
+    schemas/kubernetes/v1.29.0-standalone-strict/service-v1.json
+
+Manifests are validated in-process against those schemas; each schema is
+loaded and compiled once per process. `jsonschema` is used when it is
+installed, otherwise a built-in validator covering the keywords of the
+standalone (dereferenced) schemas. The same cache is handed to kubeconform
+through `-schema-location`, so the final kubeconform gate never touches
+the network either.
+
+KUBERNETES_VERSION picks the schema set (default 1.29.0) and
+K8S_SCHEMA_DIR the cache root (default schemas/kubernetes).
+
+Usage:
+    from src.tools.k8s_schema import get_schema_store
+
+    store = get_schema_store()
+    if store.available:
+        findings = store.validate(manifest_yaml)
+"""
+
+import json
+import os
+import threading
+
+import yaml
+
+from src.tools.batch_validate import ToolFinding
+
+DEFAULT_KUBERNETES_VERSION = "1.29.0"
+DEFAULT_SCHEMA_DIR = "schemas/kubernetes"
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import jsonschema
+except ImportError:  # optional: the built-in validator covers the standalone schemas
+    jsonschema = None
+
+
+def normalize_version(version: str) -> str:
+    """'1.29' / 'v1.29.0' -> 'v1.29.0'; 'master' stays as is."""
+    v = version.strip().lstrip("v")
+    if v == "master":
+        return v
+    parts = v.split(".")
+    while len(parts) < 3:
+        parts.append("0")
+    return "v" + ".".join(parts)
+
+
+def schema_filename(kind: str, api_version: str) -> str:
+    """kubeconform's file name for a kind: Deployment + apps/v1 -> deployment-apps-v1.json."""
+    group, _, version = api_version.rpartition("/")
+    suffix = f"-{group.split('.')[0]}-{version}" if group else f"-{version}"
+    return f"{kind.lower()}{suffix}.json"
+
+
+# ─── Built-in validator ──────────────────────────────────────────
+
+_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def _path(parts) -> str:
+    return ".".join(str(p) for p in parts) or "(root)"
+
+
+class _BuiltinValidator:
+    """Subset of JSON Schema used by the standalone Kubernetes schemas (no $ref)."""
+
+    def __init__(self, schema: dict):
+        self.schema = schema
+
+    def errors(self, instance) -> list[str]:
+        out: list[str] = []
+        self._check(self.schema, instance, [], out)
+        return out
+
+    def _check(self, schema, value, path, out):
+        if not isinstance(schema, dict):
+            return
+        if schema.get("x-kubernetes-int-or-string") and isinstance(value, (int, str)) and not isinstance(value, bool):
+            return
+        types = schema.get("type")
+        if types is not None:
+            allowed = types if isinstance(types, list) else [types]
+            if not any(_TYPES.get(t, lambda v: True)(value) for t in allowed):
+                out.append(f"{_path(path)}: expected {' or '.join(allowed)}, got {type(value).__name__}")
+                return
+        if "enum" in schema and value not in schema["enum"]:
+            out.append(f"{_path(path)}: {value!r} is not one of {schema['enum']}")
+        for key in ("oneOf", "anyOf"):
+            if key in schema:
+                branches = [b for b in schema[key] if isinstance(b, dict)]
+                if branches and not any(not self._sub_errors(b, value, path) for b in branches):
+                    out.append(f"{_path(path)}: does not match any allowed schema")
+        for sub in schema.get("allOf", []):
+            self._check(sub, value, path, out)
+
+        if isinstance(value, dict):
+            props = schema.get("properties", {})
+            for name in schema.get("required", []):
+                if name not in value:
+                    out.append(f"{_path(path)}: missing required property '{name}'")
+            extra = schema.get("additionalProperties", True)
+            for name, item in value.items():
+                if name in props:
+                    self._check(props[name], item, path + [name], out)
+                elif extra is False:
+                    out.append(f"{_path(path)}: additional property '{name}' is not allowed")
+                elif isinstance(extra, dict):
+                    self._check(extra, item, path + [name], out)
+        elif isinstance(value, list) and isinstance(schema.get("items"), dict):
+            for idx, item in enumerate(value):
+                self._check(schema["items"], item, path + [idx], out)
+
+    def _sub_errors(self, schema, value, path) -> list[str]:
+        out: list[str] = []
+        self._check(schema, value, path, out)
+        return out
+
+
+class _JsonSchemaValidator:
+    def __init__(self, schema: dict):
+        cls = jsonschema.validators.validator_for(schema)
+        self._validator = cls(schema)
+
+    def errors(self, instance) -> list[str]:
+        return [f"{_path(e.absolute_path)}: {e.message}"
+                for e in sorted(self._validator.iter_errors(instance), key=lambda e: list(e.absolute_path))]
+
+
+# ─── Store ───────────────────────────────────────────────────────
+
+class SchemaStore:
+    """Strict schemas for one Kubernetes version, compiled on first use and kept."""
+
+    def __init__(self, root: str | None = None, kubernetes_version: str | None = None):
+        root = root or os.getenv("K8S_SCHEMA_DIR", DEFAULT_SCHEMA_DIR)
+        if not os.path.isabs(root):
+            root = os.path.join(_REPO_ROOT, root)
+        self.root = root
+        self.kubernetes_version = normalize_version(
+            kubernetes_version or os.getenv("KUBERNETES_VERSION", DEFAULT_KUBERNETES_VERSION))
+        self.directory = os.path.join(root, f"{self.kubernetes_version}-standalone-strict")
+        self._compiled: dict[str, object | None] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return os.path.isdir(self.directory)
+
+    def location_template(self) -> str:
+        """`-schema-location` value that makes kubeconform read this cache."""
+        return os.path.join(
+            self.root, "{{ .NormalizedKubernetesVersion }}-standalone{{ .StrictSuffix }}",
+            "{{ .ResourceKind }}{{ .KindSuffix }}.json",
+        )
+
+    def kubeconform_args(self) -> tuple[str, ...]:
+        """Offline kubeconform flags for this version; kinds without a cached schema are skipped."""
+        return ("-schema-location", self.location_template(),
+                "-kubernetes-version", self.kubernetes_version.lstrip("v"), "-ignore-missing-schemas")
+
+    def validator(self, kind: str, api_version: str):
+        """Compiled validator for a kind, or None if the cache has no schema for it."""
+        name = schema_filename(kind, api_version)
+        with self._lock:
+            if name not in self._compiled:
+                path = os.path.join(self.directory, name)
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        schema = json.load(f)
+                except (OSError, ValueError):
+                    self._compiled[name] = None
+                else:
+                    self._compiled[name] = (_JsonSchemaValidator if jsonschema else _BuiltinValidator)(schema)
+            return self._compiled[name]
+
+    def validate(self, content: str) -> list[ToolFinding]:
+        """Schema findings for every document of a manifest; kinds without a schema are skipped."""
+        try:
+            docs = [d for d in yaml.safe_load_all(content) if d is not None]
+        except yaml.YAMLError as e:
+            return [ToolFinding("k8s-schema", "invalid", "error", f"YAML parse error: {e}")]
+        findings = []
+        for doc in docs:
+            if not isinstance(doc, dict):
+                findings.append(ToolFinding("k8s-schema", "invalid", "error", "document is not a mapping"))
+                continue
+            kind, api_version = doc.get("kind"), doc.get("apiVersion")
+            if not kind or not api_version:
+                findings.append(ToolFinding("k8s-schema", "invalid", "error", "missing 'kind' or 'apiVersion'"))
+                continue
+            validator = self.validator(str(kind), str(api_version))
+            if validator is None:
+                continue
+            name = (doc.get("metadata") or {}).get("name", "") if isinstance(doc.get("metadata"), dict) else ""
+            resource = "/".join(p for p in (str(kind), str(name)) if p)
+            for message in validator.errors(doc):
+                findings.append(ToolFinding("k8s-schema", "invalid", "error", message, resource=resource))
+        return findings
+
+
+_STORES: dict[tuple, SchemaStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_schema_store(kubernetes_version: str | None = None) -> SchemaStore:
+    """The process-wide store for a version (default: KUBERNETES_VERSION)."""
+    key = (os.getenv("K8S_SCHEMA_DIR", DEFAULT_SCHEMA_DIR),
+           kubernetes_version or os.getenv("KUBERNETES_VERSION", DEFAULT_KUBERNETES_VERSION))
+    with _STORES_LOCK:
+        if key not in _STORES:
+            _STORES[key] = SchemaStore(*key)
+        return _STORES[key]
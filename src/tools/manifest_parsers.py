@@ -0,0 +1,681 @@
+"""
+Structured parsers for dependency manifests and lockfiles.
+
+Covers npm (package.json + package-lock / yarn / pnpm lockfiles), Python
+(pyproject.toml, requirements.txt, pip-tools output, poetry.lock, uv.lock),
+Go (go.mod, go.sum), Maven (pom.xml), Gradle (build.gradle[.kts],
+gradle.lockfile) and Cargo (Cargo.toml, Cargo.lock). Lockfiles are read line
+by line and never loaded whole, so a 50 MB package-lock.json costs one pass
+and the memory of the resulting name/version/edge tables.
+
+The result is one DependencySet per ecosystem. format_graph_summary() turns
+them into a few bounded lines (direct/dev/resolved counts, depth, duplicate
+versions, heaviest direct dependencies) for LLM context.
+
+Usage:
+    from src.tools.manifest_parsers import parse_project, format_graph_summary
+
+    sets = parse_project("/path/to/project")
+    print(format_graph_summary(sets))
+"""
+
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections import deque
+from dataclasses import dataclass, field
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+SUMMARY_MAX_DIRECT = 20        # direct dependency names listed per ecosystem
+SUMMARY_MAX_HEAVIEST = 5       # direct dependencies listed by transitive weight
+HEAVIEST_MAX_WORK = 2_000_000  # skip the per-dependency closure walk above (direct deps x resolved)
+
+# Root-level files parse_project() reads; a change to any of them re-runs the summary
+ROOT_MANIFEST_FILES = (
+    "package.json", "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml",
+    "pyproject.toml", "requirements.txt", "requirements.in", "poetry.lock", "uv.lock",
+    "go.mod", "go.sum",
+    "pom.xml", "build.gradle", "build.gradle.kts", "gradle.lockfile",
+    "Cargo.toml", "Cargo.lock",
+)
+
+
+@dataclass
+class DependencySet:
+    ecosystem: str                                            # "npm" | "python" | "go" | "maven" | "gradle" | "cargo"
+    manifest: str                                             # file the direct dependencies came from
+    direct: dict[str, str] = field(default_factory=dict)      # name -> version spec
+    dev: dict[str, str] = field(default_factory=dict)         # test/dev/optional groups
+    lockfile: str | None = None
+    resolved: dict[str, str] = field(default_factory=dict)    # name -> locked version (first seen)
+    edges: dict[str, set[str]] = field(default_factory=dict)  # name -> names it depends on
+    duplicates: set[str] = field(default_factory=set)         # names locked at more than one version
+    meta: dict[str, str] = field(default_factory=dict)        # module path, runtime version, ...
+    scripts: list[str] = field(default_factory=list)
+
+    def lock(self, name: str, version: str):
+        old = self.resolved.setdefault(name, version)
+        if old != version:
+            self.duplicates.add(name)
+
+    def depends(self, name: str, dep: str):
+        self.edges.setdefault(name, set()).add(dep)
+
+    def graph_stats(self) -> dict:
+        """Counts plus, when the lockfile has edges, depth and the heaviest direct dependencies."""
+        roots = [n for n in list(self.direct) + list(self.dev) if n in self.resolved or n in self.edges]
+        stats = {
+            "direct": len(self.direct), "dev": len(self.dev), "resolved": len(self.resolved),
+            "transitive": len(set(self.resolved) - set(self.direct) - set(self.dev)),
+            "duplicates": len(self.duplicates), "depth": 0, "heaviest": [],
+        }
+        if not self.edges or not roots:
+            return stats
+        depth = {n: 1 for n in roots}
+        queue = deque(roots)
+        while queue:
+            name = queue.popleft()
+            for dep in self.edges.get(name, ()):
+                if dep not in depth:
+                    depth[dep] = depth[name] + 1
+                    queue.append(dep)
+        stats["depth"] = max(depth.values())
+        if len(self.direct) * max(len(self.resolved), 1) <= HEAVIEST_MAX_WORK:
+            weights = [(len(self._closure(n)), n) for n in self.direct if n in self.edges]
+            stats["heaviest"] = [(n, w) for w, n in sorted(weights, key=lambda x: (-x[0], x[1]))
+                                 if w][:SUMMARY_MAX_HEAVIEST]
+        return stats
+
+    def _closure(self, root: str) -> set[str]:
+        seen, stack = set(), [root]
+        while stack:
+            for dep in self.edges.get(stack.pop(), ()):
+                if dep not in seen and dep != root:
+                    seen.add(dep)
+                    stack.append(dep)
+        return seen
+
+
+# ─── npm ────────────────────────────────────────────────────────────
+
+def parse_package_json(path: str) -> DependencySet:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    ds = DependencySet("npm", "package.json",
+                       direct=dict(data.get("dependencies") or {}),
+                       dev={**(data.get("optionalDependencies") or {}), **(data.get("devDependencies") or {})})
+    ds.scripts = list((data.get("scripts") or {}).keys())
+    if (data.get("engines") or {}).get("node"):
+        ds.meta["node"] = data["engines"]["node"]
+    if data.get("workspaces"):
+        ws = data["workspaces"]
+        ds.meta["workspaces"] = str(len(ws.get("packages", []) if isinstance(ws, dict) else ws))
+    return ds
+
+
+_JSON_KEY_OPEN = re.compile(r'^\s*"((?:[^"\\]|\\.)*)":\s*([\[{])\s*$')
+_JSON_KEY_SCALAR = re.compile(r'^\s*"((?:[^"\\]|\\.)*)":\s*(.*?),?\s*$')
+
+
+def _walk_pretty_json(f):
+    """Streams (object path, key, raw value) for each scalar in a pretty-printed JSON file."""
+    path: list[str] = []
+    for line in f:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped in ("{", "["):
+            path.append("")  # anonymous object/array, e.g. inside "funding": [...]
+            continue
+        if stripped[0] in "}]":
+            if path:
+                path.pop()
+            continue
+        m = _JSON_KEY_OPEN.match(line)
+        if m:
+            path.append(m.group(1))
+            continue
+        m = _JSON_KEY_SCALAR.match(line)
+        if m:
+            yield path, m.group(1), m.group(2).strip('"')
+
+
+def _pkg_name(lock_key: str) -> str:
+    """"node_modules/a/node_modules/@s/b" -> "@s/b"."""
+    return lock_key.rsplit("node_modules/", 1)[-1]
+
+
+def parse_package_lock(path: str, ds: DependencySet):
+    """package-lock.json / npm-shrinkwrap.json, lockfileVersion 1-3."""
+    ds.lockfile = os.path.basename(path)
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.readline()
+        if first.strip() != "{":
+            # Minified lockfile: no line structure to stream over
+            f.seek(0)
+            _package_lock_from_data(json.load(f), ds)
+            return
+        has_packages = False
+        for keys, key, value in _walk_pretty_json(f):
+            if keys and keys[0] == "packages" and len(keys) >= 2:
+                has_packages = True
+                if not keys[1]:
+                    continue  # the root project itself
+                name = _pkg_name(keys[1])
+                if len(keys) == 2 and key == "version":
+                    ds.lock(name, value)
+                elif len(keys) == 3 and keys[2] in ("dependencies", "optionalDependencies", "peerDependencies"):
+                    ds.depends(name, key)
+            elif keys and keys[0] == "dependencies" and not has_packages and len(keys) >= 2:
+                # v1: nested "dependencies" objects; the package is the last name in the chain
+                if len(keys) % 2 == 0 and key == "version":
+                    ds.lock(keys[-1], value)
+                elif len(keys) % 2 == 1 and keys[-1] == "requires":
+                    ds.depends(keys[-2], key)
+
+
+def _package_lock_from_data(data: dict, ds: DependencySet):
+    for key, pkg in (data.get("packages") or {}).items():
+        if not key:
+            continue
+        name = _pkg_name(key)
+        if "version" in pkg:
+            ds.lock(name, pkg["version"])
+        for section in ("dependencies", "optionalDependencies", "peerDependencies"):
+            for dep in pkg.get(section) or {}:
+                ds.depends(name, dep)
+    if data.get("packages"):
+        return
+    stack = list((data.get("dependencies") or {}).items())
+    while stack:
+        name, pkg = stack.pop()
+        if "version" in pkg:
+            ds.lock(name, pkg["version"])
+        for dep in pkg.get("requires") or {}:
+            ds.depends(name, dep)
+        stack.extend((pkg.get("dependencies") or {}).items())
+
+
+def _split_spec(spec: str) -> str:
+    """"@scope/name@^1" / "name@npm:^1" -> package name."""
+    spec = spec.strip().strip('"')
+    at = spec.find("@", 1)
+    return spec[:at] if at > 0 else spec
+
+
+def parse_yarn_lock(path: str, ds: DependencySet):
+    """yarn.lock, classic (v1) and berry (v2+) formats."""
+    ds.lockfile = "yarn.lock"
+    name, in_deps = None, False
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            indent = len(line) - len(line.lstrip(" "))
+            text = line.strip()
+            if indent == 0:
+                name = _split_spec(text.rstrip(":").split(",")[0])
+                in_deps = False
+                if name == "__metadata":
+                    name = None
+            elif name is None:
+                continue
+            elif indent == 2:
+                in_deps = text.rstrip(":") in ("dependencies", "optionalDependencies")
+                if text.startswith("version"):
+                    ds.lock(name, text.split(None, 1)[1].lstrip(":").strip().strip('"'))
+            elif indent == 4 and in_deps:
+                # v1: `name "^1.0.0"`, berry: `name: "npm:^1.0.0"`; scoped names are quoted
+                dep = text[1:text.index('"', 1)] if text.startswith('"') else re.split(r"[:\s]", text, 1)[0]
+                ds.depends(name, dep)
+
+
+def _pnpm_key(key: str) -> tuple[str, str]:
+    """pnpm package keys across lockfile versions -> (name, version)."""
+    key = key.strip().strip("'\"").lstrip("/")
+    key = key.split("(", 1)[0]              # peer-dependency suffix
+    at = key.find("@", 1)
+    if at > 0:
+        return key[:at], key[at + 1:]
+    name, _, version = key.rpartition("/")  # v5: /name/1.2.3
+    return name, version
+
+
+def parse_pnpm_lock(path: str, ds: DependencySet):
+    ds.lockfile = "pnpm-lock.yaml"
+    section, name, in_deps = None, None, False
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            indent = len(line) - len(line.lstrip(" "))
+            text = line.strip()
+            if indent == 0:
+                section = text.rstrip(":")
+                name = None
+            elif section not in ("packages", "snapshots"):
+                continue
+            elif indent == 2 and text.endswith(":"):
+                name, version = _pnpm_key(text[:-1])
+                if version:
+                    ds.lock(name, version)
+                in_deps = False
+            elif indent == 4 and name:
+                in_deps = text.rstrip(":") in ("dependencies", "optionalDependencies")
+            elif indent == 6 and name and in_deps:
+                ds.depends(name, text.split(":", 1)[0].strip("'\""))
+
+
+# ─── Python ─────────────────────────────────────────────────────────
+
+_REQ_LINE = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*(.*)$")
+
+
+def normalize_python_name(name: str) -> str:
+    """PEP 503 normalisation: case-insensitive, runs of -_. are equivalent."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _parse_requirement(text: str) -> tuple[str, str] | None:
+    text = text.split(" #", 1)[0].split(";", 1)[0].strip()
+    m = _REQ_LINE.match(text)
+    if not m:
+        return None
+    return normalize_python_name(m.group(1)), m.group(3).strip()
+
+
+def _is_source(parent: str) -> bool:
+    """pip-compile `via` entries naming an input file (`-r requirements.in`, `app (pyproject.toml)`)."""
+    return parent.startswith("-") or "(" in parent or parent.endswith((".in", ".txt", ".toml"))
+
+
+def parse_requirements(path: str, ds: DependencySet):
+    """requirements.txt / .in; pip-compile output (with `# via` annotations) also fills the lock tables."""
+    pinned: dict[str, str] = {}
+    parents: dict[str, list[str]] = {}
+    compiled = collecting = False
+    current = None
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            if line.startswith("#"):
+                note = line.lstrip("#").strip()
+                # Only pip-compile's own header, not any comment that mentions the tool
+                compiled = compiled or "autogenerated by pip-compile" in note.lower()
+                if current and note.startswith("via"):
+                    collecting = True
+                    note = note[3:].strip()
+                elif not (collecting and raw[:1].isspace()):
+                    collecting = False
+                    continue
+                if note:
+                    parents.setdefault(current, []).extend(p.strip() for p in note.split(",") if p.strip())
+                continue
+            collecting = False
+            if line.startswith("-"):
+                continue  # -r/-c includes, -e editables, --hash continuations, --index-url ...
+            code, _, comment = line.partition(" #")
+            req = _parse_requirement(code.rstrip("\\ "))
+            if req is None:
+                continue
+            current = req[0]
+            pinned[current] = req[1]
+            if comment.strip().startswith("via"):  # pip-tools < 5: `flask==2.0  # via -r requirements.in`
+                parents.setdefault(current, []).extend(
+                    p.strip() for p in comment.strip()[3:].split(",") if p.strip())
+
+    if not (compiled or parents):
+        for name, spec in pinned.items():
+            ds.direct.setdefault(name, spec)
+        return
+    ds.lockfile = os.path.basename(path)
+    from_sources = set()
+    for name, spec in pinned.items():
+        if spec.startswith("==") and "*" not in spec:  # ranges and wildcards resolve nothing
+            ds.lock(name, spec.lstrip("=").strip())
+        for parent in parents.get(name, []):
+            if _is_source(parent):
+                from_sources.add(name)
+            else:
+                ds.depends(normalize_python_name(parent), name)
+    if not ds.direct:
+        # Without requirements.in / pyproject.toml the direct set comes from the annotations
+        direct = from_sources or {n for n in pinned if not parents.get(n)}
+        ds.direct.update({n: pinned[n] for n in pinned if n in direct})
+
+
+def parse_pyproject(path: str, ds: DependencySet) -> bool:
+    """PEP 621 / PEP 735 / Poetry dependency tables. False if no TOML parser is available."""
+    if tomllib is None:
+        return False
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    project = data.get("project") or {}
+    for req in project.get("dependencies") or []:
+        if (r := _parse_requirement(req)):
+            ds.direct[r[0]] = r[1]
+    groups = list((project.get("optional-dependencies") or {}).values())
+    groups += list((data.get("dependency-groups") or {}).values())
+    for group in groups:
+        for req in group:
+            if isinstance(req, str) and (r := _parse_requirement(req)):
+                ds.dev.setdefault(r[0], r[1])
+    if project.get("requires-python"):
+        ds.meta["python"] = project["requires-python"]
+
+    poetry = (data.get("tool") or {}).get("poetry") or {}
+
+    def _poetry(table: dict, target: dict):
+        for name, spec in (table or {}).items():
+            if name.lower() == "python":
+                ds.meta["python"] = spec if isinstance(spec, str) else spec.get("version", "")
+                continue
+            target[normalize_python_name(name)] = spec if isinstance(spec, str) else spec.get("version", "*")
+
+    _poetry(poetry.get("dependencies"), ds.direct)
+    _poetry(poetry.get("dev-dependencies"), ds.dev)
+    for group in (poetry.get("group") or {}).values():
+        _poetry(group.get("dependencies"), ds.dev)
+    return True
+
+
+def _array_names(text: str) -> list[str]:
+    """Dependency names in a TOML array fragment: `{ name = "x", ... }` (uv) or `"x 1.0"` (Cargo)."""
+    if "name" in text:
+        return re.findall(r'name\s*=\s*"([^"]+)"', text)
+    return re.findall(r'"([^" ]+)[^"]*"', text)
+
+
+def parse_toml_lock(path: str, ds: DependencySet, normalize=normalize_python_name):
+    """Streams poetry.lock, uv.lock and Cargo.lock: `[[package]]` blocks with name, version and dependencies."""
+    ds.lockfile = os.path.basename(path)
+    name = version = table = None
+    in_array = False    # inside a multi-line `dependencies = [`
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            if in_array:
+                if line.startswith("]"):
+                    in_array = False
+                else:
+                    for dep in _array_names(line):
+                        ds.depends(name, normalize(dep))
+                continue
+            if line.startswith("["):
+                table = line.strip("[] ")
+                if line == "[[package]]":
+                    if name and version:
+                        ds.lock(name, version)
+                    name = version = None
+                continue
+            key, _, value = (part.strip() for part in line.partition("="))
+            if table == "package":
+                if key == "name":
+                    name = normalize(value.strip('"'))
+                elif key == "version":
+                    version = value.strip('"')
+                elif key == "dependencies" and value.startswith("[") and name:
+                    for dep in _array_names(value[1:]):
+                        ds.depends(name, normalize(dep))
+                    in_array = not value.endswith("]")
+            elif table == "package.dependencies" and name and key:
+                # poetry.lock: one `dep = "spec"` line per dependency
+                ds.depends(name, normalize(key.strip('"')))
+    if name and version:
+        ds.lock(name, version)
+
+
+# ─── Go ─────────────────────────────────────────────────────────────
+
+def parse_go_mod(path: str) -> DependencySet:
+    ds = DependencySet("go", "go.mod")
+    in_require = False
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.split("//", 1)[0].strip()
+            indirect = "// indirect" in raw
+            if not line:
+                continue
+            if in_require:
+                if line == ")":
+                    in_require = False
+                    continue
+                parts = line.split()
+            elif line.startswith("require ("):
+                in_require = True
+                continue
+            elif line.startswith("require "):
+                parts = line.split()[1:]
+            else:
+                word, _, rest = line.partition(" ")
+                if word in ("module", "go", "toolchain"):
+                    ds.meta[word] = rest.strip()
+                continue
+            if len(parts) >= 2:
+                if indirect:
+                    ds.lock(parts[0], parts[1])
+                else:
+                    ds.direct[parts[0]] = parts[1]
+    return ds
+
+
+def parse_go_sum(path: str, ds: DependencySet):
+    ds.lockfile = "go.sum"
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and not parts[1].endswith("/go.mod"):
+                ds.lock(parts[0], parts[1])
+    for name, version in ds.direct.items():
+        ds.resolved.setdefault(name, version)
+
+
+# ─── JVM ────────────────────────────────────────────────────────────
+
+def parse_pom(path: str) -> DependencySet:
+    """pom.xml <dependencies> (not dependencyManagement or plugins), with ${property} substitution."""
+    ds = DependencySet("maven", "pom.xml")
+    props: dict[str, str] = {}
+    stack: list[str] = []
+    dep: dict[str, str] = {}
+    found: list[dict] = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if event == "start":
+            stack.append(tag)
+            if stack == ["project", "dependencies", "dependency"]:
+                dep = {}
+            continue
+        if len(stack) == 3 and stack[:2] == ["project", "properties"]:
+            props[tag] = (elem.text or "").strip()
+        elif stack == ["project", "version"]:
+            props["project.version"] = (elem.text or "").strip()
+        elif len(stack) == 4 and stack[:3] == ["project", "dependencies", "dependency"]:
+            dep[tag] = (elem.text or "").strip()
+        elif stack == ["project", "dependencies", "dependency"]:
+            found.append(dep)
+        stack.pop()
+        elem.clear()
+
+    def _sub(value: str) -> str:
+        return re.sub(r"\$\{([^}]+)\}", lambda m: props.get(m.group(1), m.group(0)), value)
+
+    for d in found:
+        name = f"{d.get('groupId', '')}:{d.get('artifactId', '')}"
+        target = ds.dev if d.get("scope") in ("test", "provided") else ds.direct
+        target[_sub(name)] = _sub(d.get("version", ""))
+    for key in ("java.version", "maven.compiler.release", "maven.compiler.source"):
+        if key in props:
+            ds.meta["java"] = props[key]
+            break
+    return ds
+
+
+_GRADLE_DEP = re.compile(
+    r"""^\s*(\w+)\s*\(?\s*['"]([^'":\s]+):([^'":\s]+)(?::([^'"@\s]+))?[^'"]*['"]""")
+_GRADLE_CONFIGS = {"implementation", "api", "compile", "compileOnly", "runtimeOnly", "runtime",
+                   "annotationProcessor", "kapt", "ksp"}
+
+
+def parse_gradle(path: str) -> DependencySet:
+    ds = DependencySet("gradle", os.path.basename(path))
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            m = _GRADLE_DEP.match(line)
+            if not m:
+                continue
+            config, group, artifact, version = m.groups()
+            if config.startswith("test") or config.startswith("androidTest"):
+                ds.dev[f"{group}:{artifact}"] = version or ""
+            elif config in _GRADLE_CONFIGS:
+                ds.direct[f"{group}:{artifact}"] = version or ""
+    return ds
+
+
+def parse_gradle_lockfile(path: str, ds: DependencySet):
+    ds.lockfile = "gradle.lockfile"
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            coord = line.split("=", 1)[0].strip()
+            if coord.startswith("#") or coord.startswith("empty"):
+                continue
+            parts = coord.split(":")
+            if len(parts) == 3:
+                ds.lock(f"{parts[0]}:{parts[1]}", parts[2])
+
+
+# ─── Cargo ──────────────────────────────────────────────────────────
+
+def parse_cargo_toml(path: str) -> DependencySet | None:
+    if tomllib is None:
+        return None
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    ds = DependencySet("cargo", "Cargo.toml")
+
+    def _version(spec) -> str:
+        return spec if isinstance(spec, str) else (spec.get("version") or ("workspace" if spec.get("workspace") else "path"))
+
+    for name, spec in {**(data.get("workspace") or {}).get("dependencies", {}), **(data.get("dependencies") or {})}.items():
+        ds.direct[name] = _version(spec)
+    for section in ("dev-dependencies", "build-dependencies"):
+        for name, spec in (data.get(section) or {}).items():
+            ds.dev[name] = _version(spec)
+    if (data.get("package") or {}).get("rust-version"):
+        ds.meta["rust"] = data["package"]["rust-version"]
+    return ds
+
+
+# ─── Project ────────────────────────────────────────────────────────
+
+def parse_project(root: str) -> list[DependencySet]:
+    """One DependencySet per ecosystem with a manifest at the project root."""
+    def _has(name: str) -> bool:
+        return os.path.isfile(os.path.join(root, name))
+
+    def _path(name: str) -> str:
+        return os.path.join(root, name)
+
+    sets: list[DependencySet] = []
+
+    def _try(fn, *args):
+        try:
+            return fn(*args)
+        except (OSError, ValueError, UnicodeDecodeError, ET.ParseError) as e:
+            # tomllib.TOMLDecodeError and json.JSONDecodeError are ValueErrors
+            print(f"  [!] Could not parse {os.path.basename(args[0])}: {e}")
+            return None
+
+    if _has("package.json") and (ds := _try(parse_package_json, _path("package.json"))):
+        for lock, parser in (("package-lock.json", parse_package_lock), ("npm-shrinkwrap.json", parse_package_lock),
+                             ("pnpm-lock.yaml", parse_pnpm_lock), ("yarn.lock", parse_yarn_lock)):
+            if _has(lock):
+                _try(parser, _path(lock), ds)
+                break
+        sets.append(ds)
+
+    py = DependencySet("python", "")
+    if _has("pyproject.toml") and _try(parse_pyproject, _path("pyproject.toml"), py):
+        py.manifest = "pyproject.toml"
+    if _has("requirements.in"):
+        _try(parse_requirements, _path("requirements.in"), py)
+        py.manifest = py.manifest or "requirements.in"
+    if _has("requirements.txt"):
+        _try(parse_requirements, _path("requirements.txt"), py)
+        py.manifest = py.manifest or "requirements.txt"
+    for lock in ("poetry.lock", "uv.lock"):
+        if _has(lock):
+            _try(parse_toml_lock, _path(lock), py)
+            break
+    if py.manifest or py.lockfile:
+        py.manifest = py.manifest or py.lockfile
+        sets.append(py)
+
+    if _has("go.mod") and (ds := _try(parse_go_mod, _path("go.mod"))):
+        if _has("go.sum"):
+            _try(parse_go_sum, _path("go.sum"), ds)
+        sets.append(ds)
+
+    if _has("pom.xml") and (ds := _try(parse_pom, _path("pom.xml"))):
+        sets.append(ds)
+    for gradle in ("build.gradle.kts", "build.gradle"):
+        if _has(gradle) and (ds := _try(parse_gradle, _path(gradle))):
+            if _has("gradle.lockfile"):
+                _try(parse_gradle_lockfile, _path("gradle.lockfile"), ds)
+            sets.append(ds)
+            break
+
+    if _has("Cargo.toml") and (ds := _try(parse_cargo_toml, _path("Cargo.toml"))):
+        if _has("Cargo.lock"):
+            _try(parse_toml_lock, _path("Cargo.lock"), ds, str)
+        sets.append(ds)
+    return sets
+
+
+def _names(deps: dict[str, str], limit: int) -> str:
+    def _fmt(name: str, spec: str) -> str:
+        if not spec or spec == "*":
+            return name
+        return f"{name}{spec}" if spec[0] in "=<>~!" else f"{name}@{spec}"  # PEP 440 vs npm/Go style
+
+    items = [_fmt(n, v) for n, v in list(deps.items())[:limit]]
+    if len(deps) > limit:
+        items.append(f"(+{len(deps) - limit} more)")
+    return ", ".join(items)
+
+
+def format_graph_summary(sets: list[DependencySet], max_direct: int = SUMMARY_MAX_DIRECT) -> str:
+    """A few bounded lines per ecosystem: counts, depth, duplicates, direct names, heaviest deps."""
+    lines = []
+    for ds in sets:
+        s = ds.graph_stats()
+        source = f"{ds.manifest} + {ds.lockfile}" if ds.lockfile and ds.lockfile != ds.manifest else ds.manifest
+        parts = [f"{s['direct']} direct", f"{s['dev']} dev"]
+        if ds.lockfile:
+            parts.append(f"{s['resolved']} resolved ({s['transitive']} transitive)")
+            if s["depth"]:
+                parts.append(f"depth {s['depth']}")
+            if s["duplicates"]:
+                parts.append(f"{s['duplicates']} at multiple versions")
+        lines.append(f"- {ds.ecosystem} ({source}): {', '.join(parts)}")
+        if ds.meta:
+            lines.append("  " + ", ".join(f"{k} {v}" for k, v in ds.meta.items()))
+        if ds.direct:
+            lines.append(f"  direct: {_names(ds.direct, max_direct)}")
+        if ds.dev:
+            lines.append(f"  dev: {_names(ds.dev, max_direct // 2)}")
+        if s["heaviest"]:
+            lines.append("  heaviest: " + ", ".join(f"{n} ({w} transitive)" for n, w in s["heaviest"]))
+    return "\n".join(lines)
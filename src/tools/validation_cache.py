@@ -0,0 +1,186 @@
+"""
+Validation result cache — re-validating unchanged content is free.
+
+Results are memoized under a key built from the content hash, the tool,
+the tool's identity and everything else that can change the verdict
+(policy bundle hash, stage, flags). The tool's identity is the resolved
+binary's path, size and mtime, which changes whenever the tool is
+upgraded and costs a stat instead of a `--version` spawn.
+
+Entries live in memory (LRU) and, when VALIDATION_CACHE_DIR is set, also
+on disk as one small JSON file per key, so repeated runs and parallel
+processes share results.
+
+Identical contents inside one batch are validated once, and ToolErrors /
+missing tools are never cached.
+
+Usage:
+    from src.tools.validation_cache import get_validation_cache
+
+    cache = get_validation_cache()
+    findings = cache.run_batch("hadolint", binary, items, run_hadolint)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Callable, Hashable
+
+from src.tools.batch_validate import ToolFinding
+
+VALIDATION_CACHE_MAX_ENTRIES = 4096
+CACHE_FORMAT_VERSION = 1
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def tool_identity(binary: str | None) -> str:
+    """`path:size:mtime` of the resolved binary, or "" if it can't be found."""
+    if not binary:
+        return ""
+    path = binary if os.sep in binary else shutil.which(binary)
+    if not path:
+        return ""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    return f"{os.path.realpath(path)}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def bundle_hash(policy_dir: str) -> str:
+    """Hash of every .rego file under `policy_dir` (names and contents)."""
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(policy_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(".rego"):
+                continue
+            path = os.path.join(root, name)
+            h.update(os.path.relpath(path, policy_dir).encode())
+            try:
+                with open(path, "rb") as f:
+                    h.update(f.read())
+            except OSError:
+                continue
+    return h.hexdigest()
+
+
+class ValidationCache:
+    """Memoized validation results: in-memory LRU plus an optional on-disk directory."""
+
+    def __init__(self, directory: str | None = None, max_entries: int = VALIDATION_CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._memory: OrderedDict[str, object] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        return hashlib.sha256("\0".join((str(CACHE_FORMAT_VERSION),) + parts).encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        if self.directory:
+            try:
+                with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                    value = json.load(f)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                with self._lock:
+                    self.hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value):
+        """Store a JSON-serialisable value."""
+        self._remember(key, value)
+        if not self.directory:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # the disk tier is best-effort
+
+    def _remember(self, key: str, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.misses = 0
+
+    def run_batch(self, tool: str, binary: str, items: dict[Hashable, str],
+                  runner: Callable[..., dict | None], *extra: str,
+                  **runner_kwargs) -> dict[Hashable, list[ToolFinding]] | None:
+        """
+        `runner(binary, items, **runner_kwargs)` for the items not already cached.
+
+        `extra` goes into the key alongside the content hash, tool and binary
+        identity (flags, policy bundle hash, ...). Returns None, as the runner
+        does, when the tool is missing and nothing was cached.
+        """
+        identity = tool_identity(binary)
+        keys = {k: self.key(tool, identity, *extra, content_hash(c)) for k, c in items.items()}
+        results: dict[Hashable, list[ToolFinding]] = {}
+        misses: dict[str, str] = {}          # cache key -> content, de-duplicated
+        for k, c in items.items():
+            cached = self.get(keys[k]) if identity else None
+            if cached is not None:
+                results[k] = [ToolFinding(**f) for f in cached]
+            else:
+                misses.setdefault(keys[k], c)
+
+        if misses:
+            fresh = runner(binary, misses, **runner_kwargs)
+            if fresh is None:
+                return None if not results else {k: results.get(k, []) for k in items}
+            for cache_key, found in fresh.items():
+                if identity:
+                    self.put(cache_key, [asdict(f) for f in found])
+            for k in items:
+                if k not in results:
+                    results[k] = list(fresh.get(keys[k], []))
+        return results
+
+
+_CACHE: ValidationCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_validation_cache() -> ValidationCache:
+    """The process-wide cache; on disk too when VALIDATION_CACHE_DIR is set."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ValidationCache(os.getenv("VALIDATION_CACHE_DIR") or None)
+        return _CACHE
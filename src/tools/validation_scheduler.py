@@ -0,0 +1,117 @@
+"""
+Validation scheduler — independent validators run concurrently.
+
+Each `Check` is a zero-argument callable (one linter batch, one rule set,
+one policy backend) with its own timeout. `run_checks` submits them all to
+a shared thread pool (the tools are subprocesses or I/O, so threads
+overlap them fine) and returns one `CheckOutcome` per check, in the order
+the checks were given, so merged findings are deterministic.
+
+With `stop_when`, the scheduler returns as soon as a finished check's value
+satisfies it (e.g. "has an ERROR") and marks the unfinished checks as
+skipped, which is all a pass/fail pre-screen needs.
+
+A check that overruns its timeout is reported as timed out; its thread is
+left to finish in the background (the tools' own subprocess timeouts bound
+it), but nobody waits for it.
+
+Usage:
+    from src.tools.validation_scheduler import Check, run_checks
+
+    outcomes = run_checks([Check("hadolint", lint_all, timeout=60), Check("rules", rules_all, timeout=5)],
+                          stop_when=lambda errors: any(errors.values()))
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable
+
+DEFAULT_CHECK_TIMEOUT = 120.0
+VALIDATION_WORKERS = int(os.getenv("VALIDATION_WORKERS", "8"))
+_THREAD_PREFIX = "validate"
+
+
+@dataclass
+class Check:
+    name: str
+    fn: Callable[[], Any]
+    timeout: float = DEFAULT_CHECK_TIMEOUT
+
+
+@dataclass
+class CheckOutcome:
+    name: str
+    value: Any = None
+    error: BaseException | None = None
+    timed_out: bool = False
+    skipped: bool = False       # not finished when a stop_when check ended the run
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.timed_out and not self.skipped
+
+
+_POOL: ThreadPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=max(1, VALIDATION_WORKERS), thread_name_prefix=_THREAD_PREFIX)
+        return _POOL
+
+
+def _run_one(check: Check) -> CheckOutcome:
+    start = time.perf_counter()
+    try:
+        return CheckOutcome(check.name, check.fn(), elapsed=time.perf_counter() - start)
+    except Exception as e:
+        return CheckOutcome(check.name, error=e, elapsed=time.perf_counter() - start)
+
+
+def run_checks(checks: list[Check], stop_when: Callable[[Any], bool] | None = None) -> list[CheckOutcome]:
+    """Outcomes of `checks`, in input order, from one concurrent run."""
+    if not checks:
+        return []
+    # Inside a validator thread (nested scheduling): run inline, the outer check's timeout bounds it
+    if threading.current_thread().name.startswith(_THREAD_PREFIX):
+        outcomes = []
+        for i, check in enumerate(checks):
+            outcome = _run_one(check)
+            outcomes.append(outcome)
+            if stop_when and outcome.ok and stop_when(outcome.value):
+                outcomes.extend(CheckOutcome(c.name, skipped=True) for c in checks[i + 1:])
+                break
+        return outcomes
+
+    start = time.perf_counter()
+    futures: dict[Future, int] = {_pool().submit(_run_one, c): i for i, c in enumerate(checks)}
+    outcomes: list[CheckOutcome | None] = [None] * len(checks)
+    pending = set(futures)
+    while pending:
+        now = time.perf_counter() - start
+        next_deadline = min(checks[futures[f]].timeout for f in pending) - now
+        done, pending = wait(pending, timeout=max(0.0, next_deadline), return_when=FIRST_COMPLETED)
+        stop = False
+        for f in done:
+            outcome = f.result()
+            outcomes[futures[f]] = outcome
+            if stop_when and outcome.ok and stop_when(outcome.value):
+                stop = True
+        now = time.perf_counter() - start
+        for f in list(pending):
+            if stop:
+                f.cancel()
+                outcomes[futures[f]] = CheckOutcome(checks[futures[f]].name, skipped=True)
+                pending.discard(f)
+            elif now >= checks[futures[f]].timeout:
+                f.cancel()
+                outcomes[futures[f]] = CheckOutcome(checks[futures[f]].name, timed_out=True, elapsed=now)
+                pending.discard(f)
+    return outcomes
@@ -0,0 +1,328 @@
+"""
+GitHub Actions workflow analysis — the job graph, not just the syntax.
+
+Builds the `needs:` DAG of a parsed workflow and reports what determines
+how long the pipeline takes:
+
+    - dependency cycles and `needs:` on jobs that do not exist (GitHub
+      rejects both);
+    - matrix expansion per job (include / exclude applied, max-parallel
+      turned into waves);
+    - whether jobs that install dependencies cache them;
+    - an estimated duration per job (from its steps), the critical path
+      through the DAG, the expected wall time, and the parallelism
+      (runner minutes / wall minutes).
+
+Durations are heuristics (STEP_MINUTES), meant to rank candidate
+pipelines against each other, not to predict a real run.
+
+Usage:
+    from src.tools.workflow_analysis import analyze_workflow
+
+    analysis = analyze_workflow(yaml.safe_load(workflow_yaml))
+    analysis.errors()      # -> ["Job dependency cycle: build -> test -> build"]
+    analysis.summary()     # -> "expected wall time ~7.1 min (critical path: lint -> test -> deploy), ..."
+"""
+
+import itertools
+import math
+import re
+from dataclasses import dataclass, field
+
+JOB_OVERHEAD_MINUTES = 0.3     # runner provisioning + job setup
+MATRIX_ENUMERATION_LIMIT = 4096
+
+# (pattern on `uses` or `run`, minutes); first match wins, DEFAULT_STEP_MINUTES otherwise
+STEP_MINUTES = [
+    (re.compile(r"^actions/checkout@"), 0.2),
+    (re.compile(r"^actions/(cache|setup-[\w-]+)@"), 0.3),
+    (re.compile(r"^docker/build-push-action@"), 4.0),
+    (re.compile(r"\b(docker (buildx )?build|npm run build|yarn build|go build|mvn \S*\s*package|"
+                r"gradle\w* (assemble|build)|cargo build)\b"), 3.0),
+    (re.compile(r"\b(pytest|npm (run )?test|yarn test|jest|go test|mvn \S*\s*(test|verify)|"
+                r"gradle\w* test|cargo test|tox|rspec)\b"), 3.0),
+]
+DEFAULT_STEP_MINUTES = 0.5
+INSTALL_MINUTES = 2.0          # dependency install without a cache
+CACHED_INSTALL_MINUTES = 0.5
+
+INSTALL_PATTERN = re.compile(
+    r"\b(npm (ci|install)|yarn install|pnpm (i|install)|pip3? install|poetry install|"
+    r"pipenv install|bundle install|go mod download|mvn \S*\s*(install|dependency:)|gradle\w* dependencies|"
+    r"cargo fetch|composer install)\b", re.MULTILINE)
+# setup-* actions whose `with: cache:` input enables dependency caching; setup-go v4+ caches by default
+_SETUP_CACHE = re.compile(r"^actions/setup-(node|python|java|go|dotnet)@")
+_SETUP_GO_DEFAULT_CACHE = re.compile(r"^actions/setup-go@v([4-9]|\d{2,})")
+
+
+@dataclass
+class JobNode:
+    name: str
+    needs: list[str] = field(default_factory=list)
+    steps: int = 0
+    matrix_size: int = 1          # job runs after include / exclude
+    matrix_dynamic: bool = False  # matrix built from an expression; size unknown, counted as 1
+    max_parallel: int | None = None
+    installs_deps: bool = False
+    has_cache: bool = False
+    minutes: float = 0.0          # one run of the job
+
+    @property
+    def waves(self) -> int:
+        if not self.max_parallel or self.max_parallel >= self.matrix_size:
+            return 1 if self.matrix_size else 0
+        return math.ceil(self.matrix_size / self.max_parallel)
+
+    @property
+    def wall_minutes(self) -> float:
+        return self.minutes * self.waves
+
+    @property
+    def runner_minutes(self) -> float:
+        return self.minutes * self.matrix_size
+
+
+@dataclass
+class WorkflowAnalysis:
+    jobs: dict[str, JobNode] = field(default_factory=dict)
+    cycles: list[list[str]] = field(default_factory=list)
+    unknown_needs: list[tuple[str, str]] = field(default_factory=list)   # (job, missing dependency)
+    critical_path: list[str] = field(default_factory=list)
+    expected_minutes: float = 0.0   # wall time along the critical path, given enough runners
+    runner_minutes: float = 0.0     # sum over every job run
+    max_width: int = 0              # most job runs that can be in flight at once
+
+    @property
+    def parallelism(self) -> float:
+        return self.runner_minutes / self.expected_minutes if self.expected_minutes else 0.0
+
+    @property
+    def job_runs(self) -> int:
+        return sum(j.matrix_size for j in self.jobs.values())
+
+    @property
+    def uncached_jobs(self) -> list[str]:
+        return [j.name for j in self.jobs.values() if j.installs_deps and not j.has_cache]
+
+    def errors(self) -> list[str]:
+        out = [f"Job dependency cycle: {' -> '.join(c + c[:1])}" for c in self.cycles]
+        out += [f"Job '{job}' needs unknown job '{dep}'" for job, dep in self.unknown_needs]
+        return out
+
+    def warnings(self) -> list[str]:
+        out = [f"Job '{name}' installs dependencies without a cache" for name in self.uncached_jobs]
+        out += [f"Job '{j.name}' has a dynamic matrix; its size is not known statically"
+                for j in self.jobs.values() if j.matrix_dynamic]
+        return out
+
+    def summary(self) -> str:
+        if self.cycles:
+            return "wall time unknown (job dependency cycle)"
+        return (f"expected wall time ~{self.expected_minutes:.1f} min "
+                f"(critical path: {' -> '.join(self.critical_path) or 'none'}), "
+                f"{self.job_runs} job run(s), parallelism {self.parallelism:.1f}x, "
+                f"peak {self.max_width} runner(s)")
+
+
+# ─── Per-job facts ───────────────────────────────────────────────
+
+def _needs(job: dict) -> list[str]:
+    needs = job.get("needs")
+    if isinstance(needs, str):
+        return [needs]
+    if isinstance(needs, list):
+        return [str(n) for n in needs]
+    return []
+
+
+def _is_expression(value) -> bool:
+    return isinstance(value, str) and "${{" in value
+
+
+def _matrix_size(strategy) -> tuple[int, bool]:
+    """(number of job runs, dynamic?) for a job's `strategy`."""
+    if not isinstance(strategy, dict) or "matrix" not in strategy:
+        return 1, False
+    matrix = strategy["matrix"]
+    if not isinstance(matrix, dict):
+        return 1, _is_expression(matrix)
+    dynamic = False
+    dims: dict[str, list] = {}
+    for key, values in matrix.items():
+        if key in ("include", "exclude"):
+            continue
+        if isinstance(values, list):
+            dims[key] = values
+        else:
+            dynamic = True
+            dims[key] = [values]
+    include = matrix.get("include") if isinstance(matrix.get("include"), list) else []
+    exclude = matrix.get("exclude") if isinstance(matrix.get("exclude"), list) else []
+    dynamic = dynamic or _is_expression(matrix.get("include")) or _is_expression(matrix.get("exclude"))
+
+    if math.prod(len(v) for v in dims.values()) > MATRIX_ENUMERATION_LIMIT:
+        return math.prod(len(v) for v in dims.values()) + len(include), dynamic
+    keys = list(dims)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*dims.values())] if keys else []
+    combos = [c for c in combos
+              if not any(isinstance(e, dict) and all(c.get(k) == v for k, v in e.items()) for e in exclude)]
+    size = len(combos)
+    for entry in include:
+        if not isinstance(entry, dict):
+            continue
+        # An include entry extends every combination it does not contradict, else it adds one
+        extends = any(all(c[k] == v for k, v in entry.items() if k in dims) for c in combos)
+        if not extends:
+            size += 1
+    return size, dynamic
+
+
+def _step_minutes(step: dict, cached: bool) -> float:
+    text = step.get("uses") if isinstance(step.get("uses"), str) else str(step.get("run") or "")
+    if isinstance(step.get("run"), str) and INSTALL_PATTERN.search(step["run"]):
+        return CACHED_INSTALL_MINUTES if cached else INSTALL_MINUTES
+    for pattern, minutes in STEP_MINUTES:
+        if pattern.search(text.strip()):
+            return minutes
+    return DEFAULT_STEP_MINUTES
+
+
+def _step_caches(step: dict) -> bool:
+    uses = step.get("uses")
+    if not isinstance(uses, str):
+        return False
+    if uses.startswith("actions/cache@") or uses.startswith("actions/cache/restore@"):
+        return True
+    with_ = step.get("with") if isinstance(step.get("with"), dict) else {}
+    if _SETUP_GO_DEFAULT_CACHE.match(uses):
+        return with_.get("cache", True) not in (False, "false")
+    return bool(_SETUP_CACHE.match(uses)) and with_.get("cache") not in (None, "", False, "false")
+
+
+def _job_node(name: str, job: dict) -> JobNode:
+    steps = [s for s in job.get("steps") or [] if isinstance(s, dict)]
+    size, dynamic = _matrix_size(job.get("strategy"))
+    strategy = job.get("strategy") if isinstance(job.get("strategy"), dict) else {}
+    max_parallel = strategy.get("max-parallel")
+    node = JobNode(
+        name=name, needs=_needs(job), steps=len(steps), matrix_size=size, matrix_dynamic=dynamic,
+        max_parallel=max_parallel if isinstance(max_parallel, int) and max_parallel > 0 else None,
+        installs_deps=any(isinstance(s.get("run"), str) and INSTALL_PATTERN.search(s["run"]) for s in steps),
+        has_cache=any(_step_caches(s) for s in steps),
+    )
+    if isinstance(job.get("uses"), str):
+        node.minutes = JOB_OVERHEAD_MINUTES + DEFAULT_STEP_MINUTES  # reusable workflow: opaque
+    else:
+        node.minutes = JOB_OVERHEAD_MINUTES + sum(_step_minutes(s, node.has_cache) for s in steps)
+    return node
+
+
+# ─── Graph ───────────────────────────────────────────────────────
+
+def _cycle_through(graph: dict[str, list[str]], component: set[str]) -> list[str]:
+    """Shortest cycle from the component's first job back to itself, following `needs` edges."""
+    start = min(component)
+    parent: dict[str, str] = {}
+    queue = [start]
+    for node in queue:
+        for dep in graph[node]:
+            if dep == start:
+                path = [node]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                return path[::-1]
+            if dep in component and dep not in parent:
+                parent[dep] = node
+                queue.append(dep)
+    return [start]
+
+
+def _cycles(graph: dict[str, list[str]]) -> list[list[str]]:
+    """One `needs` cycle per strongly connected component (Tarjan), starting at its first name."""
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    found: list[list[str]] = []
+
+    def strongconnect(v):
+        index[v] = low[v] = len(index)
+        stack.append(v)
+        on_stack.add(v)
+        for w in graph[v]:
+            if w not in index:
+                strongconnect(w)
+                low[v] = min(low[v], low[w])
+            elif w in on_stack:
+                low[v] = min(low[v], index[w])
+        if low[v] == index[v]:
+            component = []
+            while True:
+                w = stack.pop()
+                on_stack.discard(w)
+                component.append(w)
+                if w == v:
+                    break
+            if len(component) > 1 or v in graph[v]:
+                found.append(_cycle_through(graph, set(component)))
+
+    for v in graph:
+        if v not in index:
+            strongconnect(v)
+    return sorted(found)
+
+
+def analyze_workflow(workflow: dict) -> WorkflowAnalysis:
+    """Job graph analysis of a parsed workflow (`yaml.safe_load` output)."""
+    jobs = workflow.get("jobs") if isinstance(workflow, dict) else None
+    analysis = WorkflowAnalysis()
+    if not isinstance(jobs, dict):
+        return analysis
+    for name, job in jobs.items():
+        if isinstance(job, dict):
+            analysis.jobs[str(name)] = _job_node(str(name), job)
+
+    graph: dict[str, list[str]] = {}
+    for name, node in analysis.jobs.items():
+        graph[name] = []
+        for dep in node.needs:
+            if dep in analysis.jobs:
+                graph[name].append(dep)
+            else:
+                analysis.unknown_needs.append((name, dep))
+    analysis.runner_minutes = sum(n.runner_minutes for n in analysis.jobs.values())
+    analysis.cycles = _cycles(graph)
+    if analysis.cycles:
+        return analysis
+
+    # Longest path: each job finishes `wall_minutes` after its slowest dependency
+    finish: dict[str, float] = {}
+    level: dict[str, int] = {}
+    via: dict[str, str | None] = {}
+
+    def visit(name):
+        if name in finish:
+            return
+        for dep in graph[name]:
+            visit(dep)
+        slowest = max(graph[name], key=lambda d: finish[d], default=None)
+        via[name] = slowest
+        finish[name] = (finish[slowest] if slowest else 0.0) + analysis.jobs[name].wall_minutes
+        level[name] = 1 + max((level[d] for d in graph[name]), default=-1)
+
+    for name in graph:
+        visit(name)
+    if finish:
+        end = max(finish, key=lambda n: finish[n])
+        analysis.expected_minutes = finish[end]
+        path = []
+        while end is not None:
+            path.append(end)
+            end = via[end]
+        analysis.critical_path = path[::-1]
+    width: dict[int, int] = {}
+    for name, lvl in level.items():
+        node = analysis.jobs[name]
+        width[lvl] = width.get(lvl, 0) + min(node.matrix_size, node.max_parallel or node.matrix_size)
+    analysis.max_width = max(width.values(), default=0)
+    return analysis
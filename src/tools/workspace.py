@@ -0,0 +1,152 @@
+"""
+Per-validation temp workspaces.
+
+Every external tool run gets its own private directory (mode 0700, unique
+name from mkdtemp), so concurrent validations in one process, in worker
+threads or in a process pool never share a path. Directories live on tmpfs
+when the host has one (/dev/shm), since validator inputs are small and
+short-lived, and fall back to the system temp dir otherwise.
+
+Cleanup is guaranteed at three levels:
+    - the `with` block removes the workspace, whatever the tool did;
+    - workspaces still open at interpreter exit are removed by an atexit hook
+      (forked children drop the parent's list, so they never delete its dirs);
+    - leftovers of crashed processes (owner pid gone, older than STALE_AFTER)
+      are swept once per process, on the first workspace it creates.
+
+VALIDATION_TMPDIR overrides the location.
+
+Usage:
+    from src.tools.workspace import TempWorkspace
+
+    with TempWorkspace("hadolint_") as ws:
+        path = ws.write("draft_a/Dockerfile", content)
+        subprocess.run(["hadolint", path])
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+NAME_PREFIX = "devops_"
+STALE_AFTER = 3600  # seconds; never sweep a workspace younger than this
+_TMPFS = "/dev/shm"
+
+
+def workspace_base() -> str:
+    """Directory new workspaces are created in: VALIDATION_TMPDIR, tmpfs, or the system temp dir."""
+    configured = os.getenv("VALIDATION_TMPDIR")
+    if configured:
+        os.makedirs(configured, exist_ok=True)
+        return configured
+    if os.path.isdir(_TMPFS) and os.access(_TMPFS, os.W_OK | os.X_OK):
+        return _TMPFS
+    return tempfile.gettempdir()
+
+
+# ─── Live-workspace registry ─────────────────────────────────────
+
+_LIVE: dict[str, int] = {}      # root -> owner pid
+_LIVE_LOCK = threading.Lock()
+_SWEPT: set[str] = set()        # bases already swept by this process
+
+
+def _cleanup_live():
+    with _LIVE_LOCK:
+        roots = [root for root, pid in _LIVE.items() if pid == os.getpid()]
+        _LIVE.clear()
+    for root in roots:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _forget_parent_workspaces():
+    # Runs in a forked child: the parent's workspaces are not ours to delete
+    global _LIVE_LOCK
+    _LIVE_LOCK = threading.Lock()
+    _LIVE.clear()
+
+
+atexit.register(_cleanup_live)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_parent_workspaces)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def sweep_stale(base: str | None = None, older_than: float = STALE_AFTER) -> int:
+    """Remove workspaces left by dead processes; returns how many were removed."""
+    base = base or workspace_base()
+    removed = 0
+    now = time.time()
+    try:
+        entries = list(os.scandir(base))
+    except OSError:
+        return 0
+    for entry in entries:
+        if not entry.name.startswith(NAME_PREFIX) or not entry.is_dir(follow_symlinks=False):
+            continue
+        pid = entry.name[len(NAME_PREFIX):].split("_", 1)[0]
+        if not pid.isdigit() or int(pid) == os.getpid() or _pid_alive(int(pid)):
+            continue
+        try:
+            if now - entry.stat(follow_symlinks=False).st_mtime < older_than:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(entry.path, ignore_errors=True)
+        removed += 1
+    return removed
+
+
+# ─── Workspace ───────────────────────────────────────────────────
+
+class TempWorkspace:
+    """A private temp directory, removed on exit (or at interpreter exit at the latest)."""
+
+    def __init__(self, prefix: str = "validate_", base: str | None = None):
+        base = base or workspace_base()
+        with _LIVE_LOCK:
+            sweep = base not in _SWEPT
+            _SWEPT.add(base)
+        if sweep:
+            sweep_stale(base)
+        # The owner pid in the name is what lets sweep_stale tell crash leftovers from live work
+        self.root = tempfile.mkdtemp(prefix=f"{NAME_PREFIX}{os.getpid()}_{prefix}", dir=base)
+        with _LIVE_LOCK:
+            _LIVE[self.root] = os.getpid()
+
+    def path(self, relpath: str) -> str:
+        """Absolute path for `relpath` inside the workspace (parent directories created)."""
+        path = os.path.normpath(os.path.join(self.root, relpath))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"path escapes the workspace: {relpath}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def write(self, relpath: str, content: str) -> str:
+        path = self.path(relpath)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def close(self):
+        with _LIVE_LOCK:
+            _LIVE.pop(self.root, None)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
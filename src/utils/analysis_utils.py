@@ -3,7 +3,10 @@ from src.schemas import ProjectContext
 import os
 
 def load_or_run_analysis(project_path: str) -> ProjectContext:
-    agent = CodeAnalysisAgent(project_path)
+    # CI: analyze git-tracked files only and reuse results for services outside the diff
+    workers = os.environ.get("ANALYSIS_WORKERS")
+    agent = CodeAnalysisAgent(project_path, git_base=os.environ.get("ANALYSIS_GIT_BASE") or None,
+                              workers=int(workers) if workers else None)
     context = agent.get_cached_analysis()
     
     # Print rich analysis summary
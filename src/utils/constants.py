@@ -2,6 +2,7 @@ import os
 
 CONFIG_DIR = "configs"
 GUIDELINES_DIR = os.path.join(CONFIG_DIR, "guidelines")
+DEPENDENCY_CATALOG = os.path.join(CONFIG_DIR, "dependency_catalog.json")
 
 GUIDELINES_DOCKER = os.path.join(GUIDELINES_DIR, "docker-guidelines.md")
 GUIDELINES_K8S = os.path.join(GUIDELINES_DIR, "k8s-guidelines.md")
@@ -1,10 +1,71 @@
 """Shared pytest fixtures for devops-agent tests."""
 
 import os
+import sys
 import json
+import stat
 import tempfile
 import pytest
 
+# Stand-in for hadolint / kubeconform / conftest: logs "<tool> <argc>" per run and
+# emits the real tools' JSON shapes for files containing "BAD" (hadolint: a
+# style-level finding for "STYLE", which must not fail the file).
+FAKE_TOOL_SCRIPT = '''#!{python}
+import json, os, sys
+tool = os.path.basename(sys.argv[0])
+with open(os.environ["FAKE_TOOL_LOG"], "a") as log:
+    log.write(tool + " " + str(len(sys.argv)) + "\\n")
+if "--version" in sys.argv:
+    print("fake 1.0"); sys.exit(0)
+paths = [a for a in sys.argv[1:] if os.path.isfile(a)]
+bad = [p for p in paths if "BAD" in open(p).read()]
+if tool == "hadolint":
+    print(json.dumps([{{"file": p, "line": 1, "code": "DL3007", "level": "warning",
+                       "message": "Using latest is prone to errors"}} for p in bad]
+                     + [{{"file": p, "line": 1, "code": "DL3059", "level": "style",
+                         "message": "Multiple consecutive RUN instructions"}}
+                        for p in paths if "STYLE" in open(p).read()]))
+elif tool == "kubeconform":
+    print(json.dumps({{"resources": [{{"filename": p, "kind": "Deployment", "name": "web",
+                                      "status": "statusInvalid", "msg": "additional properties 'BAD'"}} for p in bad],
+                      "summary": {{}}}}))
+else:
+    print(json.dumps([{{"filename": p, "namespace": "main", "successes": 0,
+                       "failures": [{{"msg": "BAD found"}}] if p in bad else [], "warnings": []}} for p in paths]))
+sys.exit(1 if bad else 0)
+'''
+
+
+class FakeTools:
+    """Stand-in CLI tools in <tmp>/bin, put on PATH; every run is logged to FAKE_TOOL_LOG."""
+
+    def __init__(self, tmp_path, monkeypatch):
+        self.bin_dir = tmp_path / "bin"
+        self.bin_dir.mkdir(exist_ok=True)
+        self.log = tmp_path / "calls.log"
+        self.log.write_text("")
+        self._monkeypatch = monkeypatch
+        monkeypatch.setenv("FAKE_TOOL_LOG", str(self.log))
+
+    def install(self, *names, script=FAKE_TOOL_SCRIPT, only=False) -> str:
+        """Writes `script` (a format string; {python} is the interpreter) as each tool.
+
+        With `only`, PATH holds nothing but the fakes, so real tools can't leak in.
+        Returns the path of the last tool installed.
+        """
+        path = None
+        for name in names:
+            path = self.bin_dir / name
+            path.write_text(script.format(python=sys.executable))
+            path.chmod(path.stat().st_mode | stat.S_IEXEC)
+        self._monkeypatch.setenv("PATH", str(self.bin_dir) if only
+                                 else f"{self.bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+        return str(path)
+
+    def calls(self, tool: str) -> list[str]:
+        """Logged runs of `tool`, in order."""
+        return [l for l in self.log.read_text().splitlines() if l.startswith(tool + " ")]
+
 
 @pytest.fixture
 def mock_env(monkeypatch):
@@ -52,3 +113,9 @@ def mock_context():
         "ports": ["3000"],
         "env_vars": ["MONGO_URI"],
     }
+
+
+@pytest.fixture
+def fake_tools(tmp_path, monkeypatch):
+    """Installer for stand-in validator CLIs (hadolint, kubeconform, conftest, opa, ...)."""
+    return FakeTools(tmp_path, monkeypatch)
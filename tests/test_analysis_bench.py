@@ -0,0 +1,33 @@
+"""Smoke test for benchmarks/analysis_bench.py on a repo small enough for CI."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.analysis_bench import bench_repo, check_regressions, generate_monorepo
+
+
+class TestAnalysisBench:
+    """Generator, per-phase instrumentation and the regression gate."""
+
+    def test_scenarios_and_pruning(self, tmp_path):
+        counts = generate_monorepo(str(tmp_path), services=6, files=3, vendored=10)
+        rows = bench_repo(str(tmp_path))
+        totals = {r["scenario"]: r for r in rows if r["phase"] == "total"}
+        assert set(totals) == {"cold", "warm", "one-service"}
+
+        cold_index = next(r for r in rows if r["scenario"] == "cold" and r["phase"] == "index")
+        # Vendored trees are pruned, never stat'ed
+        assert cold_index["stats"] < counts["source_files"] + counts["vendored_files"]
+        assert cold_index["stats"] >= counts["source_files"]
+
+        assert totals["cold"]["detectors_rerun"] > 0
+        assert totals["warm"]["detectors_rerun"] == 0
+        assert totals["one-service"]["services_analyzed"] == 1
+
+    def test_regression_gate(self):
+        base = [{"scenario": "cold", "phase": "total", "wall_ms": 100.0, "stats": 1000, "read_kb": "n/a"}]
+        slower = [{"scenario": "cold", "phase": "total", "wall_ms": 140.0, "stats": 1000, "read_kb": 10.0}]
+        assert check_regressions(slower, base, 0.25) == ["cold: wall_ms 100.0 -> 140.0 (+40%)"]
+        assert check_regressions(slower, base, 0.5) == []
@@ -0,0 +1,61 @@
+"""Tests for batch validation: one tool process per stage, findings mapped back per file."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.agents.deterministic_reviewer import DeterministicReviewer
+from src.engine.models import GeneratedFile
+from src.engine.validate import Validator
+from src.policy.validator import PolicyValidator
+
+
+class TestBatchValidation:
+    """Drafts share one tool invocation; results stay per draft."""
+
+    def test_reviewer_lints_all_drafts_in_one_run(self, fake_tools):
+        fake_tools.install("hadolint", "kubeconform", "conftest")
+        reviewer = DeterministicReviewer()
+        reviewer.hadolint_path = str(fake_tools.bin_dir / "hadolint")
+        reviewer.kubeconform_path = str(fake_tools.bin_dir / "kubeconform")
+
+        results = reviewer.review_dockerfiles(["FROM node:20\n", "FROM node:20  # BAD\n", "FROM python:3.12  # STYLE\n"])
+        assert [ok for ok, _ in results] == [True, False, True]
+        assert "Dockerfile:1 DL3007 warning" in results[1][1]
+        assert len(fake_tools.calls("hadolint")) == 1
+
+        ok, msg = reviewer.review_k8s_batch(["kind: Service\n", "kind: Deployment\nBAD: 1\n"])[1]
+        assert not ok and "manifest.yaml - Deployment/web invalid" in msg
+        assert len(fake_tools.calls("kubeconform")) == 1
+
+    def test_validator_batches_by_type(self, fake_tools):
+        fake_tools.install("hadolint", "kubeconform", "conftest")
+        files = [
+            GeneratedFile("svc/a/Dockerfile", "FROM node:20\n"),
+            GeneratedFile("svc/b/Dockerfile", "FROM node:20 # BAD\n"),
+            GeneratedFile("k8s/web.yaml", "kind: Service\nmetadata: {name: web}\n"),
+            GeneratedFile("notes.txt", "hello"),
+            GeneratedFile("svc/c/Dockerfile", "FROM node:20 # STYLE\n"),
+        ]
+        results = Validator().validate_many(files)
+        assert [r.passed for r in results] == [True, False, True, True, True]
+        assert results[1].errors[0].startswith("HADOLINT ERROR:\nDockerfile:1 DL3007")
+        assert len(fake_tools.calls("hadolint")) == 1
+        assert len(fake_tools.calls("kubeconform")) == 1
+
+    def test_policy_validator_runs_conftest_once(self, fake_tools):
+        fake_tools.install("hadolint", "kubeconform", "conftest")
+        validator = PolicyValidator()
+        assert validator.conftest_available
+        clean = "FROM node:20-alpine\nUSER app\nHEALTHCHECK CMD true\n"
+        results = validator.validate_many([clean, clean + "# BAD\n"], "docker")
+        assert results[0] == (True, [])
+        passed, violations = results[1]
+        assert not passed and [v.rule for v in violations] == ["conftest-failure"]
+        assert len(fake_tools.calls("conftest")) == 2  # --version probe + one test run
+
+    def test_missing_tools_are_skipped(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PATH", str(tmp_path))
+        results = Validator().validate_many([GeneratedFile("Dockerfile", "FROM node:20\n")])
+        assert results[0].passed
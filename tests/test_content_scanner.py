@@ -0,0 +1,31 @@
+"""Tests for the shared concurrent content scanner."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.tools.content_scanner import ContentScanner
+
+
+class TestContentScanner:
+    """One read per file, all patterns applied."""
+
+    def test_all_patterns_from_one_read(self, tmp_path):
+        src = tmp_path / "server.js"
+        src.write_text("const db = process.env.DATABASE_URL;\napp.listen(3000);\n")
+        hits = ContentScanner().scan([str(src), str(src)])
+        assert list(hits) == [str(src)]
+        assert hits[str(src)]["listen_call"] == ["3000"]
+        assert hits[str(src)]["node_env"] == ["DATABASE_URL"]
+        assert "python_env" not in hits[str(src)]
+
+    def test_skips_binaries_and_caps_size(self, tmp_path):
+        binary = tmp_path / "app.py"
+        binary.write_bytes(b"\x00\x01port = 8080")
+        big = tmp_path / "main.py"
+        big.write_text("x" * 100 + "\nport = 9090\n")
+        hits = ContentScanner(max_bytes=50).scan([str(binary), str(big), str(tmp_path / "missing.py")])
+        assert hits[str(binary)] == {}
+        assert hits[str(big)] == {}
+        assert hits[str(tmp_path / "missing.py")] == {}
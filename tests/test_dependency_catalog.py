@@ -0,0 +1,109 @@
+"""Tests for the data-driven dependency classifier."""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from src.agents.code_analysis_agent import CodeAnalysisAgent
+from src.tools.dependency_catalog import DependencyCatalog, get_catalog
+
+
+class TestDependencyCatalog:
+    """Exact and prefix lookups across ecosystems."""
+
+    def test_databases_across_ecosystems(self):
+        catalog = get_catalog()
+        assert catalog.database("ioredis") == ("cache", "Redis")
+        assert catalog.database("psycopg2") == ("rdbms", "PostgreSQL")
+        assert catalog.database("github.com/jackc/pgx/v5") == ("rdbms", "PostgreSQL")
+        assert catalog.database("org.hibernate.orm:hibernate-core") == ("rdbms", "Hibernate (ORM)")
+        assert catalog.database("github.com/redis/go-redis/v9") == ("cache", "Redis")
+        assert catalog.database("lodash") is None
+
+    def test_frameworks_follow_catalog_priority(self):
+        catalog = get_catalog()
+        assert catalog.frameworks(["vite", "react", "express"]) == ["Express", "React", "Vite"]
+        assert catalog.frameworks(["angular", "@angular/core"]) == ["Angular"]
+        assert catalog.frameworks(["org.springframework.boot:spring-boot-starter-web"]) == ["Spring Boot"]
+
+    def test_cloud_prefixes_match_at_boundaries(self):
+        catalog = get_catalog()
+        assert catalog.clouds(["aws-sdk", "@aws-sdk/client-s3", "boto3"]) == {"aws"}
+        assert catalog.clouds(["google-cloud-storage"]) == {"gcp"}
+        assert catalog.clouds(["@azure/identity", "azure-storage-blob"]) == {"azure"}
+        assert catalog.clouds(["awsome", "googlecloudish"]) == set()
+
+    def test_exact_beats_prefix_and_kinds_are_independent(self):
+        catalog = get_catalog()
+        hit = catalog.classify("@aws-sdk/client-dynamodb")
+        assert hit["database"].label == "DynamoDB"
+        assert hit["cloud"].category == "aws"
+
+    def test_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            DependencyCatalog({"format_version": 99})
+
+
+class TestAgentUsesCatalog:
+    """New ecosystems are picked up from the catalog without agent changes."""
+
+    def test_service_frameworks_and_databases(self, tmp_path):
+        svc = tmp_path / "services" / "web"
+        svc.mkdir(parents=True)
+        (svc / "package.json").write_text(json.dumps({
+            "dependencies": {"express": "4", "@prisma/client": "5", "kafkajs": "2", "@aws-sdk/client-s3": "3"},
+        }))
+        (tmp_path / "package.json").write_text(json.dumps({"dependencies": {"@aws-sdk/client-s3": "3"}}))
+
+        ctx = CodeAnalysisAgent(str(tmp_path)).analyze(incremental=False)
+        details = ctx.microservice_details["services/web"]
+        assert details["frameworks"] == ["Express"]
+        assert details["ports"] == ["3000"]
+        assert ctx.databases["rdbms"] == {"Prisma (ORM)": ["services/web"]}
+        assert ctx.databases["broker"] == {"Kafka": ["services/web"]}
+        assert "aws" in ctx.architecture
+
+    def test_go_maven_and_cargo_services(self, tmp_path):
+        (tmp_path / "api").mkdir()
+        (tmp_path / "api" / "go.mod").write_text(
+            "module example.com/api\n\ngo 1.22\n\nrequire (\n\tgithub.com/gin-gonic/gin v1.9.1\n"
+            "\tgithub.com/jackc/pgx/v5 v5.5.0\n\tgithub.com/aws/aws-sdk-go-v2 v1.24.0\n)\n")
+        (tmp_path / "billing").mkdir()
+        (tmp_path / "billing" / "pom.xml").write_text(
+            "<project><properties><java.version>17</java.version></properties><dependencies>"
+            "<dependency><groupId>org.springframework.boot</groupId>"
+            "<artifactId>spring-boot-starter-web</artifactId></dependency>"
+            "<dependency><groupId>org.apache.kafka</groupId><artifactId>kafka-clients</artifactId>"
+            "<version>3.6.0</version></dependency></dependencies></project>")
+        (tmp_path / "edge").mkdir()
+        (tmp_path / "edge" / "Cargo.toml").write_text(
+            '[package]\nname = "edge"\nrust-version = "1.75"\n\n[dependencies]\naxum = "0.7"\nredis = "0.24"\n')
+
+        ctx = CodeAnalysisAgent(str(tmp_path)).analyze(incremental=False)
+        assert ctx.microservice_dirs == ["api", "billing", "edge"]
+        api, billing, edge = (ctx.microservice_details[d] for d in ctx.microservice_dirs)
+        assert (api["language"], api["frameworks"], api["node_version"]) == ("Go", ["Gin"], "1.22")
+        assert (billing["language"], billing["frameworks"], billing["base_image"].split(" ")[0]) == \
+            ("Java", ["Spring Boot"], "maven:3-eclipse-temurin-17")
+        assert (edge["language"], edge["frameworks"], edge["node_version"]) == ("Rust", ["Axum"], "1.75")
+        assert ctx.databases["rdbms"] == {"PostgreSQL": ["api"]}
+        assert ctx.databases["broker"] == {"Kafka": ["billing"]}
+        assert ctx.databases["cache"] == {"Redis": ["edge"]}
+        assert "aws" in ctx.architecture
+
+    def test_catalog_version_change_invalidates_cache(self, tmp_path):
+        (tmp_path / "requirements.txt").write_text("flask\n")
+        CodeAnalysisAgent(str(tmp_path)).analyze()
+        cache_file = tmp_path / ".devops_analysis_cache.json"
+        data = json.loads(cache_file.read_text())
+        assert data["ruleset"] == get_catalog().version
+
+        data["ruleset"] = "older"
+        cache_file.write_text(json.dumps(data))
+        again = CodeAnalysisAgent(str(tmp_path))
+        again.analyze()
+        assert len(again.last_rerun) == len(CodeAnalysisAgent.DETECTORS)
@@ -0,0 +1,71 @@
+"""Tests for src/tools/dockerfile_lint.py — hadolint rule IDs from the in-process linter."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.agents.deterministic_reviewer import DeterministicReviewer
+from src.tools.dockerfile_lint import lint_dockerfile
+
+
+def _codes(content):
+    return [(f.line, f.code) for f in lint_dockerfile(content)]
+
+
+class TestDockerfileLint:
+    """One rule family per test, checked against hadolint's behaviour."""
+
+    def test_image_tags(self):
+        assert _codes("FROM ubuntu\nFROM node:latest AS build\nFROM build\nFROM scratch\n") == [
+            (1, "DL3006"), (2, "DL3007"),
+        ]
+        assert _codes("ARG BASE=node:20\nFROM ${BASE}\nFROM registry:5000/team/app:1.2\n") == []
+
+    def test_apt_get(self):
+        assert _codes("FROM debian:12\nRUN apt-get update && apt-get install curl\n") == [
+            (2, "DL3008"), (2, "DL3014"), (2, "DL3015"), (2, "DL3009"),
+        ]
+        clean = ("FROM debian:12\nRUN apt-get update \\\n && apt-get install -y --no-install-recommends curl=7.88 \\\n"
+                 " && rm -rf /var/lib/apt/lists/*\n")
+        assert _codes(clean) == []
+
+    def test_apk_pip_npm(self):
+        content = ("FROM alpine:3.20\n"
+                   "RUN apk add --no-cache --virtual .deps curl=8.5.0-r0 git\n"
+                   "RUN pip install --no-cache-dir flask==3.0.0 requests\n"
+                   "RUN pip install -r requirements.txt\n"
+                   "RUN npm install -g @angular/cli@17.0.0 && npm install express && npm ci\n")
+        assert _codes(content) == [(2, "DL3018"), (3, "DL3013"), (4, "DL3042"), (5, "DL3016")]
+
+    def test_pipefail_and_shell_form(self):
+        content = ("FROM debian:12\nRUN curl -fsSL x || true\nRUN curl x | sh\n"
+                   'SHELL ["/bin/bash", "-o", "pipefail", "-c"]\nRUN curl x | sh\nCMD node app.js\n')
+        assert _codes(content) == [(3, "DL4006"), (6, "DL3025")]
+
+    def test_instruction_rules(self):
+        content = ("FROM node:20\nMAINTAINER me\nWORKDIR app\nADD src /app\nADD https://x/y.tgz /tmp/\n"
+                   "RUN cd /app && sudo make\n"
+                   'CMD ["a"]\nCMD ["b"]\nUSER root\n')
+        assert _codes(content) == [
+            (2, "DL4000"), (3, "DL3000"), (4, "DL3020"), (6, "DL3004"), (6, "DL3003"), (8, "DL4003"), (9, "DL3002"),
+        ]
+
+    def test_ignore_pragma(self):
+        content = "FROM debian:12\n# hadolint ignore=DL3008, DL3015\nRUN apt-get install -y curl && rm -rf /var/lib/apt/lists/*\n"
+        assert _codes(content) == []
+
+    def test_output_matches_hadolint_format(self):
+        finding = lint_dockerfile("FROM node\n")[0]
+        assert finding.format("Dockerfile") == "Dockerfile:1 DL3006 warning: Always tag the version of an image explicitly"
+
+
+class TestReviewerPrescreen:
+    """Drafts failing the built-in linter never reach hadolint."""
+
+    def test_lint_failures_reported_without_hadolint(self, tmp_path):
+        reviewer = DeterministicReviewer()
+        reviewer.hadolint_path = str(tmp_path / "missing-hadolint")
+        bad, good = reviewer.review_dockerfiles(["FROM node\n", "FROM node:20\n"])
+        assert not bad[0] and "Dockerfile:1 DL3006 warning" in bad[1]
+        assert good[0] and "hadolint binary not found" in good[1]
@@ -0,0 +1,219 @@
+"""Tests for the single-pass project index used by CodeAnalysisAgent."""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.tools.file_index import FileIndex
+from src.agents.code_analysis_agent import CodeAnalysisAgent
+
+
+def _write(root, rel, content=""):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+class TestFileIndex:
+    """One pruned walk, queried many ways."""
+
+    def test_prunes_vendor_dirs_and_indexes_metadata(self, tmp_path):
+        _write(tmp_path, "api/package.json", "{}")
+        _write(tmp_path, "api/node_modules/left-pad/package.json", "{}")
+        _write(tmp_path, ".git/HEAD", "ref")
+        _write(tmp_path, "api/server.js", "app.listen(3000)")
+
+        index = FileIndex.build(str(tmp_path))
+        assert [e.path for e in index] == ["api/package.json", "api/server.js"]
+        assert index.get("api/server.js").size == len("app.listen(3000)")
+        assert [e.path for e in index.named("package.json")] == ["api/package.json"]
+        assert {e.name for e in index.children("api")} == {"package.json", "server.js"}
+        assert index.has_dir("api") and not index.has_dir("api/node_modules")
+
+
+class TestCodeAnalysisOnIndex:
+    """Detectors produce the same facts from the index as from walking."""
+
+    def test_microservice_detection(self, tmp_path):
+        _write(tmp_path, "backend/package.json", json.dumps({"dependencies": {"express": "4", "pg": "8"}}))
+        _write(tmp_path, "backend/server.js", "const port = process.env.PORT; app.listen(4000)")
+        _write(tmp_path, "backend/node_modules/x/server.js", "app.listen(9999)")
+        _write(tmp_path, "worker/requirements.txt", "celery==5\nredis>=4\n")
+        _write(tmp_path, ".github/workflows/ci.yml", "on: push")
+        _write(tmp_path, "Dockerfile", "FROM node:20")
+
+        ctx = CodeAnalysisAgent(str(tmp_path)).analyze()
+        assert ctx.microservice_dirs == ["backend", "worker"]
+        assert ctx.microservice_details["backend"]["ports"] == ["4000"]
+        assert "9999" not in ctx.ports
+        assert "PORT" in ctx.env_vars
+        assert ctx.existing_files["GitHub Actions"] == ".github/workflows"
+        assert ctx.databases["rdbms"] == {"PostgreSQL": ["backend"]}
+        assert ctx.databases["cache"] == {"Redis": ["worker"]}
+        assert "node_modules" not in ctx.file_structure
+
+    def test_dockerignore_does_not_hide_services(self, tmp_path):
+        _write(tmp_path, ".dockerignore", "frontend/\ntests/\n")
+        _write(tmp_path, "frontend/package.json", json.dumps({"dependencies": {"react": "18", "react-dom": "18"}}))
+        _write(tmp_path, "backend/requirements.txt", "flask==3\n")
+
+        ctx = CodeAnalysisAgent(str(tmp_path)).analyze()
+        assert ctx.microservice_dirs == ["backend", "frontend"]
+        assert "frontend/package.json" not in FileIndex.build_context(str(tmp_path)).listing()
+
+
+class TestIncrementalAnalysis:
+    """Only detectors whose input files changed re-run; the cache survives."""
+
+    def test_rerun_only_changed_detectors(self, tmp_path):
+        _write(tmp_path, "api/package.json", json.dumps({"dependencies": {"express": "4"}}))
+        _write(tmp_path, "api/server.js", "app.listen(4000)")
+        _write(tmp_path, "settings.py", "os.environ.get('SECRET_KEY')")
+
+        first = CodeAnalysisAgent(str(tmp_path))
+        first.analyze()
+        assert len(first.last_rerun) == len(CodeAnalysisAgent.DETECTORS)
+
+        unchanged = CodeAnalysisAgent(str(tmp_path))
+        ctx = unchanged.get_cached_analysis()
+        assert unchanged.last_rerun == []
+        assert ctx.env_vars == ["SECRET_KEY"]
+        assert ".devops_context.json" not in ctx.file_structure
+
+        _write(tmp_path, "settings.py", "os.environ.get('SECRET_KEY')\\nos.environ.get('DEBUG')")
+        changed = CodeAnalysisAgent(str(tmp_path))
+        ctx = changed.get_cached_analysis()
+        assert changed.last_rerun == ["env_vars"]
+        assert ctx.env_vars == ["DEBUG", "SECRET_KEY"]
+        assert ctx.microservice_details["api"]["ports"] == ["4000"]
+
+    def test_hash_mode_ignores_touched_files(self, tmp_path):
+        _write(tmp_path, "requirements.txt", "flask==3\n")
+        CodeAnalysisAgent(str(tmp_path), hash_contents=True).analyze()
+        os.utime(tmp_path / "requirements.txt", (1, 1))
+        again = CodeAnalysisAgent(str(tmp_path), hash_contents=True)
+        again.analyze()
+        assert again.last_rerun == []
+
+
+class TestGitDiffAnalysis:
+    """git ls-files index plus a diff-driven change set."""
+
+    def _git(self, root, *args):
+        import subprocess
+        subprocess.run(["git", "-C", str(root), "-c", "user.email=ci@example.com", "-c", "user.name=ci", *args],
+                       check=True, capture_output=True)
+
+    def test_only_services_in_diff_are_reanalyzed(self, tmp_path):
+        _write(tmp_path, "api/package.json", json.dumps({"dependencies": {"express": "4"}}))
+        _write(tmp_path, "api/server.js", "app.listen(4000)")
+        _write(tmp_path, "worker/requirements.txt", "celery==5\n")
+        _write(tmp_path, ".gitignore", "*.out\n")
+        _write(tmp_path, "api/build.out", "untracked output")
+        self._git(tmp_path, "init", "-q")
+        self._git(tmp_path, "add", ".")
+        self._git(tmp_path, "commit", "-qm", "init")
+
+        first = CodeAnalysisAgent(str(tmp_path), git_base="HEAD")
+        ctx = first.analyze()
+        assert first.last_services_analyzed == ["api", "worker"]
+        assert "build.out" not in ctx.file_structure
+
+        # A fresh checkout bumps every mtime; only the diff should count
+        for path in tmp_path.rglob("*"):
+            if path.is_file() and ".git" not in path.parts:
+                os.utime(path, (2_000_000_000, 2_000_000_000))
+        _write(tmp_path, "worker/requirements.txt", "celery==5\nredis==5\n")
+
+        second = CodeAnalysisAgent(str(tmp_path), git_base="HEAD")
+        ctx = second.analyze()
+        assert second.last_services_analyzed == ["worker"]
+        assert "env_vars" not in second.last_rerun
+        assert ctx.databases["cache"] == {"Redis": ["worker"]}
+        assert ctx.microservice_details["api"]["ports"] == ["4000"]
+
+    def test_diff_is_taken_against_the_cached_commit(self, tmp_path):
+        _write(tmp_path, "api/package.json", json.dumps({"dependencies": {"express": "4"}}))
+        _write(tmp_path, "worker/requirements.txt", "celery==5\n")
+        self._git(tmp_path, "init", "-q")
+        self._git(tmp_path, "add", ".")
+        self._git(tmp_path, "commit", "-qm", "init")
+        CodeAnalysisAgent(str(tmp_path), git_base="HEAD").analyze()
+
+        # Committed since the cached run: `git diff HEAD` is empty, the change still counts
+        _write(tmp_path, "worker/requirements.txt", "celery==5\nredis==5\n")
+        self._git(tmp_path, "commit", "-qam", "add redis")
+        agent = CodeAnalysisAgent(str(tmp_path), git_base="HEAD")
+        ctx = agent.analyze()
+        assert agent.last_services_analyzed == ["worker"]
+        assert ctx.databases["cache"] == {"Redis": ["worker"]}
+
+    def test_unknown_cached_commit_diffs_against_git_base(self, tmp_path):
+        import subprocess
+        _write(tmp_path, "api/package.json", json.dumps({"dependencies": {"express": "4"}}))
+        _write(tmp_path, "worker/requirements.txt", "celery==5\n")
+        self._git(tmp_path, "init", "-q")
+        self._git(tmp_path, "add", ".")
+        self._git(tmp_path, "commit", "-qm", "init")
+        base = subprocess.run(["git", "-C", str(tmp_path), "rev-parse", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+        CodeAnalysisAgent(str(tmp_path), git_base=base).analyze()
+
+        # A cache restored from a build whose commit this clone never fetched
+        cache_file = tmp_path / ".devops_analysis_cache.json"
+        data = json.loads(cache_file.read_text())
+        data["commit"] = "0" * 40
+        cache_file.write_text(json.dumps(data))
+        for path in tmp_path.rglob("*"):
+            if path.is_file() and ".git" not in path.parts:
+                os.utime(path, (2_000_000_000, 2_000_000_000))
+        _write(tmp_path, "worker/requirements.txt", "celery==5\nredis==5\n")
+        self._git(tmp_path, "commit", "-qam", "add redis")
+
+        agent = CodeAnalysisAgent(str(tmp_path), git_base=base)
+        agent.analyze()
+        assert agent.last_services_analyzed == ["worker"]
+
+    def test_falls_back_to_walk_outside_git(self, tmp_path):
+        _write(tmp_path, "app.py", "os.environ.get('TOKEN')")
+        ctx = CodeAnalysisAgent(str(tmp_path), git_base="HEAD").analyze()
+        assert ctx.env_vars == ["TOKEN"]
+
+
+class TestParallelServiceAnalysis:
+    """Per-service analysis gives the same result in-process and across a process pool."""
+
+    def test_pool_matches_serial(self, tmp_path, monkeypatch):
+        import src.agents.code_analysis_agent as agent_mod
+        for i in range(6):
+            _write(tmp_path, f"svc{i}/package.json", json.dumps({"dependencies": {"express": "4", "ioredis": "5"}}))
+            _write(tmp_path, f"svc{i}/server.js", f"app.listen({4000 + i})")
+        _write(tmp_path, "py/requirements.txt", "fastapi\npsycopg2\n")
+
+        serial = CodeAnalysisAgent(str(tmp_path), workers=1).analyze(incremental=False)
+        monkeypatch.setattr(agent_mod, "SERVICE_POOL_MIN_JOBS", 2)
+        parallel_agent = CodeAnalysisAgent(str(tmp_path), workers=3)
+        parallel = parallel_agent.analyze(incremental=False)
+
+        assert parallel.microservice_details == serial.microservice_details
+        assert parallel.databases == serial.databases
+        assert parallel.microservice_details["svc5"]["ports"] == ["4005"]
+        assert parallel.databases["cache"]["Redis"] == [f"svc{i}" for i in range(6)]
+        assert len(parallel_agent.last_services_analyzed) == 7
+
+    def test_serial_services_use_a_threaded_scan(self, tmp_path, monkeypatch):
+        import src.agents.code_analysis_agent as agent_mod
+        sizes = []
+
+        class RecordingScanner(agent_mod.ContentScanner):
+            def __init__(self, *args, workers=None, **kwargs):
+                sizes.append(workers)
+                super().__init__(*args, workers=workers, **kwargs)
+
+        monkeypatch.setattr(agent_mod, "ContentScanner", RecordingScanner)
+        _write(tmp_path, "api/package.json", json.dumps({"dependencies": {"express": "4"}}))
+        _write(tmp_path, "api/server.js", "app.listen(4000)")
+        CodeAnalysisAgent(str(tmp_path), workers=1).analyze(incremental=False)
+        assert sizes and 1 not in sizes  # workers=1 is reserved for jobs inside the process pool
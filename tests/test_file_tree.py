@@ -0,0 +1,43 @@
+"""Tests for the bounded file-tree summary that replaces the full listing in prompts."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.tools.file_index import FileIndex
+from src.tools.file_tree import render_tree, summarize_tree, tree_to_dict
+
+
+def _touch(root, rel, content="x"):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+class TestFileTree:
+    """Directory aggregation, ignore rules and size limits."""
+
+    def test_aggregates_and_honors_gitignore(self, tmp_path):
+        _touch(tmp_path, ".gitignore", "coverage/\n*.log\n")
+        _touch(tmp_path, "api/server.js")
+        _touch(tmp_path, "api/routes/users.js")
+        _touch(tmp_path, "api/debug.log")
+        _touch(tmp_path, "coverage/lcov.info")
+
+        tree = summarize_tree(FileIndex.build(str(tmp_path)))
+        assert "coverage" not in tree
+        assert tree["api"].files == 2
+        assert tree["api"].extensions[".js"] == 2
+        assert tree_to_dict(tree)["api"]["subdirs"] == 1
+
+    def test_render_is_bounded(self, tmp_path):
+        for i in range(300):
+            _touch(tmp_path, f"svc{i % 30}/src/deep/a/b/file{i}.py")
+        text = render_tree(summarize_tree(FileIndex.build(str(tmp_path))), max_lines=40)
+        lines = text.splitlines()
+        assert len(lines) == 41
+        assert lines[0].startswith("300 files")
+        assert lines[-1].endswith("more entries omitted")
+        assert "file0.py" not in text  # below the depth limit, folded into counts
+        assert "subdirs folded" in text
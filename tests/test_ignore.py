@@ -0,0 +1,50 @@
+"""Tests for the shared gitignore-style path matcher."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.tools.file_index import FileIndex
+from src.tools.ignore import IgnoreMatcher
+
+
+class TestIgnoreMatcher:
+    """gitignore semantics on names, anchored paths and globs."""
+
+    def test_builtin_vendor_dirs(self):
+        m = IgnoreMatcher.for_project("/nonexistent")
+        assert m.match("web/node_modules", is_dir=True)
+        assert not m.match("web/node_modules", is_dir=False)  # dir-only rule
+        assert m.is_ignored("svc/.venv/lib/site.py")
+        assert not m.is_ignored("svc/src/app.py")
+
+    def test_negation_anchoring_and_globs(self):
+        m = IgnoreMatcher()
+        m.add_patterns(["*.log", "!keep.log", "/out", "docs/**/*.tmp", "build/"])
+        assert m.match("a/b/debug.log", is_dir=False)
+        assert not m.match("a/keep.log", is_dir=False)
+        assert m.match("out", is_dir=True)
+        assert not m.match("src/out", is_dir=True)
+        assert m.match("docs/x/y/z.tmp", is_dir=False)
+        assert not m.match("src/z.tmp", is_dir=False)
+        m.add_patterns(["!build/"])
+        assert not m.match("build", is_dir=True)
+
+    def test_dockerignore_is_root_relative_but_keeps_artifacts(self, tmp_path):
+        (tmp_path / ".dockerignore").write_text("tests\nDockerfile\n")
+        assert not IgnoreMatcher.for_project(str(tmp_path)).match("tests", is_dir=True)
+        m = IgnoreMatcher.for_project(str(tmp_path), use_dockerignore=True)
+        assert m.match("tests", is_dir=True)
+        assert not m.match("api/tests", is_dir=True)
+        assert not m.match("Dockerfile", is_dir=False)
+
+    def test_walker_honors_nested_gitignore(self, tmp_path):
+        (tmp_path / "api" / "generated").mkdir(parents=True)
+        (tmp_path / "api" / ".gitignore").write_text("generated/\n*.snap\n")
+        (tmp_path / "api" / "generated" / "client.js").write_text("x")
+        (tmp_path / "api" / "view.snap").write_text("x")
+        (tmp_path / "api" / "server.js").write_text("x")
+        (tmp_path / "other.snap").write_text("x")
+        paths = [e.path for e in FileIndex.build(str(tmp_path))]
+        assert paths == ["api/.gitignore", "api/server.js", "other.snap"]
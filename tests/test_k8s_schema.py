@@ -0,0 +1,114 @@
+"""Tests for src/tools/k8s_schema.py — offline manifest schema validation."""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.engine.models import GeneratedFile
+from src.engine.validate import Validator
+from src.tools.k8s_schema import SchemaStore, normalize_version, schema_filename
+from src.tools.validation_cache import ValidationCache
+
+# Trimmed standalone-strict schema in kubeconform's layout
+_DEPLOYMENT = {
+    "type": "object",
+    "required": ["spec"],
+    "additionalProperties": False,
+    "properties": {
+        "apiVersion": {"type": ["string", "null"]},
+        "kind": {"type": ["string", "null"], "enum": ["Deployment"]},
+        "metadata": {"type": "object", "properties": {"name": {"type": "string"}}},
+        "spec": {
+            "type": ["object", "null"],
+            "additionalProperties": False,
+            "properties": {
+                "replicas": {"type": ["integer", "null"]},
+                "template": {"type": "object", "properties": {"spec": {"type": "object", "properties": {
+                    "containers": {"type": "array", "items": {
+                        "type": "object", "additionalProperties": False, "required": ["name"],
+                        "properties": {
+                            "name": {"type": "string"}, "image": {"type": "string"},
+                            "ports": {"type": "array", "items": {"type": "object", "properties": {
+                                "containerPort": {"type": "integer"},
+                                "targetPort": {"x-kubernetes-int-or-string": True},
+                            }}},
+                        },
+                    }},
+                }}}},
+            },
+        },
+    },
+}
+
+_VALID = """
+apiVersion: apps/v1
+kind: Deployment
+metadata: {name: web}
+spec:
+  replicas: 2
+  template:
+    spec:
+      containers:
+        - name: app
+          image: web:1.0
+          ports: [{containerPort: 8080, targetPort: http}]
+---
+apiVersion: example.com/v1
+kind: Widget
+metadata: {name: no-schema-cached}
+"""
+
+
+def _store(tmp_path, version="1.29"):
+    directory = tmp_path / "schemas" / "v1.29.0-standalone-strict"
+    directory.mkdir(parents=True)
+    (directory / "deployment-apps-v1.json").write_text(json.dumps(_DEPLOYMENT))
+    return SchemaStore(str(tmp_path / "schemas"), version)
+
+
+class TestSchemaStore:
+    """Schema lookup, compile-once reuse and strict validation."""
+
+    def test_names_follow_kubeconform_layout(self):
+        assert schema_filename("Deployment", "apps/v1") == "deployment-apps-v1.json"
+        assert schema_filename("Ingress", "networking.k8s.io/v1") == "ingress-networking-v1.json"
+        assert schema_filename("Service", "v1") == "service-v1.json"
+        assert normalize_version("1.29") == "v1.29.0"
+
+    def test_valid_manifest_and_unknown_kind(self, tmp_path):
+        store = _store(tmp_path)
+        assert store.available and store.validate(_VALID) == []
+        assert store.validator("Deployment", "apps/v1") is store.validator("Deployment", "apps/v1")
+
+    def test_strict_findings(self, tmp_path):
+        store = _store(tmp_path)
+        bad = _VALID.replace("replicas: 2", "replicas: two").replace("image: web:1.0", "imagee: web:1.0")
+        messages = [f.message for f in store.validate(bad)]
+        assert "spec.replicas: expected integer or null, got str" in messages
+        assert "spec.template.spec.containers.0: additional property 'imagee' is not allowed" in messages
+        assert store.validate(bad)[0].format("manifest.yaml").startswith("manifest.yaml - Deployment/web invalid: ")
+
+    def test_other_version_is_unavailable(self, tmp_path):
+        _store(tmp_path)
+        assert not SchemaStore(str(tmp_path / "schemas"), "1.30").available
+
+    def test_kubeconform_reads_the_cache(self, tmp_path):
+        args = _store(tmp_path).kubeconform_args()
+        assert args[:2] == ("-schema-location", str(tmp_path / "schemas" / "{{ .NormalizedKubernetesVersion }}"
+                                                    "-standalone{{ .StrictSuffix }}" / "{{ .ResourceKind }}"
+                                                    "{{ .KindSuffix }}.json"))
+        assert "-kubernetes-version" in args and "1.29.0" in args
+
+
+class TestValidatorSchemas:
+    """Validator checks manifests offline before any kubeconform run."""
+
+    def test_schema_errors_block_without_kubeconform(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PATH", str(tmp_path))  # no kubeconform / hadolint
+        validator = Validator(cache=ValidationCache(), schemas=_store(tmp_path))
+        bad = GeneratedFile("k8s/web.yaml", _VALID.replace("replicas: 2", "replicas: '2'"))
+        result = validator.validate(bad)
+        assert not result.passed
+        assert result.errors[0].startswith("K8S SCHEMA ERROR:\nmanifest.yaml - Deployment/web invalid: spec.replicas")
@@ -0,0 +1,171 @@
+"""Tests for the manifest / lockfile parsers behind ContextGatherer."""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.tools.context_gatherer import ContextGatherer
+from src.tools.manifest_parsers import (
+    DependencySet, parse_package_lock, parse_yarn_lock, parse_pnpm_lock,
+    parse_requirements, parse_toml_lock, parse_go_mod, parse_go_sum, parse_pom, parse_project,
+)
+
+
+def _write(root, rel, text):
+    path = root / rel
+    path.write_text(text)
+    return str(path)
+
+
+class TestNodeLockfiles:
+    """package-lock (streamed and minified), yarn and pnpm."""
+
+    LOCK = {
+        "name": "web", "lockfileVersion": 3,
+        "packages": {
+            "": {"dependencies": {"express": "^4"}},
+            "node_modules/express": {"version": "4.18.2", "dependencies": {"debug": "2.6.9"},
+                                     "funding": [{"type": "github", "url": "x"}]},
+            "node_modules/debug": {"version": "2.6.9", "dependencies": {"ms": "2.0.0"}},
+            "node_modules/express/node_modules/debug": {"version": "4.3.4"},
+            "node_modules/ms": {"version": "2.0.0"},
+        },
+    }
+
+    def test_package_lock_pretty_and_minified_agree(self, tmp_path):
+        pretty = DependencySet("npm", "package.json", direct={"express": "^4"})
+        parse_package_lock(_write(tmp_path, "a.json", json.dumps(self.LOCK, indent=2)), pretty)
+        minified = DependencySet("npm", "package.json", direct={"express": "^4"})
+        parse_package_lock(_write(tmp_path, "b.json", json.dumps(self.LOCK)), minified)
+
+        assert pretty.resolved == minified.resolved == {"express": "4.18.2", "debug": "2.6.9", "ms": "2.0.0"}
+        assert pretty.edges == minified.edges
+        assert pretty.duplicates == {"debug"}
+        stats = pretty.graph_stats()
+        assert stats["depth"] == 3
+        assert stats["heaviest"] == [("express", 2)]
+
+    def test_yarn_and_pnpm(self, tmp_path):
+        yarn = DependencySet("npm", "package.json", direct={"@babel/core": "^7"})
+        parse_yarn_lock(_write(tmp_path, "yarn.lock", (
+            '"@babel/core@^7", "@babel/core@^7.1.0":\n  version "7.23.0"\n  dependencies:\n'
+            '    "@babel/parser" "^7.23.0"\n    debug "^4"\n\n'
+            '"@babel/parser@^7.23.0":\n  version "7.23.0"\n\ndebug@^4:\n  version "4.3.4"\n'
+        )), yarn)
+        assert yarn.resolved == {"@babel/core": "7.23.0", "@babel/parser": "7.23.0", "debug": "4.3.4"}
+        assert yarn.edges["@babel/core"] == {"@babel/parser", "debug"}
+
+        pnpm = DependencySet("npm", "package.json", direct={"react": "^18"})
+        parse_pnpm_lock(_write(tmp_path, "pnpm-lock.yaml", (
+            "lockfileVersion: '9.0'\n\npackages:\n\n  loose-envify@1.4.0:\n    resolution: {integrity: x}\n\n"
+            "  react@18.2.0:\n    resolution: {integrity: y}\n\nsnapshots:\n\n"
+            "  react@18.2.0:\n    dependencies:\n      loose-envify: 1.4.0\n"
+        )), pnpm)
+        assert pnpm.resolved == {"loose-envify": "1.4.0", "react": "18.2.0"}
+        assert pnpm.edges == {"react": {"loose-envify"}}
+
+
+class TestOtherEcosystems:
+    """pip-compile, uv/poetry/Cargo TOML locks, Go and Maven."""
+
+    def test_pip_compile_output(self, tmp_path):
+        ds = DependencySet("python", "requirements.txt")
+        parse_requirements(_write(tmp_path, "requirements.txt", (
+            "# autogenerated by pip-compile\nclick==8.1.7\n    # via flask\n"
+            "flask==3.0.0\n    # via -r requirements.in\n"
+            "Psycopg2_Binary==2.9.9 \\\n    --hash=sha256:abc\n    # via -r requirements.in\n"
+        )), ds)
+        assert ds.direct == {"flask": "==3.0.0", "psycopg2-binary": "==2.9.9"}
+        assert ds.resolved["click"] == "8.1.7"
+        assert ds.edges == {"flask": {"click"}}
+
+    def test_plain_requirements_are_direct_only(self, tmp_path):
+        ds = DependencySet("python", "requirements.txt")
+        parse_requirements(_write(tmp_path, "requirements.txt", "flask>=2  # web\n-r base.txt\nredis; python_version>'3'\n"), ds)
+        assert ds.direct == {"flask": ">=2", "redis": ""}
+        assert ds.lockfile is None
+
+    def test_input_file_mentioning_pip_compile_is_not_a_lock(self, tmp_path):
+        _write(tmp_path, "requirements.in", "# Use pip-compile to generate requirements.lock\nflask>=2.0\nredis\n")
+        _write(tmp_path, "requirements.txt", (
+            "# This file is autogenerated by pip-compile with Python 3.11\n"
+            "flask==3.0.0\n    # via -r requirements.in\nredis==5.0.1\n    # via -r requirements.in\n"
+        ))
+        [py] = parse_project(str(tmp_path))
+        assert py.direct == {"flask": ">=2.0", "redis": ""}
+        assert py.resolved == {"flask": "3.0.0", "redis": "5.0.1"}
+        assert not py.duplicates
+
+    def test_toml_locks(self, tmp_path):
+        uv = DependencySet("python", "pyproject.toml", direct={"fastapi": ">=0.110"})
+        parse_toml_lock(_write(tmp_path, "uv.lock", (
+            'version = 1\n\n[[package]]\nname = "fastapi"\nversion = "0.110.0"\n'
+            'dependencies = [\n    { name = "pydantic" },\n]\n\n'
+            '[[package]]\nname = "pydantic"\nversion = "2.6.0"\n\n'
+            '[package.metadata]\nrequires-dist = [\n    { name = "ignored" },\n]\n'
+        )), uv)
+        assert uv.resolved == {"fastapi": "0.110.0", "pydantic": "2.6.0"}
+        assert uv.edges == {"fastapi": {"pydantic"}}
+
+        poetry = DependencySet("python", "pyproject.toml")
+        parse_toml_lock(_write(tmp_path, "poetry.lock", (
+            '[[package]]\nname = "Flask"\nversion = "3.0.0"\n\n[package.dependencies]\n'
+            'click = ">=8"\nWerkzeug = {version = ">=3"}\n\n[metadata]\ncontent-hash = "x"\n'
+        )), poetry)
+        assert poetry.edges == {"flask": {"click", "werkzeug"}}
+
+        cargo = DependencySet("cargo", "Cargo.toml", direct={"axum": "0.7"})
+        parse_toml_lock(_write(tmp_path, "Cargo.lock", (
+            '[[package]]\nname = "axum"\nversion = "0.7.4"\ndependencies = [\n "tokio",\n "tower 0.4.13",\n]\n\n'
+            '[[package]]\nname = "tokio"\nversion = "1.35.0"\n'
+        )), cargo, str)
+        assert cargo.edges == {"axum": {"tokio", "tower"}}
+
+    def test_go_and_maven(self, tmp_path):
+        ds = parse_go_mod(_write(tmp_path, "go.mod", (
+            "module example.com/api\n\ngo 1.22\n\nrequire (\n\tgithub.com/gin-gonic/gin v1.9.1\n"
+            "\tgolang.org/x/sys v0.15.0 // indirect\n)\nrequire github.com/lib/pq v1.10.9\n"
+        )))
+        parse_go_sum(_write(tmp_path, "go.sum", (
+            "github.com/gin-gonic/gin v1.9.1 h1:a=\ngithub.com/gin-gonic/gin v1.9.1/go.mod h1:b=\n"
+            "golang.org/x/sys v0.14.0 h1:c=\n"
+        )), ds)
+        assert ds.meta == {"module": "example.com/api", "go": "1.22"}
+        assert ds.direct == {"github.com/gin-gonic/gin": "v1.9.1", "github.com/lib/pq": "v1.10.9"}
+        assert ds.duplicates == {"golang.org/x/sys"}
+
+        pom = parse_pom(_write(tmp_path, "pom.xml", (
+            '<project xmlns="http://maven.apache.org/POM/4.0.0"><properties><pg.version>42.7.1</pg.version>'
+            '</properties><dependencyManagement><dependencies><dependency><groupId>x</groupId>'
+            '<artifactId>bom</artifactId></dependency></dependencies></dependencyManagement><dependencies>'
+            '<dependency><groupId>org.postgresql</groupId><artifactId>postgresql</artifactId>'
+            '<version>${pg.version}</version></dependency><dependency><groupId>junit</groupId>'
+            '<artifactId>junit</artifactId><scope>test</scope></dependency></dependencies></project>'
+        )))
+        assert pom.direct == {"org.postgresql:postgresql": "42.7.1"}
+        assert list(pom.dev) == ["junit:junit"]
+
+
+class TestContextGatherer:
+    """Bounded, structured context for the LLM."""
+
+    def test_context_is_structured_and_bounded(self, tmp_path):
+        deps = {f"dep{i}": "^1" for i in range(50)}
+        _write(tmp_path, "package.json", json.dumps({"dependencies": deps, "scripts": {"start": "node ."}}))
+        _write(tmp_path, "requirements.txt", "flask==3.0.0\n" + "# padding\n" * 500)
+
+        text = ContextGatherer(str(tmp_path)).get_context()
+        assert "Project Type: Node.js" in text and "Project Type: Python" in text
+        assert "Available Scripts: start" in text
+        assert "(+30 more)" in text
+        assert "# padding" not in text
+        assert "- python (requirements.txt): 1 direct" in text
+        assert len(text) < 2000
+
+    def test_unparseable_manifest_is_skipped(self, tmp_path):
+        _write(tmp_path, "package.json", "{not json")
+        _write(tmp_path, "go.mod", "module example.com/x\n")
+        assert [ds.ecosystem for ds in parse_project(str(tmp_path))] == ["go"]
+        assert "No specific project context" in ContextGatherer(str(tmp_path / "missing")).get_context()
@@ -110,3 +110,76 @@ jobs:
         passed, violations = self.validator.validate("hello world", "UnknownStage")
         assert passed is True
         assert violations == []
+
+
+class TestStructuredFindings:
+    """Rules run on the parsed model: per container / per step, with line numbers."""
+
+    def setup_method(self):
+        self.validator = PolicyValidator()
+
+    def test_limits_reported_per_container(self):
+        manifest = """
+apiVersion: v1
+kind: Service
+metadata:
+  name: web
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: web
+  namespace: shop
+spec:
+  template:
+    spec:
+      containers:
+        - name: app
+          image: web:1.0
+          resources:
+            limits: {cpu: 500m, memory: 256Mi}
+          readinessProbe: {httpGet: {path: /healthz, port: 8080}}
+        - name: sidecar
+          image: proxy:2.1
+          resources: {}
+"""
+        passed, violations = self.validator.validate(manifest, "K8s")
+        messages = {v.rule: v.message for v in violations}
+        assert not passed
+        assert messages["k8s-no-limits"] == "Line 21: Container 'sidecar' in Deployment/web has no resource limits."
+        assert messages["k8s-no-readiness"].startswith("Line 21: Container 'sidecar'")
+        assert len(violations) == 2
+
+    def test_comment_mentioning_resources_does_not_hide_missing_limits(self):
+        manifest = (
+            "kind: Pod\nmetadata: {name: p, namespace: ns}\n"
+            "# resources: set by the platform team\n"
+            "spec:\n  containers:\n    - name: c\n      image: c:1\n      readinessProbe: {exec: {command: [true]}}\n"
+        )
+        rules = [v.rule for v in self.validator.validate(manifest, "K8s")[1]]
+        assert rules == ["k8s-no-limits"]
+
+    def test_final_stage_user_counts(self):
+        dockerfile = (
+            "FROM node:20 AS build\nUSER node\nRUN npm ci\n"
+            "FROM node:20-slim\nCOPY --from=build /app /app\nHEALTHCHECK CMD true\n"
+        )
+        rules = [v.rule for v in self.validator.validate(dockerfile, "Docker")[1]]
+        assert rules == ["docker-no-user"]
+
+    def test_stage_reference_is_not_an_unpinned_image(self):
+        dockerfile = "FROM golang:1.22 AS build\nFROM build\nUSER 1000\nHEALTHCHECK NONE\n"
+        violations = self.validator.validate(dockerfile, "Docker")[1]
+        assert [v.rule for v in violations] == ["docker-no-healthcheck"]
+
+    def test_unpinned_step_has_job_and_line(self):
+        workflow = "on: [pull_request_target]\njobs:\n  build:\n    steps:\n      - name: co\n        uses: actions/checkout\n"
+        passed, violations = self.validator.validate(workflow, "CI")
+        messages = {v.rule: v.message for v in violations}
+        assert not passed
+        assert messages["ci-unpinned-action"] == "Line 6: Action 'actions/checkout' in step 'co' of job 'build' is not pinned."
+        assert messages["ci-pull-request-target"].startswith("Line 1: ")
+
+    def test_invalid_yaml_is_an_error(self):
+        passed, violations = self.validator.validate("kind: Deployment\n  bad: [indent\n", "K8s")
+        assert not passed and violations[0].rule == "parse-error"
@@ -0,0 +1,104 @@
+"""Tests for the resident policy engine and the conftest-shaped policy inputs."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.policy.engine import PolicyEngine
+from src.policy.documents import parse_document, parse_dockerfile
+from src.policy.validator import PolicyValidator
+
+# Stand-in for `opa run --server`: logs each start, answers /health and
+# /v1/data/main, denying any input containing "BAD" and echoing the
+# Dockerfile commands it received as a warning.
+_FAKE_OPA = '''#!{python}
+import json, os, sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+with open(os.environ["FAKE_TOOL_LOG"], "a") as log:
+    log.write("opa " + " ".join(sys.argv[1:]) + "\\n")
+host, port = sys.argv[sys.argv.index("--addr") + 1].rsplit(":", 1)
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    def log_message(self, *a): pass
+    def _send(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def do_GET(self):
+        self._send({{}})
+    def do_POST(self):
+        doc = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["input"]
+        deny = ["BAD input"] if "BAD" in json.dumps(doc) else []
+        warn = [",".join(i["Cmd"] for i in doc)] if isinstance(doc, list) else []
+        self._send({{"result": {{"deny": deny, "warn": warn}}}})
+
+HTTPServer((host, int(port)), Handler).serve_forever()
+'''
+
+
+class TestPolicyInputs:
+    """Inputs match what conftest hands the Rego policies."""
+
+    def test_dockerfile_instructions(self):
+        doc = [i.to_input() for i in parse_dockerfile(
+            "# syntax=docker/dockerfile:1\n"
+            "FROM --platform=linux/amd64 node:20 AS build\n"
+            "RUN apt-get update && \\\n    apt-get install -y curl\n"
+            "ENV A=1 B=two\n"
+            "FROM gcr.io/distroless/nodejs20\n"
+            'CMD ["node", "server.js"]\n'
+        ).instructions]
+        assert [i["Cmd"] for i in doc] == ["from", "run", "env", "from", "cmd"]
+        assert doc[0]["Flags"] == ["--platform=linux/amd64"]
+        assert doc[0]["Value"] == ["node:20", "AS", "build"]
+        assert doc[1]["Value"] == ["apt-get update && apt-get install -y curl"]
+        assert doc[2]["Value"] == ["A", "1", "B", "two"]
+        assert doc[3]["Stage"] == 1
+        assert doc[4]["JSON"] and doc[4]["Value"] == ["node", "server.js"]
+
+    def test_yaml_keeps_on_key_and_splits_documents(self):
+        docs = parse_document("on:\n  pull_request_target: {}\n---\nkind: Service\n", "workflow.yml").inputs()
+        assert docs == [{"on": {"pull_request_target": {}}}, {"kind": "Service"}]
+
+
+class TestResidentEngine:
+    """One OPA server per policy directory, reused across checks."""
+
+    def test_server_started_once_and_reused(self, fake_tools):
+        engine = PolicyEngine(fake_tools.install("opa", script=_FAKE_OPA, only=True))  # no conftest
+        try:
+            validator = PolicyValidator(engine=engine)
+            assert validator.opa_available and not validator.conftest_available
+
+            clean = "FROM node:20-alpine\nUSER app\nHEALTHCHECK CMD true\n"
+            passed, violations = validator.validate(clean, "docker")
+            assert passed and [v.message for v in violations] == ["from,user,healthcheck"]
+            passed, violations = validator.validate(clean + "# BAD comment is dropped\n", "docker")
+            assert passed
+
+            results = validator.validate_many(["kind: Deployment\nBAD: 1\n", "kind: Service\n"], "k8s")
+            assert results[0][0] is False and results[0][1][-1].rule == "opa-failure"
+            assert not any(v.rule.startswith("opa-") for v in results[1][1])
+
+            starts = fake_tools.calls("opa")
+            assert len(starts) == 2  # policies/docker and policies/k8s
+            assert all("--server" in s and "--watch" in s for s in starts)
+        finally:
+            engine.close()
+
+    def test_falls_back_when_server_cannot_start(self, fake_tools):
+        broken = fake_tools.install("opa", script="#!/bin/sh\nexit 1\n", only=True)
+        validator = PolicyValidator(engine=PolicyEngine(broken))
+        passed, violations = validator.validate("FROM node:20\nUSER app\n", "docker")
+        assert passed and not validator.opa_available
+        assert [v.rule for v in violations] == ["docker-no-healthcheck", "opa-error"]
+
+    def test_builtin_backend_skips_rego(self, fake_tools):
+        binary = fake_tools.install("opa", script=_FAKE_OPA, only=True)
+        validator = PolicyValidator(engine=PolicyEngine(binary), backend="builtin")
+        validator.validate("FROM node:20\n", "docker")
+        assert fake_tools.calls("opa") == []
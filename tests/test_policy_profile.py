@@ -0,0 +1,110 @@
+"""Tests for policy profiling (src/policy/profile.py) and precompiled bundles (src/policy/bundle.py)."""
+
+import sys
+import os
+import hashlib
+import json
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.audit.decision_log import AuditLog
+from src.policy.bundle import BundleIndex
+from src.policy.documents import parse_document
+from src.policy.engine import PolicyEngine
+from src.policy.profile import PolicyProfile, attribute_rego_profile, rego_rule_heads
+from src.policy.rules import STAGE_RULES, run_rules
+from src.policy.validator import PolicyValidator
+from src.tools.validation_cache import ValidationCache, bundle_hash
+
+_ROOT = os.path.join(os.path.dirname(__file__), "..")
+_DOCKERFILE = "FROM node:latest\nRUN npm ci\n"
+
+
+def _write_audit(directory, entries):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "run1.json"), "w") as f:
+        json.dump({"run_id": "run1", "entries": entries}, f)
+
+
+class TestPolicyProfile:
+    """Per-rule timings, hits and decision feedback."""
+
+    def test_run_rules_records_every_rule(self):
+        profile = PolicyProfile()
+        doc = parse_document(_DOCKERFILE, "Dockerfile")
+        found = run_rules(doc, STAGE_RULES["docker"], profile=profile)
+        assert [v.rule for v in found] == [v.rule for v in run_rules(doc, STAGE_RULES["docker"])]
+        stats = {s.rule: s for s in profile.ranked()}
+        assert set(stats) == {"docker-no-latest", "docker-no-user", "docker-no-healthcheck"}
+        assert all(s.calls == 1 and s.hits == 1 and s.seconds >= 0 for s in stats.values())
+
+    def test_feedback_from_audit_log(self, tmp_path):
+        _write_audit(tmp_path, [
+            {"stage": "Docker", "decision": "approve", "policy_rules": ["docker-no-healthcheck"]},
+            {"stage": "Docker", "decision": "refine", "policy_rules": ["docker-no-healthcheck", "docker-no-user"]},
+            {"stage": "Docker", "decision": "reject", "policy_rules": ["docker-no-user"]},
+            {"stage": "Docker", "event": "generation", "model": "x"},
+        ])
+        profile = PolicyProfile()
+        assert profile.load_feedback(str(tmp_path)) == 3
+        stats = {s.rule: s for s in profile.ranked()}
+        assert (stats["docker-no-healthcheck"].fired, stats["docker-no-healthcheck"].override_rate) == (2, 0.5)
+        assert (stats["docker-no-user"].upheld, stats["docker-no-user"].overridden) == (2, 0)
+        assert "50%" in profile.report()
+
+    def test_audit_log_records_rules(self):
+        audit = AuditLog(run_id="t")
+        audit.record(stage="CI", decision="approve", policy_rules=["ci-no-dependency-cache"] * 2)
+        assert audit.entries[0]["policy_rules"] == ["ci-no-dependency-cache"]
+
+    def test_rego_rows_attributed_to_rule_heads(self):
+        policy_dir = os.path.join(_ROOT, "policies", "ci")
+        heads = rego_rule_heads(os.path.join(policy_dir, "workflow.rego"))
+        assert heads[0] == (6, "deny: Deny unpinned GitHub Actions")
+        profile = PolicyProfile()
+        attribute_rego_profile([
+            {"location": {"file": "workflow.rego", "row": 9}, "total_time_ns": 3_000_000, "num_eval": 4},
+            {"location": {"file": "workflow.rego", "row": 10}, "total_time_ns": 1_000_000, "num_eval": 4},
+        ], profile, policy_dir)
+        [stats] = profile.ranked()
+        assert stats.rule == "workflow.rego:deny: Deny unpinned GitHub Actions"
+        assert stats.backend == "rego" and stats.calls == 4 and abs(stats.seconds - 0.004) < 1e-9
+
+    def test_latency_budget_warning(self, caplog):
+        validator = PolicyValidator(cache=ValidationCache(), backend="builtin", latency_budget_ms=0,
+                                    profile=PolicyProfile())
+        with caplog.at_level(logging.WARNING, logger="devops-agent.policy"):
+            validator.validate(_DOCKERFILE, "docker")
+        assert any("over latency budget" in r.getMessage() for r in caplog.records)
+        assert {s.rule for s in validator.profile.ranked()} >= {"docker-no-latest"}
+
+
+class TestPolicyBundles:
+    """The engine serves a bundle only while it matches the policy sources."""
+
+    def _index(self, tmp_path, policy_dir):
+        bundles = tmp_path / "bundles"
+        bundles.mkdir()
+        (bundles / "docker.tar.gz").write_bytes(b"bundle")
+        entry = {"bundle": "docker.tar.gz", "sha256": hashlib.sha256(b"bundle").hexdigest(),
+                 "source_hash": bundle_hash(str(policy_dir))}
+        (bundles / "index.json").write_text(json.dumps({"bundles": {"docker": entry}}))
+        return BundleIndex(str(bundles))
+
+    def test_current_bundle_is_served(self, tmp_path):
+        policy_dir = tmp_path / "docker"
+        policy_dir.mkdir()
+        (policy_dir / "dockerfile.rego").write_text("package main\n")
+        engine = PolicyEngine(binary="opa", bundles=self._index(tmp_path, policy_dir))
+        cmd = engine._server(str(policy_dir)).command()
+        assert cmd[-2:] == ["--bundle", str(tmp_path / "bundles" / "docker.tar.gz")] and "--watch" not in cmd
+
+    def test_stale_bundle_falls_back_to_sources(self, tmp_path):
+        policy_dir = tmp_path / "docker"
+        policy_dir.mkdir()
+        (policy_dir / "dockerfile.rego").write_text("package main\n")
+        index = self._index(tmp_path, policy_dir)
+        (policy_dir / "dockerfile.rego").write_text("package main\n\ndeny contains \"x\" if { true }\n")
+        cmd = PolicyEngine(binary="opa", bundles=index)._server(str(policy_dir)).command()
+        assert cmd[-2:] == ["--watch", str(policy_dir)]
@@ -0,0 +1,175 @@
+"""Tests for src/engine/rag.py on the local NumPy backend (no chromadb needed)."""
+
+import sys
+import os
+import json
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+from src.engine.rag import RAGStore
+from src.engine.vector_backends import HashingEmbedder, NumpyBackend
+
+
+class TestHashingEmbedder:
+    """Local embedding model."""
+
+    def test_vectors_are_unit_length(self):
+        vecs = HashingEmbedder(dim=64).embed(["pin base images", ""])
+        assert vecs.shape == (2, 64)
+        assert abs(np.linalg.norm(vecs[0]) - 1.0) < 1e-5
+        assert not vecs[1].any()
+
+    def test_deterministic_across_instances(self):
+        a = HashingEmbedder().embed(["USER nonroot"])
+        b = HashingEmbedder().embed(["USER nonroot"])
+        assert np.array_equal(a, b)
+
+
+class TestNumpyRAGStore:
+    """RAGStore behaviour on the NumPy backend."""
+
+    def test_seed_and_retrieve_filters_by_type(self, tmp_path):
+        store = RAGStore(str(tmp_path), backend="numpy", use_snapshot=False)
+        store.seed_initial_knowledge()
+        result = store.retrieve("readiness probes and resource limits", "k8s", k=3)
+        assert "Kubernetes" in result
+        assert all(i.startswith("k8s_") for i in store.last_retrieved_ids)
+
+    def test_persists_across_instances(self, tmp_path):
+        RAGStore(str(tmp_path), backend="numpy", use_snapshot=False).add_knowledge("ci", "Cache pip downloads between runs")
+        reopened = RAGStore(str(tmp_path), backend="numpy", use_snapshot=False)
+        assert reopened.backend.count() == 1
+        assert isinstance(reopened.backend, NumpyBackend)
+
+    def test_retrieval_and_outcome_counters(self, tmp_path):
+        store = RAGStore(str(tmp_path), backend="numpy", use_snapshot=False)
+        store.add_knowledge("docker", "Use multi-stage builds", validated=True)
+        store.retrieve("multi-stage", "docker")
+        store.record_outcome(store.last_retrieved_ids, success=False)
+        meta = store.backend.get()["metadatas"][0]
+        assert meta["retrieval_count"] == 1
+        assert meta["success_count"] == 1
+        assert meta["failure_count"] == 1
+
+    def test_usage_stats_are_logged_not_rewritten(self, tmp_path):
+        store = RAGStore(str(tmp_path), backend="numpy", use_snapshot=False)
+        store.add_knowledge("docker", "Use multi-stage builds")
+        sidecar = store.backend.entries_path
+        before = os.path.getmtime(sidecar)
+        store.retrieve("multi-stage", "docker")
+        assert os.path.getmtime(sidecar) == before
+        reopened = RAGStore(str(tmp_path), backend="numpy", use_snapshot=False)
+        assert reopened.backend.get()["metadatas"][0]["retrieval_count"] == 1
+
+    def test_compaction_evicts_and_merges(self, tmp_path):
+        store = RAGStore(str(tmp_path), backend="numpy", use_snapshot=False)
+        store.add_knowledge("docker", "Run as a non-root USER in the final stage")
+        store.add_knowledge("docker", "Run as a non-root USER in the final stage.")
+        store.add_knowledge("docker", "Always use curl | bash installers", validated=False)
+        bad_id = store.backend.get()["ids"][2]
+        for _ in range(3):
+            store.record_outcome([bad_id], success=False)
+
+        report = store.compact()
+        assert report.evicted_low_value == [bad_id]
+        assert len(report.merged) == 1
+        assert RAGStore(str(tmp_path), backend="numpy", use_snapshot=False).backend.count() == 1
+
+    def test_compaction_evicts_stale_but_keeps_seeds(self, tmp_path):
+        store = RAGStore(str(tmp_path), backend="numpy", use_snapshot=False)
+        store.seed_initial_knowledge()
+        store.add_knowledge("docker", "Old advisory nobody reads")
+        old_id = store.backend.get()["ids"][-1]
+        store.backend.update([old_id], [{"created_at": 0.0}])
+
+        report = store.compact()
+        assert report.evicted_stale == [old_id]
+        assert report.kept == 3
+
+
+    def test_interrupted_write_keeps_the_old_index(self, tmp_path, monkeypatch):
+        import src.engine.vector_backends as backends
+        store = RAGStore(str(tmp_path), backend="numpy", use_snapshot=False)
+        store.add_knowledge("docker", "Use multi-stage builds")
+
+        def crash(path, text):
+            raise OSError("disk full")
+        monkeypatch.setattr(backends, "_write_atomic", crash)
+        try:
+            store.add_knowledge("docker", "Pin base image digests")
+        except OSError:
+            pass
+        monkeypatch.undo()
+        reopened = RAGStore(str(tmp_path), backend="numpy", use_snapshot=False)
+        assert reopened.backend.get()["documents"] == ["Use multi-stage builds"]
+        assert reopened.retrieve("multi-stage", "docker")
+
+
+    def test_reads_unversioned_index(self, tmp_path):
+        backend = NumpyBackend(str(tmp_path), "kb")
+        np.save(os.path.join(tmp_path, "kb.npy"), HashingEmbedder().embed(["USER nonroot"]))
+        with open(backend.entries_path, "w") as f:
+            json.dump({"embedder": backend.embedder.name, "ids": ["a"], "documents": ["USER nonroot"],
+                       "metadatas": [{}]}, f)
+        backend = NumpyBackend(str(tmp_path), "kb")
+        assert backend.query("nonroot", 1)["ids"] == ["a"]
+        backend.add(["b"], ["HEALTHCHECK"], [{}])
+        assert sorted(os.listdir(tmp_path)) == sorted(["kb.json", os.path.basename(backend.vectors_path)])
+
+    def test_missing_chromadb_is_logged(self, tmp_path, monkeypatch, caplog):
+        monkeypatch.chdir(tmp_path)  # the fallback index lives at the default relative path
+        with caplog.at_level(logging.WARNING, logger="devops-agent.rag"):
+            store = RAGStore(str(tmp_path / "chroma"), backend="chroma", use_snapshot=False)
+        assert isinstance(store.backend, NumpyBackend)
+        assert any("chromadb is not installed" in r.getMessage() for r in caplog.records)
+
+
+class TestKnowledgeSnapshot:
+    """Prebuilt read-only snapshot layered under the mutable store."""
+
+    def test_build_and_layered_retrieve(self, tmp_path):
+        from src.engine.rag import GOLDEN_PATHS
+        from src.engine.rag_snapshot import KnowledgeSnapshot, build_snapshot
+
+        guidelines = tmp_path / "guidelines"
+        guidelines.mkdir()
+        (guidelines / "docker-guidelines.md").write_text(
+            "# Docker Guidelines\n\n## Runtime\n- HEALTHCHECK required\n\n## Build\n- Pin base image digests\n"
+        )
+        snap_dir = tmp_path / "snap"
+        version = build_snapshot(str(snap_dir), str(guidelines), GOLDEN_PATHS)
+        assert version == build_snapshot(str(snap_dir), str(guidelines), GOLDEN_PATHS)
+
+        snapshot = KnowledgeSnapshot.load(str(snap_dir))
+        assert snapshot.count() == len(GOLDEN_PATHS) + 2
+
+        store = RAGStore(str(tmp_path / "db"), backend="numpy", snapshot_path=str(snap_dir))
+        store.seed_initial_knowledge()
+        assert store.backend.count() == 0  # nothing embedded at startup
+
+        store.add_knowledge("docker", "Use BuildKit cache mounts for pip downloads")
+        result = store.retrieve("pip cache mounts", "docker", k=3)
+        assert "BuildKit" in result
+        assert len(store.last_retrieved_ids) == 3
+
+    def test_stale_snapshot_is_skipped(self, tmp_path, caplog):
+        from src.engine.rag_snapshot import MANIFEST_FILE, build_snapshot
+        snap_dir = tmp_path / "snap"
+        build_snapshot(str(snap_dir), str(tmp_path / "no-guidelines"), [("docker", "Pin base images")])
+        manifest = json.loads((snap_dir / MANIFEST_FILE).read_text())
+        manifest["embedder"] = "hashing-tf-512"  # built before the tokenizer change
+        (snap_dir / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+        with caplog.at_level(logging.WARNING, logger="devops-agent.rag"):
+            store = RAGStore(str(tmp_path / "db"), backend="numpy", snapshot_path=str(snap_dir))
+        assert store.snapshot is None
+        assert any("build_rag_snapshot.py" in r.getMessage() for r in caplog.records)
+        store.add_knowledge("docker", "Use multi-stage builds")
+        assert "multi-stage" in store.retrieve("multi-stage builds", "docker")
+
+    def test_missing_snapshot_is_none(self, tmp_path):
+        from src.engine.rag_snapshot import KnowledgeSnapshot
+        assert KnowledgeSnapshot.load(str(tmp_path / "nope")) is None
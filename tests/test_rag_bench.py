@@ -0,0 +1,33 @@
+"""Smoke test for benchmarks/rag_bench.py at a size small enough for CI."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.common import percentile
+from benchmarks.rag_bench import bench_size, recorded_corpus
+
+
+class TestRagBench:
+    """Benchmark harness produces sane numbers."""
+
+    def test_percentile_nearest_rank(self):
+        samples = [float(i) for i in range(1, 101)]
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile([], 95) == 0.0
+
+    def test_recorded_queries_resolve_to_guideline_bullets(self):
+        chunks, queries = recorded_corpus()
+        assert chunks and queries
+        assert all(q["relevant"] for q in queries)
+
+    def test_bench_small_store(self):
+        rows = bench_size(300, k=5, repeats=1)
+        assert {r["query_set"] for r in rows} == {"synthetic", "recorded"}
+        for row in rows:
+            assert 0.0 <= row["recall_at_k"] <= 1.0
+            assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
+        recorded = next(r for r in rows if r["query_set"] == "recorded")
+        assert recorded["recall_at_k"] > 0.3
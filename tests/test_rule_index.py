@@ -0,0 +1,77 @@
+"""Tests for src/engine/rule_index.py — rule-level guideline/policy retrieval."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.engine.rule_index import RuleIndex, parse_guideline_rules, parse_rego_rules
+
+GUIDELINES = """# Docker Guidelines
+
+## Build (Critical)
+- Multi-stage builds mandatory
+
+## Runtime
+- HEALTHCHECK required in every production image
+- NEVER use :latest tags
+- CMD must use exec form
+"""
+
+REGO = """package main
+
+# Deny running as root
+deny contains msg if {
+    not any_user
+    msg := "Dockerfile: No USER instruction found."
+}
+
+warn contains msg if {
+    input[i].Cmd == "add"
+    msg := sprintf("Prefer COPY over ADD (line %d)", [i + 1])
+}
+"""
+
+
+class TestRuleParsing:
+
+    def test_one_rule_per_bullet_with_section(self, tmp_path):
+        path = tmp_path / "docker-guidelines.md"
+        path.write_text(GUIDELINES)
+        rules = parse_guideline_rules(str(path))
+        assert len(rules) == 4
+        assert rules[0].pinned and rules[0].section == "Build (Critical)"
+        assert not rules[1].pinned
+
+    def test_rego_rules_use_comment_and_message(self, tmp_path):
+        path = tmp_path / "dockerfile.rego"
+        path.write_text(REGO)
+        rules = parse_rego_rules(str(path))
+        assert len(rules) == 2
+        assert rules[0].text.startswith("Deny running as root")
+        assert rules[0].section == "policy: deny"
+        assert "Prefer COPY over ADD" in rules[1].text
+
+
+class TestRuleIndex:
+
+    def _index(self, tmp_path):
+        (tmp_path / "docker-guidelines.md").write_text(GUIDELINES)
+        policy_dir = tmp_path / "policies"
+        policy_dir.mkdir()
+        (policy_dir / "dockerfile.rego").write_text(REGO)
+        return RuleIndex(str(tmp_path / "docker-guidelines.md"), str(policy_dir))
+
+    def test_top_n_is_bounded_and_keeps_pinned(self, tmp_path):
+        rules = self._index(tmp_path).top_rules("FROM node:latest", n=3)
+        assert len(rules) == 3
+        assert any(r.pinned for r in rules)
+        assert any(":latest" in r.text for r in rules)
+
+    def test_rebuilds_when_guidelines_grow(self, tmp_path):
+        index = self._index(tmp_path)
+        assert len(index.top_rules("anything", n=50)) == 6
+        path = tmp_path / "docker-guidelines.md"
+        path.write_text(GUIDELINES + "- Use tini as init\n")
+        os.utime(path, (0, 0))  # force a distinct mtime on fast filesystems
+        assert len(index.top_rules("anything", n=50)) == 7
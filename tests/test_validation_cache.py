@@ -0,0 +1,111 @@
+"""Tests for src/tools/validation_cache.py — memoized tool and policy results."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.engine.models import GeneratedFile
+from src.engine.validate import Validator
+from src.policy.engine import PolicyEngine, PolicyEngineError
+from src.policy.validator import PolicyValidator
+from src.tools.batch_validate import ToolFinding
+from src.tools.validation_cache import ValidationCache
+
+
+class _FlakyEngine(PolicyEngine):
+    """OPA stand-in whose first evaluation fails, then denies everything."""
+
+    def __init__(self):
+        super().__init__(binary=sys.executable)
+        self.calls = 0
+
+    def evaluate(self, policy_dir, documents):
+        self.calls += 1
+        if self.calls == 1:
+            raise PolicyEngineError("opa server did not start")
+        return [ToolFinding("opa", "data.main", "error", "rego says no")]
+
+
+class TestValidationCache:
+    """Keys, de-duplication and the disk tier."""
+
+    def test_run_batch_only_runs_new_unique_content(self, tmp_path):
+        tool = tmp_path / "lint"
+        tool.write_text("")
+        calls = []
+
+        def runner(binary, items):
+            calls.append(sorted(items.values()))
+            return {k: [ToolFinding("lint", "X1", "error", "bad")] if "bad" in c else [] for k, c in items.items()}
+
+        cache = ValidationCache()
+        first = cache.run_batch("lint", str(tool), {0: "ok", 1: "bad", 2: "ok"}, runner)
+        assert [len(first[k]) for k in range(3)] == [0, 1, 0]
+        assert calls == [["bad", "ok"]]
+
+        second = cache.run_batch("lint", str(tool), {"a": "bad", "b": "new"}, runner)
+        assert second["a"][0].code == "X1" and second["b"] == []
+        assert calls[-1] == ["new"]
+
+        os.utime(tool, ns=(0, 0))  # "upgraded" binary -> new key
+        cache.run_batch("lint", str(tool), {0: "ok"}, runner)
+        assert calls[-1] == ["ok"]
+
+    def test_disk_tier_is_shared(self, tmp_path):
+        key = ValidationCache.key("hadolint", "id", "abc")
+        ValidationCache(str(tmp_path / "cache")).put(key, [{"rule": "r"}])
+        fresh = ValidationCache(str(tmp_path / "cache"))
+        assert fresh.get(key) == [{"rule": "r"}] and fresh.hits == 1
+
+    def test_missing_tool_is_not_cached(self, tmp_path):
+        cache = ValidationCache()
+        assert cache.run_batch("lint", str(tmp_path / "absent"), {0: "x"}, lambda b, i: None) is None
+        assert cache.hits == cache.misses == 0
+
+
+class TestCachedValidators:
+    """Validator and PolicyValidator reuse earlier verdicts."""
+
+    def test_validator_skips_unchanged_files(self, fake_tools):
+        fake_tools.install("hadolint", only=True)
+        validator = Validator(cache=ValidationCache())
+        files = [GeneratedFile("a/Dockerfile", "FROM node:20\n"), GeneratedFile("b/Dockerfile", "FROM x:1 # BAD\n")]
+        assert [r.passed for r in validator.validate_many(files)] == [True, False]
+        again = validator.validate_many(files)
+        assert [r.passed for r in again] == [True, False] and "DL3007" in again[1].errors[0]
+        assert len(fake_tools.calls("hadolint")) == 1
+
+    def test_policy_results_follow_the_bundle(self, tmp_path, fake_tools):
+        fake_tools.install("conftest", only=True)
+        policies = tmp_path / "policies" / "docker"
+        policies.mkdir(parents=True)
+        (policies / "dockerfile.rego").write_text("package main\n")
+        validator = PolicyValidator(cache=ValidationCache(), backend="conftest")
+        validator.project_root = str(tmp_path)
+
+        content = "FROM node:20\nUSER app\nHEALTHCHECK CMD true\n# BAD\n"
+        first = validator.validate(content, "docker")
+        assert validator.validate(content, "docker") == first
+        assert len(fake_tools.calls("conftest")) == 2  # --version + one test run
+
+        (policies / "dockerfile.rego").write_text("package main\n# edited\n")
+        assert validator.validate(content, "docker") == first
+        assert len(fake_tools.calls("conftest")) == 3
+
+    def test_failed_rego_run_is_not_cached(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PATH", str(tmp_path))  # no conftest to fall back to
+        policies = tmp_path / "policies" / "docker"
+        policies.mkdir(parents=True)
+        (policies / "dockerfile.rego").write_text("package main\n")
+        cache, engine = ValidationCache(), _FlakyEngine()
+        content = "FROM node:20\nUSER app\nHEALTHCHECK CMD true\n"
+
+        validator = PolicyValidator(engine=engine, cache=cache, backend="opa")
+        validator.project_root = str(tmp_path)
+        assert [v.rule for v in validator.validate(content, "docker")[1]] == ["opa-error"]
+
+        validator = PolicyValidator(engine=engine, cache=cache, backend="opa")
+        validator.project_root = str(tmp_path)
+        passed, violations = validator.validate(content, "docker")
+        assert not passed and [v.message for v in violations] == ["rego says no"]
@@ -0,0 +1,79 @@
+"""Tests for src/tools/validation_scheduler.py and the concurrent validators built on it."""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.engine.models import GeneratedFile
+from src.engine.validate import Validator
+from src.policy.validator import PolicyValidator
+from src.tools.validation_cache import ValidationCache
+from src.tools.validation_scheduler import Check, run_checks
+
+
+def _sleeper(seconds, value):
+    def fn():
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+# Stand-in tool that answers --version at once but takes 3s over any real input
+_SLOW_TOOL = "#!/bin/sh\n[ \"$1\" = --version ] && echo 1.0 && exit 0\nsleep 3\necho '[]'\n"
+
+
+class TestRunChecks:
+    """Concurrency, ordering, timeouts and early exit."""
+
+    def test_checks_overlap_and_keep_order(self):
+        start = time.perf_counter()
+        outcomes = run_checks([Check("a", _sleeper(0.3, "A")), Check("b", _sleeper(0.3, "B"))])
+        assert time.perf_counter() - start < 0.55
+        assert [(o.name, o.value) for o in outcomes] == [("a", "A"), ("b", "B")]
+
+    def test_timeout_and_exception(self):
+        def boom():
+            raise RuntimeError("bad flags")
+
+        start = time.perf_counter()
+        slow, broken = run_checks([Check("slow", _sleeper(2, "late"), timeout=0.2), Check("broken", boom)])
+        assert time.perf_counter() - start < 1
+        assert slow.timed_out and not slow.ok
+        assert isinstance(broken.error, RuntimeError)
+
+    def test_stop_when_skips_unfinished_checks(self):
+        start = time.perf_counter()
+        fast, slow = run_checks([Check("fast", _sleeper(0, ["ERROR"])), Check("slow", _sleeper(2, []))],
+                                stop_when=bool)
+        assert time.perf_counter() - start < 1
+        assert fast.value == ["ERROR"] and slow.skipped
+
+
+class TestConcurrentValidators:
+    """Validator / PolicyValidator merge concurrent results and honour fail_fast and timeouts."""
+
+    def test_tool_timeout_is_reported(self, fake_tools):
+        fake_tools.install("hadolint", script=_SLOW_TOOL)
+        validator = Validator(cache=ValidationCache(), timeouts={"hadolint": 0.3})
+        result = validator.validate(GeneratedFile("Dockerfile", "FROM node:20\n"))
+        assert result.errors == ["HADOLINT TIMEOUT: no result within 0.3s"]
+
+    def test_fail_fast_returns_on_first_error(self, fake_tools):
+        fake_tools.install("kubeconform", script=_SLOW_TOOL)
+        validator = Validator(cache=ValidationCache())
+        manifest = GeneratedFile("k8s/web.yaml", "kind: Deployment\nspec: {replicas: 1}\n")
+        start = time.perf_counter()
+        result = validator.validate(manifest, fail_fast=True)
+        assert time.perf_counter() - start < 2
+        assert not result.passed and "Deployment replicas < 2" in result.errors
+
+    def test_policy_fail_fast_skips_slow_backend(self, fake_tools):
+        fake_tools.install("conftest", script=_SLOW_TOOL)
+        validator = PolicyValidator(cache=ValidationCache(), backend="conftest")
+        assert validator.conftest_available
+        start = time.perf_counter()
+        passed, violations = validator.validate("FROM node:20\n", "docker", fail_fast=True)
+        assert time.perf_counter() - start < 2
+        assert not passed and "docker-no-user" in [v.rule for v in violations]
@@ -0,0 +1,138 @@
+"""Tests for src/tools/workflow_analysis.py — GitHub Actions job graph analysis."""
+
+import sys
+import os
+import stat
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import yaml
+
+from src.agents.deterministic_reviewer import DeterministicReviewer
+from src.engine.models import GeneratedFile
+from src.engine.validate import Validator
+from src.policy.validator import PolicyValidator
+from src.tools.validation_cache import ValidationCache
+from src.tools.workflow_analysis import analyze_workflow
+
+_PIPELINE = """
+on: push
+jobs:
+  lint:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+      - run: npm ci
+      - run: npm run lint
+  test:
+    needs: lint
+    strategy:
+      max-parallel: 2
+      matrix:
+        node: [18, 20, 22]
+        os: [ubuntu-latest, windows-latest]
+        exclude: [{node: 18, os: windows-latest}]
+        include: [{node: 22, experimental: true}, {node: 23, os: ubuntu-latest}]
+    steps:
+      - uses: actions/checkout@v4
+      - uses: actions/setup-node@v4
+        with: {cache: npm}
+      - run: npm ci
+      - run: npm test
+  image:
+    needs: lint
+    steps:
+      - uses: docker/build-push-action@v5
+  deploy:
+    needs: [test, image]
+    steps:
+      - run: ./deploy.sh
+"""
+
+# Stand-in for actionlint: reports every file that contains "BAD"
+_FAKE_ACTIONLINT = '''#!{python}
+import json, sys
+paths = [a for a in sys.argv[1:] if a.endswith(".yml")]
+bad = [p for p in paths if "BAD" in open(p).read()]
+print(json.dumps([{{"message": "property BAD is not defined", "filepath": p, "line": 3, "column": 1,
+                   "kind": "expression"}} for p in bad]))
+sys.exit(1 if bad else 0)
+'''
+
+
+def _analysis(text=_PIPELINE):
+    return analyze_workflow(yaml.safe_load(text))
+
+
+class TestWorkflowAnalysis:
+    """Matrix expansion, caching and the critical path through `needs`."""
+
+    def test_matrix_expansion(self):
+        test = _analysis().jobs["test"]
+        # 3 x 2 - 1 excluded; the node 22 include extends, the node 23 include adds a run
+        assert test.matrix_size == 6 and test.waves == 3
+
+    def test_critical_path_and_wall_time(self):
+        analysis = _analysis()
+        assert analysis.critical_path == ["lint", "test", "deploy"]
+        jobs = analysis.jobs
+        assert analysis.expected_minutes == jobs["lint"].minutes + 3 * jobs["test"].minutes + jobs["deploy"].minutes
+        assert analysis.job_runs == 9 and analysis.max_width == 3
+        assert 1 < analysis.parallelism < analysis.job_runs
+        assert analysis.summary().startswith(f"expected wall time ~{analysis.expected_minutes:.1f} min")
+
+    def test_cache_detection(self):
+        analysis = _analysis()
+        uncached = _analysis(_PIPELINE.replace("with: {cache: npm}", "with: {}"))
+        assert analysis.uncached_jobs == ["lint"] and uncached.uncached_jobs == ["lint", "test"]
+        assert analysis.jobs["test"].minutes < uncached.jobs["test"].minutes
+
+    def test_cycles_and_unknown_needs(self):
+        broken = _PIPELINE.replace("  lint:\n", "  lint:\n    needs: deploy\n").replace("[test, image]",
+                                                                                       "[test, image, ghost]")
+        analysis = _analysis(broken)
+        assert analysis.errors() == ["Job dependency cycle: deploy -> test -> lint -> deploy",
+                                     "Job 'deploy' needs unknown job 'ghost'"]
+        assert analysis.critical_path == [] and "cycle" in analysis.summary()
+
+    def test_dynamic_matrix(self):
+        analysis = _analysis("jobs:\n  t:\n    strategy:\n      matrix: ${{ fromJSON(needs.plan.outputs.m) }}\n"
+                             "    steps: [{run: make}]\n")
+        assert analysis.jobs["t"].matrix_dynamic and analysis.jobs["t"].matrix_size == 1
+
+
+class TestWorkflowIntegration:
+    """Validator, reviewer and policy rules surface the job graph; actionlint runs once per batch."""
+
+    def test_validator_rejects_cycles(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PATH", str(tmp_path))  # no actionlint
+        cyclic = _PIPELINE.replace("  lint:\n", "  lint:\n    needs: deploy\n")
+        result = Validator(cache=ValidationCache()).validate(GeneratedFile(".github/workflows/ci.yml", cyclic))
+        assert not result.passed
+        assert any(e.startswith("Job dependency cycle: ") for e in result.errors)
+
+    def test_reviewer_reports_wall_time_and_actionlint(self, tmp_path):
+        reviewer = DeterministicReviewer()
+        reviewer.cache = ValidationCache()
+        reviewer.actionlint_path = str(tmp_path / "actionlint")
+        with open(reviewer.actionlint_path, "w") as f:
+            f.write(_FAKE_ACTIONLINT.format(python=sys.executable))
+        os.chmod(reviewer.actionlint_path, os.stat(reviewer.actionlint_path).st_mode | stat.S_IEXEC)
+
+        good, bad = reviewer.review_workflows([_PIPELINE, _PIPELINE.replace("./deploy.sh", "${{ BAD }}")])
+        assert good[0] and "Actionlint passed" in good[1] and "expected wall time ~" in good[1]
+        assert "Job 'lint' installs dependencies without a cache" in good[1]
+        assert not bad[0] and "workflow.yml:3 expression error: property BAD is not defined" in bad[1]
+
+    def test_reviewer_rejects_documents_without_jobs(self, tmp_path):
+        reviewer = DeterministicReviewer()
+        reviewer.actionlint_path = str(tmp_path / "actionlint")  # missing: the graph check alone decides
+        results = reviewer.review_workflows(["", "just some text", "- a\n- b\n", "on: push\n", "jobs: {}\n"])
+        assert all(not ok and "non-empty `jobs` mapping" in log for ok, log in results)
+
+    def test_policy_rules(self):
+        validator = PolicyValidator(cache=ValidationCache(), backend="builtin")
+        violations = validator.validate(_PIPELINE.replace("[test, image]", "[test, ghost]"), "CI")[1]
+        messages = {v.rule: v.message for v in violations}
+        assert messages["ci-job-graph"] == "Line 30: Job 'deploy' needs unknown job 'ghost'."
+        assert messages["ci-no-dependency-cache"] == "Line 5: Job 'lint' installs dependencies without a cache."
@@ -0,0 +1,73 @@
+"""Tests for src/tools/workspace.py — private, self-cleaning temp workspaces."""
+
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from src.tools import workspace
+from src.tools.batch_validate import BatchWorkspace
+from src.tools.workspace import NAME_PREFIX, TempWorkspace, sweep_stale, workspace_base
+
+
+class TestTempWorkspace:
+    """Isolation between concurrent validations and guaranteed cleanup."""
+
+    def test_concurrent_workspaces_never_collide(self, tmp_path):
+        def validate(n):
+            with TempWorkspace(base=str(tmp_path)) as ws:
+                path = ws.write("Dockerfile", f"FROM alpine:3.{n}\n")
+                time.sleep(0.01)
+                with open(path, encoding="utf-8") as f:
+                    return ws.root, f.read()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(validate, range(16)))
+        assert len({root for root, _ in results}) == 16
+        assert [content for _, content in results] == [f"FROM alpine:3.{n}\n" for n in range(16)]
+        assert os.listdir(tmp_path) == []
+
+    def test_removed_when_the_tool_run_fails(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            with TempWorkspace(base=str(tmp_path)) as ws:
+                ws.write("k8s/manifest.yaml", "kind: Service\n")
+                raise RuntimeError("kubeconform crashed")
+        assert not os.path.exists(ws.root)
+
+    def test_paths_stay_inside(self, tmp_path):
+        with TempWorkspace(base=str(tmp_path)) as ws:
+            with pytest.raises(ValueError):
+                ws.path("../outside")
+
+    def test_open_workspaces_removed_at_exit(self, tmp_path):
+        ws = TempWorkspace(base=str(tmp_path))
+        workspace._cleanup_live()
+        assert not os.path.exists(ws.root)
+
+    def test_base_selection(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("VALIDATION_TMPDIR", str(tmp_path / "shm"))
+        assert workspace_base() == str(tmp_path / "shm")
+        with BatchWorkspace() as ws:
+            assert ws.root.startswith(str(tmp_path / "shm"))
+            assert os.path.basename(ws.add("draft_a", "FROM alpine\n", "Dockerfile")) == "Dockerfile"
+
+
+class TestSweepStale:
+    """Leftovers of crashed processes are removed; live or recent workspaces are kept."""
+
+    def test_only_old_dead_owner_dirs_are_swept(self, tmp_path):
+        dead = tmp_path / f"{NAME_PREFIX}999999999_validate_x"   # above any pid_max
+        recent = tmp_path / f"{NAME_PREFIX}999999999_validate_y"
+        live = tmp_path / f"{NAME_PREFIX}{os.getppid()}_validate_z"
+        other = tmp_path / "unrelated"
+        for d in (dead, recent, live, other):
+            d.mkdir()
+        old = time.time() - 2 * workspace.STALE_AFTER
+        for d in (dead, live, other):
+            os.utime(d, (old, old))
+        assert sweep_stale(str(tmp_path)) == 1
+        assert sorted(os.listdir(tmp_path)) == sorted([recent.name, live.name, other.name])